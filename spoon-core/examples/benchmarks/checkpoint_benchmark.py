@@ -0,0 +1,120 @@
+"""Memory and time per step of graph checkpointing on a 200-step graph.
+
+Two nodes alternate for 200 steps on a thread that already carries a long
+message history. Every other step appends a message carrying a 2 KB tool
+output, and the graph checkpoints after each node.
+The benchmark compares the delta-encoded InMemoryCheckpointer against a
+baseline that keeps every snapshot as saved (the previous behaviour), and
+reports memory retained by the checkpointer and mean time per step.
+
+Run: python examples/benchmarks/checkpoint_benchmark.py
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, TypedDict
+
+try:
+    from spoon_ai.graph import END, InMemoryCheckpointer, StateGraph
+except ModuleNotFoundError:
+    import sys, pathlib
+    sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+    from spoon_ai.graph import END, InMemoryCheckpointer, StateGraph
+
+
+class BenchState(TypedDict):
+    messages: List[Dict[str, Any]]
+    scratch: Dict[str, Any]
+    step: int
+
+
+class FullSnapshotCheckpointer:
+    """Keeps every snapshot as handed over, like the pre-delta checkpointer."""
+
+    def __init__(self):
+        self.checkpoints: Dict[str, list] = {}
+
+    def save_checkpoint(self, thread_id: str, snapshot) -> None:
+        self.checkpoints.setdefault(thread_id, []).append(snapshot)
+
+    def get_checkpoint(self, thread_id: str, checkpoint_id: Optional[str] = None):
+        snapshots = self.checkpoints.get(thread_id)
+        return snapshots[-1] if snapshots else None
+
+
+def build_graph(checkpointer, steps: int, payload: int):
+    output = "x" * payload
+
+    async def think(state: BenchState) -> dict:
+        step = state["step"] + 1
+        return {
+            "step": step,
+            "messages": [{"role": "assistant", "content": f"step {step}"}],
+            "scratch": {"last": step},
+        }
+
+    async def act(state: BenchState) -> dict:
+        step = state["step"] + 1
+        content = f"{step:06d}{output}"
+        return {"step": step, "messages": [{"role": "tool", "content": content, "step": step}]}
+
+    def route(state: BenchState) -> str:
+        return "done" if state["step"] >= steps else "think"
+
+    graph = StateGraph(BenchState, checkpointer=checkpointer)
+    graph.add_node("think", think)
+    graph.add_node("act", act)
+    graph.add_edge("think", "act")
+    graph.add_conditional_edges("act", route, {"think": "think", "done": END})
+    graph.set_entry_point("think")
+    return graph.compile()
+
+
+def seed_history(size: int) -> List[Dict[str, Any]]:
+    return [{"role": "user" if i % 2 else "assistant", "content": f"earlier turn {i}"} for i in range(size)]
+
+
+async def run(name: str, checkpointer, steps: int, payload: int, history: int) -> None:
+    compiled = build_graph(checkpointer, steps, payload)
+    initial = {"messages": seed_history(history), "scratch": {}, "step": 0}
+    config = {"configurable": {"thread_id": "bench"}, "max_iterations": steps + 10}
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    state = await compiled.invoke(initial, config)
+    elapsed = time.perf_counter() - start
+    # Keep the final state alive so only checkpoint storage differs between runs
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert state["step"] == steps
+    print(
+        f"{name:<14} {(retained - before) / 1024:>10.0f} {(peak - before) / 1024:>10.0f}"
+        f" {elapsed / steps * 1e6:>12.0f}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--payload", type=int, default=2048, help="tool output size in bytes")
+    parser.add_argument("--history", type=int, default=500, help="messages already on the thread")
+    parser.add_argument("--keyframe-interval", type=int, default=16)
+    args = parser.parse_args()
+
+    print(f"{'checkpointer':<14} {'kept KiB':>10} {'peak KiB':>10} {'us / step':>12}")
+    await run("full-snapshot", FullSnapshotCheckpointer(), args.steps, args.payload, args.history)
+    await run(
+        "delta",
+        InMemoryCheckpointer(args.steps + 10, keyframe_interval=args.keyframe_interval),
+        args.steps,
+        args.payload,
+        args.history,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
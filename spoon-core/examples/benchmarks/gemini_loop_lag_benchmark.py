@@ -0,0 +1,155 @@
+"""Event-loop lag while the Gemini provider serves concurrent requests.
+
+A local mock of the Gemini REST API answers each generateContent call after a
+fixed delay (streamGenerateContent sends a few SSE chunks over the same time).
+While a batch of concurrent chat / chat_stream calls runs, a ticker coroutine
+measures how late the event loop wakes it up. The previous implementation
+(a synchronous client per call inside async methods) is timed for comparison.
+Lag left in the async modes is the SDK's CPU time for building and parsing
+requests, not waiting on the network.
+
+Run: python examples/benchmarks/gemini_loop_lag_benchmark.py
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from google import genai
+from google.genai import types
+
+try:
+    from spoon_ai.llm.providers.gemini_provider import GeminiProvider
+    from spoon_ai.schema import Message
+except ModuleNotFoundError:
+    import sys, pathlib
+    sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+    from spoon_ai.llm.providers.gemini_provider import GeminiProvider
+    from spoon_ai.schema import Message
+
+
+MODEL = "gemini-2.5-flash"
+
+
+def _payload(text: str) -> bytes:
+    return json.dumps({
+        "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP", "index": 0}],
+        "usageMetadata": {"promptTokenCount": 5, "candidatesTokenCount": 2, "totalTokenCount": 7},
+    }).encode()
+
+
+def start_mock_server(delay: float, stream_chunks: int) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if ":streamGenerateContent" in self.path:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                for i in range(stream_chunks):
+                    time.sleep(delay / stream_chunks)
+                    self.wfile.write(b"data: " + _payload(f"chunk {i} ") + b"\r\n\r\n")
+                    self.wfile.flush()
+                self.close_connection = True
+                return
+            time.sleep(delay)
+            body = _payload("hello")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 256  # the default backlog of 5 drops connections under a burst
+
+    server = Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def measure_lag(work, tick: float = 0.005):
+    """Run ``work()`` while sampling how late sleep(tick) wakes up; return (seconds, lags)."""
+    loop = asyncio.get_running_loop()
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = loop.time()
+            await asyncio.sleep(tick)
+            lags.append(loop.time() - start - tick)
+
+    ticker_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - start
+    done.set()
+    await ticker_task
+    return elapsed, lags
+
+
+def legacy_chat(base_url: str):
+    """The previous chat(): a new sync client per call, run inside the coroutine."""
+    async def call():
+        client = genai.Client(api_key="mock", http_options=types.HttpOptions(base_url=base_url))
+        try:
+            client.models.generate_content(model=MODEL, contents="hi", config=types.GenerateContentConfig(max_output_tokens=16))
+        finally:
+            client.close()
+    return call
+
+
+def report(name: str, requests: int, elapsed: float, lags: list) -> None:
+    lags = sorted(lags) or [0.0]
+    p99 = lags[min(len(lags) - 1, int(0.99 * len(lags)))]
+    print(f"{name:<16} {requests:>8} {elapsed * 1000:>9.0f} {p99 * 1000:>11.1f} {lags[-1] * 1000:>11.1f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.1, help="mock server latency per request (s)")
+    args = parser.parse_args()
+
+    server = start_mock_server(args.delay, stream_chunks=5)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    provider = GeminiProvider()
+    await provider.initialize({"api_key": "mock", "model": MODEL, "base_url": base_url, "max_tokens": 16})
+    messages = [Message(role="user", content="hi")]
+    await provider.chat(messages)  # warm-up: first connection to the mock server
+
+    async def native_chat():
+        await asyncio.gather(*(provider.chat(messages) for _ in range(args.requests)))
+
+    async def native_stream():
+        async def consume():
+            async for _ in provider.chat_stream(messages):
+                pass
+        await asyncio.gather(*(consume() for _ in range(args.requests)))
+
+    async def legacy():
+        call = legacy_chat(base_url)
+        await asyncio.gather(*(call() for _ in range(args.requests)))
+
+    print(f"{'mode':<16} {'requests':>8} {'total ms':>9} {'p99 lag ms':>11} {'max lag ms':>11}")
+    for name, work in (("blocking (old)", legacy), ("async chat", native_chat), ("async stream", native_stream)):
+        elapsed, lags = await measure_lag(work)
+        report(name, args.requests, elapsed, lags)
+
+    await provider.cleanup()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+"""Simulated-provider benchmark for LoadBalancer strategies.
+
+Three providers serve a steady stream of concurrent requests. Two are fast;
+the third has degraded (think 300 ms -> 8 s, scaled down here so the run takes
+a few seconds). The benchmark reports p50/p99 latency for each strategy.
+
+Run: python examples/benchmarks/load_balancer_benchmark.py
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+
+try:
+    from spoon_ai.llm.manager import LoadBalancer
+except ModuleNotFoundError:
+    import sys, pathlib
+    sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+    from spoon_ai.llm.manager import LoadBalancer
+
+
+# Mean latencies in seconds (scaled 1:100 from 300 ms and 8 s)
+PROVIDER_LATENCY = {
+    "provider-a": 0.003,
+    "provider-b": 0.003,
+    "provider-degraded": 0.080,
+}
+
+
+def _percentile(samples, quantile):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(quantile * len(ordered)))
+    return ordered[index]
+
+
+async def _run_strategy(strategy: str, requests: int, interval: float) -> list:
+    balancer = LoadBalancer()
+    providers = list(PROVIDER_LATENCY)
+    loop = asyncio.get_running_loop()
+    latencies = []
+
+    async def one_request():
+        provider = balancer.select_provider(providers, strategy)
+        balancer.record_request_start(provider)
+        start = loop.time()
+        await asyncio.sleep(random.expovariate(1 / PROVIDER_LATENCY[provider]))
+        duration = loop.time() - start
+        balancer.record_request_end(provider, duration, True)
+        latencies.append(duration)
+
+    tasks = []
+    for _ in range(requests):
+        tasks.append(asyncio.create_task(one_request()))
+        await asyncio.sleep(interval)
+    await asyncio.gather(*tasks)
+    return latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--interval", type=float, default=0.002, help="Seconds between arrivals")
+    args = parser.parse_args()
+
+    random.seed(7)
+    print(f"{'strategy':<14}{'p50 (ms)':>10}{'p99 (ms)':>10}{'mean (ms)':>11}")
+    for strategy in ("round_robin", "least_latency", "p2c"):
+        latencies = await _run_strategy(strategy, args.requests, args.interval)
+        print(
+            f"{strategy:<14}"
+            f"{_percentile(latencies, 0.50) * 1000:>10.1f}"
+            f"{_percentile(latencies, 0.99) * 1000:>10.1f}"
+            f"{statistics.mean(latencies) * 1000:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
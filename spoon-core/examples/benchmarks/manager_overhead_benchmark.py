@@ -0,0 +1,141 @@
+"""Per-call overhead of LLMManager with a no-op provider.
+
+A provider whose chat / chat_with_tools return immediately is registered in a
+private registry, so the time per call is the manager's own work: provider
+resolution, capability checks, debug logging, metrics and normalization. The
+direct provider call is the floor; "uncached" invalidates the resolved
+provider handles before every call, as every call used to resolve them.
+
+Run: python examples/benchmarks/manager_overhead_benchmark.py
+"""
+
+import argparse
+import asyncio
+import time
+
+try:
+    from spoon_ai.llm.config import ConfigurationManager, ProviderConfig
+    from spoon_ai.llm.interface import LLMProviderInterface, LLMResponse, ProviderCapability, ProviderMetadata
+    from spoon_ai.llm.manager import LLMManager
+    from spoon_ai.llm.monitoring import DebugLogger, MetricsCollector
+    from spoon_ai.llm.registry import LLMProviderRegistry
+    from spoon_ai.schema import Message
+except ModuleNotFoundError:
+    import sys, pathlib
+    sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+    from spoon_ai.llm.config import ConfigurationManager, ProviderConfig
+    from spoon_ai.llm.interface import LLMProviderInterface, LLMResponse, ProviderCapability, ProviderMetadata
+    from spoon_ai.llm.manager import LLMManager
+    from spoon_ai.llm.monitoring import DebugLogger, MetricsCollector
+    from spoon_ai.llm.registry import LLMProviderRegistry
+    from spoon_ai.schema import Message
+
+
+class NoopProvider(LLMProviderInterface):
+    _declared_capabilities = [ProviderCapability.CHAT, ProviderCapability.TOOLS]
+
+    async def initialize(self, config):
+        pass
+
+    async def chat(self, messages, **kwargs):
+        return LLMResponse(content="ok", provider="noop", model="noop", finish_reason="stop", native_finish_reason="stop")
+
+    async def chat_stream(self, messages, callbacks=None, **kwargs):
+        yield  # pragma: no cover
+
+    async def completion(self, prompt, **kwargs):
+        return await self.chat([])
+
+    async def chat_with_tools(self, messages, tools, **kwargs):
+        return await self.chat(messages)
+
+    def get_metadata(self):
+        return ProviderMetadata(name="noop", version="1", capabilities=self._declared_capabilities,
+                                max_tokens=4096, supports_system_messages=True)
+
+    async def health_check(self):
+        return True
+
+    async def cleanup(self):
+        pass
+
+
+class StaticConfig(ConfigurationManager):
+    """Configuration with a single no-op provider and no environment lookups."""
+
+    def load_provider_config(self, provider_name):
+        if provider_name not in self._provider_configs:
+            self._provider_configs[provider_name] = ProviderConfig(name=provider_name, api_key="noop", model="noop")
+        return self._provider_configs[provider_name]
+
+    def list_configured_providers(self):
+        return ["noop"]
+
+    def get_default_provider(self):
+        return "noop"
+
+    def get_fallback_chain(self):
+        return ["noop"]
+
+
+def build_manager(debug_enabled: bool) -> LLMManager:
+    registry = LLMProviderRegistry()
+    registry.register("noop", NoopProvider)
+    return LLMManager(
+        config_manager=StaticConfig(),
+        debug_logger=DebugLogger(enabled=debug_enabled),
+        metrics_collector=MetricsCollector(),
+        registry=registry,
+    )
+
+
+async def per_call_us(call, calls: int) -> float:
+    for _ in range(min(calls, 1000)):
+        await call()
+    start = time.perf_counter()
+    for _ in range(calls):
+        await call()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per mode; the best is reported")
+    args = parser.parse_args()
+
+    messages = [Message(role="user", content="hi")]
+    tools = [{"type": "function", "function": {"name": "noop", "description": "", "parameters": {}}}]
+    provider = NoopProvider()
+    with_debug = build_manager(debug_enabled=True)
+    without_debug = build_manager(debug_enabled=False)
+
+    async def uncached_chat():
+        with_debug.invalidate_provider_cache()
+        await with_debug.chat(messages)
+
+    async def uncached_tools():
+        with_debug.invalidate_provider_cache()
+        await with_debug.chat_with_tools(messages, tools)
+
+    modes = [
+        ("provider only", lambda: provider.chat(messages), lambda: provider.chat_with_tools(messages, tools)),
+        ("uncached", uncached_chat, uncached_tools),
+        ("debug log on", lambda: with_debug.chat(messages), lambda: with_debug.chat_with_tools(messages, tools)),
+        ("debug log off", lambda: without_debug.chat(messages), lambda: without_debug.chat_with_tools(messages, tools)),
+    ]
+    best = {name: [float("inf"), float("inf")] for name, _, _ in modes}
+    # Interleave modes so drift in machine load affects all of them alike
+    for _ in range(args.repeat):
+        for name, chat, chat_with_tools in modes:
+            best[name][0] = min(best[name][0], await per_call_us(chat, args.calls))
+            best[name][1] = min(best[name][1], await per_call_us(chat_with_tools, args.calls))
+
+    print(f"{'mode':<16}{'chat (us)':>11}{'chat_with_tools (us)':>22}")
+    for name, (chat_us, tools_us) in best.items():
+        print(f"{name:<16}{chat_us:>11.1f}{tools_us:>22.1f}")
+    print(f"\nactive requests left in debug logger: {len(with_debug.debug_logger.active_requests)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+"""Microbenchmark for the add_messages and append_history graph reducers.
+
+Applies one node's worth of updates (a few appends, an update by id and a
+few removals) to message states of 1k/10k/100k messages, and compares the
+indexed add_messages with the previous copy-and-rebuild implementation.
+append_history is timed appending to a history of the same size.
+
+Run: python examples/benchmarks/reducers_benchmark.py
+"""
+
+import argparse
+import time
+
+try:
+    from spoon_ai.graph import add_messages, append_history
+except ModuleNotFoundError:
+    import sys, pathlib
+    sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+    from spoon_ai.graph import add_messages, append_history
+
+
+def legacy_add_messages(existing, new):
+    """The previous implementation: one list rebuild per removal, no updates."""
+    result = list(existing)
+    for item in new:
+        if isinstance(item, dict) and item.get("type") == "remove":
+            remove_id = item.get("target_id")
+            result = [msg for msg in result if msg.get("id") != remove_id]
+        else:
+            result.append(item)
+    return result
+
+
+def build_state(size: int) -> list:
+    return [{"id": f"m{i}", "role": "user" if i % 2 else "assistant", "content": f"turn {i}"} for i in range(size)]
+
+
+def build_update(size: int, removals: int) -> list:
+    update = [{"id": f"new{i}", "role": "assistant", "content": "reply"} for i in range(3)]
+    update.append({"id": f"m{size // 2}", "role": "assistant", "content": "edited"})
+    update.extend({"type": "remove", "target_id": f"m{i * size // removals}"} for i in range(removals))
+    return update
+
+
+def time_call(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--removals", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'messages':>9} {'indexed ms':>11} {'legacy ms':>10} {'history us':>11}")
+    for size in args.sizes:
+        state = build_state(size)
+        update = build_update(size, args.removals)
+        indexed = time_call(lambda: add_messages(state, update), args.repeat)
+        legacy = time_call(lambda: legacy_add_messages(state, update), args.repeat)
+        history = build_state(size)
+        appended = time_call(lambda: append_history(history, {"event": "step"}), args.repeat)
+        print(f"{size:>9} {indexed * 1000:>11.2f} {legacy * 1000:>10.2f} {appended * 1e6:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Bytes on the wire and time to first chunk for each CompiledGraph.stream mode.
+
+A two-node agent loop runs for 50 steps on a state that already holds a long
+message history. Every chunk is JSON-serialized as an SSE/websocket server
+would, and the benchmark reports total serialized bytes, time to the first
+serialized chunk and total time per mode.
+
+Run: python examples/benchmarks/stream_modes_benchmark.py
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, TypedDict
+
+try:
+    from spoon_ai.graph import END, StateGraph
+except ModuleNotFoundError:
+    import sys, pathlib
+    sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+    from spoon_ai.graph import END, StateGraph
+
+
+class LoopState(TypedDict):
+    messages: List[Dict[str, Any]]
+    step: int
+
+
+def build_graph(steps: int):
+    async def think(state: LoopState) -> dict:
+        return {"step": state["step"] + 1, "messages": [{"role": "assistant", "content": f"step {state['step']}"}]}
+
+    async def act(state: LoopState) -> dict:
+        return {"messages": [{"role": "tool", "content": "result " * 50}]}
+
+    graph = StateGraph(LoopState)
+    graph.add_node("think", think)
+    graph.add_node("act", act)
+    graph.add_edge("think", "act")
+    graph.add_conditional_edges("act", lambda s: "done" if s["step"] >= steps else "again", {"again": "think", "done": END})
+    graph.set_entry_point("think")
+    return graph.compile()
+
+
+async def run(mode: str, steps: int, history: int) -> None:
+    compiled = build_graph(steps)
+    initial = {"messages": [{"role": "user", "content": f"earlier turn {i}"} for i in range(history)], "step": 0}
+    total_bytes = 0
+    first = None
+    start = time.perf_counter()
+    async for chunk in compiled.stream(initial, {"max_iterations": steps * 2 + 10}, stream_mode=mode):
+        total_bytes += len(json.dumps(chunk, default=str))
+        if first is None:
+            first = time.perf_counter() - start
+    elapsed = time.perf_counter() - start
+    print(f"{mode:<9} {total_bytes / 1024:>10.0f} {first * 1000:>10.2f} {elapsed * 1000:>10.1f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--history", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'mode':<9} {'KiB sent':>10} {'first ms':>10} {'total ms':>10}")
+    for mode in ("values", "updates", "messages"):
+        await run(mode, args.steps, args.history)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
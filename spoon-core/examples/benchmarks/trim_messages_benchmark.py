@@ -0,0 +1,82 @@
+"""Benchmark for ShortTermMemoryManager.trim_messages on long agent histories.
+
+Builds synthetic histories of user/assistant turns interleaved with tool calls
+and their results, then trims them to a fixed budget. Reports cold-cache and
+warm-cache times for the single-pass path, and for small histories the old
+recount-per-candidate behaviour (a counter without cached per-message counts).
+
+Run: python examples/benchmarks/trim_messages_benchmark.py
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+try:
+    from spoon_ai.memory.short_term_manager import MessageTokenCounter, ShortTermMemoryManager, TrimStrategy
+    from spoon_ai.schema import Function, Message, ToolCall
+except ModuleNotFoundError:
+    import sys, pathlib
+    sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+    from spoon_ai.memory.short_term_manager import MessageTokenCounter, ShortTermMemoryManager, TrimStrategy
+    from spoon_ai.schema import Function, Message, ToolCall
+
+
+class RecountingCounter(MessageTokenCounter):
+    """Counts the whole list on every call, forcing the recount fallback."""
+
+    async def count_tokens(self, messages, model=None):
+        return self._approximate_count(messages)
+
+
+def build_history(size: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    messages = [Message(role="system", content="You are a helpful agent.")]
+    call = 0
+    while len(messages) < size:
+        if rng.random() < 0.3:
+            ids = [f"call_{call}_{i}" for i in range(rng.randint(1, 3))]
+            call += 1
+            messages.append(Message(
+                role="assistant",
+                content="",
+                tool_calls=[ToolCall(id=i, function=Function(name="search", arguments="{}")) for i in ids],
+            ))
+            for i in ids:
+                messages.append(Message(role="tool", name="search", tool_call_id=i, content="r" * rng.randint(50, 800)))
+        else:
+            messages.append(Message(role=rng.choice(["user", "assistant"]), content="x" * rng.randint(20, 600)))
+    return messages
+
+
+async def _time_trim(manager, messages, max_tokens, strategy) -> float:
+    start = time.perf_counter()
+    await manager.trim_messages(messages, max_tokens, strategy=strategy)
+    return time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--max-tokens", type=int, default=8000)
+    parser.add_argument("--recount-max", type=int, default=2000,
+                        help="largest history to run through the recount fallback")
+    args = parser.parse_args()
+
+    print(f"{'messages':>9} {'strategy':>10} {'cold ms':>9} {'warm ms':>9} {'recount ms':>11}")
+    for size in args.sizes:
+        history = build_history(size)
+        for strategy in (TrimStrategy.FROM_END, TrimStrategy.FROM_START):
+            manager = ShortTermMemoryManager()
+            cold = await _time_trim(manager, history, args.max_tokens, strategy)
+            warm = await _time_trim(manager, history, args.max_tokens, strategy)
+            recount = "-"
+            if size <= args.recount_max:
+                legacy = ShortTermMemoryManager(token_counter=RecountingCounter())
+                recount = f"{await _time_trim(legacy, history, args.max_tokens, strategy) * 1000:.1f}"
+            print(f"{size:>9} {strategy.value:>10} {cold * 1000:>9.1f} {warm * 1000:>9.1f} {recount:>11}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,14 +1,335 @@
 import time
-from typing import Union, Dict, Any, Optional, List, AsyncIterator, AsyncContextManager
+from typing import Union, Dict, Any, Optional, List, AsyncIterator, AsyncContextManager, Callable
 import asyncio
+from collections import OrderedDict
 from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from fastmcp.client import Client as MCPClient
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def _transport_error_types() -> tuple:
+    """Exceptions that mean the connection itself failed, not the tool call."""
+    types = [OSError, EOFError]  # includes ConnectionError; TimeoutError is excluded below
+    try:
+        import anyio
+        types += [anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream]
+    except ImportError:
+        pass
+    try:
+        import httpx
+        types.append(httpx.TransportError)
+    except ImportError:
+        pass
+    return tuple(types)
+
+
+_TRANSPORT_ERRORS = _transport_error_types()
+
+
+def _is_transport_error(exc: BaseException, depth: int = 0) -> bool:
+    """Whether ``exc``, its cause/context or a grouped sub-exception is a transport failure."""
+    if exc is None or depth > 8:
+        return False
+    if isinstance(exc, (TimeoutError, asyncio.TimeoutError)):
+        # A slow tool call (e.g. asyncio.wait_for in MCPTool) fails only that call
+        return False
+    if isinstance(exc, _TRANSPORT_ERRORS):
+        return True
+    for sub in getattr(exc, "exceptions", None) or ():
+        if isinstance(sub, BaseException) and _is_transport_error(sub, depth + 1):
+            return True
+    return _is_transport_error(exc.__cause__ or exc.__context__, depth + 1)
+
+
+@dataclass
+class _PooledSession:
+    """A long-lived MCP client connection shared by everything targeting one server."""
+    key: str
+    client: Any
+    connected: bool = False
+    needs_reconnect: bool = False
+    # Replaced in the pool while still borrowed; closed when its last user releases it
+    retired: bool = False
+    users: int = 0
+    # Event loop the connection was opened on; it cannot be used from another loop
+    loop: Optional[asyncio.AbstractEventLoop] = None
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class MCPSessionPool:
+    """Keyed pool of persistent MCP client sessions.
+
+    One connected client is kept per server key and shared by concurrent
+    callers (MCP multiplexes requests over a single session), so a tool call
+    costs a single round trip instead of a full transport handshake.
+
+    - Idle sessions are closed after ``idle_timeout`` seconds.
+    - Sessions idle for longer than ``probe_interval`` are pinged before reuse
+      and reconnected if the ping fails.
+    - A session whose connection drops during use, or whose call fails with a
+      transport error, is reconnected on next use. If other callers are still
+      using it, new callers get a fresh session from ``client_factory`` and the
+      old one is closed once its last user releases it.
+    - The pool serves one event loop at a time: when called from a new loop
+      (e.g. successive ``asyncio.run`` calls) its lock is recreated and
+      sessions opened on the previous loop are replaced by fresh clients.
+    - At most ``max_size`` servers are kept connected; the least recently used
+      idle session is closed to make room.
+    """
+
+    def __init__(self, max_size: int = 32, idle_timeout: float = 600.0,
+                 probe_interval: float = 60.0, probe_timeout: float = 5.0):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+
+        self._sessions: "OrderedDict[str, _PooledSession]" = OrderedDict()
+        self._lock = asyncio.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._last_eviction = time.monotonic()
+        self._stats = {
+            "created": 0,
+            "closed": 0,
+            "failed": 0,
+            "reused": 0,
+            "reconnected": 0,
+            "evicted": 0,
+            "rebound": 0,
+        }
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        """Recreate the pool lock if the running loop changed since the last call."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+        return loop
+
+    @asynccontextmanager
+    async def session(self, key: str, client_factory: Callable[[], Any]) -> AsyncIterator[Any]:
+        """Borrow the connected client for ``key``, creating it with ``client_factory`` if needed."""
+        loop = self._bind_loop()
+        await self._evict_idle()
+        entry = await self._acquire(key, client_factory, loop)
+        try:
+            yield entry.client
+        except BaseException as e:
+            # Drop connections that died mid-call so the next caller reconnects
+            if _is_transport_error(e) or not self._is_connected(entry.client):
+                entry.needs_reconnect = True
+            raise
+        finally:
+            await self._release(entry)
+
+    async def _release(self, entry: _PooledSession) -> None:
+        entry.users -= 1
+        entry.last_used = time.monotonic()
+        if entry.retired and entry.users == 0:
+            await self._disconnect(entry)
+
+    async def _retire(self, entry: _PooledSession) -> None:
+        """Take a still-borrowed session out of the pool so new callers open a fresh one."""
+        entry.retired = True
+        async with self._lock:
+            if self._sessions.get(entry.key) is entry:
+                del self._sessions[entry.key]
+        self._stats["reconnected"] += 1
+
+    async def _acquire(self, key: str, client_factory: Callable[[], Any],
+                       loop: asyncio.AbstractEventLoop) -> _PooledSession:
+        while True:
+            entry = await self._borrow(key, client_factory, loop)
+            try:
+                async with entry.lock:
+                    if not entry.retired and await self._prepare(entry):
+                        entry.last_used = time.monotonic()
+                        return entry
+            except BaseException:
+                await self._release(entry)
+                raise
+            # Retired while we waited for it: borrow the replacement instead
+            await self._release(entry)
+
+    async def _prepare(self, entry: _PooledSession) -> bool:
+        """Connect or reuse a borrowed entry under its lock; False if it had to be retired."""
+        stale = entry.connected and entry.needs_reconnect
+        if stale:
+            logger.info(f"MCP session for {entry.key} dropped, reconnecting")
+        elif entry.connected and time.monotonic() - entry.last_used > self.probe_interval:
+            stale = not await self._probe(entry)
+            if stale:
+                logger.info(f"MCP session for {entry.key} failed liveness probe, reconnecting")
+
+        if stale:
+            if entry.users > 1:
+                # Other tasks are mid-call on it; closing now would fail their calls too
+                await self._retire(entry)
+                return False
+            await self._disconnect(entry)
+            self._stats["reconnected"] += 1
+
+        if entry.connected:
+            self._stats["reused"] += 1
+        else:
+            await self._connect(entry)
+        return True
+
+    async def _borrow(self, key: str, client_factory: Callable[[], Any],
+                      loop: asyncio.AbstractEventLoop) -> _PooledSession:
+        async with self._lock:
+            entry = self._sessions.get(key)
+            if entry is not None and entry.loop is not None and entry.loop is not loop:
+                # Opened on another (usually closed) loop: its streams are unusable here
+                logger.info(f"MCP session for {key} belongs to another event loop, replacing it")
+                self._sessions.pop(key)
+                await self._disconnect(entry)
+                self._stats["rebound"] += 1
+                entry = None
+            if entry is None:
+                await self._make_room()
+                entry = _PooledSession(key=key, client=client_factory())
+                self._sessions[key] = entry
+            self._sessions.move_to_end(key)
+            entry.users += 1
+            return entry
+
+    async def _connect(self, entry: _PooledSession) -> None:
+        try:
+            await entry.client.__aenter__()
+        except Exception as e:
+            self._stats["failed"] += 1
+            logger.error(f"Failed to create MCP session for {entry.key}: {e}")
+            raise
+        entry.connected = True
+        entry.loop = asyncio.get_running_loop()
+        entry.created_at = time.monotonic()
+        self._stats["created"] += 1
+        logger.debug(f"Created MCP session for {entry.key} (pooled: {len(self._sessions)})")
+
+    async def _disconnect(self, entry: _PooledSession) -> None:
+        if not entry.connected:
+            return
+        entry.connected = False
+        entry.needs_reconnect = False
+        if entry.loop is not asyncio.get_running_loop():
+            # Closing would await streams bound to the old loop; just forget them
+            logger.debug(f"Dropped MCP session for {entry.key} from a previous event loop")
+            return
+        try:
+            await entry.client.__aexit__(None, None, None)
+            self._stats["closed"] += 1
+            logger.debug(f"Closed MCP session for {entry.key}")
+        except Exception as e:
+            self._stats["failed"] += 1
+            logger.error(f"Error closing MCP session for {entry.key}: {e}")
+
+    async def _probe(self, entry: _PooledSession) -> bool:
+        if not self._is_connected(entry.client):
+            return False
+        ping = getattr(entry.client, "ping", None)
+        if ping is None:
+            return True
+        try:
+            result = await asyncio.wait_for(ping(), timeout=self.probe_timeout)
+            return result is not False
+        except Exception as e:
+            logger.debug(f"MCP ping failed for {entry.key}: {e}")
+            return False
+
+    @staticmethod
+    def _is_connected(client: Any) -> bool:
+        is_connected = getattr(client, "is_connected", None)
+        if is_connected is None:
+            return True
+        try:
+            return bool(is_connected())
+        except Exception:
+            return False
+
+    async def _make_room(self) -> None:
+        """Close least recently used idle sessions until a new key fits. Caller holds ``_lock``."""
+        while len(self._sessions) >= self.max_size:
+            idle_key = next((k for k, e in self._sessions.items() if e.users == 0), None)
+            if idle_key is None:
+                raise RuntimeError(f"Maximum pooled MCP sessions ({self.max_size}) reached")
+            entry = self._sessions.pop(idle_key)
+            await self._disconnect(entry)
+            self._stats["evicted"] += 1
+
+    async def _evict_idle(self) -> None:
+        """Close sessions idle for longer than ``idle_timeout``."""
+        now = time.monotonic()
+        if now - self._last_eviction < min(self.idle_timeout, 60.0):
+            return
+        self._last_eviction = now
+
+        async with self._lock:
+            stale = [
+                key for key, entry in self._sessions.items()
+                if entry.users == 0 and now - entry.last_used > self.idle_timeout
+            ]
+            for key in stale:
+                entry = self._sessions.pop(key)
+                logger.info(f"Closing idle MCP session for {key}")
+                await self._disconnect(entry)
+                self._stats["evicted"] += 1
+
+    async def close(self, key: str) -> None:
+        """Close and forget the pooled session for ``key``."""
+        self._bind_loop()
+        async with self._lock:
+            entry = self._sessions.pop(key, None)
+        if entry is not None:
+            await self._disconnect(entry)
+
+    async def close_all(self) -> None:
+        """Close every pooled session."""
+        self._bind_loop()
+        async with self._lock:
+            entries = list(self._sessions.values())
+            self._sessions.clear()
+        await asyncio.gather(*(self._disconnect(e) for e in entries), return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics for monitoring."""
+        return {
+            **self._stats,
+            "active": sum(1 for e in self._sessions.values() if e.connected),
+            "in_use": sum(e.users for e in self._sessions.values()),
+            "pooled": len(self._sessions),
+            "max_size": self.max_size,
+        }
+
+
+_global_session_pool: Optional[MCPSessionPool] = None
+
+
+def get_mcp_session_pool() -> MCPSessionPool:
+    """Get the process-wide MCP session pool.
+
+    The pool may outlive an event loop; it rebinds to the running loop on
+    use, see ``MCPSessionPool``.
+    """
+    global _global_session_pool
+    if _global_session_pool is None:
+        _global_session_pool = MCPSessionPool()
+    return _global_session_pool
+
+
+def set_mcp_session_pool(pool: MCPSessionPool) -> None:
+    """Replace the process-wide MCP session pool (e.g. to change its limits)."""
+    global _global_session_pool
+    _global_session_pool = pool
+
+
 class MCPClientMixin:
-    def __init__(self, mcp_transport):
+    def __init__(self, mcp_transport, pool_key: Optional[str] = None):
         if mcp_transport and mcp_transport != "mcp_server":
             try:
                 self._client = MCPClient(mcp_transport)
@@ -22,186 +343,40 @@ class MCPClientMixin:
         self._last_topic = None
         self._last_message_id = None
 
-        # Enhanced session management
-        self._session_lock = asyncio.Lock()
-        self._task_sessions = {}
-        self._session_count = 0
-        self._max_concurrent_sessions = 10  
-        self._cleanup_interval = 300  
-        self._last_cleanup = time.time()
-        
-        # Track session metrics for monitoring
-        self._session_stats = {
-            "created": 0,
-            "closed": 0,
-            "failed": 0,
-            "active": 0
-        }
+        # Sessions are pooled per server; tools targeting the same server share one
+        self._session_pool = get_mcp_session_pool()
+        self._pool_key = pool_key or self._derive_pool_key(mcp_transport)
+
+    @staticmethod
+    def _derive_pool_key(mcp_transport) -> str:
+        """Identify the MCP server a transport points at."""
+        if isinstance(mcp_transport, str):
+            return mcp_transport
+        return f"{type(mcp_transport).__name__}:{mcp_transport!r}"
 
     @asynccontextmanager
     async def get_session(self):
         """
-        Get a session with robust resource management and cleanup.
+        Get a session from the shared MCP session pool.
         
-        Features:
-        - Automatic session reuse per task
-        - Resource limits to prevent exhaustion
-        - Proper cleanup on cancellation/failure
-        - Periodic cleanup of stale sessions
+        The underlying connection stays open after the block exits and is
+        reused by later calls (from any task or tool) targeting the same
+        server; see ``MCPSessionPool`` for eviction and reconnect behaviour.
         """
         if self._client is None:
             raise RuntimeError("MCP client is not configured (mcp_transport is missing or invalid)")
 
-        current_task = asyncio.current_task()
-        if current_task is None:
-            raise RuntimeError("MCPClientMixin.get_session() must be called from within an async task")
-            
-        task_id = id(current_task)
-        
-        # Periodic cleanup of stale sessions
-        await self._cleanup_stale_sessions()
-        
-        # Check if current task already has a session
-        if task_id in self._task_sessions:
-            session_info = self._task_sessions[task_id]
-            if session_info["session"] and not session_info.get("closed", False):
-                try:
-                    session_info["last_accessed"] = time.time()
-                    yield session_info["session"]
-                    return
-                except Exception as e:
-                    logger.warning(f"Existing session for task {task_id} failed: {e}")
-                    # Mark as closed and continue to create new session
-                    session_info["closed"] = True
-
-        # Create new session with resource limits
-        async with self._session_lock:
-            # Check session limits
-            if self._session_count >= self._max_concurrent_sessions:
-                # Try to cleanup stale sessions first
-                await self._force_cleanup_stale_sessions()
-                
-                if self._session_count >= self._max_concurrent_sessions:
-                    raise RuntimeError(f"Maximum concurrent sessions ({self._max_concurrent_sessions}) reached")
-            
-            session = None
-            session_info = None
-            
-            try:
-                # Create new session
-                session = await self._client.__aenter__()
-                current_time = time.time()
-                
-                session_info = {
-                    "session": session,
-                    "created_at": current_time,
-                    "last_accessed": current_time,
-                    "task_id": task_id,
-                    "closed": False
-                }
-                
-                self._task_sessions[task_id] = session_info
-                self._session_count += 1
-                self._session_stats["created"] += 1
-                self._session_stats["active"] += 1
-                
-                logger.debug(f"Created MCP session for task {task_id} (total: {self._session_count})")
-                
-                # Register cleanup callback for task cancellation
-                current_task.add_done_callback(
-                    lambda t: asyncio.create_task(self._cleanup_task_session(task_id))
-                )
-                
-                yield session
-                
-            except asyncio.CancelledError:
-                logger.info(f"Session creation cancelled for task {task_id}")
-                await self._cleanup_session(task_id, session_info, session)
-                raise
-            except Exception as e:
-                logger.error(f"Failed to create MCP session for task {task_id}: {e}")
-                self._session_stats["failed"] += 1
-                await self._cleanup_session(task_id, session_info, session)
-                raise
-            finally:
-                # Always attempt cleanup on context exit
-                await self._cleanup_session(task_id, session_info, session)
+        async with self._session_pool.session(self._pool_key, self._new_pooled_client) as session:
+            yield session
 
-    async def _cleanup_session(self, task_id: int, session_info: Optional[Dict], session: Optional[Any]):
-        """Clean up a specific session with proper error handling."""
-        try:
-            if session_info and not session_info.get("closed", False):
-                session_info["closed"] = True
-                
-            if session and self._client:
-                try:
-                    await self._client.__aexit__(None, None, None)
-                    self._session_stats["closed"] += 1
-                    logger.debug(f"Successfully closed MCP session for task {task_id}")
-                except Exception as e:
-                    logger.error(f"Error closing MCP session for task {task_id}: {e}")
-                    self._session_stats["failed"] += 1
-        except Exception as e:
-            logger.error(f"Error during session cleanup for task {task_id}: {e}")
-        finally:
-            # Always remove from tracking
-            if task_id in self._task_sessions:
-                del self._task_sessions[task_id]
-                self._session_count = max(0, self._session_count - 1)
-                self._session_stats["active"] = max(0, self._session_stats["active"] - 1)
-
-    async def _cleanup_task_session(self, task_id: int):
-        """Cleanup callback for when a task completes or is cancelled."""
-        if task_id in self._task_sessions:
-            session_info = self._task_sessions[task_id]
-            await self._cleanup_session(task_id, session_info, session_info.get("session"))
-
-    async def _cleanup_stale_sessions(self):
-        """Periodic cleanup of stale sessions."""
-        current_time = time.time()
-        
-        # Only run cleanup periodically
-        if current_time - self._last_cleanup < self._cleanup_interval:
-            return
-            
-        self._last_cleanup = current_time
-        stale_threshold = current_time - 600  # 10 minutes
-        
-        stale_tasks = []
-        for task_id, session_info in self._task_sessions.items():
-            if (session_info.get("last_accessed", 0) < stale_threshold or 
-                session_info.get("closed", False)):
-                stale_tasks.append(task_id)
-        
-        for task_id in stale_tasks:
-            logger.info(f"Cleaning up stale MCP session for task {task_id}")
-            session_info = self._task_sessions.get(task_id)
-            if session_info:
-                await self._cleanup_session(task_id, session_info, session_info.get("session"))
-
-    async def _force_cleanup_stale_sessions(self):
-        """Force cleanup of all stale sessions when hitting limits."""
-        current_time = time.time()
-        stale_threshold = current_time - 300  # 5 minutes for forced cleanup
-        
-        stale_tasks = []
-        for task_id, session_info in self._task_sessions.items():
-            if (session_info.get("last_accessed", 0) < stale_threshold or 
-                session_info.get("closed", False)):
-                stale_tasks.append(task_id)
-        
-        cleanup_tasks = [
-            self._cleanup_session(
-                task_id, 
-                self._task_sessions.get(task_id), 
-                self._task_sessions.get(task_id, {}).get("session")
-            )
-            for task_id in stale_tasks
-        ]
-        
-        if cleanup_tasks:
-            logger.info(f"Force cleaning up {len(cleanup_tasks)} stale MCP sessions")
-            await asyncio.gather(*cleanup_tasks, return_exceptions=True)
+    def _new_pooled_client(self):
+        """Client for a new pooled session.
+
+        fastmcp clients keep their session state after the loop that opened
+        them closes, so a pool entry rebuilt on a new loop gets a fresh copy.
+        """
+        new = getattr(self._client, "new", None)
+        return new() if callable(new) else self._client
 
     async def list_mcp_tools(self):
         """Get the list of available tools from the MCP server"""
@@ -291,32 +466,13 @@ class MCPClientMixin:
             return False
 
     async def cleanup(self):
-        """Enhanced cleanup method with comprehensive resource cleanup."""
-        logger.info("Starting comprehensive MCP client cleanup")
-        
-        # Close all active sessions
-        cleanup_tasks = []
-        for task_id, session_info in list(self._task_sessions.items()):
-            cleanup_tasks.append(
-                self._cleanup_session(task_id, session_info, session_info.get("session"))
-            )
-        
-        if cleanup_tasks:
-            logger.info(f"Cleaning up {len(cleanup_tasks)} active MCP sessions")
-            await asyncio.gather(*cleanup_tasks, return_exceptions=True)
-        
-        # Reset all tracking
-        self._task_sessions.clear()
-        self._session_count = 0
-        self._session_stats["active"] = 0
-        
+        """Close the pooled MCP session used by this client."""
+        logger.info("Starting MCP client cleanup")
+        if self._client is not None:
+            await self._session_pool.close(self._pool_key)
         logger.info("MCP client cleanup completed")
-        logger.info(f"Session stats: {self._session_stats}")
+        logger.info(f"Session stats: {self.get_session_stats()}")
 
     def get_session_stats(self) -> Dict[str, Any]:
         """Get session statistics for monitoring."""
-        return {
-            **self._session_stats,
-            "current_sessions": len(self._task_sessions),
-            "max_sessions": self._max_concurrent_sessions
-        }
+        return self._session_pool.get_stats()
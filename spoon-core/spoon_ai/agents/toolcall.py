@@ -2,7 +2,7 @@ import json
 import asyncio
 import time
 from logging import getLogger
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 import logging
 
 from pydantic import AliasChoices, Field
@@ -43,6 +43,13 @@ class ToolCallAgent(ReActAgent):
     # Track last tool error for higher-level fallbacks
     last_tool_error: Optional[str] = Field(default=None, exclude=True)
 
+    # Concurrent tool execution: independent tool calls from one step run in
+    # parallel (up to max_concurrent_tools); serial-only tools run alone, in order.
+    max_concurrent_tools: int = Field(default=4, ge=1)
+    tool_timeout: Optional[float] = Field(default=None, description="Default per-tool timeout in seconds")
+    tool_timeouts: Dict[str, float] = Field(default_factory=dict, description="Per-tool timeout overrides")
+    serial_tool_names: List[str] = Field(default_factory=list)
+
     # MCP Tools Caching
     mcp_tools_cache: Optional[List[MCPTool]] = Field(default=None, exclude=True)
     mcp_tools_cache_timestamp: Optional[float] = Field(default=None, exclude=True)
@@ -375,27 +382,76 @@ class ToolCallAgent(ReActAgent):
                 raise ValueError("No tools to call")
             return self.memory.messages[-1].content or "No response from assistant"
 
-        results = []
-        for tool_call in self.tool_calls:
-            try:
-                result = await self.execute_tool(tool_call)
-                logger.info(f"Tool {tool_call.function.name} executed with result: {result}")
-                # Flag error-like results so callers can decide on fallbacks
-                if isinstance(result, str) and (
-                    "not healthy" in result.lower() or "execution failed" in result.lower()
-                ):
-                    self.last_tool_error = result
-            except Exception as e:
-                # Ensure we always create a tool response, even on failure
-                result = f"Error executing tool {tool_call.function.name}: {str(e)}"
-                logger.error(f"Tool {tool_call.function.name} execution failed: {e}")
-                self.last_tool_error = str(e)
+        tool_calls = list(self.tool_calls)
+        results: List[Optional[str]] = [None] * len(tool_calls)
+        semaphore = asyncio.Semaphore(self.max_concurrent_tools)
+
+        async def run_indexed(index: int, tool_call: ToolCall) -> None:
+            async with semaphore:
+                results[index] = await self._run_tool_call(tool_call)
+
+        async def run_batch(batch: List[tuple]) -> None:
+            if len(batch) == 1:
+                index, tool_call = batch[0]
+                results[index] = await self._run_tool_call(tool_call)
+            elif batch:
+                await asyncio.gather(*(run_indexed(i, tc) for i, tc in batch))
+            batch.clear()
+
+        # Run consecutive parallel-safe calls together; a serial-only call acts as a barrier
+        pending: List[tuple] = []
+        for index, tool_call in enumerate(tool_calls):
+            if self._is_serial_tool(tool_call):
+                await run_batch(pending)
+                results[index] = await self._run_tool_call(tool_call)
+            else:
+                pending.append((index, tool_call))
+        await run_batch(pending)
 
-            # Always add a tool message for each tool call to satisfy OpenAI API requirements
+        # Always add a tool message for each tool call, in the original order,
+        # to satisfy OpenAI API requirements
+        for tool_call, result in zip(tool_calls, results):
             await self.add_message("tool", result, tool_call_id=tool_call.id, tool_name=tool_call.function.name)
-            results.append(result)
         return "\n\n".join(results)
 
+    async def _run_tool_call(self, tool_call: ToolCall) -> str:
+        """Execute a single tool call, converting failures and timeouts into tool results."""
+        name = tool_call.function.name
+        timeout = self.tool_timeouts.get(name, self.tool_timeout)
+        try:
+            if timeout:
+                result = await asyncio.wait_for(self.execute_tool(tool_call), timeout=timeout)
+            else:
+                result = await self.execute_tool(tool_call)
+            logger.info(f"Tool {name} executed with result: {result}")
+            # Flag error-like results so callers can decide on fallbacks
+            if isinstance(result, str) and (
+                "not healthy" in result.lower() or "execution failed" in result.lower()
+            ):
+                self.last_tool_error = result
+        except Exception as e:
+            if timeout and isinstance(e, asyncio.TimeoutError):
+                result = f"Error executing tool {name}: timed out after {timeout}s"
+                logger.error(f"Tool {name} timed out after {timeout}s")
+                self.last_tool_error = result
+            else:
+                # Ensure we always create a tool response, even on failure;
+                # without a configured timeout a TimeoutError is the tool's own
+                result = f"Error executing tool {name}: {str(e)}"
+                logger.error(f"Tool {name} execution failed: {e}")
+                self.last_tool_error = str(e)
+        return result
+
+    def _is_serial_tool(self, tool_call: ToolCall) -> bool:
+        """Check whether a tool call must not run concurrently with others."""
+        if self.max_concurrent_tools <= 1:
+            return True
+        name = tool_call.function.name
+        if name.lower() in [n.lower() for n in self.serial_tool_names] or self._is_special_tool(name):
+            return True
+        tool = self.available_tools.tool_map.get(name)
+        return bool(getattr(tool, "serial_only", False))
+
     async def execute_tool(self, tool_call: ToolCall) -> str:
         def parse_tool_arguments(arguments):
             """Parse tool arguments using improved logic."""
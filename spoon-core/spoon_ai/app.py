@@ -6,6 +6,7 @@ from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from spoon_ai.llm.monitoring import create_metrics_router
 from spoon_ai.nft.service import app as nft_app
 from spoon_ai.tutor.service import app as tutor_app
 
@@ -36,3 +37,4 @@ _configure_cors(app)
 
 app.include_router(tutor_app.router)
 app.include_router(nft_app.router)
+app.include_router(create_metrics_router())
@@ -34,7 +34,9 @@ from .decorators import (
     node_decorator,
     router_decorator,
 )
-from .checkpointer import InMemoryCheckpointer
+from .checkpointer import BaseCheckpointer, InMemoryCheckpointer
+from .sqlite_checkpointer import SQLiteCheckpointer
+from .profiler import GraphProfiler
 
 # Engine and agent implementations (now within this package)
 from .engine import (
@@ -2,8 +2,10 @@
 GraphAgent implementation for the graph package.
 """
 import asyncio
+import bisect
 import time
 import json
+import math
 import os
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -24,51 +26,161 @@ class AgentStateCheckpoint:
 
 
 class Memory:
-    """Memory implementation with persistent storage"""
-
-    def __init__(self, storage_path: Optional[str] = None, session_id: Optional[str] = None):
+    """Memory implementation with persistent storage
+
+    Each session is an append-only JSONL log (``<session_id>.jsonl``): every
+    ``add_message`` / ``set_metadata`` appends one line, so a write costs
+    O(1) and a crash can at most tear the last line, which is skipped on
+    load. The log is compacted (rewritten atomically with only live
+    records) once it holds ``compact_every`` superseded records, on
+    ``clear()`` and after a torn line is found. Sessions saved by the old
+    single-JSON format (``<session_id>.json``) are migrated on first load.
+
+    Parsed message timestamps are kept alongside the messages for
+    ``get_recent_messages``; ``index_search=True`` additionally keeps a
+    trigram inverted index so ``search_messages`` only checks messages
+    that contain every trigram of the query.
+    """
+
+    def __init__(
+        self,
+        storage_path: Optional[str] = None,
+        session_id: Optional[str] = None,
+        *,
+        compact_every: int = 1000,
+        index_search: bool = False,
+        fsync: bool = False,
+    ):
         self.session_id = session_id or f"session_{int(time.time())}"
         self.storage_path = Path(storage_path) if storage_path else Path.home() / ".spoon_ai" / "memory"
         self.storage_path.mkdir(parents=True, exist_ok=True)
-        self.session_file = self.storage_path / f"{self.session_id}.json"
+        self.session_file = self.storage_path / f"{self.session_id}.jsonl"
+        self.legacy_session_file = self.storage_path / f"{self.session_id}.json"
+        self.compact_every = compact_every
+        self.index_search = index_search
+        self.fsync = fsync
 
         # Load existing data
         self.messages = []
         self.metadata = {}
+        self._superseded_records = 0
+        self._reset_indexes()
         self._load_from_disk()
 
+    # ---- storage -------------------------------------------------------
+
     def _load_from_disk(self):
         """Load memory data from disk"""
         try:
             if self.session_file.exists():
+                torn = False
                 with open(self.session_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            torn = True
+                            continue
+                        self._apply_record(record)
+                if torn:
+                    print(f"Warning: Skipped unreadable records in {self.session_file}, compacting")
+                    self.compact()
+            elif self.legacy_session_file.exists():
+                with open(self.legacy_session_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
-                    self.messages = data.get('messages', [])
-                    self.metadata = data.get('metadata', {})
+                self.messages = data.get('messages', [])
+                self.metadata = data.get('metadata', {})
+                self.compact()
         except Exception as e:
             print(f"Warning: Failed to load memory from disk: {e}")
             self.messages = []
             self.metadata = {}
-
-    def _save_to_disk(self):
-        """Save memory data to disk"""
+        self._reset_indexes()
+        self._index_messages(0)
+
+    def _apply_record(self, record: Dict[str, Any]):
+        op = record.get('op')
+        if op == 'message':
+            self.messages.append(record['data'])
+        elif op == 'metadata':
+            if record['key'] in self.metadata:
+                self._superseded_records += 1
+            self.metadata[record['key']] = record['value']
+
+    def _append_record(self, record: Dict[str, Any]):
+        """Append one record to the session log"""
         try:
-            data = {
-                'messages': self.messages,
-                'metadata': self.metadata,
-                'last_updated': datetime.now().isoformat(),
-                'session_id': self.session_id
-            }
-            with open(self.session_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            line = json.dumps(record, ensure_ascii=False) + "\n"
+            with open(self.session_file, 'a', encoding='utf-8') as f:
+                f.write(line)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
         except Exception as e:
             print(f"Warning: Failed to save memory to disk: {e}")
 
+    def compact(self):
+        """Rewrite the session log with only live records (atomic replace)"""
+        tmp_file = self.session_file.with_suffix('.jsonl.tmp')
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                for key, value in self.metadata.items():
+                    f.write(json.dumps({'op': 'metadata', 'key': key, 'value': value}, ensure_ascii=False) + "\n")
+                for msg in self.messages:
+                    f.write(json.dumps({'op': 'message', 'data': msg}, ensure_ascii=False) + "\n")
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            os.replace(tmp_file, self.session_file)
+            self._superseded_records = 0
+        except Exception as e:
+            print(f"Warning: Failed to compact memory on disk: {e}")
+
+    def _save_to_disk(self):
+        """Save memory data to disk"""
+        self.compact()
+
+    # ---- indexes -------------------------------------------------------
+
+    def _reset_indexes(self):
+        self._timestamps: List[float] = []
+        self._timestamps_sorted = True
+        self._trigrams: Dict[str, List[int]] = {}
+
+    def _index_messages(self, start: int):
+        for position in range(start, len(self.messages)):
+            msg = self.messages[position]
+            # Messages without a (parseable) timestamp always count as recent
+            msg_time = math.inf
+            if 'timestamp' in msg:
+                try:
+                    msg_time = datetime.fromisoformat(msg['timestamp']).timestamp()
+                except Exception:
+                    pass
+            if self._timestamps and msg_time < self._timestamps[-1]:
+                self._timestamps_sorted = False
+            self._timestamps.append(msg_time)
+            if self.index_search:
+                content = str(msg.get('content', '')).lower()
+                for gram in {content[i:i + 3] for i in range(len(content) - 2)}:
+                    self._trigrams.setdefault(gram, []).append(position)
+
+    def _sync_indexes(self):
+        # self.messages is public; rebuild if it was changed behind our back
+        if len(self._timestamps) != len(self.messages):
+            self._reset_indexes()
+            self._index_messages(0)
+
+    # ---- public API ----------------------------------------------------
+
     def clear(self):
         """Clear all messages and reset memory"""
         self.messages = []
         self.metadata = {}
-        self._save_to_disk()
+        self._reset_indexes()
+        self.compact()
 
     def add_message(self, msg):
         """Add a message to memory"""
@@ -84,8 +196,10 @@ class Memory:
         if 'timestamp' not in msg_dict:
             msg_dict['timestamp'] = datetime.now().isoformat()
 
+        self._sync_indexes()
         self.messages.append(msg_dict)
-        self._save_to_disk()
+        self._index_messages(len(self.messages) - 1)
+        self._append_record({'op': 'message', 'data': msg_dict})
 
     def get_messages(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get messages from memory"""
@@ -96,27 +210,25 @@ class Memory:
     def get_recent_messages(self, hours: int = 24) -> List[Dict[str, Any]]:
         """Get messages from the last N hours"""
         cutoff_time = datetime.now().timestamp() - (hours * 3600)
-        recent_messages = []
-
-        for msg in self.messages:
-            if 'timestamp' in msg:
-                try:
-                    msg_time = datetime.fromisoformat(msg['timestamp']).timestamp()
-                    if msg_time >= cutoff_time:
-                        recent_messages.append(msg)
-                except:
-                    recent_messages.append(msg)
-            else:
-                recent_messages.append(msg)
-
-        return recent_messages
+        self._sync_indexes()
+        if self._timestamps_sorted:
+            return self.messages[bisect.bisect_left(self._timestamps, cutoff_time):]
+        return [msg for msg, msg_time in zip(self.messages, self._timestamps) if msg_time >= cutoff_time]
 
     def search_messages(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Search messages containing the query"""
         query_lower = query.lower()
-        matching_messages = []
+        candidates = range(len(self.messages))
+        if self.index_search and len(query_lower) >= 3:
+            self._sync_indexes()
+            # Any message containing the query contains all of its trigrams,
+            # so the shortest posting list is a superset of the matches
+            postings = [self._trigrams.get(query_lower[i:i + 3], ()) for i in range(len(query_lower) - 2)]
+            candidates = min(postings, key=len)
 
-        for msg in reversed(self.messages):  # Search from most recent
+        matching_messages = []
+        for position in reversed(candidates):  # Search from most recent
+            msg = self.messages[position]
             content = str(msg.get('content', '')).lower()
             if query_lower in content:
                 matching_messages.append(msg)
@@ -137,8 +249,12 @@ class Memory:
 
     def set_metadata(self, key: str, value: Any):
         """Set metadata"""
+        if key in self.metadata:
+            self._superseded_records += 1
         self.metadata[key] = value
-        self._save_to_disk()
+        self._append_record({'op': 'metadata', 'key': key, 'value': value})
+        if self._superseded_records >= self.compact_every:
+            self.compact()
 
     def get_metadata(self, key: str, default: Any = None) -> Any:
         """Get metadata"""
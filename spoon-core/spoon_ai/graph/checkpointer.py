@@ -1,43 +1,345 @@
 """
 In-memory checkpointer for the graph package.
+
+Checkpoints are stored as structural deltas against periodic keyframes.
+Saved values are frozen (lists, dicts, sets and tuples are copied into
+immutable containers), so later mutations of the live state never leak into
+stored checkpoints, and unchanged values are shared between checkpoints
+instead of being copied at every step. Leaf objects such as messages are
+shared, not copied. Container subclasses (defaultdict, OrderedDict, Counter,
+namedtuples) record their type and are rebuilt as that type; other
+subclasses are deep-copied and stored by value.
 """
-from typing import Any, Dict, Iterable, List, Optional
+import copy
+import heapq
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 from .types import StateSnapshot, CheckpointTuple
 from .exceptions import CheckpointError
 
 
-class InMemoryCheckpointer:
-    def __init__(self, max_checkpoints_per_thread: int = 100, *, max_threads: int | None = None, ttl_seconds: int | None = None):
-        self.checkpoints: Dict[str, List[StateSnapshot]] = {}
-        self.max_checkpoints_per_thread = max_checkpoints_per_thread
-        self.max_threads = max_threads
-        self.ttl_seconds = ttl_seconds
-        self.last_access: Dict[str, datetime] = {}
+class _FrozenList(tuple):
+    """Frozen list; thawed back into a list."""
 
-    def _gc(self) -> None:
-        # TTL-based cleanup
-        if self.ttl_seconds is not None:
-            cutoff = datetime.now().timestamp() - self.ttl_seconds
-            remove_keys = []
-            for tid, snaps in self.checkpoints.items():
-                # remove snapshots older than TTL
-                kept = [s for s in snaps if s.created_at.timestamp() >= cutoff]
-                if kept:
-                    self.checkpoints[tid] = kept[-self.max_checkpoints_per_thread:]
-                else:
-                    remove_keys.append(tid)
-            for tid in remove_keys:
-                self.checkpoints.pop(tid, None)
-                self.last_access.pop(tid, None)
-        # Global thread limit
-        if self.max_threads is not None and len(self.checkpoints) > self.max_threads:
-            # evict least recently used threads by last_access
-            sorted_threads = sorted(self.last_access.items(), key=lambda kv: kv[1])
-            to_evict = len(self.checkpoints) - self.max_threads
-            for tid, _ in sorted_threads[:to_evict]:
-                self.checkpoints.pop(tid, None)
-                self.last_access.pop(tid, None)
+
+class _FrozenTuple(tuple):
+    """Frozen tuple whose items needed freezing; thawed back into a tuple."""
+
+
+class _FrozenSet(frozenset):
+    """Frozen set; thawed back into a set."""
+
+
+class _FrozenDict(dict):
+    """Dict that is never mutated or handed out after construction."""
+
+
+class _FrozenSubclass(tuple):
+    """(type, default_factory, frozen contents) of a container subclass; rebuilt as that type."""
+
+
+class _ByValue(tuple):
+    """1-tuple holding a deep copy of a container subclass that cannot be rebuilt generically."""
+
+
+_CONTAINERS = (list, tuple, dict, set)
+_FROZEN = (_FrozenList, _FrozenTuple, _FrozenSet, _FrozenDict, _FrozenSubclass, _ByValue)
+# Subclasses whose constructor takes the plain contents (defaultdict also takes its factory)
+_REBUILDABLE = (OrderedDict, defaultdict, Counter)
+
+
+def _freeze(value: Any) -> Any:
+    cls = type(value)
+    if cls is list:
+        return _FrozenList(_freeze(v) if isinstance(v, _CONTAINERS) else v for v in value)
+    if cls is dict:
+        return _FrozenDict((k, _freeze(v) if isinstance(v, _CONTAINERS) else v) for k, v in value.items())
+    if cls is set:
+        return _FrozenSet(value)
+    if cls is tuple:
+        if any(isinstance(v, _CONTAINERS) for v in value):
+            return _FrozenTuple(_freeze(v) for v in value)
+        return value
+    if not isinstance(value, _CONTAINERS) or isinstance(value, _FROZEN):
+        return value
+    return _freeze_subclass(value, cls)
+
+
+def _freeze_subclass(value: Any, cls: type) -> Any:
+    if isinstance(value, tuple) and hasattr(cls, "_make"):
+        # namedtuple: immutable unless an item needs freezing
+        if not any(isinstance(v, _CONTAINERS) for v in value):
+            return value
+        return _FrozenSubclass((cls, None, _FrozenTuple(_freeze(v) for v in value)))
+    if cls in _REBUILDABLE:
+        contents = _freeze(dict(value))
+        return _FrozenSubclass((cls, getattr(value, "default_factory", None), contents))
+    return _ByValue((copy.deepcopy(value),))
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, _FrozenList):
+        return [_thaw(v) if isinstance(v, _CONTAINERS) else v for v in value]
+    if isinstance(value, _FrozenDict):
+        return {k: _thaw(v) if isinstance(v, _CONTAINERS) else v for k, v in value.items()}
+    if isinstance(value, _FrozenSet):
+        return set(value)
+    if isinstance(value, _FrozenTuple):
+        return tuple(_thaw(v) for v in value)
+    if isinstance(value, _FrozenSubclass):
+        cls, factory, contents = value
+        if cls is defaultdict:
+            return defaultdict(factory, _thaw(contents))
+        if hasattr(cls, "_make"):
+            return cls._make(_thaw(contents))
+        return cls(_thaw(contents))
+    if isinstance(value, _ByValue):
+        return copy.deepcopy(value[0])
+    return value
+
+
+def _equal(a: Any, b: Any) -> bool:
+    if a is b:
+        return True
+    try:
+        return bool(a == b)
+    except Exception:
+        # e.g. array-like values without a scalar truth value
+        return False
+
+
+def _diff_value(value: Any, base: Any) -> Optional[Tuple]:
+    """Return a delta op turning frozen ``base`` into ``value``, or None if unchanged."""
+    if type(value) is list and isinstance(base, _FrozenList):
+        n = len(base)
+        if len(value) >= n and tuple(value[:n]) == base:
+            if len(value) == n:
+                return None
+            return ("extend", n, _freeze(value[n:]))
+    elif type(value) is dict and isinstance(base, _FrozenDict):
+        changed = {}
+        for k, v in value.items():
+            if k not in base:
+                changed[k] = _freeze(v)
+            elif not _equal(_freeze(v), base[k]):
+                changed[k] = _freeze(v)
+        removed = tuple(k for k in base if k not in value)
+        if not changed and not removed:
+            return None
+        return ("update", changed, removed)
+
+    frozen = _freeze(value)
+    if _equal(frozen, base):
+        return None
+    return ("set", frozen)
+
+
+def _apply_op(base: Any, op: Tuple) -> Any:
+    kind = op[0]
+    if kind == "extend":
+        return _FrozenList(base[: op[1]] + op[2])
+    if kind == "update":
+        updated = dict(base)
+        updated.update(op[1])
+        for k in op[2]:
+            updated.pop(k, None)
+        return _FrozenDict(updated)
+    return op[1]
+
+
+@dataclass
+class _StoredCheckpoint:
+    """A snapshot minus its values, plus either a keyframe or a delta."""
+
+    next: Tuple[str, ...]
+    config: Dict[str, Any]
+    metadata: Dict[str, Any]
+    created_at: datetime
+    parent_config: Optional[Dict[str, Any]] = None
+    tasks: Tuple[Any, ...] = field(default_factory=tuple)
+    keyframe: Optional[Dict[str, Any]] = None
+    delta: Dict[str, Tuple] = field(default_factory=dict)
+    removed: Tuple[str, ...] = ()
+
+    @property
+    def checkpoint_id(self) -> str:
+        return self.metadata.get("checkpoint_id") or str(self.created_at.timestamp())
+
+    def to_snapshot(self, values: Dict[str, Any]) -> StateSnapshot:
+        return StateSnapshot(
+            values={k: _thaw(v) for k, v in values.items()},
+            next=self.next,
+            config=self.config,
+            metadata=self.metadata,
+            created_at=self.created_at,
+            parent_config=self.parent_config,
+            tasks=self.tasks,
+        )
+
+
+class _ThreadCheckpoints:
+    """Delta-encoded checkpoint log for one thread."""
+
+    def __init__(self, keyframe_interval: int):
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.entries: List[_StoredCheckpoint] = []
+        # Frozen values of the newest checkpoint, used to diff the next one
+        self.head: Dict[str, Any] = {}
+        self._since_keyframe = 0
+        # checkpoint id -> absolute position of its first occurrence; entries[i] has position i + _dropped
+        self._positions: Dict[str, int] = {}
+        # Ids saved more than once, whose lookup moves to the next occurrence when trimmed
+        self._repeated: set = set()
+        self._dropped = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def append(self, snapshot: StateSnapshot) -> None:
+        entry = _StoredCheckpoint(
+            next=snapshot.next,
+            config=snapshot.config,
+            metadata=snapshot.metadata,
+            created_at=snapshot.created_at,
+            parent_config=snapshot.parent_config,
+            tasks=snapshot.tasks,
+        )
+        values = snapshot.values or {}
+        if not self.entries:
+            self.head = {k: _freeze(v) for k, v in values.items()}
+        else:
+            head = self.head
+            for k, v in values.items():
+                op = _diff_value(v, head[k]) if k in head else ("set", _freeze(v))
+                if op is not None:
+                    entry.delta[k] = op
+                    head[k] = _apply_op(head.get(k), op)
+            entry.removed = tuple(k for k in head if k not in values)
+            for k in entry.removed:
+                del head[k]
+            self._since_keyframe += 1
+
+        if len(self.entries) == 0 or self._since_keyframe >= self.keyframe_interval:
+            # Frozen values are immutable, so the keyframe shares them with the head
+            entry.keyframe = dict(self.head)
+            entry.delta = {}
+            entry.removed = ()
+            self._since_keyframe = 0
+        if entry.checkpoint_id in self._positions:
+            self._repeated.add(entry.checkpoint_id)
+        else:
+            self._positions[entry.checkpoint_id] = self._dropped + len(self.entries)
+        self.entries.append(entry)
+
+    def _values_at(self, index: int) -> Dict[str, Any]:
+        if index == len(self.entries) - 1:
+            return dict(self.head)
+        start = index
+        while self.entries[start].keyframe is None:
+            start -= 1
+        values = dict(self.entries[start].keyframe)
+        for entry in self.entries[start + 1 : index + 1]:
+            self._apply_entry(values, entry)
+        return values
+
+    @staticmethod
+    def _apply_entry(values: Dict[str, Any], entry: _StoredCheckpoint) -> None:
+        for k, op in entry.delta.items():
+            values[k] = _apply_op(values.get(k), op)
+        for k in entry.removed:
+            values.pop(k, None)
+
+    def snapshot_at(self, index: int) -> StateSnapshot:
+        return self.entries[index].to_snapshot(self._values_at(index))
+
+    def snapshots(self) -> List[StateSnapshot]:
+        result: List[StateSnapshot] = []
+        values: Dict[str, Any] = {}
+        for entry in self.entries:
+            if entry.keyframe is not None:
+                values = dict(entry.keyframe)
+            else:
+                self._apply_entry(values, entry)
+            result.append(entry.to_snapshot(values))
+        return result
+
+    def drop_first(self, count: int) -> None:
+        """Drop the oldest ``count`` checkpoints, re-basing the new oldest as a keyframe."""
+        if count <= 0:
+            return
+        if count >= len(self.entries):
+            self.entries = []
+            self.head = {}
+            self._since_keyframe = 0
+            self._positions = {}
+            self._repeated = set()
+            self._dropped = 0
+            return
+        first = self.entries[count]
+        if first.keyframe is None:
+            first.keyframe = self._values_at(count)
+            first.delta = {}
+            first.removed = ()
+        relocate = set()
+        for position, entry in enumerate(self.entries[:count], self._dropped):
+            if self._positions.get(entry.checkpoint_id) == position:
+                del self._positions[entry.checkpoint_id]
+                if entry.checkpoint_id in self._repeated:
+                    relocate.add(entry.checkpoint_id)
+        self._dropped += count
+        self.entries = self.entries[count:]
+        if relocate:
+            self._repeated -= relocate
+            for position, entry in enumerate(self.entries, self._dropped):
+                checkpoint_id = entry.checkpoint_id
+                if checkpoint_id in relocate:
+                    if checkpoint_id in self._positions:
+                        self._repeated.add(checkpoint_id)
+                    else:
+                        self._positions[checkpoint_id] = position
+
+    def drop_older_than(self, cutoff: float) -> None:
+        expired = 0
+        for entry in self.entries:
+            if entry.created_at.timestamp() >= cutoff:
+                break
+            expired += 1
+        self.drop_first(expired)
+
+    def oldest_timestamp(self) -> float:
+        return self.entries[0].created_at.timestamp()
+
+    def index_of(self, checkpoint_id: str) -> Optional[int]:
+        position = self._positions.get(checkpoint_id)
+        return position - self._dropped if position is not None else None
+
+
+class BaseCheckpointer(ABC):
+    """Shared tuple/history helpers for checkpointer backends.
+
+    Subclasses implement ``save_checkpoint``, ``get_checkpoint``,
+    ``list_checkpoints`` and ``clear_thread``. A lookup by a checkpoint id
+    saved more than once returns its oldest retained checkpoint.
+    """
+
+    @abstractmethod
+    def save_checkpoint(self, thread_id: str, snapshot: StateSnapshot) -> None:
+        pass
+
+    @abstractmethod
+    def get_checkpoint(self, thread_id: str, checkpoint_id: Optional[str] = None) -> Optional[StateSnapshot]:
+        pass
+
+    @abstractmethod
+    def list_checkpoints(self, thread_id: str) -> List[StateSnapshot]:
+        pass
+
+    @abstractmethod
+    def clear_thread(self, thread_id: str) -> None:
+        pass
 
     @staticmethod
     def _checkpoint_id(snapshot: StateSnapshot) -> str:
@@ -60,17 +362,106 @@ class InMemoryCheckpointer:
             pending_writes=[],
         )
 
+    def get_checkpoint_tuple(self, config: Dict[str, Any]) -> Optional[CheckpointTuple]:
+        if not isinstance(config, dict):
+            raise CheckpointError("config must be a dictionary", operation="get_tuple")
+
+        configurable = config.get("configurable", {})
+        thread_id = configurable.get("thread_id")
+        checkpoint_id = configurable.get("checkpoint_id")
+
+        if not thread_id:
+            raise CheckpointError("thread_id is required", operation="get_tuple")
+
+        snapshot = self.get_checkpoint(thread_id, checkpoint_id)
+        if not snapshot:
+            return None
+
+        return self._snapshot_to_tuple(snapshot)
+
+    def iter_checkpoint_history(self, config: Dict[str, Any]) -> Iterable[CheckpointTuple]:
+        """Return checkpoint tuples for the specified thread, newest last."""
+        if not isinstance(config, dict):
+            raise CheckpointError("config must be a dictionary", operation="history_tuple")
+
+        configurable = config.get("configurable", {})
+        thread_id = configurable.get("thread_id")
+        if not thread_id:
+            raise CheckpointError("thread_id is required", operation="history_tuple")
+
+        snapshots = self.list_checkpoints(thread_id)
+        return [self._snapshot_to_tuple(snapshot) for snapshot in snapshots]
+
+
+class InMemoryCheckpointer(BaseCheckpointer):
+    def __init__(
+        self,
+        max_checkpoints_per_thread: int = 100,
+        *,
+        max_threads: int | None = None,
+        ttl_seconds: int | None = None,
+        keyframe_interval: int = 16,
+    ):
+        self._threads: Dict[str, _ThreadCheckpoints] = {}
+        self.max_checkpoints_per_thread = max_checkpoints_per_thread
+        self.max_threads = max_threads
+        self.ttl_seconds = ttl_seconds
+        self.keyframe_interval = keyframe_interval
+        # Threads in least- to most-recently used order
+        self.last_access: "OrderedDict[str, datetime]" = OrderedDict()
+        # (expires_at, thread_id): when the thread's oldest checkpoint outlives the TTL
+        self._expiry: List[Tuple[float, str]] = []
+        self._expiry_scheduled: set = set()
+
+    @property
+    def checkpoints(self) -> Dict[str, List[StateSnapshot]]:
+        """Materialized snapshots per thread (reconstructed on access)."""
+        return {tid: log.snapshots() for tid, log in self._threads.items()}
+
+    def _touch(self, thread_id: str) -> None:
+        self.last_access[thread_id] = datetime.now()
+        self.last_access.move_to_end(thread_id)
+
+    def _schedule_expiry(self, thread_id: str, log: _ThreadCheckpoints) -> None:
+        if self.ttl_seconds is None or thread_id in self._expiry_scheduled:
+            return
+        self._expiry_scheduled.add(thread_id)
+        heapq.heappush(self._expiry, (log.oldest_timestamp() + self.ttl_seconds, thread_id))
+
+    def _gc(self) -> None:
+        # TTL: only threads whose oldest checkpoint has expired are visited
+        if self.ttl_seconds is not None:
+            now = datetime.now().timestamp()
+            while self._expiry and self._expiry[0][0] <= now:
+                _, tid = heapq.heappop(self._expiry)
+                self._expiry_scheduled.discard(tid)
+                log = self._threads.get(tid)
+                if log is None:
+                    continue
+                log.drop_older_than(now - self.ttl_seconds)
+                if len(log):
+                    self._schedule_expiry(tid, log)
+                else:
+                    self._threads.pop(tid, None)
+                    self.last_access.pop(tid, None)
+        # Global thread limit: evict least recently used threads
+        if self.max_threads is not None:
+            while len(self._threads) > self.max_threads and self.last_access:
+                tid, _ = self.last_access.popitem(last=False)
+                self._threads.pop(tid, None)
+
     def save_checkpoint(self, thread_id: str, snapshot: StateSnapshot) -> None:
         try:
             if not thread_id:
                 raise CheckpointError("Thread ID cannot be empty", operation="save")
             # update access time and run GC
-            self.last_access[thread_id] = datetime.now()
-            if thread_id not in self.checkpoints:
-                self.checkpoints[thread_id] = []
-            self.checkpoints[thread_id].append(snapshot)
-            if len(self.checkpoints[thread_id]) > self.max_checkpoints_per_thread:
-                self.checkpoints[thread_id] = self.checkpoints[thread_id][-self.max_checkpoints_per_thread:]
+            self._touch(thread_id)
+            log = self._threads.get(thread_id)
+            if log is None:
+                log = self._threads[thread_id] = _ThreadCheckpoints(self.keyframe_interval)
+            log.append(snapshot)
+            log.drop_first(len(log) - self.max_checkpoints_per_thread)
+            self._schedule_expiry(thread_id, log)
             self._gc()
         except Exception as e:
             raise CheckpointError(f"Failed to save checkpoint: {str(e)}", thread_id=thread_id, operation="save") from e
@@ -79,18 +470,16 @@ class InMemoryCheckpointer:
         try:
             if not thread_id:
                 raise CheckpointError("Thread ID cannot be empty", operation="get")
-            if thread_id not in self.checkpoints:
+            if thread_id not in self._threads:
                 return None
-            self.last_access[thread_id] = datetime.now()
-            checkpoints = self.checkpoints[thread_id]
-            if not checkpoints:
+            self._touch(thread_id)
+            log = self._threads[thread_id]
+            if not len(log):
                 return None
             if checkpoint_id:
-                for checkpoint in checkpoints:
-                    if self._checkpoint_id(checkpoint) == checkpoint_id:
-                        return checkpoint
-                return None
-            return checkpoints[-1]
+                index = log.index_of(checkpoint_id)
+                return log.snapshot_at(index) if index is not None else None
+            return log.snapshot_at(len(log) - 1)
         except Exception as e:
             raise CheckpointError(
                 f"Failed to get checkpoint: {str(e)}",
@@ -99,47 +488,19 @@ class InMemoryCheckpointer:
                 operation="get",
             ) from e
 
-    def get_checkpoint_tuple(self, config: Dict[str, Any]) -> Optional[CheckpointTuple]:
-        if not isinstance(config, dict):
-            raise CheckpointError("config must be a dictionary", operation="get_tuple")
-
-        configurable = config.get("configurable", {})
-        thread_id = configurable.get("thread_id")
-        checkpoint_id = configurable.get("checkpoint_id")
-
-        if not thread_id:
-            raise CheckpointError("thread_id is required", operation="get_tuple")
-
-        snapshot = self.get_checkpoint(thread_id, checkpoint_id)
-        if not snapshot:
-            return None
-
-        return self._snapshot_to_tuple(snapshot)
-
     def list_checkpoints(self, thread_id: str) -> List[StateSnapshot]:
         try:
             if not thread_id:
                 raise CheckpointError("Thread ID cannot be empty", operation="list")
-            self.last_access[thread_id] = datetime.now()
-            return self.checkpoints.get(thread_id, [])
+            log = self._threads.get(thread_id)
+            if log is None:
+                return []
+            self._touch(thread_id)
+            return log.snapshots()
         except Exception as e:
             raise CheckpointError(f"Failed to list checkpoints: {str(e)}", thread_id=thread_id, operation="list") from e
 
-    def iter_checkpoint_history(self, config: Dict[str, Any]) -> Iterable[CheckpointTuple]:
-        """Return checkpoint tuples for the specified thread, newest last."""
-        if not isinstance(config, dict):
-            raise CheckpointError("config must be a dictionary", operation="history_tuple")
-
-        configurable = config.get("configurable", {})
-        thread_id = configurable.get("thread_id")
-        if not thread_id:
-            raise CheckpointError("thread_id is required", operation="history_tuple")
-
-        snapshots = self.list_checkpoints(thread_id)
-        return [self._snapshot_to_tuple(snapshot) for snapshot in snapshots]
-
     def clear_thread(self, thread_id: str) -> None:
-        if thread_id in self.checkpoints:
-            del self.checkpoints[thread_id]
-        if thread_id in self.last_access:
-            del self.last_access[thread_id]
+        # A pending expiry entry for the thread is skipped when it comes due
+        self._threads.pop(thread_id, None)
+        self.last_access.pop(thread_id, None)
@@ -7,9 +7,10 @@ import uuid
 import inspect
 import time
 import re
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Callable, Dict, List, Optional, Union, Pattern, TypeVar, Generic, TypedDict, Literal, Iterable
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Sequence, Tuple, Union, Pattern, TypeVar, Generic, TypedDict, Literal, Iterable
 from abc import ABC, abstractmethod
 
 from .exceptions import (
@@ -31,9 +32,11 @@ from .types import (
 from .reducers import (
     merge_dicts,
     add_messages,
+    _extract_remove_id,
 )
 from .decorators import node_decorator
 from .checkpointer import InMemoryCheckpointer
+from .profiler import GraphProfiler, current_run
 from spoon_ai.schema import (
     Message, MessageContent, ContentBlock,
     TextContent, ImageContent, ImageUrlContent, ImageSource, ImageUrlSource,
@@ -441,6 +444,91 @@ class RouteRule:
         return False
 
 
+# Kinds of compiled edge entries in _NodeRoutes.edges
+_EDGE_TARGET = 0
+_EDGE_MAP = 1
+_EDGE_PREDICATE = 2
+
+# Kinds of compiled routing rules in _NodeRoutes.rules
+_RULE_KEYWORD = 0
+_RULE_PATTERN = 1
+_RULE_CALLABLE = 2
+
+class _NodeRoutes:
+    """Edges and routing rules of one source node, compiled for dispatch.
+
+    Edge entries are pre-classified so a step does no type checks, and
+    entries behind an unconditional edge are dropped as unreachable. Rules
+    keep their priority order; keyword rules are pre-lowercased and the text
+    they match against (query plus rendered state) is built once per lookup
+    rather than once per rule.
+    """
+
+    __slots__ = ("edges", "rules")
+
+    def __init__(self, edges: List[tuple], rules: List[RouteRule], targets: set):
+        compiled = []
+        for edge_target, edge_condition in edges:
+            if edge_condition is None and isinstance(edge_target, str):
+                if edge_target in targets:
+                    compiled.append((_EDGE_TARGET, edge_target, None))
+                    break
+            elif callable(edge_target) and isinstance(edge_condition, dict):
+                compiled.append((_EDGE_MAP, edge_target, edge_condition))
+            elif isinstance(edge_target, str) and callable(edge_condition):
+                compiled.append((_EDGE_PREDICATE, edge_target, edge_condition))
+        self.edges = tuple(compiled)
+
+        plan = []
+        for rule in rules:
+            condition = rule.condition
+            if isinstance(condition, str):
+                plan.append((_RULE_KEYWORD, condition.lower(), rule.target))
+            elif isinstance(condition, Pattern):
+                plan.append((_RULE_PATTERN, condition, rule.target))
+            elif callable(condition):
+                plan.append((_RULE_CALLABLE, condition, rule.target))
+        self.rules = tuple(plan)
+
+    def find_edge_target(self, state: Dict[str, Any]) -> Optional[str]:
+        for kind, target, condition in self.edges:
+            if kind == _EDGE_TARGET:
+                return target
+            if kind == _EDGE_MAP:
+                try:
+                    cond_key = target(state)
+                    if isinstance(cond_key, str) and cond_key in condition:
+                        return condition[cond_key]
+                except Exception as e:
+                    logger.warning(f"Conditional map evaluation failed: {e}")
+            else:
+                try:
+                    if condition(state):
+                        return target
+                except Exception as e:
+                    logger.warning(f"Predicate condition failed: {e}")
+        return None
+
+    def find_matching_route(self, state: Dict[str, Any], query: str) -> Optional[str]:
+        """Return the target of the highest-priority matching rule; ``query`` is already lowercased."""
+        text = lowered = None
+        for kind, condition, target in self.rules:
+            if kind == _RULE_CALLABLE:
+                if condition(state, query):
+                    return target
+                continue
+            if text is None:
+                text = query + str(state)
+            if kind == _RULE_KEYWORD:
+                if lowered is None:
+                    lowered = text.lower()
+                if condition in lowered:
+                    return target
+            elif condition.search(text):
+                return target
+        return None
+
+
 @dataclass
 class RunningSummary:
     """Rolling conversation summary used by the summarisation node."""
@@ -552,6 +640,8 @@ class StateGraph(Generic[State]):
 
         # Enhanced features
         self.routing_rules: Dict[str, List[RouteRule]] = {}
+        # Bumped on every node/edge/rule change so compiled routing tables can be rebuilt
+        self._routing_version = 0
         self.intelligent_router: Optional[Callable[[Dict[str, Any], str], str]] = None
 
         # LLM Router
@@ -573,7 +663,7 @@ class StateGraph(Generic[State]):
         # Configuration
         self.config: GraphConfig = GraphConfig()
         self.stream_mode: str = "values"
-        self.stream_channels: List[str] = ["values", "updates", "debug"]
+        self.stream_channels: List[str] = ["values", "updates", "messages", "debug"]
 
         # Monitoring
         self.monitoring_enabled: bool = False
@@ -603,6 +693,7 @@ class StateGraph(Generic[State]):
         else:
             raise GraphConfigurationError(f"Node must be callable or BaseNode instance", component="node")
 
+        self._routing_version += 1
         return self
 
     def add_edge(self, start_node: str, end_node: str, condition: Optional[Callable[[State], bool]] = None) -> "StateGraph":
@@ -618,6 +709,7 @@ class StateGraph(Generic[State]):
         if start_node not in self.edges:
             self.edges[start_node] = []
         self.edges[start_node].append((end_node, condition))
+        self._routing_version += 1
         return self
 
     def add_conditional_edges(self, start_node: str, condition: Callable[[State], str],
@@ -634,6 +726,7 @@ class StateGraph(Generic[State]):
         if start_node not in self.edges:
             self.edges[start_node] = []
         self.edges[start_node].append((condition, path_map))
+        self._routing_version += 1
         return self
 
     def set_entry_point(self, node_name: str) -> "StateGraph":
@@ -697,6 +790,7 @@ class StateGraph(Generic[State]):
 
         # Sort rules by priority (highest first)
         self.routing_rules[source_node].sort(key=lambda r: r.priority, reverse=True)
+        self._routing_version += 1
 
         return self
 
@@ -890,6 +984,239 @@ class StateGraph(Generic[State]):
 
 
 
+_MISSING = object()
+_COPY_ON_ACCESS = (list, dict, set)
+
+
+class _BranchState(dict):
+    """Copy-on-write view of the shared state handed to one parallel branch.
+
+    Construction copies only the top-level key table. A list, dict or set
+    value is shallow-copied the first time the branch reads it, so in-place
+    edits stay local to the branch; deeper nesting is still shared. After
+    the branch finishes, ``local_writes()`` reports the keys it assigned or
+    deleted, which the engine applies as overwrites, and the containers it
+    only mutated in place, which are merged as deltas so that branches
+    appending to the same list or dict do not drop each other's changes.
+    """
+
+    __slots__ = ("_base", "_originals", "_owned", "_written", "_deleted")
+
+    def __init__(self, base: Dict[str, Any]):
+        super().__init__(base)
+        self._base = base
+        # Values as they were when first copied; the shared state may change before the merge
+        self._originals: Dict[str, Any] = {}
+        self._owned: set = set()
+        self._written: set = set()
+        self._deleted: set = set()
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if key not in self._owned and isinstance(value, _COPY_ON_ACCESS):
+            self._originals[key] = value
+            value = value.copy()
+            dict.__setitem__(self, key, value)
+            self._owned.add(key)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, default=_MISSING):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def copy(self):
+        return {key: self[key] for key in self}
+
+    def __setitem__(self, key, value):
+        self._written.add(key)
+        self._owned.add(key)
+        self._deleted.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._written.discard(key)
+        self._deleted.add(key)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def local_writes(self) -> Tuple[Dict[str, Any], Dict[str, Any], set]:
+        """Return (overwrites, in-place deltas, deleted keys) made on this view.
+
+        A list that only grew yields the appended items, a dict the entries
+        added or changed, a set the elements added. Any other in-place edit
+        (removal, reordering) falls back to an overwrite.
+        """
+        writes: Dict[str, Any] = {}
+        deltas: Dict[str, Any] = {}
+        for key in self._owned:
+            if key in self._deleted or not dict.__contains__(self, key):
+                continue
+            value = dict.__getitem__(self, key)
+            if key in self._written:
+                writes[key] = value
+                continue
+            original = self._originals.get(key, _MISSING)
+            if value == original:
+                continue
+            delta = _container_delta(original, value)
+            if delta is _MISSING:
+                writes[key] = value
+            else:
+                deltas[key] = delta
+        return writes, deltas, self._deleted & self._base.keys()
+
+
+def _container_delta(original: Any, value: Any) -> Any:
+    """Growth of ``value`` over ``original``, or _MISSING if it did not only grow."""
+    if isinstance(original, list) and isinstance(value, list):
+        size = len(original)
+        if len(value) > size and value[:size] == original:
+            return value[size:]
+    elif isinstance(original, dict) and isinstance(value, dict):
+        if original.keys() <= value.keys():
+            return {k: v for k, v in value.items() if k not in original or original[k] != v}
+    elif isinstance(original, (set, frozenset)) and isinstance(value, (set, frozenset)):
+        if original <= value:
+            return value - original
+    return _MISSING
+
+
+class _ParallelGroupLimiter:
+    """Concurrency cap, token bucket and circuit breaker shared by runs of one parallel group.
+
+    Lives on the CompiledGraph so concurrent invocations of the same graph
+    share the limits. The breaker counts branch failures; it opens at the
+    threshold, rejects branches that have not started yet until the cooldown
+    passes, and is reset by a group run without errors.
+    """
+
+    def __init__(self, config: ParallelGroupConfig):
+        self.max_in_flight = config.max_in_flight if config.max_in_flight and config.max_in_flight > 0 else None
+        self.rate = config.rate_limit_per_second if config.rate_limit_per_second and config.rate_limit_per_second > 0 else None
+        self.burst = max(1.0, self.rate or 1.0)
+        self.breaker_threshold = config.circuit_breaker_threshold
+        self.breaker_cooldown = config.circuit_breaker_cooldown
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        self._failures = 0
+        self._open_until: Optional[float] = None
+        self.metrics: Dict[str, Any] = {
+            "runs": 0,
+            "branches_started": 0,
+            "branches_queued": 0,
+            "branches_rejected": 0,
+            "queued_time": 0.0,
+            "throttled_time": 0.0,
+            "max_in_flight_seen": 0,
+            "circuit_opens": 0,
+        }
+        self._in_flight = 0
+
+    def _slot(self) -> Optional[asyncio.Semaphore]:
+        if self.max_in_flight is None:
+            return None
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # asyncio primitives are bound to the loop they first wait on
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._loop = loop
+        return self._semaphore
+
+    @property
+    def circuit_state(self) -> str:
+        if self._open_until is None:
+            return "closed"
+        return "open" if time.monotonic() < self._open_until else "half_open"
+
+    def is_open(self) -> bool:
+        return self.circuit_state == "open"
+
+    async def _throttle(self) -> None:
+        if self.rate is None:
+            return
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+        # Reserve a token now (possibly going negative) so waiters are served in order
+        self._tokens -= 1.0
+        if self._tokens < 0:
+            delay = -self._tokens / self.rate
+            self.metrics["throttled_time"] += delay
+            await asyncio.sleep(delay)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self.breaker_threshold and self._failures >= self.breaker_threshold and not self.is_open():
+            self._open_until = time.monotonic() + self.breaker_cooldown
+            self.metrics["circuit_opens"] += 1
+
+    def record_clean_run(self) -> None:
+        self._failures = 0
+        self._open_until = None
+
+    async def run(self, group_name: str, coro_factory: Callable[[], Any]) -> Any:
+        """Run one branch under the group's limits."""
+        semaphore = self._slot()
+        if semaphore is not None:
+            queued = semaphore.locked()
+            queued_at = time.monotonic()
+            await semaphore.acquire()
+            if queued:
+                self.metrics["branches_queued"] += 1
+                self.metrics["queued_time"] += time.monotonic() - queued_at
+        try:
+            if self.is_open():
+                self.metrics["branches_rejected"] += 1
+                raise GraphExecutionError(
+                    f"Circuit breaker open for parallel group '{group_name}'",
+                    node=group_name,
+                    context={"circuit_state": "open"},
+                )
+            await self._throttle()
+            self.metrics["branches_started"] += 1
+            self._in_flight += 1
+            self.metrics["max_in_flight_seen"] = max(self.metrics["max_in_flight_seen"], self._in_flight)
+            try:
+                return await coro_factory()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.record_failure()
+                raise
+            finally:
+                self._in_flight -= 1
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**self.metrics, "circuit_state": self.circuit_state, "consecutive_failures": self._failures}
+
+
 class CompiledGraph(Generic[State]):
     """Compiled graph for execution"""
 
@@ -897,9 +1224,14 @@ class CompiledGraph(Generic[State]):
         self.graph = graph
         self.checkpointer = checkpointer or graph.checkpointer
 
-        # Execution state
-        self.execution_history: List[Dict[str, Any]] = []
-        self.max_execution_history = 1000
+        # Execution state: bounded history plus running totals over the records it holds
+        self._max_execution_history = 1000
+        self._execution_history: Deque[Dict[str, Any]] = deque(maxlen=self._max_execution_history)
+        self._history_totals: Dict[str, float] = {"count": 0, "successful": 0, "time": 0.0}
+        self._history_nodes: Dict[str, Dict[str, float]] = {}
+
+        # Optional profiler, see enable_profiling()
+        self.profiler: Optional[GraphProfiler] = None
 
         # Resume functionality
         self._resume_thread_id: Optional[str] = None
@@ -917,42 +1249,89 @@ class CompiledGraph(Generic[State]):
             "routing_performance": {}
         }
 
-    def _find_matching_route(self, current_node: str, state: Dict[str, Any]) -> Optional[str]:
-        """Find matching routing rule for the current node and state"""
-        if current_node not in self.graph.routing_rules:
-            return None
-
-        query = state.get("user_query", "").lower()
+        # Per-node routing tables, compiled now and rebuilt if the graph changes
+        self._routes: Dict[str, _NodeRoutes] = {}
+        self._routes_version = -1
+        self._compile_routes()
+
+        # Parallel group limits (max_in_flight, rate limit, circuit breaker)
+        self._group_limiters: Dict[str, _ParallelGroupLimiter] = {}
+
+    @property
+    def execution_history(self) -> Deque[Dict[str, Any]]:
+        return self._execution_history
+
+    @execution_history.setter
+    def execution_history(self, records: Iterable[Dict[str, Any]]) -> None:
+        self._execution_history = deque(maxlen=self._max_execution_history)
+        self._history_totals = {"count": 0, "successful": 0, "time": 0.0}
+        self._history_nodes = {}
+        for record in records:
+            self._append_history(record)
+
+    @property
+    def max_execution_history(self) -> int:
+        return self._max_execution_history
+
+    @max_execution_history.setter
+    def max_execution_history(self, size: int) -> None:
+        self._max_execution_history = size
+        self.execution_history = list(self._execution_history)
+
+    def enable_profiling(self, trace: bool = True, max_trace_events: int = 100_000) -> GraphProfiler:
+        """Start collecting node, reducer, checkpoint and routing timings.
+
+        Returns the profiler; its ``summary()`` is also included in
+        ``get_execution_metrics()`` and ``export_chrome_trace()`` writes a
+        trace of the recorded spans.
+        """
+        self.profiler = GraphProfiler(trace=trace, max_trace_events=max_trace_events)
+        return self.profiler
+
+    def disable_profiling(self) -> None:
+        self.profiler = None
+
+    def _compile_routes(self) -> None:
+        graph = self.graph
+        targets = set(graph.nodes)
+        targets.add(END)
+        sources = set(graph.edges) | set(graph.routing_rules)
+        self._routes = {
+            node: _NodeRoutes(graph.edges.get(node, []), graph.routing_rules.get(node, []), targets)
+            for node in sources
+        }
+        self._routes_version = graph._routing_version
 
-        # Check routing rules in priority order
-        for rule in self.graph.routing_rules[current_node]:
-            if rule.matches(state, query):
-                return rule.target
+    def _node_routes(self, node: str) -> Optional[_NodeRoutes]:
+        if self._routes_version != self.graph._routing_version:
+            self._compile_routes()
+        return self._routes.get(node)
 
-        return None
+    def _find_matching_route(self, current_node: str, state: Dict[str, Any], query: Optional[str] = None) -> Optional[str]:
+        """Find matching routing rule for the current node and state"""
+        routes = self._node_routes(current_node)
+        if routes is None or not routes.rules:
+            return None
+        if query is None:
+            query = state.get("user_query", "").lower()
+        return routes.find_matching_route(state, query)
 
     def _find_edge_target(self, current_node: str, state: Dict[str, Any]) -> Optional[str]:
-        if current_node in self.graph.edges:
-            for edge_target, edge_condition in self.graph.edges[current_node]:
-                if edge_condition is None and isinstance(edge_target, str) and (edge_target in self.graph.nodes or edge_target == END):
-                    return edge_target
-                if callable(edge_target) and isinstance(edge_condition, dict):
-                    try:
-                        cond_key = edge_target(state)
-                        if isinstance(cond_key, str) and cond_key in edge_condition:
-                            return edge_condition[cond_key]
-                    except Exception as e:
-                        logger.warning(f"Conditional map evaluation failed: {e}")
-                if isinstance(edge_target, str) and callable(edge_condition):
-                    try:
-                        if edge_condition(state):
-                            return edge_target
-                    except Exception as e:
-                        logger.warning(f"Predicate condition failed: {e}")
-        return None
+        routes = self._node_routes(current_node)
+        return routes.find_edge_target(state) if routes is not None else None
 
     async def _determine_next_node(self, current_node: str, state: Dict[str, Any]) -> Optional[str]:
         """Determine the next node to execute (async to support async LLM router)."""
+        profiler = self.profiler
+        if profiler is None:
+            return await self._route_next_node(current_node, state)
+        start = profiler.now()
+        try:
+            return await self._route_next_node(current_node, state)
+        finally:
+            profiler.record("routing", current_node, start)
+
+    async def _route_next_node(self, current_node: str, state: Dict[str, Any]) -> Optional[str]:
         query = state.get("user_query", "")
         logger.info(f"Getting next node from '{current_node}' for query: '{query}'")
 
@@ -967,7 +1346,7 @@ class CompiledGraph(Generic[State]):
 
         # Priority 2: Intelligent routing rules
         logger.info("Trying routing rules...")
-        matching_route = self._find_matching_route(current_node, state)
+        matching_route = self._find_matching_route(current_node, state, query.lower())
         if matching_route:
             logger.info(f"Routing rule matched: {matching_route}")
             return matching_route
@@ -1074,28 +1453,37 @@ class CompiledGraph(Generic[State]):
             iteration = 0
 
         max_iterations = int(config.get("max_iterations", 100) or 100)
-        self._current_thread_id = thread_id
+        # Per-run values stay in locals and the context: batch runs share this instance
+        run_token = current_run.set(thread_id)
+        profiler = self.profiler
         try:
             while current_node and iteration < max_iterations:
-                self._current_iteration = iteration
                 iteration += 1
                 # checkpoint (best-effort)
+                if profiler is not None:
+                    start = profiler.now()
                 try:
                     snapshot = StateSnapshot(values=state.copy(), next=(current_node,), config=config, metadata={"iteration": iteration, "node": current_node}, created_at=datetime.now())
                     self.graph.checkpointer.save_checkpoint(thread_id, snapshot)
                 except Exception:
                     pass
+                if profiler is not None:
+                    profiler.record("checkpoint", current_node, start)
                 # execute current node or parallel group
                 try:
                     # Check if current node is part of a parallel group
                     if current_node in self.graph.node_to_group:
                         group_name = self.graph.node_to_group[current_node]
                         logger.info(f"Executing parallel group: {group_name}")
-                        await self._execute_parallel_group(group_name, state)
+                        if profiler is not None:
+                            start = profiler.now()
+                        await self._execute_parallel_group(group_name, state, iteration)
+                        if profiler is not None:
+                            profiler.record("parallel_group", group_name, start)
                     else:
                         result = await self._execute_node(current_node, state)
                         if isinstance(result, dict):
-                            self._update_state_with_reducers(state, result)
+                            self._update_state_with_reducers(state, result, source=current_node)
                             self._maybe_cleanup_state(state)
                             # optional validation
                             try:
@@ -1131,6 +1519,8 @@ class CompiledGraph(Generic[State]):
             raise
         except Exception as e:
             raise GraphExecutionError(f"Graph execution failed: {e}", node=current_node, iteration=iteration) from e
+        finally:
+            current_run.reset(run_token)
 
 
     def _initialize_state(self, initial_state: State) -> State:
@@ -1157,6 +1547,9 @@ class CompiledGraph(Generic[State]):
         if not node:
             raise GraphExecutionError(f"Node '{node_name}' not found")
 
+        profiler = self.profiler
+        if profiler is not None:
+            start_ns = profiler.now()
         try:
             start_dt = datetime.now()
             # Call the node with proper parameters
@@ -1169,6 +1562,8 @@ class CompiledGraph(Generic[State]):
                 # Fallback for old-style nodes
                 result = await node(state)
             end_dt = datetime.now()
+            if profiler is not None:
+                profiler.record("node", node_name, start_ns)
             # record metrics
             try:
                 self._record_execution_metrics(node_name, start_dt, end_dt, True, metadata={})
@@ -1181,6 +1576,8 @@ class CompiledGraph(Generic[State]):
             raise
         except Exception as e:
             logger.error(f"Node {node_name} execution failed: {e}")
+            if profiler is not None:
+                profiler.record("node", node_name, start_ns)
             try:
                 self._record_execution_metrics(node_name, start_dt, datetime.now(), False, error=str(e))
             except Exception:
@@ -1274,44 +1671,85 @@ class CompiledGraph(Generic[State]):
                 "error": error,
                 "metadata": metadata or {}
             }
-            self.execution_history.append(record)
-            # Ring buffer: keep only last max_execution_history entries
-            if len(self.execution_history) > self.max_execution_history:
-                self.execution_history = self.execution_history[-self.max_execution_history:]
+            self._append_history(record)
         except Exception:
             pass  # Don't let monitoring break execution
 
+    def _append_history(self, record: Dict[str, Any]) -> None:
+        # Ring buffer: the deque drops its oldest record, whose totals are taken back out first
+        history = self._execution_history
+        if history.maxlen is not None and len(history) == history.maxlen:
+            if not history.maxlen:
+                return
+            self._account_history(history[0], -1)
+        history.append(record)
+        self._account_history(record, 1)
+
+    def _account_history(self, record: Dict[str, Any], sign: int) -> None:
+        totals = self._history_totals
+        totals["count"] += sign
+        totals["time"] += sign * record["execution_time"]
+        if record["success"]:
+            totals["successful"] += sign
+        node = record["node_name"]
+        stats = self._history_nodes.get(node)
+        if stats is None:
+            stats = self._history_nodes[node] = {"count": 0, "total_time": 0.0, "errors": 0}
+        stats["count"] += sign
+        stats["total_time"] += sign * record["execution_time"]
+        if not record["success"]:
+            stats["errors"] += sign
+        if not stats["count"]:
+            del self._history_nodes[node]
+
     def get_execution_metrics(self) -> Dict[str, Any]:
         """Get aggregated execution metrics"""
-        if not self.execution_history:
-            return {"total_executions": 0, "avg_execution_time": 0, "success_rate": 0, "node_stats": {}}
-
-        total = len(self.execution_history)
-        successful = sum(1 for h in self.execution_history if h["success"])
-        total_time = sum(h["execution_time"] for h in self.execution_history)
-
-        node_stats = {}
-        for h in self.execution_history:
-            node = h["node_name"]
-            if node not in node_stats:
-                node_stats[node] = {"count": 0, "total_time": 0, "errors": 0}
-            node_stats[node]["count"] += 1
-            node_stats[node]["total_time"] += h["execution_time"]
-            if not h["success"]:
-                node_stats[node]["errors"] += 1
-
-        for node, stats in node_stats.items():
-            stats["avg_time"] = stats["total_time"] / stats["count"]
-            stats["error_rate"] = stats["errors"] / stats["count"]
-
-        return {
-            "total_executions": total,
-            "avg_execution_time": total_time / total,
-            "success_rate": successful / total,
-            "node_stats": node_stats
-        }
-
-    async def _execute_parallel_group(self, group_name: str, state: Dict[str, Any]) -> None:
+        total = self._history_totals["count"]
+        if not total:
+            metrics = {
+                "total_executions": 0,
+                "avg_execution_time": 0,
+                "success_rate": 0,
+                "node_stats": {},
+                "parallel_groups": self._parallel_group_metrics(),
+            }
+        else:
+            node_stats = {}
+            for node, stats in self._history_nodes.items():
+                node_stats[node] = {
+                    **stats,
+                    "avg_time": stats["total_time"] / stats["count"],
+                    "error_rate": stats["errors"] / stats["count"],
+                }
+            metrics = {
+                "total_executions": total,
+                "avg_execution_time": self._history_totals["time"] / total,
+                "success_rate": self._history_totals["successful"] / total,
+                "node_stats": node_stats,
+                "parallel_groups": self._parallel_group_metrics(),
+            }
+        if self.profiler is not None:
+            metrics["profile"] = self.profiler.summary()
+        return metrics
+
+    def export_chrome_trace(self, path: str, thread_id: Optional[str] = None) -> None:
+        """Write the profiler's spans (optionally only one run's) as Chrome trace-event JSON."""
+        if self.profiler is None:
+            raise GraphConfigurationError("Profiling is not enabled; call enable_profiling() first", component="profiler")
+        self.profiler.export_chrome_trace(path, run=thread_id)
+
+    def _parallel_group_metrics(self) -> Dict[str, Any]:
+        return {name: limiter.snapshot() for name, limiter in self._group_limiters.items()}
+
+    def _group_limiter(self, group_name: str, group_cfg: ParallelGroupConfig) -> _ParallelGroupLimiter:
+        limiter = self._group_limiters.get(group_name)
+        if limiter is None:
+            limiter = self._group_limiters[group_name] = _ParallelGroupLimiter(group_cfg)
+        return limiter
+
+    async def _execute_parallel_group(
+        self, group_name: str, state: Dict[str, Any], iteration: Optional[int] = None
+    ) -> None:
         nodes = self.graph.parallel_groups.get(group_name, [])
         if not nodes:
             return
@@ -1325,30 +1763,67 @@ class CompiledGraph(Generic[State]):
         error_strategy = group_cfg.error_strategy
         join_condition = group_cfg.join_condition
 
-        # create tasks
+        limiter = self._group_limiter(group_name, group_cfg)
+        limiter.metrics["runs"] += 1
+        if limiter.is_open():
+            limiter.metrics["branches_rejected"] += len(nodes)
+            if error_strategy == "fail_fast":
+                raise GraphExecutionError(
+                    f"Circuit breaker open for parallel group '{group_name}'",
+                    node=group_name,
+                    context={"circuit_state": "open"},
+                )
+            self._update_state_with_reducers(
+                state, {"__errors__": [{"node": group_name, "error": "circuit breaker open"}]}
+            )
+            return
+
+        # create tasks; each branch runs on its own copy-on-write view of the state
+        # and waits for a slot and a rate-limit token before running
         loop = asyncio.get_event_loop()
+        views: Dict[str, _BranchState] = {n: _BranchState(state) for n in nodes}
         tasks: Dict[str, asyncio.Task] = {}
+        task_nodes: Dict[asyncio.Task, str] = {}
         for n in nodes:
-            tasks[n] = loop.create_task(self._execute_node(n, state))
+            tasks[n] = loop.create_task(limiter.run(group_name, lambda n=n: self._execute_node(n, views[n])))
+            task_nodes[tasks[n]] = n
 
         completed_nodes: List[str] = []
-        updates_to_merge: List[Dict[str, Any]] = []
+        branch_updates: Dict[str, Optional[Dict[str, Any]]] = {}
         errors: List[Dict[str, Any]] = []
 
+        def merge_completed() -> None:
+            # Merge in declaration order so the result does not depend on completion order
+            for n in nodes:
+                if n not in branch_updates:
+                    continue
+                writes, deltas, deleted = views[n].local_writes()
+                state.update(writes)
+                for key in deleted:
+                    state.pop(key, None)
+                for key, delta in deltas.items():
+                    # Sets have no reducer; lists and dicts append/merge onto the current value
+                    if isinstance(delta, (set, frozenset)) and isinstance(state.get(key), (set, frozenset)):
+                        state[key] = state[key] | delta
+                    else:
+                        self._update_state_with_reducers(state, {key: delta}, source=n)
+                if branch_updates[n]:
+                    self._update_state_with_reducers(state, branch_updates[n], source=n)
+
         async def handle_done(done_set):
             for t in done_set:
-                # find node name by task
-                node_name = next((name for name, task in tasks.items() if task is t), None)
+                node_name = task_nodes.get(t)
                 try:
                     result = t.result()
+                    update = None
                     if isinstance(result, Command):
-                        if result.update:
-                            updates_to_merge.append(result.update)
+                        update = result.update
                     elif isinstance(result, dict):
-                        updates_to_merge.append(result)
+                        update = result
                     elif isinstance(result, RouterResult):
                         # RouterResult in parallel branch is unusual; ignore routing but record metadata
-                        updates_to_merge.append({"__router__": {"node": node_name, "next": result.next_node}})
+                        update = {"__router__": {"node": node_name, "next": result.next_node}}
+                    branch_updates[node_name] = update
                     completed_nodes.append(node_name or "")
                 except Exception as e:
                     err_info = {"node": node_name, "error": str(e)}
@@ -1406,8 +1881,7 @@ class CompiledGraph(Generic[State]):
         except Exception:
             if error_strategy == "collect_errors":
                 # merge successful updates and attach errors into state
-                for upd in updates_to_merge:
-                    self._update_state_with_reducers(state, upd)
+                merge_completed()
                 self._update_state_with_reducers(state, {"__errors__": errors})
                 return
             raise
@@ -1426,85 +1900,274 @@ class CompiledGraph(Generic[State]):
                 # ignore join_condition errors and proceed to merge
                 pass
 
-        # finally merge accumulated updates
-        for upd in updates_to_merge:
-            self._update_state_with_reducers(state, upd)
+        # finally merge the completed branches' deltas
+        merge_completed()
+        if not errors:
+            limiter.record_clean_run()
         if errors:
             if error_strategy in {"ignore_errors", "collect_errors"}:
                 self._update_state_with_reducers(state, {"__errors__": errors})
             elif error_strategy == "fail_fast":
                 raise GraphExecutionError(
-                    f"Parallel group '{group_name}' failed", node=group_name, iteration=self._current_iteration
+                    f"Parallel group '{group_name}' failed", node=group_name, iteration=iteration
                 )
         # optional cleanup per group
         self._maybe_cleanup_state(state)
 
 
     async def stream(self, initial_state: Optional[Dict[str, Any]] = None, config: Optional[Dict[str, Any]] = None, stream_mode: str = "values"):
+        """Run the graph and yield progress after each node.
+
+        stream_mode:
+            "values" / "debug": a full copy of the state after every node and at the end.
+            "updates": ``{node: delta}`` with only the keys the node (or parallel group) wrote.
+            "messages": ``{"node": node, "messages": [...]}`` with only the messages added or
+                updated by the node; steps that touch no messages yield nothing.
+        Interrupts are yielded as ``{"type": "interrupt", ...}`` in every mode.
+        """
+        if stream_mode not in self.graph.stream_channels:
+            raise GraphConfigurationError(
+                f"Unknown stream_mode '{stream_mode}', expected one of {self.graph.stream_channels}",
+                component="stream",
+            )
+        full_state = stream_mode in ("values", "debug")
         config = config or {}
         state = self._initialize_state(initial_state)
         current_node = self.graph._entry_point
         iteration = 0
         max_iterations = int(config.get("max_iterations", 100) or 100)
-        while current_node and iteration < max_iterations:
-            iteration += 1
-            try:
-                # If current node is a parallel group entry, stream merged results after group finishes
-                if current_node in self.graph.node_to_group and current_node in self.graph.parallel_entry_nodes:
-                    await self._execute_parallel_group(self.graph.node_to_group[current_node], state)
-                    if stream_mode == "values":
+        thread_id = config.get("configurable", {}).get("thread_id", str(uuid.uuid4()))
+        run_token = current_run.set(thread_id)
+        profiler = self.profiler
+        try:
+            while current_node and iteration < max_iterations:
+                iteration += 1
+                # checkpoint (best-effort), as in invoke
+                if profiler is not None:
+                    start = profiler.now()
+                try:
+                    snapshot = StateSnapshot(values=state.copy(), next=(current_node,), config=config, metadata={"iteration": iteration, "node": current_node}, created_at=datetime.now())
+                    self.graph.checkpointer.save_checkpoint(thread_id, snapshot)
+                except Exception:
+                    pass
+                if profiler is not None:
+                    profiler.record("checkpoint", current_node, start)
+                try:
+                    # If current node is a parallel group entry, stream merged results after group finishes
+                    if current_node in self.graph.node_to_group and current_node in self.graph.parallel_entry_nodes:
+                        group_name = self.graph.node_to_group[current_node]
+                        before = dict(state)
+                        if profiler is not None:
+                            start = profiler.now()
+                        await self._execute_parallel_group(group_name, state, iteration)
+                        if profiler is not None:
+                            profiler.record("parallel_group", group_name, start)
+                        chunk = self._stream_chunk(stream_mode, group_name, state, self._group_delta(before, state))
+                        if chunk is not None:
+                            yield chunk
+                    else:
+                        result = await self._execute_node(current_node, state)
+                        if isinstance(result, Command):
+                            if result.update:
+                                self._update_state_with_reducers(state, result.update, source=current_node)
+                                chunk = self._stream_chunk(stream_mode, current_node, state, result.update)
+                                if chunk is not None:
+                                    yield chunk
+                            if result.goto:
+                                current_node = result.goto
+                                continue
+                        elif isinstance(result, dict):
+                            self._update_state_with_reducers(state, result, source=current_node)
+                            chunk = self._stream_chunk(stream_mode, current_node, state, result)
+                            if chunk is not None:
+                                yield chunk
+                            # optional validation (mirrors invoke)
+                            try:
+                                if callable(self.graph.state_validator):
+                                    self.graph.state_validator(state)
+                                if isinstance(self.graph.config, GraphConfig):
+                                    for validator in self.graph.config.state_validators:
+                                        if callable(validator):
+                                            validator(state)
+                            except Exception as e:
+                                raise GraphExecutionError(f"State validation failed: {e}", node=current_node, iteration=iteration)
+                except InterruptError as e:
+                    yield {"type": "interrupt", "node": current_node, "interrupt_id": e.interrupt_id, "interrupt_data": e.interrupt_data, "state": state.copy()}
+                    return
+                next_node = await self._determine_next_node(current_node, state)
+                if next_node == END or next_node is None:
+                    if full_state:
                         yield state.copy()
-                else:
-                    result = await self._execute_node(current_node, state)
-                    if isinstance(result, Command):
-                        if result.update:
-                            self._update_state_with_reducers(state, result.update)
-                            if stream_mode == "values":
-                                yield state.copy()
-                        if result.goto:
-                            current_node = result.goto
-                            continue
-                    elif isinstance(result, dict):
-                        self._update_state_with_reducers(state, result)
-                        if stream_mode == "values":
-                            yield state.copy()
-                        # optional validation (mirrors invoke)
-                        try:
-                            if callable(self.graph.state_validator):
-                                self.graph.state_validator(state)
-                            if isinstance(self.graph.config, GraphConfig):
-                                for validator in self.graph.config.state_validators:
-                                    if callable(validator):
-                                        validator(state)
-                        except Exception as e:
-                            raise GraphExecutionError(f"State validation failed: {e}", node=current_node, iteration=iteration)
-            except InterruptError as e:
-                yield {"type": "interrupt", "node": current_node, "interrupt_id": e.interrupt_id, "interrupt_data": e.interrupt_data, "state": state.copy()}
-                return
-            next_node = await self._determine_next_node(current_node, state)
-            if next_node == END or next_node is None:
-                if stream_mode == "values":
-                    yield state.copy()
-                break
-            current_node = next_node
+                    break
+                current_node = next_node
+        finally:
+            try:
+                current_run.reset(run_token)
+            except ValueError:
+                # The generator was closed from another context; that context never saw the run
+                pass
+
+    @staticmethod
+    def _stream_chunk(stream_mode: str, node: str, state: Dict[str, Any], update: Dict[str, Any]) -> Optional[Any]:
+        if stream_mode in ("values", "debug"):
+            return state.copy()
+        if stream_mode == "updates":
+            return {node: dict(update)}
+        messages = update.get("messages")
+        if not isinstance(messages, list):
+            return None
+        added = [m for m in messages if _extract_remove_id(m) is None]
+        return {"node": node, "messages": added} if added else None
+
+    @staticmethod
+    def _group_delta(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+        """Keys a parallel group wrote; for messages, only the entries that are new."""
+        delta = {k: v for k, v in after.items() if before.get(k, _MISSING) is not v}
+        if isinstance(delta.get("messages"), list):
+            seen = set(map(id, before.get("messages") or []))
+            delta["messages"] = [m for m in delta["messages"] if id(m) not in seen]
+        return delta
 
     def _initialize_state(self, initial_state: Optional[Dict[str, Any]]) -> Dict[str, Any]:
-        state: Dict[str, Any] = {}
         # fill defaults for Annotated list types to [] for reducer usage
-        if hasattr(self.graph.state_schema, "__annotations__"):
-            for field_name, field_type in self.graph.state_schema.__annotations__.items():
-                # heuristic for list-like fields
-                if "List" in str(field_type) or "list" in str(field_type):
-                    state[field_name] = []
-                else:
-                    state[field_name] = None
+        state: Dict[str, Any] = {name: [] if is_list else None for name, is_list in self._state_template()}
         if initial_state:
             state.update(initial_state)
         return state
 
+    def _state_template(self) -> List[Tuple[str, bool]]:
+        """(field name, is list-like) per schema field, resolved once per compiled graph."""
+        template = getattr(self, "_state_fields", None)
+        if template is None:
+            template = []
+            if hasattr(self.graph.state_schema, "__annotations__"):
+                for field_name, field_type in self.graph.state_schema.__annotations__.items():
+                    # heuristic for list-like fields
+                    template.append((field_name, "List" in str(field_type) or "list" in str(field_type)))
+            self._state_fields = template
+        return template
+
+    async def batch(
+        self,
+        inputs: Sequence[Optional[Dict[str, Any]]],
+        config: Optional[Union[Dict[str, Any], Sequence[Optional[Dict[str, Any]]]]] = None,
+        *,
+        max_concurrency: Optional[int] = None,
+        thread_ids: Optional[Sequence[str]] = None,
+        return_exceptions: bool = True,
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """Invoke the graph once per input and return results in input order.
+
+        See ``abatch_as_completed`` for the arguments. With ``return_exceptions``
+        a failed run leaves its exception in its slot instead of failing the batch.
+        """
+        results: List[Any] = [None] * len(inputs)
+        async for index, result in self.abatch_as_completed(
+            inputs,
+            config,
+            max_concurrency=max_concurrency,
+            thread_ids=thread_ids,
+            return_exceptions=return_exceptions,
+        ):
+            results[index] = result
+        return results
+
+    async def abatch_as_completed(
+        self,
+        inputs: Sequence[Optional[Dict[str, Any]]],
+        config: Optional[Union[Dict[str, Any], Sequence[Optional[Dict[str, Any]]]]] = None,
+        *,
+        max_concurrency: Optional[int] = None,
+        thread_ids: Optional[Sequence[str]] = None,
+        return_exceptions: bool = True,
+    ) -> AsyncIterator[Tuple[int, Union[Dict[str, Any], Exception]]]:
+        """Invoke the graph once per input, yielding ``(index, result)`` as runs finish.
+
+        Args:
+            inputs: Initial states (or Commands), one per run.
+            config: One config shared by every run, or a sequence with one per input.
+            max_concurrency: Upper bound on runs in flight; None runs all at once.
+            thread_ids: Thread id per input. Runs without one get a fresh thread id,
+                so checkpoints of different inputs never mix.
+            return_exceptions: Yield a failed run's exception as its result; when
+                False the first failure cancels the remaining runs and is raised.
+
+        At most ``max_concurrency`` worker tasks pull inputs in order, so large
+        batches do not create one task per input up front. Runs share this
+        compiled graph's routing tables and state template, so a pending legacy
+        resume (which would make every run resume the same thread) is rejected.
+        """
+        if self._resume_thread_id:
+            raise ValueError("Cannot batch while a checkpoint resume is pending; invoke it first")
+        inputs = list(inputs)
+        configs = self._batch_configs(len(inputs), config, thread_ids)
+        if not inputs:
+            return
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        workers = min(len(inputs), max_concurrency or len(inputs))
+        finished: asyncio.Queue = asyncio.Queue()
+        pending = iter(range(len(inputs)))
+
+        async def worker() -> None:
+            for index in pending:
+                try:
+                    result = await self.invoke(inputs[index], configs[index])
+                except Exception as e:
+                    result = e
+                finished.put_nowait((index, result))
 
+        tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+        try:
+            for _ in range(len(inputs)):
+                index, result = await finished.get()
+                if isinstance(result, Exception) and not return_exceptions:
+                    raise result
+                yield index, result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    def _batch_configs(
+        count: int,
+        config: Optional[Union[Dict[str, Any], Sequence[Optional[Dict[str, Any]]]]],
+        thread_ids: Optional[Sequence[str]],
+    ) -> List[Dict[str, Any]]:
+        if config is None or isinstance(config, dict):
+            configs = [config] * count
+        else:
+            configs = list(config)
+            if len(configs) != count:
+                raise ValueError(f"Expected {count} configs, got {len(configs)}")
+        if thread_ids is not None and len(thread_ids) != count:
+            raise ValueError(f"Expected {count} thread_ids, got {len(thread_ids)}")
+
+        prepared = []
+        for index, cfg in enumerate(configs):
+            cfg = dict(cfg or {})
+            configurable = dict(cfg.get("configurable") or {})
+            if thread_ids is not None:
+                configurable["thread_id"] = thread_ids[index]
+            elif "thread_id" not in configurable:
+                configurable["thread_id"] = str(uuid.uuid4())
+            cfg["configurable"] = configurable
+            prepared.append(cfg)
+        return prepared
+
+
+
+    def _update_state_with_reducers(self, state: Dict[str, Any], updates: Dict[str, Any], source: Optional[str] = None) -> None:
+        profiler = self.profiler
+        if profiler is None:
+            self._apply_reducers(state, updates)
+            return
+        start = profiler.now()
+        self._apply_reducers(state, updates)
+        profiler.record("reducer", source or "state", start)
 
-    def _update_state_with_reducers(self, state: Dict[str, Any], updates: Dict[str, Any]) -> None:
+    def _apply_reducers(self, state: Dict[str, Any], updates: Dict[str, Any]) -> None:
         for key, value in updates.items():
             if key not in state:
                 state[key] = value
@@ -0,0 +1,139 @@
+"""
+Low-overhead profiler for graph runs.
+
+Keeps streaming aggregates per (category, name) -- count, total, max and
+approximate p50/p95 from a log-bucketed histogram -- and optionally a
+bounded buffer of spans that can be exported as Chrome trace-event JSON
+(load it in chrome://tracing or https://ui.perfetto.dev).
+
+Categories recorded by the engine: "node", "parallel_group", "reducer",
+"checkpoint" and "routing".
+"""
+import contextvars
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Histogram resolution: bucket edges grow by 2**(1/8), about 9% apart
+_BUCKETS_PER_OCTAVE = 8
+_log2 = math.log2
+
+# Run (thread_id) the current task is executing, used to group trace events
+current_run: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("graph_profiler_run", default=None)
+
+
+class _Aggregate:
+    __slots__ = ("count", "total_ns", "max_ns", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets: Dict[int, int] = {}
+
+    def percentile(self, q: float) -> float:
+        """Upper edge of the bucket holding the q-quantile, in nanoseconds."""
+        rank = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                if bucket < 0:
+                    return 0.0
+                return min(float(self.max_ns), 2 ** ((bucket + 1) / _BUCKETS_PER_OCTAVE))
+        return float(self.max_ns)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total_ms": self.total_ns / 1e6,
+            "avg_ms": self.total_ns / self.count / 1e6 if self.count else 0.0,
+            "p50_ms": self.percentile(0.5) / 1e6,
+            "p95_ms": self.percentile(0.95) / 1e6,
+            "max_ms": self.max_ns / 1e6,
+        }
+
+
+class GraphProfiler:
+    """Collects per-node, reducer, checkpoint and routing timings for a compiled graph.
+
+    Recording a span costs a dict lookup, a histogram update and, when
+    tracing, one tuple appended to a bounded deque; percentiles are only
+    computed when ``summary()`` is called.
+    """
+
+    def __init__(self, trace: bool = True, max_trace_events: int = 100_000):
+        self.trace = trace
+        self._aggregates: Dict[Tuple[str, str], _Aggregate] = {}
+        self._events: Deque[Tuple[str, str, int, int, Optional[str], int]] = deque(maxlen=max_trace_events)
+        self._origin_ns = time.perf_counter_ns()
+
+    @staticmethod
+    def now() -> int:
+        return time.perf_counter_ns()
+
+    def record(self, category: str, name: str, start_ns: int, end_ns: Optional[int] = None) -> None:
+        """Record a span that started at ``start_ns`` (from ``now()``) and ended now or at ``end_ns``."""
+        if end_ns is None:
+            end_ns = time.perf_counter_ns()
+        duration_ns = end_ns - start_ns
+        key = (category, name)
+        aggregate = self._aggregates.get(key)
+        if aggregate is None:
+            aggregate = self._aggregates[key] = _Aggregate()
+        # Updated inline rather than through a method: this runs several times per graph step
+        aggregate.count += 1
+        aggregate.total_ns += duration_ns
+        if duration_ns > aggregate.max_ns:
+            aggregate.max_ns = duration_ns
+        bucket = int(_log2(duration_ns) * _BUCKETS_PER_OCTAVE) if duration_ns > 0 else -1
+        buckets = aggregate.buckets
+        buckets[bucket] = buckets.get(bucket, 0) + 1
+        if self.trace:
+            self._events.append((category, name, start_ns, duration_ns, current_run.get(), threading.get_ident()))
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Aggregates as ``{category: {name: {count, total_ms, avg_ms, p50_ms, p95_ms, max_ms}}}``."""
+        result: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (category, name), aggregate in self._aggregates.items():
+            result.setdefault(category, {})[name] = aggregate.summary()
+        return result
+
+    def reset(self) -> None:
+        self._aggregates.clear()
+        self._events.clear()
+
+    def chrome_trace(self, run: Optional[str] = None) -> Dict[str, Any]:
+        """Trace-event JSON object for all recorded spans, or only those of ``run``.
+
+        Each graph run (thread_id) gets its own track.
+        """
+        tracks: Dict[Any, int] = {}
+        events: List[Dict[str, Any]] = []
+        for category, name, start_ns, duration_ns, event_run, os_thread in self._events:
+            if run is not None and event_run != run:
+                continue
+            track_key = event_run if event_run is not None else os_thread
+            tid = tracks.setdefault(track_key, len(tracks) + 1)
+            events.append({
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start_ns - self._origin_ns) / 1000,
+                "dur": duration_ns / 1000,
+                "pid": os.getpid(),
+                "tid": tid,
+            })
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": str(key)}}
+            for key, tid in tracks.items()
+        ]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str, run: Optional[str] = None) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(run), f)
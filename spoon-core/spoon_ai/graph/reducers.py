@@ -7,25 +7,86 @@ from spoon_ai.memory.remove_message import RemoveMessage, REMOVE_ALL_MESSAGES
 from spoon_ai.schema import Message
 
 
+_REMOVED = object()
+
+
 def add_messages(existing: List[Any], new: List[Any]) -> List[Any]:
+    """Append ``new`` to ``existing``, applying updates and removals by message id.
+
+    A new message whose id is already present replaces it in place (later
+    duplicates of that id are dropped); removal directives drop every message
+    with the target id, or everything for ``REMOVE_ALL_MESSAGES``. Only the
+    ids referenced by ``new`` are indexed, in one scan of ``existing``, and
+    removals leave tombstones compacted at the end, so an update costs a
+    single linear pass however many removals it carries.
+    """
     if existing is None:
         existing = []
     if not new:
         return existing
 
-    result: List[Any] = list(existing)
+    # Everything before the last remove-all directive is discarded anyway
+    base = existing
+    start = 0
+    for pos, item in enumerate(new):
+        if _extract_remove_id(item) == REMOVE_ALL_MESSAGES:
+            base = []
+            start = pos + 1
+    new = new[start:] if start else new
+
+    targets = set()
+    for item in new:
+        target_id = _extract_remove_id(item)
+        if target_id is None:
+            target_id = _message_identifier(item)
+        if target_id is not None:
+            targets.add(target_id)
+
+    result: List[Any] = list(base)
+    if not targets:
+        result.extend(new)
+        return result
+
+    index = _index_messages(result, targets)
+    tombstones = 0
     for item in new:
         remove_id = _extract_remove_id(item)
-        if remove_id is None:
+        target_id = remove_id if remove_id is not None else _message_identifier(item)
+        if target_id is None:
             result.append(item)
             continue
-        if remove_id == REMOVE_ALL_MESSAGES:
-            result = []
+        positions = index.get(target_id)
+        if remove_id is not None:
+            if positions:
+                for pos in positions:
+                    result[pos] = _REMOVED
+                tombstones += len(positions)
+                del index[target_id]
             continue
-        result = [msg for msg in result if _message_identifier(msg) != remove_id]
+        if positions:
+            result[positions[0]] = item
+            for pos in positions[1:]:
+                result[pos] = _REMOVED
+            tombstones += len(positions) - 1
+            del positions[1:]
+        else:
+            index[target_id] = [len(result)]
+            result.append(item)
+
+    if tombstones:
+        result = [msg for msg in result if msg is not _REMOVED]
     return result
 
 
+def _index_messages(messages: List[Any], targets: Set[str]) -> Dict[str, List[int]]:
+    """Map each id in ``targets`` to its positions in ``messages``."""
+    index: Dict[str, List[int]] = {}
+    for pos, msg_id in enumerate(map(_message_identifier, messages)):
+        if msg_id in targets:
+            index.setdefault(msg_id, []).append(pos)
+    return index
+
+
 def _extract_remove_id(item: Any) -> Union[str, None]:
     if isinstance(item, RemoveMessage):
         return item.target_id
@@ -35,10 +96,10 @@ def _extract_remove_id(item: Any) -> Union[str, None]:
 
 
 def _message_identifier(message: Any) -> Union[str, None]:
-    if isinstance(message, Message):
-        return getattr(message, "id", None)
     if isinstance(message, dict):
         return message.get("id")
+    if isinstance(message, Message):
+        return getattr(message, "id", None)
     return None
 
 
@@ -57,12 +118,17 @@ def merge_dicts(existing: Dict, new: Dict) -> Dict:
 
 
 def append_history(existing: List, new: Dict) -> List:
+    """Append a timestamped entry to ``existing`` in place and return it.
+
+    The list is not copied, so appends are amortized O(1); callers that keep
+    an older reference to the list will see the new entry.
+    """
     if existing is None:
         existing = []
     if new is None:
         return existing
-    entry = {"timestamp": datetime.now().isoformat(), **new}
-    return existing + [entry]
+    existing.append({"timestamp": datetime.now().isoformat(), **new})
+    return existing
 
 
 def union_sets(existing: Set, new: Set) -> Set:
@@ -0,0 +1,240 @@
+"""
+SQLite checkpointer for the graph package.
+
+Checkpoints are pickled into a single file-backed database in WAL mode, so
+they survive restarts and can be shared by processes on the same host.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .checkpointer import BaseCheckpointer
+from .exceptions import CheckpointError
+from .types import StateSnapshot
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    id INTEGER PRIMARY KEY,
+    thread_id TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    snapshot BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS checkpoints_thread ON checkpoints (thread_id, id);
+CREATE INDEX IF NOT EXISTS checkpoints_lookup ON checkpoints (thread_id, checkpoint_id);
+CREATE INDEX IF NOT EXISTS checkpoints_created ON checkpoints (created_at);
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id TEXT PRIMARY KEY,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS threads_access ON threads (last_access);
+"""
+
+
+class SQLiteCheckpointer(BaseCheckpointer):
+    """Checkpointer persisted to SQLite, with the same interface as InMemoryCheckpointer.
+
+    Saves are pickled immediately (so later state mutations do not leak) and
+    written in batches of ``batch_size`` or every ``flush_interval`` seconds,
+    whichever comes first. A read writes buffered checkpoints only if it
+    targets a thread that has some; access times are recorded with the next
+    batch, and TTL expiry and LRU eviction run only on batch flushes (reads
+    skip expired checkpoints). Call ``close()`` (or ``flush()``) before
+    exiting so buffered checkpoints reach disk.
+
+    Every lookup, per-thread trim, TTL expiry and LRU eviction goes through an
+    index. With ``max_threads`` set, each flush also counts the threads inside
+    its write transaction, so the limit holds when several processes share
+    the file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_checkpoints_per_thread: int = 100,
+        *,
+        max_threads: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        batch_size: int = 16,
+        flush_interval: float = 1.0,
+    ):
+        self.path = path
+        self.max_checkpoints_per_thread = max_checkpoints_per_thread
+        self.max_threads = max_threads
+        self.ttl_seconds = ttl_seconds
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[str, str, float, bytes]] = []
+        self._pending_since = 0.0
+        self._touched: Dict[str, float] = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def save_checkpoint(self, thread_id: str, snapshot: StateSnapshot) -> None:
+        try:
+            if not thread_id:
+                raise CheckpointError("Thread ID cannot be empty", operation="save")
+            blob = pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+            now = time.time()
+            with self._lock:
+                if not self._pending:
+                    self._pending_since = now
+                self._pending.append(
+                    (thread_id, self._checkpoint_id(snapshot), snapshot.created_at.timestamp(), blob)
+                )
+                self._touched[thread_id] = now
+                due = len(self._pending) >= self.batch_size or now - self._pending_since >= self.flush_interval
+            if due:
+                self.flush()
+        except Exception as e:
+            raise CheckpointError(f"Failed to save checkpoint: {str(e)}", thread_id=thread_id, operation="save") from e
+
+    def flush(self) -> None:
+        """Write buffered checkpoints and access times, then apply trimming, TTL and LRU."""
+        self._flush(maintain=True)
+
+    def _flush_for_read(self, thread_id: str) -> None:
+        """Write buffered checkpoints before reading ``thread_id``, if it has any."""
+        with self._lock:
+            if not any(row[0] == thread_id for row in self._pending):
+                return
+        self._flush(maintain=False)
+
+    def _read_cutoff(self) -> float:
+        return time.time() - self.ttl_seconds if self.ttl_seconds is not None else float("-inf")
+
+    def _flush(self, maintain: bool) -> None:
+        with self._lock, self._conn:
+            if not self._pending and not self._touched:
+                return
+            self._conn.executemany(
+                "INSERT INTO checkpoints (thread_id, checkpoint_id, created_at, snapshot) VALUES (?, ?, ?, ?)",
+                self._pending,
+            )
+            for thread_id, accessed in self._touched.items():
+                cur = self._conn.execute(
+                    "INSERT OR IGNORE INTO threads (thread_id, last_access) VALUES (?, ?)", (thread_id, accessed)
+                )
+                if not cur.rowcount:
+                    self._conn.execute(
+                        "UPDATE threads SET last_access = ? WHERE thread_id = ?", (accessed, thread_id)
+                    )
+            for thread_id in {row[0] for row in self._pending}:
+                self._trim_thread(thread_id)
+            self._pending = []
+            self._touched = {}
+            if not maintain:
+                return
+            if self.ttl_seconds is not None:
+                self._expire(time.time() - self.ttl_seconds)
+            if self.max_threads is not None:
+                # Counted after this transaction's writes; other processes may have added threads
+                thread_count = self._conn.execute("SELECT COUNT(*) FROM threads").fetchone()[0]
+                if thread_count > self.max_threads:
+                    self._evict(thread_count - self.max_threads)
+
+    def _trim_thread(self, thread_id: str) -> None:
+        row = self._conn.execute(
+            "SELECT id FROM checkpoints WHERE thread_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?",
+            (thread_id, self.max_checkpoints_per_thread),
+        ).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM checkpoints WHERE thread_id = ? AND id <= ?", (thread_id, row[0]))
+
+    def _expire(self, cutoff: float) -> None:
+        self._conn.execute("DELETE FROM checkpoints WHERE created_at < ?", (cutoff,))
+        # A thread idle for longer than the TTL has no live checkpoints left
+        expired = [
+            row[0]
+            for row in self._conn.execute("SELECT thread_id FROM threads WHERE last_access < ?", (cutoff,))
+        ]
+        self._drop_threads(expired)
+
+    def _evict(self, count: int) -> None:
+        oldest = [
+            row[0]
+            for row in self._conn.execute("SELECT thread_id FROM threads ORDER BY last_access LIMIT ?", (count,))
+        ]
+        self._drop_threads(oldest)
+
+    def _drop_threads(self, thread_ids: List[str]) -> None:
+        rows = [(tid,) for tid in thread_ids]
+        self._conn.executemany("DELETE FROM checkpoints WHERE thread_id = ?", rows)
+        self._conn.executemany("DELETE FROM threads WHERE thread_id = ?", rows)
+
+    def _touch(self, thread_id: str) -> None:
+        with self._lock:
+            self._touched[thread_id] = time.time()
+
+    def get_checkpoint(self, thread_id: str, checkpoint_id: Optional[str] = None) -> Optional[StateSnapshot]:
+        try:
+            if not thread_id:
+                raise CheckpointError("Thread ID cannot be empty", operation="get")
+            self._flush_for_read(thread_id)
+            cutoff = self._read_cutoff()
+            with self._lock:
+                if checkpoint_id:
+                    row = self._conn.execute(
+                        "SELECT snapshot FROM checkpoints WHERE thread_id = ? AND checkpoint_id = ?"
+                        " AND created_at >= ? ORDER BY id LIMIT 1",
+                        (thread_id, checkpoint_id, cutoff),
+                    ).fetchone()
+                else:
+                    row = self._conn.execute(
+                        "SELECT snapshot FROM checkpoints WHERE thread_id = ? AND created_at >= ?"
+                        " ORDER BY id DESC LIMIT 1",
+                        (thread_id, cutoff),
+                    ).fetchone()
+            if row is None:
+                return None
+            self._touch(thread_id)
+            return pickle.loads(row[0])
+        except Exception as e:
+            raise CheckpointError(
+                f"Failed to get checkpoint: {str(e)}",
+                thread_id=thread_id,
+                checkpoint_id=checkpoint_id,
+                operation="get",
+            ) from e
+
+    def list_checkpoints(self, thread_id: str) -> List[StateSnapshot]:
+        try:
+            if not thread_id:
+                raise CheckpointError("Thread ID cannot be empty", operation="list")
+            self._flush_for_read(thread_id)
+            cutoff = self._read_cutoff()
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT snapshot FROM checkpoints WHERE thread_id = ? AND created_at >= ? ORDER BY id",
+                    (thread_id, cutoff),
+                ).fetchall()
+            if rows:
+                self._touch(thread_id)
+            return [pickle.loads(row[0]) for row in rows]
+        except Exception as e:
+            raise CheckpointError(f"Failed to list checkpoints: {str(e)}", thread_id=thread_id, operation="list") from e
+
+    def clear_thread(self, thread_id: str) -> None:
+        self.flush()
+        with self._lock, self._conn:
+            self._touched.pop(thread_id, None)
+            exists = self._conn.execute("SELECT 1 FROM threads WHERE thread_id = ?", (thread_id,)).fetchone()
+            self._conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+            if exists:
+                self._drop_threads([thread_id])
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
@@ -26,8 +26,10 @@ from .config import (
 from .monitoring import (
     DebugLogger,
     MetricsCollector,
+    LatencyHistogram,
     RequestMetrics,
     ProviderStats,
+    create_metrics_router,
     get_debug_logger,
     get_metrics_collector
 )
@@ -49,6 +51,8 @@ from .manager import (
     LLMManager,
     FallbackStrategy,
     LoadBalancer,
+    CircuitBreaker,
+    CircuitState,
     get_llm_manager,
     set_llm_manager
 )
@@ -87,8 +91,10 @@ __all__ = [
     # Monitoring
     'DebugLogger',
     'MetricsCollector', 
+    'LatencyHistogram',
     'RequestMetrics',
     'ProviderStats',
+    'create_metrics_router',
     'get_debug_logger',
     'get_metrics_collector',
     
@@ -108,6 +114,8 @@ __all__ = [
     'LLMManager',
     'FallbackStrategy',
     'LoadBalancer',
+    'CircuitBreaker',
+    'CircuitState',
     'get_llm_manager',
     'set_llm_manager',
     
@@ -2,10 +2,13 @@
 LLM Response Caching - Cache LLM responses to avoid redundant API calls.
 """
 
+import asyncio
 import hashlib
 import json
+import time
+from collections import OrderedDict
 from typing import Dict, Optional, List, Any
-from datetime import datetime, timedelta
+from datetime import datetime
 from logging import getLogger
 
 from spoon_ai.schema import Message
@@ -16,7 +19,13 @@ logger = getLogger(__name__)
 
 
 class LLMResponseCache:
-    """Cache for LLM responses to avoid redundant API calls."""
+    """LRU cache for LLM responses with lazy TTL expiry.
+
+    Entries live in an ``OrderedDict`` ordered from least to most recently
+    used, so lookups, inserts and evictions are all O(1). Expired entries are
+    dropped when they are next touched (or when they reach the LRU end),
+    instead of scanning the whole cache on every insert.
+    """
     
     def __init__(self, default_ttl: int = 3600, max_size: int = 1000):
         """Initialize the cache.
@@ -25,9 +34,16 @@ class LLMResponseCache:
             default_ttl: Default time-to-live in seconds (default: 1 hour)
             max_size: Maximum number of cached entries (default: 1000)
         """
-        self.cache: Dict[str, Dict[str, Any]] = {}
+        self.cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self.default_ttl = default_ttl
         self.max_size = max_size
+
+        # Accounting counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.total_bytes = 0
     
     def _generate_cache_key(self, messages: List[Message], provider: Optional[str] = None, **kwargs) -> str:
         """Generate a cache key from messages and parameters.
@@ -58,6 +74,23 @@ class LLMResponseCache:
         cache_str = json.dumps(cache_data, sort_keys=True)
         return hashlib.sha256(cache_str.encode()).hexdigest()
     
+    @staticmethod
+    def _estimate_size(response: LLMResponse) -> int:
+        """Estimate the in-memory payload size of a response in bytes."""
+        size = len((response.content or "").encode("utf-8"))
+        for tool_call in response.tool_calls or []:
+            function = getattr(tool_call, "function", None)
+            if function is not None:
+                size += len((function.name or "").encode("utf-8"))
+                size += len((function.arguments or "").encode("utf-8"))
+        return size
+
+    def _remove_entry(self, cache_key: str) -> None:
+        """Drop an entry and release its byte accounting."""
+        entry = self.cache.pop(cache_key, None)
+        if entry is not None:
+            self.total_bytes -= entry['size_bytes']
+
     def get(self, messages: List[Message], provider: Optional[str] = None, **kwargs) -> Optional[LLMResponse]:
         """Get cached response if available.
         
@@ -69,19 +102,32 @@ class LLMResponseCache:
         Returns:
             Optional[LLMResponse]: Cached response if found and not expired, None otherwise
         """
-        cache_key = self._generate_cache_key(messages, provider, **kwargs)
+        return self.get_by_key(self._generate_cache_key(messages, provider, **kwargs))
+
+    def get_by_key(self, cache_key: str) -> Optional[LLMResponse]:
+        """Get cached response for a precomputed cache key.
         
-        if cache_key not in self.cache:
+        Args:
+            cache_key: Key produced by ``_generate_cache_key``
+            
+        Returns:
+            Optional[LLMResponse]: Cached response if found and not expired, None otherwise
+        """
+        entry = self.cache.get(cache_key)
+        if entry is None:
+            self.misses += 1
             return None
         
-        entry = self.cache[cache_key]
-        
         # Check if entry has expired
-        if datetime.now() > entry['expires_at']:
-            del self.cache[cache_key]
+        if time.monotonic() > entry['expires_at']:
+            self._remove_entry(cache_key)
+            self.expirations += 1
+            self.misses += 1
             logger.debug(f"Cache entry expired for key: {cache_key[:8]}...")
             return None
         
+        self.cache.move_to_end(cache_key)
+        self.hits += 1
         logger.debug(f"Cache hit for key: {cache_key[:8]}...")
         return entry['response']
     
@@ -96,46 +142,88 @@ class LLMResponseCache:
             ttl: Time-to-live in seconds (optional, uses default if not provided)
             **kwargs: Additional parameters
         """
-        # Enforce max size by removing oldest entries if needed
-        if len(self.cache) >= self.max_size:
-            # Remove oldest entries (by expiration time)
-            sorted_entries = sorted(self.cache.items(), key=lambda x: x[1]['expires_at'])
-            entries_to_remove = len(self.cache) - self.max_size + 1
-            for key, _ in sorted_entries[:entries_to_remove]:
-                del self.cache[key]
-            logger.debug(f"Cache size limit reached, removed {entries_to_remove} oldest entries")
-        
-        cache_key = self._generate_cache_key(messages, provider, **kwargs)
-        expires_at = datetime.now() + timedelta(seconds=ttl or self.default_ttl)
+        self.set_by_key(self._generate_cache_key(messages, provider, **kwargs), response, ttl=ttl)
+
+    def set_by_key(self, cache_key: str, response: LLMResponse, ttl: Optional[int] = None) -> None:
+        """Store response in cache under a precomputed cache key.
         
+        Args:
+            cache_key: Key produced by ``_generate_cache_key``
+            response: LLM response to cache
+            ttl: Time-to-live in seconds (optional, uses default if not provided)
+        """
+        ttl_seconds = ttl or self.default_ttl
+
+        # Replacing an existing entry must not count as an eviction
+        self._remove_entry(cache_key)
+
+        # Enforce max size by evicting least recently used entries
+        while self.cache and len(self.cache) >= self.max_size:
+            oldest_key, oldest_entry = self.cache.popitem(last=False)
+            self.total_bytes -= oldest_entry['size_bytes']
+            if time.monotonic() > oldest_entry['expires_at']:
+                self.expirations += 1
+            else:
+                self.evictions += 1
+            logger.debug(f"Cache size limit reached, evicted key: {oldest_key[:8]}...")
+
+        size_bytes = self._estimate_size(response)
         self.cache[cache_key] = {
             'response': response,
-            'expires_at': expires_at,
-            'cached_at': datetime.now()
+            'expires_at': time.monotonic() + ttl_seconds,
+            'cached_at': datetime.now(),
+            'size_bytes': size_bytes,
         }
+        self.total_bytes += size_bytes
         
-        logger.debug(f"Cached response for key: {cache_key[:8]}... (expires at {expires_at})")
+        logger.debug(f"Cached response for key: {cache_key[:8]}... (ttl {ttl_seconds}s)")
     
     def clear(self) -> None:
         """Clear all cached entries."""
         self.cache.clear()
+        self.total_bytes = 0
         logger.info("Cache cleared")
+
+    def reset_stats(self) -> None:
+        """Reset hit/miss/eviction counters without touching cached entries."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics.
         
         Returns:
-            Dict[str, Any]: Cache statistics including size, max_size, etc.
+            Dict[str, Any]: Cache statistics including size, hit/miss counters and byte usage
         """
+        lookups = self.hits + self.misses
         return {
             'size': len(self.cache),
             'max_size': self.max_size,
-            'default_ttl': self.default_ttl
+            'default_ttl': self.default_ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'total_bytes': self.total_bytes,
         }
 
 
 class CachedLLMManager:
-    """Wrapper around LLMManager that adds response caching."""
+    """Wrapper around LLMManager that adds response caching.
+
+    Concurrent cache misses for the same request are coalesced: the first
+    caller (the leader) performs the provider call while identical callers
+    (followers) await the leader's result instead of issuing their own.
+
+    * If the leader's call raises, every follower receives the same exception
+      and nothing is cached.
+    * If the leader is cancelled, followers are not cancelled; one of them is
+      promoted to leader and retries the call.
+    * Cancelling a follower only cancels that follower's wait.
+    """
     
     def __init__(self, llm_manager: LLMManager, cache: Optional[LLMResponseCache] = None):
         """Initialize cached LLM manager.
@@ -146,6 +234,10 @@ class CachedLLMManager:
         """
         self.llm_manager = llm_manager
         self.cache = cache or LLMResponseCache()
+
+        # Single-flight state: cache key -> future resolved by the leader
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.coalesced_requests = 0
     
     async def chat(self, messages: List[Message], provider: Optional[str] = None, 
                    use_cache: bool = True, cache_ttl: Optional[int] = None, **kwargs) -> LLMResponse:
@@ -161,19 +253,53 @@ class CachedLLMManager:
         Returns:
             LLMResponse: LLM response (from cache or API)
         """
-        # Try to get from cache first
-        if use_cache:
-            cached_response = self.cache.get(messages, provider, **kwargs)
+        if not use_cache:
+            return await self.llm_manager.chat(messages, provider=provider, **kwargs)
+
+        cache_key = self.cache._generate_cache_key(messages, provider, **kwargs)
+
+        while True:
+            # Try to get from cache first
+            cached_response = self.cache.get_by_key(cache_key)
             if cached_response is not None:
                 logger.info("Returning cached response")
                 return cached_response
-        
-        # If not in cache, make API call
-        response = await self.llm_manager.chat(messages, provider=provider, **kwargs)
-        
-        # Store in cache
-        if use_cache:
-            self.cache.set(messages, response, provider, ttl=cache_ttl, **kwargs)
+
+            leader_future = self._in_flight.get(cache_key)
+            if leader_future is None:
+                break
+
+            # Follow the in-flight request instead of calling the provider again
+            self.coalesced_requests += 1
+            logger.debug(f"Coalescing request for key: {cache_key[:8]}...")
+            try:
+                return await asyncio.shield(leader_future)
+            except asyncio.CancelledError:
+                current_task = asyncio.current_task()
+                if not leader_future.cancelled() or (current_task and current_task.cancelling()):
+                    raise
+                # The leader was cancelled; retry and possibly become the new leader
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[cache_key] = future
+        try:
+            response = await self.llm_manager.chat(messages, provider=provider, **kwargs)
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case no follower is waiting
+            future.exception()
+            raise
+        else:
+            # Store in cache before waking followers
+            self.cache.set_by_key(cache_key, response, ttl=cache_ttl)
+            future.set_result(response)
+        finally:
+            if self._in_flight.get(cache_key) is future:
+                del self._in_flight[cache_key]
+            if not future.done():
+                # Leader was cancelled (or interrupted): let followers retry
+                future.cancel()
         
         return response
     
@@ -203,6 +329,9 @@ class CachedLLMManager:
         """Get cache statistics.
         
         Returns:
-            Dict[str, Any]: Cache statistics
+            Dict[str, Any]: Cache statistics, including request coalescing counters
         """
-        return self.cache.get_stats()
+        stats = self.cache.get_stats()
+        stats['coalesced_requests'] = self.coalesced_requests
+        stats['in_flight'] = len(self._in_flight)
+        return stats
@@ -90,6 +90,8 @@ class ConfigurationManager:
         self._load_dotenv()
         self._config_cache: Dict[str, Any] = {}
         self._provider_configs: Dict[str, ProviderConfig] = {}
+        # Bumped on every reload so consumers can drop state derived from the old configuration
+        self.generation = 0
         self._load_config()
 
     def _load_dotenv(self) -> None:
@@ -608,4 +610,5 @@ class ConfigurationManager:
         self._config_cache.clear()
         self._provider_configs.clear()
         self._load_config()
+        self.generation += 1
         logger.debug("Configuration cache refreshed from environment")
@@ -0,0 +1,162 @@
+"""
+Uploaded File Registry - Reuse Files API uploads across turns and requests.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Awaitable, Callable, Dict, List, Optional
+
+logger = getLogger(__name__)
+
+
+@dataclass
+class _UploadedFile:
+    file_id: str
+    size: int
+    refs: int = 0
+    expires_at: Optional[float] = None
+
+
+class UploadedFileRegistry:
+    """Content-hash keyed registry of files uploaded to a Files API.
+
+    A request ``acquire``s every large attachment it sends and ``release``s
+    them when it finishes. Attachments with the same content share one
+    upload, including concurrent uploads of the same content. A file whose
+    last reference is released stays available for ``ttl`` seconds so the
+    next turn can reuse it. Deletion is deferred: ``collect()`` returns
+    the ids of expired unreferenced files, and of the least recently used
+    ones beyond ``max_files``, for the caller to delete.
+    """
+
+    def __init__(self, ttl: float = 3600.0, max_files: int = 100):
+        """Initialize the registry.
+
+        Args:
+            ttl: Seconds an unreferenced upload is kept for reuse (default: 1 hour)
+            max_files: Maximum number of unreferenced uploads kept (default: 100)
+        """
+        self.ttl = ttl
+        self.max_files = max_files
+        # Least recently used first
+        self._files: "OrderedDict[str, _UploadedFile]" = OrderedDict()
+        self._pending: Dict[str, "asyncio.Future[_UploadedFile]"] = {}
+
+        # Accounting counters
+        self.uploads = 0
+        self.reuses = 0
+        self.uploaded_bytes = 0
+        self.deletions = 0
+
+    @staticmethod
+    def content_key(data: str, purpose: str = "user_data") -> str:
+        """Key for an attachment, hashed from its base64 payload so reuse skips decoding."""
+        return f"{purpose}:{hashlib.sha256(data.encode('ascii', 'ignore')).hexdigest()}"
+
+    async def acquire(self, key: str, upload: Callable[[], Awaitable[tuple]]) -> str:
+        """Take a reference to the file for ``key``, uploading it if needed.
+
+        Args:
+            key: Key from ``content_key``
+            upload: Coroutine factory returning ``(file_id, size_in_bytes)``
+
+        Returns:
+            The file id; pass ``key`` to ``release`` when the request is done.
+        """
+        while True:
+            entry = self._files.get(key)
+            if entry is not None and not self._expired(entry, time.monotonic()):
+                self._files.move_to_end(key)
+                self.reuses += 1
+                break
+            pending = self._pending.get(key)
+            if pending is None:
+                entry = await self._upload(key, upload)
+                break
+            try:
+                entry = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The uploading request was cancelled, not this one: look again
+                continue
+            self.reuses += 1
+            break
+        entry.refs += 1
+        entry.expires_at = None
+        return entry.file_id
+
+    async def _upload(self, key: str, upload: Callable[[], Awaitable[tuple]]) -> _UploadedFile:
+        future: "asyncio.Future[_UploadedFile]" = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            file_id, size = await upload()
+        except asyncio.CancelledError:
+            # Waiters retry instead of receiving a cancellation meant for this caller
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an upload nobody else waited on doesn't log a warning
+            future.exception()
+            raise
+        finally:
+            self._pending.pop(key, None)
+        entry = _UploadedFile(file_id=file_id, size=size)
+        # An expired upload of the same content is superseded; collect() deletes it
+        stale = self._files.pop(key, None)
+        if stale is not None:
+            self._files[f"stale:{stale.file_id}"] = stale
+        self._files[key] = entry
+        self.uploads += 1
+        self.uploaded_bytes += size
+        future.set_result(entry)
+        return entry
+
+    def release(self, keys: List[str]) -> None:
+        """Drop one reference per key; unreferenced files start their TTL."""
+        now = time.monotonic()
+        for key in keys:
+            entry = self._files.get(key)
+            if entry is None or entry.refs <= 0:
+                continue
+            entry.refs -= 1
+            if entry.refs == 0:
+                entry.expires_at = now + self.ttl
+
+    def _expired(self, entry: _UploadedFile, now: float) -> bool:
+        return entry.refs == 0 and entry.expires_at is not None and entry.expires_at <= now
+
+    def collect(self) -> List[str]:
+        """Remove expired and excess unreferenced files; return their ids for deletion."""
+        now = time.monotonic()
+        unreferenced = [key for key, entry in self._files.items() if entry.refs == 0]
+        excess = len(unreferenced) - self.max_files
+        doomed = []
+        for key in unreferenced:
+            if excess > 0 or self._expired(self._files[key], now):
+                doomed.append(self._files.pop(key).file_id)
+                excess -= 1
+        self.deletions += len(doomed)
+        return doomed
+
+    def drain(self) -> List[str]:
+        """Forget every file (e.g. on shutdown); return all ids for deletion."""
+        file_ids = [entry.file_id for entry in self._files.values()]
+        self._files.clear()
+        self.deletions += len(file_ids)
+        return file_ids
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "files": len(self._files),
+            "referenced": sum(1 for entry in self._files.values() if entry.refs),
+            "uploads": self.uploads,
+            "reuses": self.reuses,
+            "uploaded_bytes": self.uploaded_bytes,
+            "deletions": self.deletions,
+        }
@@ -3,7 +3,11 @@ LLM Manager - Central orchestrator for managing providers, fallback, and load ba
 """
 
 import asyncio
+import math
 import random
+import time
+from collections import deque
+from enum import Enum
 from typing import List, Dict, Any, Optional, AsyncGenerator, Set
 from logging import getLogger
 
@@ -68,11 +72,183 @@ class ProviderState:
         self.last_error_time = None
         self.backoff_until = None
 
+class CircuitState(str, Enum):
+    """States of a provider circuit breaker."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreaker:
+    """Per-provider circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and the
+    provider is skipped. Once ``recovery_timeout`` seconds have passed a single
+    probe request is let through (half-open); its outcome closes or re-opens
+    the circuit.
+    """
+    failure_threshold: int = 5
+    recovery_timeout: float = 30.0
+    state: CircuitState = CircuitState.CLOSED
+    consecutive_failures: int = 0
+    opened_at: float = 0.0
+    probe_in_flight: bool = False
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent, claiming the probe slot if half-open."""
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_timeout:
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self.probe_in_flight = False
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self.probe_in_flight:
+                return False
+            self.probe_in_flight = True
+
+        return True
+
+    def record_success(self) -> None:
+        """Record a successful request and close the circuit."""
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed request, opening the circuit if needed."""
+        self.consecutive_failures += 1
+        self.probe_in_flight = False
+        if self.state == CircuitState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+
+    def record_cancelled(self) -> None:
+        """Release the probe slot when a request is abandoned without a result."""
+        self.probe_in_flight = False
+
+
 class FallbackStrategy:
-    """Handles fallback logic between providers."""
+    """Handles fallback logic between providers.
+
+    Providers are tried in fallback-chain order. Each provider has a circuit
+    breaker so providers that keep failing are skipped without waiting for
+    them. With hedging enabled, if the current attempt has not answered after
+    the hedge delay (the provider's observed p95 latency once enough samples
+    exist), the next provider is started as well; the first success wins and
+    the slower attempt is cancelled.
+    """
 
-    def __init__(self, debug_logger: DebugLogger):
+    def __init__(self, debug_logger: DebugLogger,
+                 enable_hedging: bool = False,
+                 hedge_delay: float = 1.0,
+                 hedge_quantile: float = 0.95,
+                 min_hedge_samples: int = 20,
+                 latency_window: int = 200,
+                 enable_circuit_breaker: bool = True,
+                 failure_threshold: int = 5,
+                 recovery_timeout: float = 30.0):
+        """Initialize fallback strategy.
+
+        Args:
+            debug_logger: Logger used to record fallback events
+            enable_hedging: Whether to send hedged requests to the next provider
+            hedge_delay: Hedge delay in seconds used until enough latency samples exist
+            hedge_quantile: Latency quantile used to derive the hedge delay
+            min_hedge_samples: Samples required before the quantile is trusted
+            latency_window: Number of recent latencies kept per provider
+            enable_circuit_breaker: Whether to skip providers with an open circuit
+            failure_threshold: Consecutive failures that open a circuit
+            recovery_timeout: Seconds an open circuit waits before a probe request
+        """
         self.debug_logger = debug_logger
+        self.enable_hedging = enable_hedging
+        self.hedge_delay = hedge_delay
+        self.hedge_quantile = hedge_quantile
+        self.min_hedge_samples = min_hedge_samples
+        self.latency_window = latency_window
+        self.enable_circuit_breaker = enable_circuit_breaker
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self.circuit_breakers: Dict[str, CircuitBreaker] = {}
+        self.provider_latencies: Dict[str, deque] = {}
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+
+    def get_circuit_breaker(self, provider: str) -> CircuitBreaker:
+        """Get or create the circuit breaker for a provider."""
+        breaker = self.circuit_breakers.get(provider)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                failure_threshold=self.failure_threshold,
+                recovery_timeout=self.recovery_timeout
+            )
+            self.circuit_breakers[provider] = breaker
+        return breaker
+
+    def get_hedge_delay(self, provider: str) -> float:
+        """Get the hedge delay for a provider from its recent latency quantile."""
+        samples = self.provider_latencies.get(provider)
+        if not samples or len(samples) < self.min_hedge_samples:
+            return self.hedge_delay
+
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(self.hedge_quantile * len(ordered)) - 1))
+        return ordered[index]
+
+    def record_latency(self, provider: str, duration: float) -> None:
+        """Record a successful request latency for hedge delay estimation."""
+        samples = self.provider_latencies.get(provider)
+        if samples is None:
+            samples = deque(maxlen=self.latency_window)
+            self.provider_latencies[provider] = samples
+        samples.append(duration)
+
+    def get_circuit_states(self) -> Dict[str, str]:
+        """Get the circuit state of every provider seen so far."""
+        return {name: breaker.state.value for name, breaker in self.circuit_breakers.items()}
+
+    def _filter_available(self, providers: List[str]) -> List[str]:
+        """Drop providers whose circuit is open."""
+        if not self.enable_circuit_breaker:
+            return list(providers)
+
+        available = []
+        for provider_name in providers:
+            breaker = self.get_circuit_breaker(provider_name)
+            if breaker.state == CircuitState.CLOSED:
+                available.append(provider_name)
+            elif breaker.state == CircuitState.OPEN and \
+                    time.monotonic() - breaker.opened_at < breaker.recovery_timeout:
+                logger.info(f"Skipping provider {provider_name}: circuit open")
+            else:
+                available.append(provider_name)
+        return available
+
+    async def _attempt(self, provider_name: str, operation, *args, **kwargs) -> Any:
+        """Run one provider attempt, feeding latency and circuit breaker state."""
+        breaker = self.get_circuit_breaker(provider_name) if self.enable_circuit_breaker else None
+        if breaker is not None and not breaker.allow_request():
+            raise ProviderUnavailableError(provider_name, context={"reason": "circuit_open"})
+
+        start_time = time.monotonic()
+        try:
+            result = await operation(provider_name, *args, **kwargs)
+        except asyncio.CancelledError:
+            if breaker is not None:
+                breaker.record_cancelled()
+            raise
+        except Exception:
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+
+        self.record_latency(provider_name, time.monotonic() - start_time)
+        if breaker is not None:
+            breaker.record_success()
+        return result
 
     async def execute_with_fallback(self, providers: List[str], operation, *args, **kwargs) -> LLMResponse:
         """Execute operation with fallback chain.
@@ -88,12 +264,23 @@ class FallbackStrategy:
         Raises:
             ProviderError: If all providers fail
         """
+        candidates = self._filter_available(providers)
+        if not candidates:
+            raise ProviderError(
+                "fallback",
+                "All providers are unavailable (circuit open)",
+                context={"attempted_providers": providers}
+            )
+
+        if self.enable_hedging and len(candidates) > 1:
+            return await self._execute_hedged(candidates, operation, *args, **kwargs)
+
         last_error = None
 
-        for i, provider_name in enumerate(providers):
+        for i, provider_name in enumerate(candidates):
             try:
                 logger.info(f"Attempting operation with provider: {provider_name}")
-                result = await operation(provider_name, *args, **kwargs)
+                result = await self._attempt(provider_name, operation, *args, **kwargs)
 
                 if i > 0:  # Log successful fallback
                     logger.info(f"Successfully fell back to {provider_name} after {i} failures")
@@ -105,13 +292,80 @@ class FallbackStrategy:
                 logger.warning(f"Provider {provider_name} failed: {str(e)}")
 
                 # Log fallback event if not the last provider
-                if i < len(providers) - 1:
-                    next_provider = providers[i + 1]
+                if i < len(candidates) - 1:
+                    next_provider = candidates[i + 1]
                     self.debug_logger.log_fallback(provider_name, next_provider, str(e))
 
                 continue
 
         # All providers failed
+        raise ProviderError(
+            "fallback",
+            f"All providers failed. Last error: {str(last_error)}",
+            original_error=last_error,
+            context={"attempted_providers": candidates}
+        )
+
+    async def _execute_hedged(self, providers: List[str], operation, *args, **kwargs) -> LLMResponse:
+        """Execute operation with at most one hedged request in flight alongside the primary."""
+        pending: Dict[asyncio.Task, str] = {}
+        hedge_tasks: Set[asyncio.Task] = set()
+        remaining = list(providers)
+        last_error = None
+        last_started: Optional[str] = None
+
+        def launch(hedged: bool = False) -> None:
+            nonlocal last_started
+            provider_name = remaining.pop(0)
+            logger.info(f"Attempting operation with provider: {provider_name}")
+            task = asyncio.ensure_future(self._attempt(provider_name, operation, *args, **kwargs))
+            pending[task] = provider_name
+            if hedged:
+                hedge_tasks.add(task)
+            last_started = provider_name
+
+        try:
+            launch()
+            while pending:
+                timeout = None
+                if remaining and len(pending) < 2:
+                    timeout = self.get_hedge_delay(last_started)
+
+                done, _ = await asyncio.wait(
+                    pending.keys(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    # Hedge timer fired: send the next provider in parallel
+                    self.hedged_requests += 1
+                    logger.info(f"Provider {last_started} exceeded hedge delay {timeout:.3f}s; "
+                                f"hedging with {remaining[0]}")
+                    launch(hedged=True)
+                    continue
+
+                for task in done:
+                    provider_name = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        if task in hedge_tasks:
+                            self.hedge_wins += 1
+                            logger.info(f"Hedged request to {provider_name} answered first")
+                        return task.result()
+
+                    last_error = error
+                    logger.warning(f"Provider {provider_name} failed: {str(error)}")
+                    if remaining:
+                        self.debug_logger.log_fallback(provider_name, remaining[0], str(error))
+
+                # Start the next provider right away if nothing is left running
+                if not pending and remaining:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending.keys(), return_exceptions=True)
+
         raise ProviderError(
             "fallback",
             f"All providers failed. Last error: {str(last_error)}",
@@ -121,18 +375,54 @@ class FallbackStrategy:
 
 
 class LoadBalancer:
-    """Handles load balancing between multiple provider instances."""
+    """Handles load balancing between multiple provider instances.
+
+    Besides the static strategies, two latency-aware strategies use an
+    exponentially weighted moving average (EWMA) of observed latency and the
+    number of requests currently in flight per provider:
+
+    * ``least_latency`` picks the provider with the lowest
+      ``ewma_latency * (in_flight + 1)`` score.
+    * ``p2c`` ("power of two choices") compares two randomly sampled providers
+      by the same score, which avoids herding on a single provider.
+
+    Providers without latency samples are scored with a prior (the mean EWMA
+    of the sampled providers, or ``default_latency`` before any sample), so a
+    cold-start burst is spread by in-flight count instead of all going to the
+    first unsampled provider.
+
+    A provider's EWMA decays toward that prior as its last sample ages, so a
+    provider penalised by failures is tried again once the penalty is stale
+    instead of being starved of the traffic that would prove it recovered.
+    """
 
-    def __init__(self):
+    def __init__(self, ewma_alpha: float = 0.3, failure_penalty: float = 5.0,
+                 default_latency: float = 1.0, decay_seconds: float = 60.0):
+        """Initialize load balancer.
+
+        Args:
+            ewma_alpha: Smoothing factor for latency EWMA (higher reacts faster)
+            failure_penalty: Latency in seconds recorded for failed requests
+            default_latency: Latency prior in seconds used while no provider has samples
+            decay_seconds: Time constant for decaying an idle provider's EWMA toward the prior
+        """
         self.provider_weights: Dict[str, float] = {}
         self.provider_health: Dict[str, bool] = {}
+        self.ewma_alpha = ewma_alpha
+        self.failure_penalty = failure_penalty
+        self.default_latency = default_latency
+        self.ewma_latency: Dict[str, float] = {}
+        self.in_flight: Dict[str, int] = {}
+        self.decay_seconds = decay_seconds
+        self.last_sample: Dict[str, float] = {}
 
     def select_provider(self, providers: List[str], strategy: str = "round_robin") -> str:
         """Select a provider based on load balancing strategy.
 
         Args:
             providers: List of available providers
-            strategy: Load balancing strategy ('round_robin', 'weighted', 'random')
+            strategy: Load balancing strategy ('round_robin', 'weighted', 'random',
+                'least_latency', 'p2c')
 
         Returns:
             str: Selected provider name
@@ -148,9 +438,70 @@ class LoadBalancer:
             return random.choice(healthy_providers)
         elif strategy == "weighted":
             return self._weighted_selection(healthy_providers)
+        elif strategy == "least_latency":
+            return min(healthy_providers, key=self.get_load_score)
+        elif strategy == "p2c":
+            return self._power_of_two_selection(healthy_providers)
         else:  # round_robin (default)
             return self._round_robin_selection(healthy_providers)
 
+    def get_load_score(self, provider: str) -> float:
+        """Score a provider by EWMA latency scaled by outstanding requests (lower is better).
+
+        Providers without latency samples use the prior from ``get_latency_prior``.
+        """
+        return self.get_latency(provider) * (self.in_flight.get(provider, 0) + 1)
+
+    def get_latency(self, provider: str) -> float:
+        """Expected latency of a provider: its EWMA decayed toward the prior by sample age."""
+        prior = self.get_latency_prior()
+        latency = self.ewma_latency.get(provider)
+        if latency is None:
+            return prior
+        elapsed = time.monotonic() - self.last_sample.get(provider, time.monotonic())
+        weight = math.exp(-max(0.0, elapsed) / self.decay_seconds) if self.decay_seconds > 0 else 1.0
+        return prior + (latency - prior) * weight
+
+    def get_latency_prior(self) -> float:
+        """Latency assumed for unsampled providers: the mean sampled EWMA, else ``default_latency``."""
+        if not self.ewma_latency:
+            return self.default_latency
+        return sum(self.ewma_latency.values()) / len(self.ewma_latency)
+
+    def _power_of_two_selection(self, providers: List[str]) -> str:
+        """Pick the better of two randomly sampled providers."""
+        if len(providers) < 2:
+            return providers[0]
+        first, second = random.sample(providers, 2)
+        return first if self.get_load_score(first) <= self.get_load_score(second) else second
+
+    def record_request_start(self, provider: str) -> None:
+        """Record that a request has been dispatched to a provider."""
+        self.in_flight[provider] = self.in_flight.get(provider, 0) + 1
+
+    def record_request_cancelled(self, provider: str) -> None:
+        """Record that a dispatched request was abandoned before completing."""
+        self.in_flight[provider] = max(0, self.in_flight.get(provider, 0) - 1)
+
+    def record_request_end(self, provider: str, duration: float, success: bool = True) -> None:
+        """Record request completion and fold its latency into the provider EWMA.
+
+        Args:
+            provider: Provider name
+            duration: Request duration in seconds
+            success: Whether request was successful; failures count as at least
+                ``failure_penalty`` seconds
+        """
+        self.in_flight[provider] = max(0, self.in_flight.get(provider, 0) - 1)
+
+        sample = duration if success else max(duration, self.failure_penalty)
+        if provider not in self.ewma_latency:
+            self.ewma_latency[provider] = sample
+        else:
+            previous = self.get_latency(provider)
+            self.ewma_latency[provider] = self.ewma_alpha * sample + (1 - self.ewma_alpha) * previous
+        self.last_sample[provider] = time.monotonic()
+
     def _round_robin_selection(self, providers: List[str]) -> str:
         """Simple round-robin selection."""
         if not hasattr(self, '_round_robin_index'):
@@ -221,6 +572,14 @@ class LLMManager:
         self.load_balancing_enabled: bool = False
         self.load_balancing_strategy: str = "round_robin"
 
+        # Hot-path caches: resolved provider instances, tool support and the provider chain.
+        # Dropped by invalidate_provider_cache() or when the config/registry generation changes.
+        self._provider_handles: Dict[str, LLMProviderInterface] = {}
+        self._tool_support: Dict[str, bool] = {}
+        self._provider_chain: Optional[List[str]] = None
+        self._provider_chain_key: Optional[tuple] = None
+        self._cache_generation = self._current_generation()
+
         # Initialize providers from configuration
         self._initialize_providers()
 
@@ -260,6 +619,50 @@ class LLMManager:
 
         atexit.register(cleanup_sync)
 
+    def _current_generation(self) -> tuple:
+        return (getattr(self.config_manager, 'generation', 0), getattr(self.registry, 'generation', 0))
+
+    def invalidate_provider_cache(self, provider_name: Optional[str] = None) -> None:
+        """Drop cached provider handles and capability flags.
+
+        Called automatically when the configuration is reloaded or the registry
+        changes; call it directly after changing provider configuration by other means.
+
+        Args:
+            provider_name: Provider to invalidate (default: all providers)
+        """
+        if provider_name is None:
+            self._provider_handles.clear()
+            self._tool_support.clear()
+            self._provider_chain = None
+        else:
+            self._provider_handles.pop(provider_name, None)
+            self._tool_support.pop(provider_name, None)
+        self._cache_generation = self._current_generation()
+
+    def _get_provider_handle(self, provider_name: str) -> LLMProviderInterface:
+        """Get the provider instance, resolving configuration only on first use."""
+        provider_instance = self._provider_handles.get(provider_name)
+        if provider_instance is None:
+            generation = self._current_generation()
+            config = self.config_manager.load_provider_config(provider_name)
+            provider_instance = self.registry.get_provider(provider_name, config.model_dump())
+            # Creating the instance bumps the registry generation; don't treat that as a change
+            if generation == self._cache_generation:
+                self._cache_generation = self._current_generation()
+            self._provider_handles[provider_name] = provider_instance
+        return provider_instance
+
+    def _supports_tools(self, provider_name: str) -> bool:
+        supported = self._tool_support.get(provider_name)
+        if supported is None:
+            capabilities = self.registry.get_capabilities(provider_name)
+            supported = ProviderCapability.TOOLS in capabilities
+            if not supported:
+                logger.debug(f"Provider {provider_name} does not support tools: {capabilities}")
+            self._tool_support[provider_name] = supported
+        return supported
+
     def _get_provider_state(self, provider_name: str) -> ProviderState:
         """Get or create provider state."""
         if provider_name not in self.provider_states:
@@ -311,7 +714,7 @@ class LLMManager:
             try:
                 # Get provider configuration
                 config = self.config_manager.load_provider_config(provider_name)
-                provider_instance = self.registry.get_provider(provider_name, config.model_dump())
+                provider_instance = self._get_provider_handle(provider_name)
 
                 logger.info(f"Initializing provider: {provider_name}")
 
@@ -354,15 +757,18 @@ class LLMManager:
 
         # Get provider instance
         try:
-            config = self.config_manager.load_provider_config(provider_name)
-            provider_instance = self.registry.get_provider(provider_name, config.model_dump())
+            provider_instance = self._get_provider_handle(provider_name)
         except Exception as e:
             logger.error(f"Failed to get provider instance {provider_name}: {e}")
             raise ProviderError(provider_name, f"Failed to get provider instance: {str(e)}", original_error=e)
 
         # Log request
-        request_id = self.debug_logger.log_request(provider_name, method, kwargs)
-        start_time = asyncio.get_event_loop().time()
+        debug_logger = self.debug_logger
+        request_id = debug_logger.log_request(provider_name, method, kwargs) if getattr(debug_logger, 'enabled', True) else ""
+        model = self._requested_model(provider_instance, kwargs)
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        self.load_balancer.record_request_start(provider_name)
 
         try:
             # Execute the operation
@@ -373,35 +779,45 @@ class LLMManager:
             response = await operation(*args, **kwargs)
 
             # Calculate duration and add metadata
-            duration = asyncio.get_event_loop().time() - start_time
+            duration = loop.time() - start_time
             response.duration = duration
             response.request_id = request_id
 
             # Log successful response
-            self.debug_logger.log_response(request_id, response, duration)
+            if request_id:
+                debug_logger.log_response(request_id, response, duration)
 
             # Record metrics
             tokens = response.usage.get('total_tokens', 0) if response.usage else 0
             self.metrics_collector.record_request(
-                provider_name, method, duration, True, tokens, response.model
+                provider_name, method, duration, True, tokens, model or response.model
             )
+            self.load_balancer.record_request_end(provider_name, duration, True)
 
             # Mark provider as healthy
             self.load_balancer.update_provider_health(provider_name, True)
 
             return response
 
+        except asyncio.CancelledError:
+            # Abandoned (e.g. a losing hedged request): release the slot without a latency sample
+            self.load_balancer.record_request_cancelled(provider_name)
+            if request_id:
+                debug_logger.log_cancelled(request_id)
+            raise
+
         except Exception as e:
             # Calculate duration
-            duration = asyncio.get_event_loop().time() - start_time
+            duration = loop.time() - start_time
 
             # Log error
-            self.debug_logger.log_error(request_id, e, {"provider": provider_name, "method": method})
+            debug_logger.log_error(request_id, e, {"provider": provider_name, "method": method})
 
             # Record metrics
             self.metrics_collector.record_request(
-                provider_name, method, duration, False, error=str(e)
+                provider_name, method, duration, False, model=model, error=str(e)
             )
+            self.load_balancer.record_request_end(provider_name, duration, False)
 
             # Update provider health
             self.load_balancer.update_provider_health(provider_name, False)
@@ -414,6 +830,12 @@ class LLMManager:
 
             raise
 
+    @staticmethod
+    def _requested_model(provider_instance: LLMProviderInterface, kwargs: Dict[str, Any]) -> str:
+        """Model a request targets, so failures land in the same metrics series as successes."""
+        model = kwargs.get('model') or getattr(provider_instance, 'model', '')
+        return model if isinstance(model, str) else ''
+
     def _is_critical_error(self, error: Exception) -> bool:
         """Determine if an error requires provider reinitialization."""
         critical_error_patterns = [
@@ -484,6 +906,7 @@ class LLMManager:
 
             # Clear provider states
             self.provider_states.clear()
+            self.invalidate_provider_cache()
 
             if cleanup_errors:
                 logger.warning(f"Some providers failed to cleanup: {cleanup_errors}")
@@ -504,7 +927,8 @@ class LLMManager:
                 "last_error": str(state.last_error) if state.last_error else None,
                 "last_error_time": state.last_error_time.isoformat() if state.last_error_time else None,
                 "backoff_until": state.backoff_until.isoformat() if state.backoff_until else None,
-                "health_status": self.load_balancer.provider_health.get(provider_name, True)
+                "health_status": self.load_balancer.provider_health.get(provider_name, True),
+                "circuit_state": self.fallback_strategy.get_circuit_breaker(provider_name).state.value
             }
 
         return status
@@ -532,6 +956,7 @@ class LLMManager:
                 state.last_error = None
                 state.last_error_time = None
                 state.backoff_until = None
+                self.invalidate_provider_cache(provider_name)
 
                 logger.info(f"Reset provider state: {provider_name}")
 
@@ -630,7 +1055,7 @@ class LLMManager:
         await self._ensure_provider_initialized(provider_name)
 
         # Get provider instance
-        provider_instance = self.registry.get_provider(provider_name)
+        provider_instance = self._get_provider_handle(provider_name)
 
         # Create callback manager with internal monitoring callbacks
         internal_callbacks = self._get_internal_callbacks()
@@ -638,8 +1063,11 @@ class LLMManager:
         callback_manager = CallbackManager.from_callbacks(all_callbacks)
 
         # Log request
-        request_id = self.debug_logger.log_request(provider_name, 'chat_stream', kwargs)
-        start_time = asyncio.get_event_loop().time()
+        debug_logger = self.debug_logger
+        request_id = debug_logger.log_request(provider_name, 'chat_stream', kwargs) if getattr(debug_logger, 'enabled', True) else ""
+        model = self._requested_model(provider_instance, kwargs)
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
 
         try:
             # Stream from provider with callbacks
@@ -647,20 +1075,28 @@ class LLMManager:
                 yield chunk
 
             # Log successful completion
-            duration = asyncio.get_event_loop().time() - start_time
+            duration = loop.time() - start_time
+            if request_id:
+                debug_logger.log_stream_end(request_id, duration)
             self.metrics_collector.record_request(
-                provider_name, 'chat_stream', duration, True
+                provider_name, 'chat_stream', duration, True, model=model
             )
 
         except Exception as e:
             # Log error
-            duration = asyncio.get_event_loop().time() - start_time
-            self.debug_logger.log_error(request_id, e, {"provider": provider_name})
+            duration = loop.time() - start_time
+            debug_logger.log_error(request_id, e, {"provider": provider_name})
             self.metrics_collector.record_request(
-                provider_name, 'chat_stream', duration, False, error=str(e)
+                provider_name, 'chat_stream', duration, False, model=model, error=str(e)
             )
             raise
 
+        except BaseException:
+            # Consumer stopped iterating (aclose) or the task was cancelled
+            if request_id:
+                debug_logger.log_cancelled(request_id)
+            raise
+
     def _get_internal_callbacks(self) -> List[BaseCallbackHandler]:
         """Get internal monitoring callbacks."""
         # For now, return empty list
@@ -717,12 +1153,8 @@ class LLMManager:
         tool_capable_providers = []
         for p in providers:
             try:
-                capabilities = self.registry.get_capabilities(p)
-                if ProviderCapability.TOOLS in capabilities:
+                if self._supports_tools(p):
                     tool_capable_providers.append(p)
-                    logger.debug(f"Provider {p} supports tools")
-                else:
-                    logger.debug(f"Provider {p} does not support tools: {capabilities}")
             except Exception as e:
                 logger.warning(f"Failed to check capabilities for provider {p}: {e}")
                 continue
@@ -812,13 +1244,20 @@ class LLMManager:
         Returns:
             List[str]: List of provider names in order of preference
         """
+        if self._cache_generation != self._current_generation():
+            self.invalidate_provider_cache()
+
         if requested_provider:
             # Use specific provider only
             if not self.registry.is_registered(requested_provider):
                 raise ConfigurationError(f"Provider '{requested_provider}' not registered")
             return [requested_provider]
 
-        providers = self._build_provider_chain()
+        chain_key = (self.default_provider, tuple(self.fallback_chain))
+        if self._provider_chain is None or chain_key != self._provider_chain_key:
+            self._provider_chain = self._build_provider_chain()
+            self._provider_chain_key = chain_key
+        providers = list(self._provider_chain)
 
         # Use load balancing if enabled and multiple providers available
         if self.load_balancing_enabled and len(providers) > 1:
@@ -851,9 +1290,10 @@ class LLMManager:
         """Enable load balancing with specified strategy.
 
         Args:
-            strategy: Load balancing strategy ('round_robin', 'weighted', 'random')
+            strategy: Load balancing strategy ('round_robin', 'weighted', 'random',
+                'least_latency', 'p2c')
         """
-        valid_strategies = ['round_robin', 'weighted', 'random']
+        valid_strategies = ['round_robin', 'weighted', 'random', 'least_latency', 'p2c']
         if strategy not in valid_strategies:
             raise ConfigurationError(f"Invalid load balancing strategy: {strategy}")
 
@@ -861,6 +1301,26 @@ class LLMManager:
         self.load_balancing_strategy = strategy
         logger.info(f"Enabled load balancing with strategy: {strategy}")
 
+    def enable_hedging(self, hedge_delay: float = 1.0, hedge_quantile: float = 0.95) -> None:
+        """Enable hedged requests across the fallback chain.
+
+        Args:
+            hedge_delay: Hedge delay in seconds used until enough latency samples exist
+            hedge_quantile: Latency quantile used to derive the hedge delay
+        """
+        if hedge_delay < 0 or not 0 < hedge_quantile <= 1:
+            raise ConfigurationError("Invalid hedging configuration")
+
+        self.fallback_strategy.enable_hedging = True
+        self.fallback_strategy.hedge_delay = hedge_delay
+        self.fallback_strategy.hedge_quantile = hedge_quantile
+        logger.info(f"Enabled request hedging (delay={hedge_delay}s, quantile={hedge_quantile})")
+
+    def disable_hedging(self) -> None:
+        """Disable hedged requests."""
+        self.fallback_strategy.enable_hedging = False
+        logger.info("Disabled request hedging")
+
     def disable_load_balancing(self) -> None:
         """Disable load balancing."""
         self.load_balancing_enabled = False
@@ -916,6 +1376,10 @@ class LLMManager:
                 "fallback_chain": self.fallback_chain,
                 "load_balancing_enabled": self.load_balancing_enabled,
                 "load_balancing_strategy": self.load_balancing_strategy,
+                "hedging_enabled": self.fallback_strategy.enable_hedging,
+                "hedged_requests": self.fallback_strategy.hedged_requests,
+                "hedge_wins": self.fallback_strategy.hedge_wins,
+                "circuit_breakers": self.fallback_strategy.get_circuit_states(),
                 "registered_providers": self.registry.list_providers()
             },
             "providers": self.metrics_collector.get_all_stats(),
@@ -2,9 +2,11 @@
 Comprehensive monitoring, debugging, and metrics collection for LLM operations.
 """
 
+import logging
 import time
 import uuid
-from typing import Dict, Any, Optional, List
+from bisect import bisect_left
+from typing import Dict, Any, Optional, List, Sequence, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
@@ -79,18 +81,34 @@ class ProviderStats:
 class DebugLogger:
     """Comprehensive logging and debugging system for LLM operations."""
     
-    def __init__(self, max_history: int = 1000, enable_detailed_logging: bool = True):
+    def __init__(self, max_history: int = 1000, enable_detailed_logging: bool = True,
+                 enabled: Optional[bool] = None):
         """Initialize debug logger.
         
         Args:
             max_history: Maximum number of requests to keep in history
             enable_detailed_logging: Whether to enable detailed request/response logging
+            enabled: Whether to track requests at all; when False every log call is a no-op
+                and ``log_request`` returns an empty request ID. Defaults to following
+                whether this module's logger is enabled for DEBUG.
         """
         self.max_history = max_history
         self.enable_detailed_logging = enable_detailed_logging
+        self.enabled = enabled
         self.request_history: deque = deque(maxlen=max_history)
         self.active_requests: Dict[str, RequestMetrics] = {}
     
+    @property
+    def enabled(self) -> bool:
+        """Whether requests are tracked; unless set explicitly, only while DEBUG logging is on."""
+        if self._enabled is None:
+            return logger.isEnabledFor(logging.DEBUG)
+        return self._enabled
+    
+    @enabled.setter
+    def enabled(self, value: Optional[bool]) -> None:
+        self._enabled = value
+    
     def log_request(self, provider: str, method: str, params: Dict[str, Any]) -> str:
         """Log request with unique ID.
         
@@ -102,6 +120,8 @@ class DebugLogger:
         Returns:
             str: Unique request ID
         """
+        if not self.enabled:
+            return ""
         request_id = str(uuid.uuid4())
         
         # Create request metrics
@@ -117,14 +137,15 @@ class DebugLogger:
         self.active_requests[request_id] = metrics
         
         if self.enable_detailed_logging:
-            logger.debug(f"[{request_id}] {provider}.{method} started", extra={
-                'request_id': request_id,
-                'provider': provider,
-                'method': method,
-                'params': params
-            })
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"[{request_id}] {provider}.{method} started", extra={
+                    'request_id': request_id,
+                    'provider': provider,
+                    'method': method,
+                    'params': params
+                })
         else:
-            logger.info(f"[{request_id}] {provider}.{method} started")
+            logger.info("[%s] %s.%s started", request_id, provider, method)
         
         return request_id
     
@@ -136,6 +157,8 @@ class DebugLogger:
             response: LLM response object
             duration: Request duration in seconds
         """
+        if not self.enabled:
+            return
         if request_id not in self.active_requests:
             logger.warning(f"Response logged for unknown request ID: {request_id}")
             return
@@ -167,16 +190,50 @@ class DebugLogger:
         del self.active_requests[request_id]
         
         if self.enable_detailed_logging:
-            logger.debug(f"[{request_id}] {metrics.provider}.{metrics.method} completed in {duration:.3f}s", extra={
-                'request_id': request_id,
-                'provider': metrics.provider,
-                'method': metrics.method,
-                'duration': duration,
-                'tokens': metrics.total_tokens,
-                'success': True
-            })
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"[{request_id}] {metrics.provider}.{metrics.method} completed in {duration:.3f}s", extra={
+                    'request_id': request_id,
+                    'provider': metrics.provider,
+                    'method': metrics.method,
+                    'duration': duration,
+                    'tokens': metrics.total_tokens,
+                    'success': True
+                })
         else:
-            logger.info(f"[{request_id}] {metrics.provider}.{metrics.method} completed in {duration:.3f}s")
+            logger.info("[%s] %s.%s completed in %.3fs", request_id, metrics.provider, metrics.method, duration)
+    
+    def log_stream_end(self, request_id: str, duration: float) -> None:
+        """Log successful completion of a streaming request.
+        
+        Args:
+            request_id: Request ID from log_request
+            duration: Stream duration in seconds
+        """
+        metrics = self.active_requests.pop(request_id, None) if self.enabled else None
+        if metrics is None:
+            return
+        metrics.end_time = datetime.now()
+        metrics.duration = duration
+        metrics.success = True
+        self.request_history.append(metrics)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[%s] %s.%s stream completed in %.3fs", request_id, metrics.provider, metrics.method, duration)
+    
+    def log_cancelled(self, request_id: str) -> None:
+        """Log a request that was abandoned (cancelled or closed) before finishing.
+        
+        Args:
+            request_id: Request ID from log_request
+        """
+        metrics = self.active_requests.pop(request_id, None) if self.enabled else None
+        if metrics is None:
+            return
+        metrics.end_time = datetime.now()
+        metrics.duration = (metrics.end_time - metrics.start_time).total_seconds()
+        metrics.error = "cancelled"
+        self.request_history.append(metrics)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[%s] %s.%s cancelled", request_id, metrics.provider, metrics.method)
     
     def log_error(self, request_id: str, error: Exception, context: Dict[str, Any]) -> None:
         """Log error with context.
@@ -186,6 +243,9 @@ class DebugLogger:
             error: Exception that occurred
             context: Additional error context
         """
+        if not self.enabled or not request_id:
+            logger.error(f"{context.get('provider', 'unknown')} request failed: {error}")
+            return
         if request_id not in self.active_requests:
             logger.warning(f"Error logged for unknown request ID: {request_id}")
             return
@@ -259,18 +319,105 @@ class DebugLogger:
         logger.info("Request history cleared")
 
 
+# Upper bounds (seconds) of the latency histogram buckets; a final +Inf bucket is implicit
+DEFAULT_LATENCY_BUCKETS = (
+    0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 4.0, 5.0,
+    7.5, 10.0, 15.0, 20.0, 30.0, 45.0, 60.0, 120.0,
+)
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with percentile estimates.
+    
+    Recording is a bisect over a short, fixed list of bounds plus two
+    additions, so its cost does not grow with the number of samples.
+    Percentiles are interpolated linearly inside the bucket that holds them.
+    """
+    
+    __slots__ = ("bounds", "counts", "count", "sum", "max")
+    
+    def __init__(self, bounds: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        """Initialize histogram.
+        
+        Args:
+            bounds: Increasing bucket upper bounds in seconds
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+    
+    def observe(self, value: float) -> None:
+        """Record one sample."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+    
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram with the same bounds into this one."""
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+    
+    def quantile(self, q: float) -> float:
+        """Estimate the ``q`` quantile (0-1) in seconds; 0.0 when empty."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[i - 1] if i else 0.0
+                upper = min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+                return lower + (upper - lower) * max(rank - seen, 0.0) / count
+            seen += count
+        return self.max
+    
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """``(le, cumulative count)`` pairs as exposed by OpenMetrics, ending with ``+Inf``."""
+        result = []
+        total = 0
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            result.append((repr(float(bound)), total))
+        result.append(("+Inf", self.count))
+        return result
+
+
+@dataclass
+class SeriesMetrics:
+    """Monotonic counters and latency histogram for one provider/model pair."""
+    latency: LatencyHistogram
+    requests: int = 0
+    errors: int = 0
+    tokens: int = 0
+    cost: float = 0.0
+
+
 class MetricsCollector:
     """Collects and aggregates performance metrics for LLM providers."""
     
-    def __init__(self, window_size: int = 3600):
+    def __init__(self, window_size: int = 3600, latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
         """Initialize metrics collector.
         
         Args:
             window_size: Time window in seconds for rolling metrics
+            latency_buckets: Upper bounds in seconds of the latency histogram buckets
         """
         self.window_size = window_size
+        self.latency_buckets = tuple(latency_buckets)
         self.provider_stats: Dict[str, ProviderStats] = {}
+        self.series: Dict[Tuple[str, str], SeriesMetrics] = {}
+        # (unix time, provider, method, duration, success, tokens, model, error), oldest first
         self.rolling_metrics: deque = deque()
+        self._next_clean = 0.0
         self._cost_per_token = {
             'openai': {'gpt-4.1': 0.00003, 'gpt-3.5-turbo': 0.000002},
             'anthropic': {'claude-3-sonnet': 0.000015, 'claude-3-haiku': 0.000001},
@@ -290,49 +437,51 @@ class MetricsCollector:
             model: Model name
             error: Error message if failed
         """
-        # Initialize provider stats if needed
-        if provider not in self.provider_stats:
-            self.provider_stats[provider] = ProviderStats(provider=provider)
+        now = time.time()
         
-        stats = self.provider_stats[provider]
+        # Initialize provider stats if needed
+        stats = self.provider_stats.get(provider)
+        if stats is None:
+            stats = self.provider_stats[provider] = ProviderStats(provider=provider)
+        # One series per label set: a missing model ('' or None) is recorded as "unknown"
+        key = (provider, str(model) if model else "unknown")
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = SeriesMetrics(latency=LatencyHistogram(self.latency_buckets))
         
         # Update counters
         stats.total_requests += 1
+        series.requests += 1
         if success:
             stats.successful_requests += 1
         else:
             stats.failed_requests += 1
+            series.errors += 1
             if error:
                 stats.errors[error] += 1
         
         # Update timing
         stats.total_duration += duration
         stats.average_duration = stats.total_duration / stats.total_requests
-        stats.last_request = datetime.now()
+        stats.last_request = datetime.fromtimestamp(now)
+        series.latency.observe(duration)
         
         # Update tokens and cost
         stats.total_tokens += tokens
+        series.tokens += tokens
         if model and tokens > 0:
             cost = self._calculate_cost(provider, model, tokens)
             stats.total_cost += cost
+            series.cost += cost
         
         # Update error rate
         stats.error_rate = stats.failed_requests / stats.total_requests
         
-        # Add to rolling metrics
-        self.rolling_metrics.append({
-            'timestamp': datetime.now(),
-            'provider': provider,
-            'method': method,
-            'duration': duration,
-            'success': success,
-            'tokens': tokens,
-            'model': model,
-            'error': error
-        })
-        
-        # Clean old metrics
-        self._clean_old_metrics()
+        # Add to rolling metrics; expired entries are dropped at most once per second
+        self.rolling_metrics.append((now, provider, method, duration, success, tokens, model, error))
+        if now >= self._next_clean:
+            self._clean_old_metrics(now)
+            self._next_clean = now + 1.0
     
     def _calculate_cost(self, provider: str, model: str, tokens: int) -> float:
         """Calculate cost for token usage.
@@ -349,10 +498,10 @@ class MetricsCollector:
             return tokens * self._cost_per_token[provider][model]
         return 0.0
     
-    def _clean_old_metrics(self) -> None:
+    def _clean_old_metrics(self, now: Optional[float] = None) -> None:
         """Remove metrics older than window_size."""
-        cutoff = datetime.now() - timedelta(seconds=self.window_size)
-        while self.rolling_metrics and self.rolling_metrics[0]['timestamp'] < cutoff:
+        cutoff = (now if now is not None else time.time()) - self.window_size
+        while self.rolling_metrics and self.rolling_metrics[0][0] < cutoff:
             self.rolling_metrics.popleft()
     
     def get_provider_stats(self, provider: str) -> Optional[ProviderStats]:
@@ -387,7 +536,19 @@ class MetricsCollector:
         """
         self._clean_old_metrics()
         
-        metrics = list(self.rolling_metrics)
+        metrics = [
+            {
+                'timestamp': datetime.fromtimestamp(timestamp),
+                'provider': entry_provider,
+                'method': entry_method,
+                'duration': duration,
+                'success': success,
+                'tokens': tokens,
+                'model': model,
+                'error': error
+            }
+            for timestamp, entry_provider, entry_method, duration, success, tokens, model, error in self.rolling_metrics
+        ]
         
         if provider:
             metrics = [m for m in metrics if m['provider'] == provider]
@@ -418,7 +579,8 @@ class MetricsCollector:
             'total_cost': total_cost,
             'active_providers': len(self.provider_stats),
             'window_size_seconds': self.window_size,
-            'metrics_count': len(self.rolling_metrics)
+            'metrics_count': len(self.rolling_metrics),
+            'latency_percentiles': self.get_latency_percentiles()
         }
     
     def reset_stats(self, provider: Optional[str] = None) -> None:
@@ -431,10 +593,118 @@ class MetricsCollector:
             if provider in self.provider_stats:
                 del self.provider_stats[provider]
                 logger.info(f"Reset statistics for provider: {provider}")
+            for key in [key for key in self.series if key[0] == provider]:
+                del self.series[key]
         else:
             self.provider_stats.clear()
+            self.series.clear()
             self.rolling_metrics.clear()
             logger.info("Reset all statistics")
+    
+    def get_latency_histogram(self, provider: Optional[str] = None, model: Optional[str] = None) -> LatencyHistogram:
+        """Get the latency histogram merged over the matching provider/model series.
+        
+        Args:
+            provider: Filter by provider (optional)
+            model: Filter by model (optional)
+            
+        Returns:
+            LatencyHistogram: Merged histogram (empty if nothing matches)
+        """
+        merged = LatencyHistogram(self.latency_buckets)
+        for (series_provider, series_model), series in list(self.series.items()):
+            if provider is not None and series_provider != provider:
+                continue
+            if model is not None and series_model != model:
+                continue
+            merged.merge(series.latency)
+        return merged
+    
+    def get_latency_percentiles(self, provider: Optional[str] = None, model: Optional[str] = None,
+                                quantiles: Sequence[float] = (0.5, 0.9, 0.99)) -> Dict[str, float]:
+        """Get estimated latency percentiles in seconds.
+        
+        Args:
+            provider: Filter by provider (optional)
+            model: Filter by model (optional)
+            quantiles: Quantiles to estimate, between 0 and 1
+            
+        Returns:
+            Dict[str, float]: e.g. ``{'p50': 0.8, 'p90': 2.1, 'p99': 6.4}``
+        """
+        histogram = self.get_latency_histogram(provider, model)
+        return {f"p{q * 100:g}": histogram.quantile(q) for q in quantiles}
+    
+    def render_openmetrics(self, prefix: str = "spoon_llm") -> str:
+        """Render all series in the OpenMetrics text exposition format.
+        
+        Exposes per provider/model: a request latency histogram and counters
+        for requests, errors, tokens and estimated cost.
+        
+        Args:
+            prefix: Metric name prefix
+            
+        Returns:
+            str: Exposition text, terminated by ``# EOF``
+        """
+        series = sorted(self.series.items())
+        lines = [
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+            f"# UNIT {prefix}_request_duration_seconds seconds",
+            f"# HELP {prefix}_request_duration_seconds LLM request latency.",
+        ]
+        for (provider, model), metrics in series:
+            labels = _openmetrics_labels(provider, model)
+            for le, count in metrics.latency.cumulative():
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f"{prefix}_request_duration_seconds_count{{{labels}}} {metrics.latency.count}")
+            lines.append(f"{prefix}_request_duration_seconds_sum{{{labels}}} {metrics.latency.sum!r}")
+        
+        counters = (
+            ("requests", "LLM requests.", lambda m: m.requests),
+            ("errors", "Failed LLM requests.", lambda m: m.errors),
+            ("tokens", "Tokens used by LLM requests.", lambda m: m.tokens),
+            ("cost_usd", "Estimated LLM cost in USD.", lambda m: m.cost),
+        )
+        for name, help_text, value in counters:
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            if name == "cost_usd":
+                lines.append(f"# UNIT {prefix}_{name} usd")
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            for (provider, model), metrics in series:
+                lines.append(f"{prefix}_{name}_total{{{_openmetrics_labels(provider, model)}}} {value(metrics)!r}")
+        
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _openmetrics_labels(provider: str, model: str) -> str:
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'provider="{escape(provider)}",model="{escape(model)}"'
+
+
+def create_metrics_router(collector: Optional[MetricsCollector] = None, path: str = "/metrics"):
+    """Build a FastAPI router serving the collector's metrics in OpenMetrics format.
+    
+    Args:
+        collector: Metrics collector to expose (default: the global collector)
+        path: Route path of the endpoint
+        
+    Returns:
+        APIRouter: Router ready to mount with ``app.include_router``
+    """
+    from fastapi import APIRouter
+    from fastapi.responses import Response
+    
+    router = APIRouter(tags=["metrics"])
+    
+    @router.get(path, include_in_schema=False)
+    async def metrics() -> Response:
+        source = collector or get_metrics_collector()
+        return Response(content=source.render_openmetrics(), media_type=OPENMETRICS_CONTENT_TYPE)
+    
+    return router
 
 
 # Global instances for convenience
@@ -0,0 +1,212 @@
+"""
+Prompt Cache Planner - Place Anthropic cache_control breakpoints on stable prefixes.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+# Anthropic allows at most four cache_control breakpoints per request
+MAX_CACHE_BREAKPOINTS = 4
+
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+class PromptCachePlanner:
+    """Chooses where to put cache_control breakpoints in an Anthropic request.
+
+    The request prefix is hashed element by element in cache order: each
+    tool, then the system prompt, then each message. Prefixes that carried
+    a breakpoint are remembered (within the cache TTL), which forms the
+    prefix-stability history. Each request then gets up to
+    ``max_breakpoints`` breakpoints, in priority order:
+
+    1. the last message, which writes the conversation so the next turn
+       of an agent loop can read it;
+    2. the longest prefix that carried a breakpoint in an earlier request,
+       which is a cache read even when the tail has changed;
+    3. the end of the system prompt;
+    4. the end of the tools.
+
+    Breakpoints whose prefix is shorter than ``min_prefix_tokens`` (which
+    the API would not cache) are skipped. If tail writes are rarely read
+    back, they are only written every ``probe_every`` requests.
+    """
+
+    def __init__(
+        self,
+        max_breakpoints: int = MAX_CACHE_BREAKPOINTS,
+        min_prefix_tokens: int = 1024,
+        ttl: float = 300.0,
+        history_size: int = 256,
+        chars_per_token: int = 4,
+        probe_every: int = 8,
+    ):
+        self.max_breakpoints = max_breakpoints
+        self.min_prefix_tokens = min_prefix_tokens
+        self.ttl = ttl
+        self.history_size = history_size
+        self.chars_per_token = chars_per_token
+        self.probe_every = probe_every
+        # prefix digest -> (last written/read time, was a tail breakpoint); least recent first
+        self._history: "OrderedDict[bytes, Tuple[float, bool]]" = OrderedDict()
+
+        # Accounting counters
+        self.requests = 0
+        self.breakpoints = 0
+        self.stable_prefix_hits = 0
+        self.stable_prefix_tokens = 0
+        self.tail_writes = 0
+        self.tail_reuses = 0
+
+    def plan(self, params: Dict[str, Any]) -> List[str]:
+        """Add cache_control to ``params`` (system/tools/messages) in place.
+
+        Returns the labels of the elements marked, e.g. ``["tool:7", "system", "message:3"]``.
+        """
+        tools = params.get("tools") or []
+        system = params.get("system")
+        messages = params.get("messages") or []
+
+        # Elements in cache order: (label, cumulative token estimate, digest)
+        elements: List[Tuple[str, int, bytes]] = []
+        digest = b""
+        chars = 0
+        for i, tool in enumerate(tools):
+            digest, chars = self._extend(digest, chars, tool)
+            elements.append((f"tool:{i}", chars // self.chars_per_token, digest))
+        if system:
+            digest, chars = self._extend(digest, chars, system)
+            elements.append(("system", chars // self.chars_per_token, digest))
+        for i, message in enumerate(messages):
+            digest, chars = self._extend(digest, chars, message)
+            elements.append((f"message:{i}", chars // self.chars_per_token, digest))
+        if not elements:
+            return []
+
+        self.requests += 1
+        now = time.monotonic()
+        budget = self.max_breakpoints - self._count_existing(params)
+        candidates: List[int] = []
+
+        # 1. tail of the conversation
+        last = len(elements) - 1
+        tail_is_message = bool(messages)
+        if tail_is_message and self._write_tail():
+            candidates.append(last)
+
+        # 2. longest prefix cached by an earlier request
+        stable = None
+        for index in range(last, -1, -1):
+            seen = self._history.get(elements[index][2])
+            if seen is not None and now - seen[0] <= self.ttl:
+                stable = index
+                break
+        if stable is not None:
+            self.stable_prefix_hits += 1
+            self.stable_prefix_tokens += elements[stable][1]
+            if self._history[elements[stable][2]][1]:
+                self.tail_reuses += 1
+            candidates.append(stable)
+
+        # 3./4. end of system prompt and of tools
+        if system:
+            candidates.append(len(tools))
+        if tools:
+            candidates.append(len(tools) - 1)
+
+        placed: List[int] = []
+        for index in candidates:
+            if len(placed) >= budget:
+                break
+            if index in placed or elements[index][1] < self.min_prefix_tokens:
+                continue
+            if self._mark(params, elements[index][0]):
+                placed.append(index)
+
+        for index in placed:
+            self._remember(elements[index][2], now, tail=tail_is_message and index == last)
+        if tail_is_message and last in placed:
+            self.tail_writes += 1
+        self.breakpoints += len(placed)
+        return [elements[index][0] for index in sorted(placed)]
+
+    def _extend(self, digest: bytes, chars: int, element: Any) -> Tuple[bytes, int]:
+        encoded = json.dumps(element, sort_keys=True, default=str, ensure_ascii=False).encode()
+        return hashlib.blake2b(digest + encoded, digest_size=16).digest(), chars + len(encoded)
+
+    def _write_tail(self) -> bool:
+        # Tail writes cost extra; keep making them only while they get read back
+        if self.tail_writes < 4 or self.tail_reuses * 4 >= self.tail_writes:
+            return True
+        return self.requests % self.probe_every == 0
+
+    def _remember(self, digest: bytes, now: float, tail: bool) -> None:
+        previous = self._history.pop(digest, None)
+        self._history[digest] = (now, tail or bool(previous and previous[1]))
+        while len(self._history) > self.history_size:
+            self._history.popitem(last=False)
+
+    @staticmethod
+    def _count_existing(params: Dict[str, Any]) -> int:
+        """Breakpoints the caller already placed, which count against the limit."""
+        count = 0
+        blocks: List[Any] = list(params.get("tools") or [])
+        if isinstance(params.get("system"), list):
+            blocks.extend(params["system"])
+        for message in params.get("messages") or []:
+            if isinstance(message.get("content"), list):
+                blocks.extend(message["content"])
+        for block in blocks:
+            if isinstance(block, dict) and "cache_control" in block:
+                count += 1
+        return count
+
+    @staticmethod
+    def _mark(params: Dict[str, Any], label: str) -> bool:
+        """Put cache_control on the last block of the labelled element."""
+        kind, _, index = label.partition(":")
+        if kind == "tool":
+            # Copy so tool definitions passed in by the caller are not modified
+            tools = list(params["tools"])
+            tools[int(index)] = {**tools[int(index)], "cache_control": dict(_EPHEMERAL)}
+            params["tools"] = tools
+            return True
+        if kind == "system":
+            system = params["system"]
+            if isinstance(system, str):
+                params["system"] = [{"type": "text", "text": system, "cache_control": dict(_EPHEMERAL)}]
+                return True
+            return _mark_last_block(system)
+        message = params["messages"][int(index)]
+        content = message.get("content")
+        if isinstance(content, str):
+            if not content:
+                return False
+            message["content"] = [{"type": "text", "text": content, "cache_control": dict(_EPHEMERAL)}]
+            return True
+        return isinstance(content, list) and _mark_last_block(content)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "planned_requests": self.requests,
+            "breakpoints_placed": self.breakpoints,
+            "stable_prefix_hits": self.stable_prefix_hits,
+            "stable_prefix_hit_rate": self.stable_prefix_hits / self.requests if self.requests else 0.0,
+            "estimated_stable_prefix_tokens": self.stable_prefix_tokens,
+            "tail_writes": self.tail_writes,
+            "tail_reuses": self.tail_reuses,
+        }
+
+
+def _mark_last_block(blocks: List[Any]) -> bool:
+    if not blocks or not isinstance(blocks[-1], dict):
+        return False
+    block = blocks[-1]
+    # Empty text and thinking blocks cannot carry cache_control
+    if block.get("type") in ("thinking", "redacted_thinking") or (block.get("type") == "text" and not block.get("text")):
+        return False
+    blocks[-1] = {**block, "cache_control": dict(_EPHEMERAL)}
+    return True
@@ -19,6 +19,7 @@ from spoon_ai.callbacks.manager import CallbackManager
 from ..interface import LLMProviderInterface, LLMResponse, ProviderMetadata, ProviderCapability
 from ..errors import ProviderError, AuthenticationError, RateLimitError, ModelNotFoundError, NetworkError
 from ..registry import register_provider
+from ..prompt_cache import PromptCachePlanner
 
 logger = getLogger(__name__)
 
@@ -44,6 +45,7 @@ class AnthropicProvider(LLMProviderInterface):
             "cache_read_input_tokens": 0,
             "total_input_tokens": 0
         }
+        self.cache_planner = PromptCachePlanner()
         
     async def initialize(self, config: Dict[str, Any]) -> None:
         """Initialize the Anthropic provider with configuration."""
@@ -53,6 +55,11 @@ class AnthropicProvider(LLMProviderInterface):
             self.max_tokens = config.get('max_tokens', 4096)
             self.temperature = config.get('temperature', 0.3)
             self.enable_prompt_cache = config.get('enable_prompt_cache', True)
+            # Haiku models only cache prefixes of at least 2048 tokens
+            default_min_tokens = 2048 if 'haiku' in self.model else 1024
+            self.cache_planner = PromptCachePlanner(
+                min_prefix_tokens=config.get('prompt_cache_min_tokens', default_min_tokens)
+            )
             
             api_key = config.get('api_key')
             if not api_key:
@@ -217,24 +224,8 @@ class AnthropicProvider(LLMProviderInterface):
 
         for message in messages:
             if message.role == "system":
-                # Handle system messages separately
-                # Get text content from message
-                msg_content = message.text_content if message.is_multimodal else message.content
-
-                # Only apply cache_control to system message if it's large enough
-                if (self.enable_prompt_cache and
-                    msg_content and len(msg_content) >= 4000):
-                    system_content = [
-                        {
-                            "type": "text",
-                            "text": msg_content,
-                            "cache_control": {"type": "ephemeral"}
-                        }
-                    ]
-                    logger.info(f"Applied cache_control to system message ({len(msg_content)} chars)")
-                else:
-                    # Use string format for simple system messages
-                    system_content = msg_content
+                # Handle system messages separately; cache_control is placed by _apply_cache_plan
+                system_content = message.text_content if message.is_multimodal else message.content
             elif message.role == "tool":
                 # Convert tool messages to user messages with tool_result
                 tool_content = message.text_content if message.is_multimodal else message.content
@@ -292,38 +283,22 @@ class AnthropicProvider(LLMProviderInterface):
     
     def _convert_tools(self, tools: List[Dict]) -> List[Dict]:
         """Convert tools to Anthropic format."""
-        anthropic_tools = []
-        cache_control_count = 0
-        max_cache_control_blocks = 3  # Leave room for system message cache_control
-        
-        for i, tool in enumerate(tools):
-            anthropic_tool = {
+        return [
+            {
                 "name": tool["function"]["name"],
                 "description": tool["function"]["description"],
                 "input_schema": tool["function"]["parameters"]
             }
-            
-            # Only add cache control to the first few tools to stay within Anthropic's limit
-            # Prioritize tools with larger schemas or descriptions
-            tool_size = len(str(tool["function"]["parameters"])) + len(tool["function"]["description"])
-            should_cache = (
-                self.enable_prompt_cache and 
-                cache_control_count < max_cache_control_blocks and
-                len(tools) > 4 and  # Only use cache_control when there are many tools
-                (tool_size > 500 or i < 2)  # Cache large tools or first 2 tools
-            )
-            
-            if should_cache:
-                anthropic_tool["cache_control"] = {"type": "ephemeral"}
-                cache_control_count += 1
-                logger.debug(f"Applied cache_control to tool: {tool['function']['name']} (size: {tool_size})")
-            
-            anthropic_tools.append(anthropic_tool)
-        
-        if cache_control_count > 0:
-            logger.info(f"Applied cache_control to {cache_control_count}/{len(tools)} tools")
-        
-        return anthropic_tools
+            for tool in tools
+        ]
+
+    def _apply_cache_plan(self, request_params: Dict[str, Any]) -> None:
+        """Place cache_control breakpoints on the stable prefix of the request (in place)."""
+        if not self.enable_prompt_cache:
+            return
+        breakpoints = self.cache_planner.plan(request_params)
+        if breakpoints:
+            logger.debug(f"Applied cache_control to {', '.join(breakpoints)}")
     
     def _log_cache_metrics(self, usage_data) -> None:
         """Log cache metrics from Anthropic API response usage data."""
@@ -337,9 +312,15 @@ class AnthropicProvider(LLMProviderInterface):
             if hasattr(usage_data, 'input_tokens') and usage_data.input_tokens:
                 self.cache_metrics["total_input_tokens"] += usage_data.input_tokens
     
-    def get_cache_metrics(self) -> Dict[str, int]:
-        """Get current cache performance metrics."""
-        return self.cache_metrics.copy()
+    def get_cache_metrics(self) -> Dict[str, Any]:
+        """Get current cache performance metrics, including breakpoint planner statistics."""
+        metrics: Dict[str, Any] = self.cache_metrics.copy()
+        # input_tokens excludes cached tokens, so the prompt total is the sum of all three
+        prompt_tokens = (metrics["cache_read_input_tokens"] + metrics["cache_creation_input_tokens"]
+                         + metrics["total_input_tokens"])
+        metrics["cache_hit_ratio"] = metrics["cache_read_input_tokens"] / prompt_tokens if prompt_tokens else 0.0
+        metrics.update(self.cache_planner.get_stats())
+        return metrics
     
     async def chat(self, messages: List[Message], **kwargs) -> LLMResponse:
         """Send chat request to Anthropic."""
@@ -372,6 +353,7 @@ class AnthropicProvider(LLMProviderInterface):
             # Only add system parameter if we have system content
             if system_content is not None:
                 request_params['system'] = system_content
+            self._apply_cache_plan(request_params)
             
             response = await self.client.messages.create(**request_params)
             
@@ -427,6 +409,7 @@ class AnthropicProvider(LLMProviderInterface):
             # Only add system parameter if we have system content
             if system_content is not None:
                 request_params['system'] = system_content
+            self._apply_cache_plan(request_params)
             
             # Process streaming response
             full_content = ""
@@ -562,6 +545,7 @@ class AnthropicProvider(LLMProviderInterface):
             # Only add system parameter if we have system content
             if system_content is not None:
                 request_params['system'] = system_content
+            self._apply_cache_plan(request_params)
             
             async with self.client.messages.stream(**request_params) as stream:
                 async for chunk in stream:
@@ -7,8 +7,10 @@ import json
 import os
 import time
 import uuid
-from typing import List, Dict, Any, Optional, AsyncIterator
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 from logging import getLogger
+from urllib.parse import urlparse
 from uuid import uuid4
 import mimetypes
 
@@ -40,6 +42,9 @@ from ..registry import register_provider
 
 logger = getLogger(__name__)
 
+# Host of the public Gemini API; the SDK builds its own URL for it
+_GEMINI_API_HOST = "generativelanguage.googleapis.com"
+
 
 def _normalize_mime_type(mime_type: str) -> str:
     """Normalize MIME type for Gemini API compatibility.
@@ -60,6 +65,15 @@ def _normalize_mime_type(mime_type: str) -> str:
     return mime_type
 
 
+def _image_mime_type(url: str, content_type: Optional[str]) -> str:
+    """MIME type of a downloaded image from its Content-Type header or URL."""
+    if not content_type:
+        mime_type, _ = mimetypes.guess_type(url)
+        content_type = mime_type or "image/jpeg"
+    # Extract MIME type (remove charset if present)
+    return _normalize_mime_type(content_type.split(";")[0].strip())
+
+
 @register_provider("gemini", [
     ProviderCapability.CHAT,
     ProviderCapability.COMPLETION,
@@ -78,6 +92,15 @@ class GeminiProvider(LLMProviderInterface):
         self.max_tokens: int = 4096
         self.temperature: float = 0.3
         self.api_key: str = ""
+        self.base_url: Optional[str] = None
+        # The SDK's async transport and the image HTTP client are bound to the
+        # event loop they were created on; both are rebuilt if the loop changes.
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http_client: Optional["httpx.AsyncClient"] = None
+        # Downloaded image URLs (LRU, bounded by total bytes)
+        self._image_cache: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+        self._image_cache_size = 0
+        self.image_cache_max_bytes: int = 32 * 1024 * 1024
 
     @staticmethod
     def _safe_get_response_text(response: Any) -> str:
@@ -254,10 +277,20 @@ class GeminiProvider(LLMProviderInterface):
             if not api_key:
                 raise AuthenticationError("gemini", context={"config": config})
 
-            # Keep api_key only; create/close clients per request to avoid
-            # shutdown warnings from google-genai about pending aclose tasks.
+            # The client is created on first use and reused; cleanup() closes it.
             self.api_key = str(api_key)
             self.client = None
+            self._client_loop = None
+            base_url = config.get('base_url')
+            # The default config points at the public API, which the SDK addresses itself
+            if base_url and urlparse(base_url).hostname != _GEMINI_API_HOST:
+                self.base_url = base_url
+            else:
+                self.base_url = None
+            self.image_cache_max_bytes = int(config.get('image_cache_bytes', self.image_cache_max_bytes))
+            # Building the client loads TLS/credential state (~hundreds of ms), so do it off the loop
+            self.client = await asyncio.to_thread(self._new_client)
+            self._client_loop = asyncio.get_running_loop()
 
             logger.info(f"Gemini provider initialized with model: {self.model}")
 
@@ -266,11 +299,107 @@ class GeminiProvider(LLMProviderInterface):
                 raise
             raise ProviderError("gemini", f"Failed to initialize: {str(e)}", original_error=e)
 
-    def _convert_content_block_to_part(self, block: ContentBlock) -> types.Part:
+    def _new_client(self) -> genai.Client:
+        client_kwargs: Dict[str, Any] = {"api_key": self.api_key}
+        if self.base_url:
+            client_kwargs["http_options"] = types.HttpOptions(base_url=self.base_url)
+        return genai.Client(**client_kwargs)
+
+    def _get_client(self) -> genai.Client:
+        """Return the shared client, creating it for the running event loop if needed."""
+        loop = asyncio.get_running_loop()
+        if self.client is None or self._client_loop is not loop:
+            stale = self.client
+            self.client = self._new_client()
+            self._client_loop = loop
+            # A client from another (usually closed) loop can only release its sync side
+            if stale is not None:
+                try:
+                    stale.close()
+                except Exception:
+                    pass
+            self._http_client = None
+        return self.client
+
+    def _cache_image(self, url: str, image: Tuple[bytes, str]) -> None:
+        size = len(image[0])
+        if size > self.image_cache_max_bytes:
+            return
+        previous = self._image_cache.pop(url, None)
+        if previous is not None:
+            self._image_cache_size -= len(previous[0])
+        self._image_cache[url] = image
+        self._image_cache_size += size
+        while self._image_cache_size > self.image_cache_max_bytes:
+            _, evicted = self._image_cache.popitem(last=False)
+            self._image_cache_size -= len(evicted[0])
+
+    async def _download_image(self, url: str) -> Tuple[bytes, str]:
+        """Download an image URL without blocking the event loop, via the image cache."""
+        cached = self._image_cache.get(url)
+        if cached is not None:
+            self._image_cache.move_to_end(url)
+            return cached
+
+        if not HTTPX_AVAILABLE and not REQUESTS_AVAILABLE:
+            logger.error(
+                "httpx or requests is required to download external image URLs. "
+                "Please install one with: pip install httpx (or pip install requests)"
+            )
+            raise ValueError(
+                f"Cannot process external image URL: {url}. "
+                "httpx or requests is required but not installed."
+            )
+
+        try:
+            if HTTPX_AVAILABLE:
+                self._get_client()  # resets the HTTP client if the loop changed
+                if self._http_client is None or self._http_client.is_closed:
+                    self._http_client = httpx.AsyncClient(timeout=10.0)
+                response = await self._http_client.get(url)
+            else:
+                import requests
+                response = await asyncio.to_thread(requests.get, url, timeout=10.0)
+            response.raise_for_status()
+            image = (response.content, _image_mime_type(url, response.headers.get("Content-Type")))
+        except Exception as e:
+            logger.error(f"Failed to download image from URL {url}: {e}")
+            raise ValueError(f"Cannot process image URL: {url}. Download failed: {e}")
+
+        logger.debug(f"Downloaded image from URL: {url[:50]}... (size: {len(image[0])} bytes, type: {image[1]})")
+        self._cache_image(url, image)
+        return image
+
+    async def _prefetch_images(self, messages: List[Message]) -> Dict[str, Tuple[bytes, str]]:
+        """Download the remote image URLs in the user messages concurrently."""
+        urls = []
+        for message in messages:
+            if message.role != "user" or not isinstance(message.content, list):
+                continue
+            for block in message.content:
+                if isinstance(block, ImageUrlContent) and not block.image_url.url.startswith("data:"):
+                    if block.image_url.url not in urls:
+                        urls.append(block.image_url.url)
+        if not urls:
+            return {}
+        images = await asyncio.gather(*(self._download_image(url) for url in urls))
+        return dict(zip(urls, images))
+
+    @staticmethod
+    def _last_user_message(messages: List[Message]) -> List[Message]:
+        for message in reversed(messages):
+            if message.role == "user":
+                return [message]
+        return []
+
+    def _convert_content_block_to_part(
+        self, block: ContentBlock, images: Optional[Dict[str, Tuple[bytes, str]]] = None
+    ) -> types.Part:
         """Convert a content block to a Gemini Part.
 
         Args:
             block: A content block (TextContent, ImageContent, ImageUrlContent, etc.)
+            images: Image URLs already downloaded by ``_prefetch_images``
 
         Returns:
             Gemini types.Part object
@@ -319,7 +448,12 @@ class GeminiProvider(LLMProviderInterface):
                     data=image_data,
                     mime_type=normalized_mime_type
                 )
-            # For regular URLs, download the image and convert to bytes
+            # Regular URLs are normally downloaded ahead of time by _prefetch_images
+            if images and url in images:
+                image_bytes, mime_type = images[url]
+                return types.Part.from_bytes(data=image_bytes, mime_type=mime_type)
+
+            # Synchronous callers: download the image and convert to bytes
             if not HTTPX_AVAILABLE and not REQUESTS_AVAILABLE:
                 logger.error(
                     "httpx or requests is required to download external image URLs. "
@@ -348,14 +482,7 @@ class GeminiProvider(LLMProviderInterface):
                     content_type = response.headers.get("Content-Type")
                 
                 # Detect MIME type from URL or Content-Type header
-                if not content_type:
-                    mime_type, _ = mimetypes.guess_type(url)
-                    content_type = mime_type or "image/jpeg"
-                
-                # Extract MIME type (remove charset if present)
-                mime_type = content_type.split(";")[0].strip()
-                # Normalize MIME type (e.g., image/jpg -> image/jpeg)
-                normalized_mime_type = _normalize_mime_type(mime_type)
+                normalized_mime_type = _image_mime_type(url, content_type)
                 
                 logger.debug(f"Downloaded image from URL: {url[:50]}... (size: {len(image_bytes)} bytes, type: {normalized_mime_type})")
                 
@@ -442,11 +569,14 @@ class GeminiProvider(LLMProviderInterface):
             logger.warning(f"Unknown content block type: {type(block)}")
             return types.Part.from_text(text=str(block))
 
-    def _convert_message_content_to_parts(self, content) -> List[types.Part]:
+    def _convert_message_content_to_parts(
+        self, content, images: Optional[Dict[str, Tuple[bytes, str]]] = None
+    ) -> List[types.Part]:
         """Convert message content to list of Gemini Parts.
 
         Args:
             content: Message content (str or List[ContentBlock])
+            images: Image URLs already downloaded by ``_prefetch_images``
 
         Returns:
             List of Gemini types.Part objects
@@ -456,11 +586,13 @@ class GeminiProvider(LLMProviderInterface):
         if isinstance(content, str):
             return [types.Part.from_text(text=content)]
         elif isinstance(content, list):
-            return [self._convert_content_block_to_part(block) for block in content]
+            return [self._convert_content_block_to_part(block, images) for block in content]
         else:
             return [types.Part.from_text(text=str(content))]
 
-    def _convert_messages(self, messages: List[Message]) -> tuple[Optional[str], Any]:
+    def _convert_messages(
+        self, messages: List[Message], images: Optional[Dict[str, Tuple[bytes, str]]] = None
+    ) -> tuple[Optional[str], Any]:
         """Convert Message objects to Gemini format for simple chat.
 
         Handles both text-only and multimodal messages seamlessly.
@@ -480,7 +612,7 @@ class GeminiProvider(LLMProviderInterface):
         # Get the last user message - can be text or multimodal
         for message in reversed(messages):
             if message.role == "user":
-                user_parts = self._convert_message_content_to_parts(message.content)
+                user_parts = self._convert_message_content_to_parts(message.content, images)
                 break
 
         # If no user message found, use a default
@@ -489,7 +621,9 @@ class GeminiProvider(LLMProviderInterface):
 
         return system_content, user_parts
 
-    def _convert_messages_for_tools(self, messages: List[Message]) -> tuple[Optional[str], List]:
+    def _convert_messages_for_tools(
+        self, messages: List[Message], images: Optional[Dict[str, Tuple[bytes, str]]] = None
+    ) -> tuple[Optional[str], List]:
         """Convert Message objects to Gemini format for tool calling.
 
         Handles both text-only and multimodal messages seamlessly.
@@ -506,7 +640,7 @@ class GeminiProvider(LLMProviderInterface):
                     system_content = msg_text or ""
             elif message.role == "user":
                 # Handle both text and multimodal user messages
-                parts = self._convert_message_content_to_parts(message.content)
+                parts = self._convert_message_content_to_parts(message.content, images)
                 gemini_messages.append(types.Content(
                     role="user",
                     parts=parts
@@ -613,7 +747,8 @@ class GeminiProvider(LLMProviderInterface):
         try:
             start_time = asyncio.get_event_loop().time()
 
-            system_content, user_parts = self._convert_messages(messages)
+            images = await self._prefetch_images(self._last_user_message(messages))
+            system_content, user_parts = self._convert_messages(messages, images)
 
             # Extract parameters
             model = self._resolve_model_name(kwargs.get('model'))
@@ -671,24 +806,12 @@ class GeminiProvider(LLMProviderInterface):
                 generate_config.response_schema = schema
                 generate_config.response_mime_type = 'application/json'
 
-            client = genai.Client(api_key=self.api_key)
-            try:
-                # Send request
-                response = client.models.generate_content(
-                    model=model,
-                    contents=contents,
-                    config=generate_config
-                )
-            finally:
-                # Close both sync + async clients to prevent pending-task warnings.
-                try:
-                    client.close()
-                except Exception:
-                    pass
-                try:
-                    await client.aio.aclose()
-                except Exception:
-                    pass
+            # Send request
+            response = await self._get_client().aio.models.generate_content(
+                model=model,
+                contents=contents,
+                config=generate_config
+            )
 
             duration = asyncio.get_event_loop().time() - start_time
             return self._convert_response(response, duration, model=model)
@@ -709,7 +832,8 @@ class GeminiProvider(LLMProviderInterface):
         run_id = uuid4()
 
         try:
-            system_content, user_parts = self._convert_messages(messages)
+            images = await self._prefetch_images(self._last_user_message(messages))
+            system_content, user_parts = self._convert_messages(messages, images)
 
             # Extract parameters
             model = self._resolve_model_name(kwargs.get('model'))
@@ -754,90 +878,79 @@ class GeminiProvider(LLMProviderInterface):
             # Filter out parameters that generate_content_stream doesn't accept
             filtered_kwargs = {k: v for k, v in kwargs.items()
                                if k not in ['model', 'max_tokens', 'temperature', 'callbacks', 'timeout']}
-            client = genai.Client(api_key=self.api_key)
-            try:
-                stream = client.models.generate_content_stream(
-                    model=model,
-                    contents=contents,
-                    config=generate_config,
-                    **filtered_kwargs
-                )
+            stream = await self._get_client().aio.models.generate_content_stream(
+                model=model,
+                contents=contents,
+                config=generate_config,
+                **filtered_kwargs
+            )
 
-                for part_response in stream:
+            async for part_response in stream:
+                chunk = ""
+                try:
+                    if (
+                        hasattr(part_response, "candidates")
+                        and part_response.candidates
+                        and getattr(part_response.candidates[0], "content", None) is not None
+                        and getattr(part_response.candidates[0].content, "parts", None)
+                    ):
+                        parts = part_response.candidates[0].content.parts
+                        chunk = "".join(
+                            [p.text for p in parts if getattr(p, "text", None)]
+                        )
+                except Exception:
                     chunk = ""
-                    try:
-                        if (
-                            hasattr(part_response, "candidates")
-                            and part_response.candidates
-                            and getattr(part_response.candidates[0], "content", None) is not None
-                            and getattr(part_response.candidates[0].content, "parts", None)
-                        ):
-                            parts = part_response.candidates[0].content.parts
-                            chunk = "".join(
-                                [p.text for p in parts if getattr(p, "text", None)]
-                            )
-                    except Exception:
-                        chunk = ""
-
-                    # Fallback: some SDK responses expose streaming text via `part_response.text`
-                    if not chunk:
-                        maybe_text = getattr(part_response, "text", None)
-                        if isinstance(maybe_text, str):
-                            chunk = maybe_text
 
-                    if not chunk:
-                        continue
+                # Fallback: some SDK responses expose streaming text via `part_response.text`
+                if not chunk:
+                    maybe_text = getattr(part_response, "text", None)
+                    if isinstance(maybe_text, str):
+                        chunk = maybe_text
 
-                    full_content += chunk
+                if not chunk:
+                    continue
 
-                    # Trigger on_llm_new_token callback
-                    await callback_manager.on_llm_new_token(
-                        token=chunk,
-                        run_id=run_id
-                    )
+                full_content += chunk
 
-                    # Extract finish reason
-                    if (
-                        hasattr(part_response, "candidates")
-                        and part_response.candidates
-                        and part_response.candidates[0].finish_reason
-                    ):
-                        finish_reason = str(part_response.candidates[0].finish_reason)
-
-                    # Extract usage stats if available
-                    if hasattr(part_response, 'usage_metadata') and part_response.usage_metadata:
-                        usage_data = {
-                            "prompt_tokens": part_response.usage_metadata.prompt_token_count,
-                            "completion_tokens": part_response.usage_metadata.candidates_token_count,
-                            "total_tokens": part_response.usage_metadata.total_token_count
-                        }
+                # Trigger on_llm_new_token callback
+                await callback_manager.on_llm_new_token(
+                    token=chunk,
+                    run_id=run_id
+                )
 
-                    # Build response chunk
-                    response_chunk = LLMResponseChunk(
-                        content=full_content,
-                        delta=chunk,
-                        provider="gemini",
-                        model=model,
-                        finish_reason=finish_reason,
-                        tool_calls=[],
-                        usage=usage_data,
-                        metadata={
-                            "chunk_index": chunk_index,
-                            "finish_reason": finish_reason
-                        },
-                        chunk_index=chunk_index
-                    )
-                    chunk_index += 1
-                    yield response_chunk
-            finally:
-                try:
-                    client.close()
-                except Exception:
-                    pass
-                try:
-                    await client.aio.aclose()
-                except Exception:
-                    pass
+                # Extract finish reason
+                if (
+                    hasattr(part_response, "candidates")
+                    and part_response.candidates
+                    and part_response.candidates[0].finish_reason
+                ):
+                    finish_reason = str(part_response.candidates[0].finish_reason)
+
+                # Extract usage stats if available
+                if hasattr(part_response, 'usage_metadata') and part_response.usage_metadata:
+                    usage_data = {
+                        "prompt_tokens": part_response.usage_metadata.prompt_token_count,
+                        "completion_tokens": part_response.usage_metadata.candidates_token_count,
+                        "total_tokens": part_response.usage_metadata.total_token_count
+                    }
+
+                # Build response chunk
+                response_chunk = LLMResponseChunk(
+                    content=full_content,
+                    delta=chunk,
+                    provider="gemini",
+                    model=model,
+                    finish_reason=finish_reason,
+                    tool_calls=[],
+                    usage=usage_data,
+                    metadata={
+                        "chunk_index": chunk_index,
+                        "finish_reason": finish_reason
+                    },
+                    chunk_index=chunk_index
+                )
+                chunk_index += 1
+                yield response_chunk
 
             # Trigger on_llm_end callback
             final_response = LLMResponse(
@@ -877,7 +990,8 @@ class GeminiProvider(LLMProviderInterface):
             start_time = asyncio.get_event_loop().time()
 
             # Convert messages to Gemini format
-            system_content, gemini_messages = self._convert_messages_for_tools(messages)
+            images = await self._prefetch_images(messages)
+            system_content, gemini_messages = self._convert_messages_for_tools(messages, images)
 
             # Convert tools to Gemini format
             gemini_tools = self._convert_tools_to_gemini(tools)
@@ -912,22 +1026,11 @@ class GeminiProvider(LLMProviderInterface):
                 generate_config.system_instruction = system_content
 
             # Send request
-            client = genai.Client(api_key=self.api_key)
-            try:
-                response = client.models.generate_content(
-                    model=model,
-                    contents=gemini_messages,
-                    config=generate_config
-                )
-            finally:
-                try:
-                    client.close()
-                except Exception:
-                    pass
-                try:
-                    await client.aio.aclose()
-                except Exception:
-                    pass
+            response = await self._get_client().aio.models.generate_content(
+                model=model,
+                contents=gemini_messages,
+                config=generate_config
+            )
 
             duration = asyncio.get_event_loop().time() - start_time
             return self._convert_tool_response(response, duration, model=model)
@@ -1143,7 +1246,7 @@ class GeminiProvider(LLMProviderInterface):
 
     async def health_check(self) -> bool:
         """Check if Gemini provider is healthy."""
-        if not self.client:
+        if not self.api_key:
             return False
 
         try:
@@ -1151,7 +1254,7 @@ class GeminiProvider(LLMProviderInterface):
             contents = [types.Part.from_text(text="test")]
             config = types.GenerateContentConfig(max_output_tokens=1)
 
-            response = self.client.models.generate_content(
+            response = await self._get_client().aio.models.generate_content(
                 model=self.model,
                 contents=contents,
                 config=config
@@ -1163,8 +1266,26 @@ class GeminiProvider(LLMProviderInterface):
 
     async def cleanup(self) -> None:
         """Cleanup Gemini provider resources."""
-        # No persistent client is kept; nothing to clean up.
-        self.client = None
+        client, self.client = self.client, None
+        if client is not None:
+            # Close both sync + async clients to prevent pending-task warnings.
+            try:
+                client.close()
+            except Exception:
+                pass
+            try:
+                await client.aio.aclose()
+            except Exception:
+                pass
+        if self._http_client is not None:
+            try:
+                await self._http_client.aclose()
+            except Exception:
+                pass
+            self._http_client = None
+        self._client_loop = None
+        self._image_cache.clear()
+        self._image_cache_size = 0
         self.api_key = ""
 
         logger.info("Gemini provider cleaned up")
@@ -18,6 +18,7 @@ from spoon_ai.schema import (
     TextContent, ImageContent, ImageUrlContent, DocumentContent, FileContent, ContentBlock
 )
 from ..interface import LLMProviderInterface, LLMResponse, ProviderMetadata, ProviderCapability
+from ..file_registry import UploadedFileRegistry
 from ..errors import ProviderError, AuthenticationError, RateLimitError, ModelNotFoundError, NetworkError
 from spoon_ai.callbacks.base import BaseCallbackHandler
 from spoon_ai.callbacks.manager import CallbackManager
@@ -41,6 +42,8 @@ class OpenAICompatibleProvider(LLMProviderInterface):
         self.provider_name: str = "openai_compatible"
         self.default_base_url: str = "https://api.openai.com/v1"
         self.default_model: str = "gpt-4.1"
+        # Large attachments uploaded to the Files API, shared across requests
+        self.file_registry = UploadedFileRegistry()
 
     def _uses_completion_token_param(self, model: str) -> bool:
         """Whether this model expects max_completion_tokens instead of max_tokens.
@@ -134,6 +137,11 @@ class OpenAICompatibleProvider(LLMProviderInterface):
                 # Fallback to simple timeout if httpx not available or timeout is already a Timeout object
                 timeout = timeout_config
 
+            self.file_registry = UploadedFileRegistry(
+                ttl=config.get('file_cache_ttl', 3600),
+                max_files=config.get('file_cache_max_files', 100),
+            )
+
             # Get provider-specific headers
             additional_headers = self.get_additional_headers(config)
 
@@ -206,19 +214,24 @@ class OpenAICompatibleProvider(LLMProviderInterface):
             logger.error(f"Failed to upload file to OpenAI: {e}")
             raise ProviderError(self.get_provider_name(), f"File upload failed: {str(e)}", original_error=e)
 
-    async def _cleanup_uploaded_files(self, file_ids: List[str]) -> None:
-        """Clean up uploaded files from OpenAI.
+    async def _cleanup_uploaded_files(self, file_refs: List[str]) -> None:
+        """Release a request's uploaded files and delete expired ones.
 
-        Call this after the chat completion to remove temporary files.
-        This method is request-scoped to ensure concurrent requests don't
-        interfere with each other's file cleanup.
+        Call this after the chat completion. Only the references held by
+        this request are released, so concurrent requests sharing a file
+        don't interfere; the file itself is deleted once it has been
+        unreferenced for the registry TTL (or on ``cleanup()``).
 
         Args:
-            file_ids: List of file IDs to delete (scoped to the current request)
+            file_refs: Registry keys returned by ``_prepare_large_files`` for this request
         """
-        if not self.client or not file_ids:
+        if not self.client:
             return
 
+        self.file_registry.release(file_refs)
+        await self._delete_files(self.file_registry.collect())
+
+    async def _delete_files(self, file_ids: List[str]) -> None:
         for file_id in file_ids:
             try:
                 await self.client.files.delete(file_id)
@@ -229,18 +242,20 @@ class OpenAICompatibleProvider(LLMProviderInterface):
     async def _prepare_large_files(self, messages: List[Dict[str, Any]]) -> tuple:
         """Process messages and upload any large files to OpenAI Files API.
 
-        Finds file blocks marked with _pending_upload and uploads them,
-        replacing the placeholder with the actual file_id.
+        Finds file blocks marked with _pending_upload and replaces the
+        placeholder with a file_id. Files are looked up by content hash in
+        ``self.file_registry``, so an attachment already uploaded by an
+        earlier turn or a concurrent request is reused instead of re-sent.
 
         Args:
             messages: Converted OpenAI-format messages
 
         Returns:
-            Tuple of (messages, uploaded_file_ids) where:
+            Tuple of (messages, file_refs) where:
             - messages: Messages with large files uploaded and file_ids filled in
-            - uploaded_file_ids: List of file IDs uploaded in this request (for cleanup)
+            - file_refs: Registry keys referenced by this request (for cleanup)
         """
-        uploaded_file_ids: List[str] = []
+        file_refs: List[str] = []
 
         for msg in messages:
             content = msg.get("content")
@@ -261,12 +276,13 @@ class OpenAICompatibleProvider(LLMProviderInterface):
                     filename = file_info.get("_filename", "document.pdf")
                     media_type = file_info.get("_media_type", "application/pdf")
 
-                    # Decode base64 to bytes
-                    file_bytes = base64.b64decode(b64_data)
+                    async def upload(b64_data=b64_data, filename=filename):
+                        file_bytes = base64.b64decode(b64_data)
+                        return await self._upload_file_to_openai(file_bytes, filename), len(file_bytes)
 
-                    # Upload to OpenAI
-                    file_id = await self._upload_file_to_openai(file_bytes, filename)
-                    uploaded_file_ids.append(file_id)
+                    key = self.file_registry.content_key(b64_data)
+                    file_id = await self.file_registry.acquire(key, upload)
+                    file_refs.append(key)
 
                     # Replace the placeholder with the actual file reference
                     content[i] = {
@@ -275,7 +291,7 @@ class OpenAICompatibleProvider(LLMProviderInterface):
                             "file_id": file_id
                         }
                     }
-                    logger.info(f"Large file '{filename}' uploaded successfully, file_id: {file_id}")
+                    logger.info(f"Large file '{filename}' attached as file_id: {file_id}")
 
                 except Exception as e:
                     logger.error(f"Failed to upload large file: {e}")
@@ -289,7 +305,7 @@ class OpenAICompatibleProvider(LLMProviderInterface):
                         }
                     }
 
-        return messages, uploaded_file_ids
+        return messages, file_refs
 
     def _convert_content_block(self, block: ContentBlock) -> Dict[str, Any]:
         """Convert a content block to OpenAI-compatible format.
@@ -597,14 +613,14 @@ class OpenAICompatibleProvider(LLMProviderInterface):
         if not self.client:
             raise ProviderError(self.get_provider_name(), "Provider not initialized")
 
-        uploaded_file_ids: List[str] = []
+        file_refs: List[str] = []
         try:
             start_time = asyncio.get_event_loop().time()
 
             openai_messages = self._convert_messages(messages)
 
-            # Handle large files by uploading to Files API (request-scoped)
-            openai_messages, uploaded_file_ids = await self._prepare_large_files(openai_messages)
+            # Handle large files via the Files API (uploads are shared by content hash)
+            openai_messages, file_refs = await self._prepare_large_files(openai_messages)
 
             # Extract parameters
             model = kwargs.get('model', self.model)
@@ -639,8 +655,8 @@ class OpenAICompatibleProvider(LLMProviderInterface):
         except Exception as e:
             await self._handle_error(e)
         finally:
-            # Clean up any uploaded files (request-scoped)
-            await self._cleanup_uploaded_files(uploaded_file_ids)
+            # Release this request's uploaded files (deferred deletion)
+            await self._cleanup_uploaded_files(file_refs)
 
     async def chat_stream(self,messages: List[Message],callbacks: Optional[List[BaseCallbackHandler]] = None,**kwargs) -> AsyncIterator[LLMResponseChunk]:
         """Send streaming chat request with full callback support.
@@ -653,13 +669,13 @@ class OpenAICompatibleProvider(LLMProviderInterface):
         # Create callback manager
         callback_manager = CallbackManager.from_callbacks(callbacks)
         run_id = uuid4()
-        uploaded_file_ids: List[str] = []
+        file_refs: List[str] = []
 
         try:
             openai_messages = self._convert_messages(messages)
 
-            # Handle large files by uploading to Files API (request-scoped)
-            openai_messages, uploaded_file_ids = await self._prepare_large_files(openai_messages)
+            # Handle large files via the Files API (uploads are shared by content hash)
+            openai_messages, file_refs = await self._prepare_large_files(openai_messages)
 
             # Extract parameters
             model = kwargs.get('model', self.model)
@@ -849,8 +865,8 @@ class OpenAICompatibleProvider(LLMProviderInterface):
             )
             await self._handle_error(e)
         finally:
-            # Clean up any uploaded files (request-scoped)
-            await self._cleanup_uploaded_files(uploaded_file_ids)
+            # Release this request's uploaded files (deferred deletion)
+            await self._cleanup_uploaded_files(file_refs)
 
     async def completion(self, prompt: str, **kwargs) -> LLMResponse:
         """Send completion request to the provider."""
@@ -863,14 +879,14 @@ class OpenAICompatibleProvider(LLMProviderInterface):
         if not self.client:
             raise ProviderError(self.get_provider_name(), "Provider not initialized")
 
-        uploaded_file_ids: List[str] = []
+        file_refs: List[str] = []
         try:
             start_time = asyncio.get_event_loop().time()
 
             openai_messages = self._convert_messages(messages)
 
-            # Handle large files by uploading to Files API (request-scoped)
-            openai_messages, uploaded_file_ids = await self._prepare_large_files(openai_messages)
+            # Handle large files via the Files API (uploads are shared by content hash)
+            openai_messages, file_refs = await self._prepare_large_files(openai_messages)
 
             # Extract parameters
             model = kwargs.get('model', self.model)
@@ -903,8 +919,8 @@ class OpenAICompatibleProvider(LLMProviderInterface):
         except Exception as e:
             await self._handle_error(e)
         finally:
-            # Clean up any uploaded files (request-scoped)
-            await self._cleanup_uploaded_files(uploaded_file_ids)
+            # Release this request's uploaded files (deferred deletion)
+            await self._cleanup_uploaded_files(file_refs)
 
     def get_metadata(self) -> ProviderMetadata:
         """Get provider metadata. Should be overridden by subclasses."""
@@ -942,6 +958,7 @@ class OpenAICompatibleProvider(LLMProviderInterface):
     async def cleanup(self) -> None:
         """Cleanup provider resources."""
         if self.client:
+            await self._delete_files(self.file_registry.drain())
             await self.client.close()
             self.client = None
         logger.info(f"{self.get_provider_name()} provider cleaned up")
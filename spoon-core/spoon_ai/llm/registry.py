@@ -18,6 +18,8 @@ class LLMProviderRegistry:
         self._providers: Dict[str, Type[LLMProviderInterface]] = {}
         self._instances: Dict[str, LLMProviderInterface] = {}
         self._configs: Dict[str, Dict[str, Any]] = {}
+        # Bumped whenever providers or instances change so callers can drop cached handles
+        self.generation = 0
 
     def register(self, name: str, provider_class: Type[LLMProviderInterface]) -> None:
         """Register a provider class.
@@ -39,6 +41,7 @@ class LLMProviderRegistry:
             logger.warning(f"Provider '{name}' already registered, overwriting")
 
         self._providers[name] = provider_class
+        self.generation += 1
         logger.info(f"Registered provider: {name}")
 
     def get_provider(self, name: str, config: Optional[Dict[str, Any]] = None) -> LLMProviderInterface:
@@ -87,6 +90,7 @@ class LLMProviderRegistry:
                 pass
 
             self._instances[name] = instance
+            self.generation += 1
             logger.info(f"Created provider instance: {name}")
             return instance
 
@@ -177,6 +181,7 @@ class LLMProviderRegistry:
 
         if name in self._configs:
             del self._configs[name]
+        self.generation += 1
 
     def clear(self) -> None:
         """Clear all registered providers and instances."""
@@ -186,6 +191,7 @@ class LLMProviderRegistry:
 
         self._providers.clear()
         self._configs.clear()
+        self.generation += 1
         logger.info("Cleared all providers from registry")
 
 
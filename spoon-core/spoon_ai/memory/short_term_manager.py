@@ -3,6 +3,7 @@
 import logging
 import math
 import uuid
+from collections import OrderedDict
 from datetime import datetime
 from enum import Enum
 from typing import List, Optional, Dict, Any, Tuple, Set
@@ -23,48 +24,89 @@ class TrimStrategy(str, Enum):
 
 
 class MessageTokenCounter:
-    """Approximate token counter aligned with LangChain semantics."""
+    """Approximate token counter aligned with LangChain semantics.
+
+    Counts are additive per message, so each message's count is memoized and
+    a list is counted by summing cached values. A cache entry is reused only
+    while the message still holds the same content and tool call objects.
+    """
+
+    def __init__(self, cache_size: int = 50000):
+        self.cache_size = cache_size
+        # id(message) -> (content, tool_calls, role, name, tool_call_id, tokens)
+        self._cache: "OrderedDict[int, Tuple[Any, Any, Any, Any, Any, int]]" = OrderedDict()
 
     async def count_tokens(
         self, messages: List[Message], model: Optional[str] = None
     ) -> int:
-        return self._approximate_count(messages)
+        return max(1, sum(self.count_message_tokens(message) for message in messages))
+
+    def count_message_tokens(self, message: Message) -> int:
+        """Return the (cached) token count contributed by a single message."""
+        key = id(message)
+        entry = self._cache.get(key)
+        # Entries hold references to content/tool_calls, so identity checks are safe
+        if (
+            entry is not None
+            and entry[0] is message.content
+            and entry[1] is message.tool_calls
+            and entry[2] == message.role
+            and entry[3] == message.name
+            and entry[4] == message.tool_call_id
+        ):
+            self._cache.move_to_end(key)
+            return entry[5]
+
+        tokens = self._message_tokens(message)
+        self._cache[key] = (
+            message.content,
+            message.tool_calls,
+            message.role,
+            message.name,
+            message.tool_call_id,
+            tokens,
+        )
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return tokens
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
 
     @staticmethod
     def _approximate_count(messages: List[Message]) -> int:
-        chars_per_token = 4.0
-        extra_tokens_per_message = 3.0
-        token_count = 0.0
+        total = sum(MessageTokenCounter._message_tokens(message) for message in messages)
+        return max(1, total)
 
-        for message in messages:
-            message_chars = 0
+    @staticmethod
+    def _message_tokens(message: Message) -> int:
+        chars_per_token = 4.0
+        extra_tokens_per_message = 3
 
-            content = message.content
-            if isinstance(content, str):
-                message_chars += len(content)
-            elif content is not None:
-                message_chars += len(repr(content))
+        message_chars = 0
 
-            if (
-                message.role == "assistant"
-                and message.tool_calls
-                and not isinstance(message.content, list)
-            ):
-                message_chars += len(repr(message.tool_calls))
+        content = message.content
+        if isinstance(content, str):
+            message_chars += len(content)
+        elif content is not None:
+            message_chars += len(repr(content))
 
-            if message.role == "tool" and message.tool_call_id:
-                message_chars += len(message.tool_call_id)
+        if (
+            message.role == "assistant"
+            and message.tool_calls
+            and not isinstance(message.content, list)
+        ):
+            message_chars += len(repr(message.tool_calls))
 
-            message_chars += len(message.role or "")
+        if message.role == "tool" and message.tool_call_id:
+            message_chars += len(message.tool_call_id)
 
-            if message.name:
-                message_chars += len(message.name)
+        message_chars += len(message.role or "")
 
-            token_count += math.ceil(message_chars / chars_per_token)
-            token_count += extra_tokens_per_message
+        if message.name:
+            message_chars += len(message.name)
 
-        total = math.ceil(token_count)
-        return max(1, total)
+        return math.ceil(message_chars / chars_per_token) + extra_tokens_per_message
 
 
 def _ensure_message_ids(messages: List[Message]) -> None:
@@ -88,47 +130,29 @@ class ShortTermMemoryManager:
         self.default_trim_strategy = default_trim_strategy
 
     @staticmethod
-    def _find_assistant_index_for_tool(messages: List[Message], tool_index: int) -> Optional[int]:
-        """Locate the assistant message that issued the tool call for the given tool message."""
-        if tool_index <= 0:
-            return None
+    def _build_tool_call_index(messages: List[Message]) -> Tuple[Dict[int, int], Dict[int, List[int]]]:
+        """Pair tool results with the assistant message that issued the call.
 
-        tool_message = messages[tool_index]
-        tool_call_id = getattr(tool_message, "tool_call_id", None)
-        if not tool_call_id:
-            return None
-
-        for idx in range(tool_index - 1, -1, -1):
-            assistant = messages[idx]
-            if assistant.role == "assistant" and assistant.tool_calls:
-                if any(call.id == tool_call_id for call in assistant.tool_calls):
-                    return idx
-        return None
-
-    def _find_tool_indices_for_assistant(self, messages: List[Message], assistant_index: int) -> List[int]:
-        """Locate all tool messages responding to the given assistant message."""
-        assistant = messages[assistant_index]
-        if assistant.role != "assistant" or not assistant.tool_calls:
-            return []
+        Returns ``(tool_owner, assistant_tools)``: tool message index -> assistant
+        index, and assistant index -> its tool message indices. A tool result is
+        paired with the nearest preceding assistant message carrying its call id.
+        """
+        latest_caller: Dict[str, int] = {}
+        tool_owner: Dict[int, int] = {}
+        assistant_tools: Dict[int, List[int]] = {}
 
-        tool_call_ids = {call.id for call in assistant.tool_calls}
-        found_indices = []
-
-        # Tool messages responding to an assistant message are typically
-        # immediately following it, but we'll search ahead to be safe.
-        for idx in range(assistant_index + 1, len(messages)):
-            msg = messages[idx]
-            if msg.role == "tool" and getattr(msg, "tool_call_id", None) in tool_call_ids:
-                found_indices.append(idx)
-                # Note: we don't break early because there might be multiple calls
-                # and we need to find all of them.
-            
-            # Stop if we hit another assistant message or user message? 
-            # Actually, just keep going until we find all of them or end of list.
-            if len(found_indices) == len(tool_call_ids):
-                break
-                
-        return found_indices
+        for idx, message in enumerate(messages):
+            if message.role == "assistant" and message.tool_calls:
+                for call in message.tool_calls:
+                    latest_caller[call.id] = idx
+            elif message.role == "tool":
+                tool_call_id = getattr(message, "tool_call_id", None)
+                owner = latest_caller.get(tool_call_id) if tool_call_id else None
+                if owner is not None:
+                    tool_owner[idx] = owner
+                    assistant_tools.setdefault(owner, []).append(idx)
+
+        return tool_owner, assistant_tools
 
     async def _apply_tool_call_dependencies(
         self,
@@ -141,64 +165,41 @@ class ShortTermMemoryManager:
         Ensure tool messages and their originating assistant messages are kept together.
         1. If a tool message is kept, its assistant message must be kept.
         2. If an assistant message with tool calls is kept, ALL its tool responses must be kept.
-        If adding dependencies would violate the token budget, the entire group is dropped.
+        If the resulting set exceeds ``max_tokens``, a warning is logged.
         """
         if not keep_indices:
             return keep_indices
 
-        # Iteratively add dependencies until stable
+        tool_owner, assistant_tools = self._build_tool_call_index(messages)
         current_indices = set(keep_indices)
-        
-        while True:
-            added_any = False
-            
-            # 1. Tool -> Assistant (ensure parent is kept)
-            for idx in list(current_indices):
-                message = messages[idx]
-                if message.role != "tool" or not getattr(message, "tool_call_id", None):
-                    continue
-
-                assistant_idx = self._find_assistant_index_for_tool(messages, idx)
-                if assistant_idx is not None and assistant_idx not in current_indices:
-                    current_indices.add(assistant_idx)
-                    added_any = True
-
-            # 2. Assistant -> Tools (ensure all responses are kept)
-            for idx in list(current_indices):
-                message = messages[idx]
-                if message.role != "assistant" or not message.tool_calls:
-                    continue
-
-                tool_indices = self._find_tool_indices_for_assistant(messages, idx)
-                for t_idx in tool_indices:
-                    if t_idx not in current_indices:
-                        current_indices.add(t_idx)
-                        added_any = True
-            
-            if not added_any:
-                break
+        pending = list(keep_indices)
+
+        while pending:
+            idx = pending.pop()
+            related = assistant_tools.get(idx, [])
+            owner = tool_owner.get(idx)
+            if owner is not None:
+                related = related + [owner]
+            for other in related:
+                if other not in current_indices:
+                    current_indices.add(other)
+                    pending.append(other)
 
-        # Check budget if specified
         if max_tokens is not None:
-            # If we exceeded budget, we need a strategy to prune.
-            # For now, let's just count and if over, we might have to prune groups.
-            # But the LangChain-style trim_messages already has its own loop.
-            # This logic is a bit complex for a simple budget check.
-            # We'll just return what we have and let the caller handle it or
-            # perform a basic check here.
-            
             proposed_messages = [messages[i] for i in sorted(current_indices)]
             token_cost = await self.token_counter.count_tokens(proposed_messages, model)
-            
             if token_cost > max_tokens:
-                # If adding dependencies broke the budget, we have to start dropping.
-                # Simplest strategy: if a group (Assistant + Tools) doesn't fit, drop the whole group
-                # starting from the oldest.
-                # This is a bit advanced, so for now we'll just log it.
                 logger.warning(f"Tool dependency resolution exceeded token budget ({token_cost} > {max_tokens})")
-        
+
         return current_indices
 
+    def _has_additive_counts(self) -> bool:
+        counter = self.token_counter
+        return (
+            hasattr(counter, "count_message_tokens")
+            and type(counter).count_tokens is MessageTokenCounter.count_tokens
+        )
+
     async def trim_messages(
         self,
         messages: List[Message],
@@ -231,33 +232,11 @@ class ShortTermMemoryManager:
             system_message = messages[0]
             remaining = messages[1:]
 
-        if strategy == TrimStrategy.FROM_END:
-            kept: List[Message] = []
-            for message in reversed(remaining):
-                trial = [message] + kept
-                candidate = ([system_message] if system_message else []) + trial
-                token_cost = await self.token_counter.count_tokens(candidate, model)
-                if token_cost <= max_tokens or not kept:
-                    kept = trial
-            trimmed = ([system_message] if system_message else []) + kept
+        if self._has_additive_counts():
+            kept = self._select_within_budget(remaining, system_message, max_tokens, strategy)
         else:
-            kept: List[Message] = []
-            for message in remaining:
-                trial = kept + [message]
-                token_cost = await self.token_counter.count_tokens(trial, model)
-                if token_cost <= max_tokens or not kept:
-                    kept = trial
-                else:
-                    break
-            trimmed = kept
-
-        if not trimmed:
-            if system_message is not None:
-                trimmed = [system_message]
-            elif remaining:
-                trimmed = [remaining[0]] if strategy == TrimStrategy.FROM_START else [remaining[-1]]
-            else:
-                trimmed = []
+            kept = await self._select_by_recount(remaining, system_message, max_tokens, strategy, model)
+        trimmed = ([system_message] if system_message else []) + kept
 
         index_lookup = {id(msg): idx for idx, msg in enumerate(messages)}
         trimmed_indices = {index_lookup[id(msg)] for msg in trimmed if id(msg) in index_lookup}
@@ -277,6 +256,63 @@ class ShortTermMemoryManager:
         )
         return trimmed
 
+    def _select_within_budget(
+        self,
+        remaining: List[Message],
+        system_message: Optional[Message],
+        max_tokens: int,
+        strategy: TrimStrategy,
+    ) -> List[Message]:
+        """Single pass over cached per-message counts."""
+        count = self.token_counter.count_message_tokens
+        used = count(system_message) if system_message else 0
+        kept: List[Message] = []
+
+        if strategy == TrimStrategy.FROM_END:
+            for message in reversed(remaining):
+                cost = count(message)
+                if used + cost <= max_tokens or not kept:
+                    kept.append(message)
+                    used += cost
+            kept.reverse()
+        else:
+            for message in remaining:
+                cost = count(message)
+                if used + cost <= max_tokens or not kept:
+                    kept.append(message)
+                    used += cost
+                else:
+                    break
+        return kept
+
+    async def _select_by_recount(
+        self,
+        remaining: List[Message],
+        system_message: Optional[Message],
+        max_tokens: int,
+        strategy: TrimStrategy,
+        model: Optional[str],
+    ) -> List[Message]:
+        """Fallback for custom counters whose totals may not be additive."""
+        prefix = [system_message] if system_message else []
+        kept: List[Message] = []
+
+        if strategy == TrimStrategy.FROM_END:
+            for message in reversed(remaining):
+                trial = [message] + kept
+                token_cost = await self.token_counter.count_tokens(prefix + trial, model)
+                if token_cost <= max_tokens or not kept:
+                    kept = trial
+        else:
+            for message in remaining:
+                trial = kept + [message]
+                token_cost = await self.token_counter.count_tokens(trial, model)
+                if token_cost <= max_tokens or not kept:
+                    kept = trial
+                else:
+                    break
+        return kept
+
     async def summarize_messages(
         self,
         messages: List[Message],
@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from web3 import Web3
+from web3.exceptions import ContractLogicError, TransactionNotFound
+from web3.logs import DISCARD
+
+logger = logging.getLogger(__name__)
+
+
+# Custom errors raised by GameBadgeNFT.mintTo, mapped to API error codes
+_CONTRACT_ERRORS = {
+    "NotMinter": "not_minter",
+    "Paused": "contract_paused",
+    "ClaimAlreadyUsed": "claim_already_used",
+    "ZeroAddress": "zero_address",
+}
+_ERROR_SELECTORS = {name: bytes(Web3.keccak(text=f"{name}()")[:4]) for name in _CONTRACT_ERRORS}
+
+# Substrings of node errors meaning the nonce was already consumed
+_NONCE_USED_MARKERS = ("nonce too low", "already known", "replacement transaction underpriced")
+
+
+def is_revert(exc: Exception) -> bool:
+    # eth-tester raises its own TransactionFailed instead of ContractLogicError
+    return isinstance(exc, ContractLogicError) or "execution reverted" in str(exc)
+
+
+def contract_error_code(exc: Exception) -> str:
+    """Map a revert to an API error code by custom error name or selector."""
+    message = f"{exc} {getattr(exc, 'data', '') or ''}"
+    for name, code in _CONTRACT_ERRORS.items():
+        selector = _ERROR_SELECTORS[name]
+        # Nodes report the revert data as hex; eth-tester as raw bytes
+        if name in message or selector.hex() in message or repr(selector) in message:
+            return code
+    return "contract_error"
+
+
+class NonceManager:
+    """Hands out monotonic nonces for one sender without a per-request RPC.
+
+    The next nonce is fetched from the chain once and then tracked locally.
+    Nonces that were reserved but never broadcast are released back and
+    reused first, so a failed send does not leave a gap that would stall
+    every later transaction.
+    """
+
+    def __init__(self, fetch_pending_count: Callable[[], Awaitable[int]]):
+        self._fetch = fetch_pending_count
+        self._lock = asyncio.Lock()
+        self._next: Optional[int] = None
+        self._gaps: List[int] = []
+
+    async def reserve(self) -> int:
+        async with self._lock:
+            if self._next is None:
+                self._next = await self._fetch()
+            if self._gaps:
+                return heapq.heappop(self._gaps)
+            nonce = self._next
+            self._next += 1
+            return nonce
+
+    async def release(self, nonce: int) -> None:
+        """Return a nonce that was reserved but did not end up on chain."""
+        async with self._lock:
+            if self._next is None or nonce >= self._next or nonce in self._gaps:
+                return
+            heapq.heappush(self._gaps, nonce)
+            # Shrink back instead of keeping gaps at the top of the range
+            while self._gaps and max(self._gaps) == self._next - 1:
+                self._gaps.remove(self._next - 1)
+                heapq.heapify(self._gaps)
+                self._next -= 1
+
+    async def resync(self) -> None:
+        """Reconcile with the chain after another sender used the account."""
+        async with self._lock:
+            chain_next = await self._fetch()
+            self._gaps = [n for n in self._gaps if n >= chain_next]
+            heapq.heapify(self._gaps)
+            self._next = max(self._next or 0, chain_next)
+
+    @property
+    def next_nonce(self) -> Optional[int]:
+        return self._next
+
+    @property
+    def gaps(self) -> List[int]:
+        return sorted(self._gaps)
+
+
+class ClaimStatus(str, Enum):
+    QUEUED = "queued"
+    SUBMITTED = "submitted"
+    CONFIRMED = "confirmed"
+    FAILED = "failed"
+
+
+@dataclass
+class MintClaim:
+    claim_id: str
+    to_address: str
+    game_id: int
+    claim_bytes: bytes = field(repr=False, default=b"")
+    status: ClaimStatus = ClaimStatus.QUEUED
+    tx_hash: Optional[str] = None
+    nonce: Optional[int] = None
+    token_id: Optional[int] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    created_at: float = field(default_factory=time.time)
+    submitted_at: Optional[float] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (ClaimStatus.CONFIRMED, ClaimStatus.FAILED)
+
+
+class MintQueue:
+    """Background mint pipeline for GameBadgeNFT.mintTo.
+
+    ``submit`` returns a claim immediately. Workers estimate gas and sign in
+    parallel, broadcast in nonce order under a single send lock, and hand
+    the transaction to one receipt poller, so no caller or thread is held for
+    a block time. Dropped transactions release their nonce and are resent;
+    the on-chain claim id makes resending idempotent.
+    """
+
+    def __init__(
+        self,
+        web3: Any,
+        contract: Any,
+        account: Any,
+        private_key: str,
+        *,
+        workers: int = 4,
+        poll_interval: float = 2.0,
+        receipt_timeout: float = 300.0,
+        max_send_attempts: int = 3,
+        max_finished_claims: int = 10000,
+    ):
+        self.web3 = web3
+        self.contract = contract
+        self.account = account
+        self._private_key = private_key
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.receipt_timeout = receipt_timeout
+        self.max_send_attempts = max_send_attempts
+        self.max_finished_claims = max_finished_claims
+
+        self.nonces = NonceManager(self._fetch_pending_count)
+        self._queue: asyncio.Queue[MintClaim] = asyncio.Queue()
+        self._claims: "OrderedDict[str, MintClaim]" = OrderedDict()
+        # 0x-prefixed tx hash -> claim awaiting its receipt
+        self._pending: Dict[str, MintClaim] = {}
+        self._pending_event = asyncio.Event()
+        self._send_lock = asyncio.Lock()
+        self._tasks: List[asyncio.Task] = []
+        self._chain_id: Optional[int] = None
+
+        self.confirmed = 0
+        self.failed = 0
+        self.resent = 0
+
+    async def _fetch_pending_count(self) -> int:
+        return await asyncio.to_thread(
+            self.web3.eth.get_transaction_count, self.account.address, "pending"
+        )
+
+    # ----------------------------
+    # Lifecycle
+    # ----------------------------
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._poll_receipts()))
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # ----------------------------
+    # Public API
+    # ----------------------------
+
+    async def submit(self, to_address: str, game_id: int) -> MintClaim:
+        """Queue a mint and return its claim without waiting for the chain."""
+        claim_raw = f"{to_address.lower()}|{game_id}|{int(time.time() * 1000)}|{uuid.uuid4().hex}"
+        claim_bytes = bytes(self.web3.keccak(text=claim_raw))
+        claim = MintClaim(
+            claim_id="0x" + claim_bytes.hex(),
+            to_address=to_address,
+            game_id=game_id,
+            claim_bytes=claim_bytes,
+        )
+        self._claims[claim.claim_id] = claim
+        self._trim_finished()
+        await self.start()
+        self._queue.put_nowait(claim)
+        return claim
+
+    def get_claim(self, claim_id: str) -> Optional[MintClaim]:
+        return self._claims.get(claim_id)
+
+    async def wait(self, claim: MintClaim, timeout: Optional[float] = None) -> MintClaim:
+        await asyncio.wait_for(claim.done.wait(), timeout)
+        return claim
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "pending_receipts": len(self._pending),
+            "confirmed": self.confirmed,
+            "failed": self.failed,
+            "resent": self.resent,
+            "next_nonce": self.nonces.next_nonce,
+            "nonce_gaps": self.nonces.gaps,
+        }
+
+    # ----------------------------
+    # Internals
+    # ----------------------------
+
+    def _trim_finished(self) -> None:
+        excess = len(self._claims) - self.max_finished_claims
+        if excess <= 0:
+            return
+        for claim_id in [cid for cid, c in self._claims.items() if c.finished][:excess]:
+            del self._claims[claim_id]
+
+    def _finish(self, claim: MintClaim, status: ClaimStatus, error: Optional[str] = None) -> None:
+        claim.status = status
+        claim.error = error
+        if status == ClaimStatus.CONFIRMED:
+            self.confirmed += 1
+        else:
+            self.failed += 1
+        claim.done.set()
+
+    async def _worker(self) -> None:
+        while True:
+            claim = await self._queue.get()
+            try:
+                await self._send(claim)
+            except Exception:  # noqa: BLE001 - a claim must never kill the worker
+                logger.exception("Mint for claim %s failed", claim.claim_id)
+                self._finish(claim, ClaimStatus.FAILED, "mint_failed")
+            finally:
+                self._queue.task_done()
+
+    async def _send(self, claim: MintClaim) -> None:
+        fn = self.contract.functions.mintTo(claim.to_address, claim.game_id, claim.claim_bytes)
+        try:
+            gas_estimate = await asyncio.to_thread(fn.estimate_gas, {"from": self.account.address})
+        except Exception as exc:  # noqa: BLE001 - reverts are classified, the rest re-raised
+            if not is_revert(exc):
+                raise
+            self._finish(claim, ClaimStatus.FAILED, contract_error_code(exc))
+            return
+
+        if self._chain_id is None:
+            self._chain_id = await asyncio.to_thread(lambda: self.web3.eth.chain_id)
+        gas_price = await asyncio.to_thread(lambda: self.web3.eth.gas_price)
+
+        while True:
+            claim.attempts += 1
+            # Reserve and broadcast under one lock so nonces reach the node in order
+            async with self._send_lock:
+                nonce = await self.nonces.reserve()
+                try:
+                    tx = fn.build_transaction(
+                        {
+                            "from": self.account.address,
+                            "nonce": nonce,
+                            "chainId": self._chain_id,
+                            "gas": gas_estimate,
+                            "gasPrice": gas_price,
+                        }
+                    )
+                    signed = self.web3.eth.account.sign_transaction(tx, self._private_key)
+                    tx_hash = await asyncio.to_thread(
+                        self.web3.eth.send_raw_transaction, signed.raw_transaction
+                    )
+                except Exception as exc:  # noqa: BLE001 - classified below
+                    message = str(exc).lower()
+                    if any(marker in message for marker in _NONCE_USED_MARKERS):
+                        # Someone else used this nonce; catch up with the chain and retry
+                        await self.nonces.resync()
+                        if claim.attempts < self.max_send_attempts:
+                            continue
+                    else:
+                        await self.nonces.release(nonce)
+                    if is_revert(exc):
+                        self._finish(claim, ClaimStatus.FAILED, contract_error_code(exc))
+                        return
+                    raise
+            break
+
+        claim.nonce = nonce
+        # Same format the synchronous endpoint has always returned
+        claim.tx_hash = tx_hash.hex()
+        claim.submitted_at = time.monotonic()
+        claim.status = ClaimStatus.SUBMITTED
+        self._pending[self.web3.to_hex(tx_hash)] = claim
+        self._pending_event.set()
+
+    async def _poll_receipts(self) -> None:
+        while True:
+            if not self._pending:
+                self._pending_event.clear()
+                await self._pending_event.wait()
+            for tx_hash, claim in list(self._pending.items()):
+                try:
+                    await self._check_receipt(tx_hash, claim)
+                except Exception:  # noqa: BLE001 - keep polling the others
+                    logger.exception("Receipt check for %s failed", tx_hash)
+            if self._pending:
+                await asyncio.sleep(self.poll_interval)
+
+    async def _check_receipt(self, tx_hash: str, claim: MintClaim) -> None:
+        try:
+            receipt = await asyncio.to_thread(self.web3.eth.get_transaction_receipt, tx_hash)
+        except TransactionNotFound:
+            if time.monotonic() - (claim.submitted_at or 0) > self.receipt_timeout:
+                await self._handle_dropped(tx_hash, claim)
+            return
+
+        del self._pending[tx_hash]
+        if receipt.get("status") != 1:
+            self._finish(claim, ClaimStatus.FAILED, "transaction_failed")
+            return
+        # The receipt also carries the ERC721 Transfer log, which is not in the ABI
+        logs = self.contract.events.Minted().process_receipt(receipt, errors=DISCARD)
+        if not logs:
+            self._finish(claim, ClaimStatus.FAILED, "minted_event_missing")
+            return
+        claim.token_id = int(logs[0]["args"]["tokenId"])
+        self._finish(claim, ClaimStatus.CONFIRMED)
+
+    async def _handle_dropped(self, tx_hash: str, claim: MintClaim) -> None:
+        try:
+            await asyncio.to_thread(self.web3.eth.get_transaction, tx_hash)
+            return  # Still known to the node, keep waiting
+        except TransactionNotFound:
+            pass
+
+        del self._pending[tx_hash]
+        # The nonce never made it on chain; hand it to the next send
+        await self.nonces.release(claim.nonce)
+        await self.nonces.resync()
+        if claim.attempts < self.max_send_attempts:
+            self.resent += 1
+            claim.status = ClaimStatus.QUEUED
+            claim.tx_hash = None
+            self._queue.put_nowait(claim)
+        else:
+            self._finish(claim, ClaimStatus.FAILED, "transaction_dropped")
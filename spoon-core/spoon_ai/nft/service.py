@@ -1,16 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import os
-import time
-from typing import Any, Dict, Optional
+from typing import Optional, Union
 
 from dotenv import load_dotenv
 from eth_account import Account
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 from web3 import Web3
-from web3.exceptions import ContractLogicError
+
+from .mint_queue import ClaimStatus, MintClaim, MintQueue
 
 
 # Load .env automatically for local/demo usage, matching repository guidance.
@@ -52,6 +54,27 @@ _contract = None
 _minter_account = None
 _minter_private_key: Optional[str] = None
 _contract_address: Optional[str] = None
+_mint_queue: Optional[MintQueue] = None
+
+_GAME_IDS = (7702, 8004, 1559)
+
+# How long the synchronous claim endpoints wait for confirmation before
+# answering 202 with the claim id to poll
+_CLAIM_WAIT_TIMEOUT = float(os.getenv("NFT_CLAIM_WAIT_TIMEOUT", "120"))
+
+# Claim error code -> HTTP status for the synchronous claim endpoints
+_ERROR_STATUS = {
+    "invalid_user_address": 400,
+    "zero_address": 400,
+    "contract_error": 400,
+    "not_minter": 403,
+    "claim_already_used": 409,
+    "contract_paused": 423,
+    "mint_failed": 500,
+    "minted_event_missing": 500,
+    "transaction_failed": 502,
+    "transaction_dropped": 502,
+}
 
 
 def _require_env(name: str) -> str:
@@ -81,11 +104,23 @@ def _init_web3() -> None:
     )
 
 
-def _parse_minted_event(receipt: Dict[str, Any]) -> Dict[str, Any]:
-    logs = _contract.events.Minted().process_receipt(receipt)  # type: ignore[union-attr]
-    if not logs:
-        raise RuntimeError("Minted event not found in receipt")
-    return logs[0]["args"]
+async def _get_mint_queue() -> MintQueue:
+    global _mint_queue
+    if _mint_queue is None:
+        try:
+            await asyncio.to_thread(_init_web3)
+        except RuntimeError as exc:
+            raise HTTPException(status_code=500, detail=str(exc)) from exc
+        if _mint_queue is None:
+            _mint_queue = MintQueue(
+                _web3,
+                _contract,
+                _minter_account,
+                _minter_private_key,
+                workers=int(os.getenv("NFT_MINT_WORKERS", "4")),
+                poll_interval=float(os.getenv("NFT_RECEIPT_POLL_INTERVAL", "2")),
+            )
+    return _mint_queue
 
 
 # ----------------------------
@@ -123,83 +158,90 @@ class ClaimBadgeResponse(BaseModel):
     model_config = {"populate_by_name": True}
 
 
+class ClaimStatusResponse(BaseModel):
+    claim_id: str = Field(alias="claimId")
+    status: ClaimStatus
+    game_id: int = Field(alias="gameId")
+    tx_hash: Optional[str] = Field(default=None, alias="txHash")
+    token_id: Optional[int] = Field(default=None, alias="tokenId")
+    error: Optional[str] = None
+
+    model_config = {"populate_by_name": True}
+
+    @classmethod
+    def from_claim(cls, claim: MintClaim) -> "ClaimStatusResponse":
+        return cls(
+            claim_id=claim.claim_id,
+            status=claim.status,
+            game_id=claim.game_id,
+            tx_hash=claim.tx_hash,
+            token_id=claim.token_id,
+            error=claim.error,
+        )
+
+
 # ----------------------------
 # Routes
 # ----------------------------
 
 
-@app.post("/claim-badge/7702", response_model=ClaimBadgeResponse)
-def claim_badge_7702(req: ClaimBadgeRequest) -> ClaimBadgeResponse:
-    return _claim_badge_for_game(req, game_id=7702)
+@app.post("/claim-badge/7702", response_model=ClaimBadgeResponse, responses={202: {"model": ClaimStatusResponse}})
+async def claim_badge_7702(req: ClaimBadgeRequest) -> Union[ClaimBadgeResponse, JSONResponse]:
+    return await _claim_badge_for_game(req, game_id=7702)
 
 
-@app.post("/claim-badge/8004", response_model=ClaimBadgeResponse)
-def claim_badge_8004(req: ClaimBadgeRequest) -> ClaimBadgeResponse:
-    return _claim_badge_for_game(req, game_id=8004)
+@app.post("/claim-badge/8004", response_model=ClaimBadgeResponse, responses={202: {"model": ClaimStatusResponse}})
+async def claim_badge_8004(req: ClaimBadgeRequest) -> Union[ClaimBadgeResponse, JSONResponse]:
+    return await _claim_badge_for_game(req, game_id=8004)
 
 
-@app.post("/claim-badge/1559", response_model=ClaimBadgeResponse)
-def claim_badge_1559(req: ClaimBadgeRequest) -> ClaimBadgeResponse:
-    return _claim_badge_for_game(req, game_id=1559)
+@app.post("/claim-badge/1559", response_model=ClaimBadgeResponse, responses={202: {"model": ClaimStatusResponse}})
+async def claim_badge_1559(req: ClaimBadgeRequest) -> Union[ClaimBadgeResponse, JSONResponse]:
+    return await _claim_badge_for_game(req, game_id=1559)
 
 
-def _claim_badge_for_game(req: ClaimBadgeRequest, game_id: int) -> ClaimBadgeResponse:
-    try:
-        _init_web3()
-    except RuntimeError as exc:
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
+@app.post("/claims/{game_id}", response_model=ClaimStatusResponse, status_code=202)
+async def submit_claim(game_id: int, req: ClaimBadgeRequest) -> ClaimStatusResponse:
+    """Queue a badge mint and return its claim id without waiting for the chain."""
+    if game_id not in _GAME_IDS:
+        raise HTTPException(status_code=404, detail="unknown_game")
+    claim = await _submit_claim(req, game_id)
+    return ClaimStatusResponse.from_claim(claim)
+
 
-    assert _web3 is not None
-    assert _contract is not None
-    assert _minter_account is not None
-    assert _minter_private_key is not None
-    assert _contract_address is not None
+@app.get("/claims/{claim_id}", response_model=ClaimStatusResponse)
+async def get_claim(claim_id: str) -> ClaimStatusResponse:
+    queue = await _get_mint_queue()
+    claim = queue.get_claim(claim_id)
+    if claim is None:
+        raise HTTPException(status_code=404, detail="claim_not_found")
+    return ClaimStatusResponse.from_claim(claim)
 
-    if not _web3.is_address(req.user_address):
+
+async def _submit_claim(req: ClaimBadgeRequest, game_id: int) -> MintClaim:
+    queue = await _get_mint_queue()
+    if not Web3.is_address(req.user_address):
         raise HTTPException(status_code=400, detail="invalid_user_address")
+    return await queue.submit(Web3.to_checksum_address(req.user_address), game_id)
 
-    to_address = _web3.to_checksum_address(req.user_address)
-    claim_raw = f"{req.user_address.lower()}|{game_id}|{int(time.time() * 1000)}"
-    claim_id_bytes = _web3.keccak(text=claim_raw)
 
+async def _claim_badge_for_game(req: ClaimBadgeRequest, game_id: int) -> Union[ClaimBadgeResponse, JSONResponse]:
+    claim = await _submit_claim(req, game_id)
+    # Waiting on the queue does not hold a worker thread for the block time
     try:
-        fn = _contract.functions.mintTo(to_address, game_id, claim_id_bytes)
-        gas_estimate = fn.estimate_gas({"from": _minter_account.address})
-        tx = fn.build_transaction(
-            {
-                "from": _minter_account.address,
-                "nonce": _web3.eth.get_transaction_count(_minter_account.address),
-                "chainId": _web3.eth.chain_id,
-                "gas": gas_estimate,
-                "gasPrice": _web3.eth.gas_price,
-            }
-        )
-        signed = _web3.eth.account.sign_transaction(tx, _minter_private_key)
-        tx_hash = _web3.eth.send_raw_transaction(signed.raw_transaction)
-        receipt = _web3.eth.wait_for_transaction_receipt(tx_hash)
-    except ContractLogicError as exc:
-        message = str(exc)
-        if "NotMinter" in message:
-            raise HTTPException(status_code=403, detail="not_minter") from exc
-        if "Paused" in message:
-            raise HTTPException(status_code=423, detail="contract_paused") from exc
-        if "ClaimAlreadyUsed" in message:
-            raise HTTPException(status_code=409, detail="claim_already_used") from exc
-        if "ZeroAddress" in message:
-            raise HTTPException(status_code=400, detail="zero_address") from exc
-        raise HTTPException(status_code=400, detail="contract_error") from exc
-    except Exception as exc:  # noqa: BLE001 - keep demo flow simple
-        raise HTTPException(status_code=500, detail="mint_failed") from exc
-
-    if receipt.get("status") != 1:
-        raise HTTPException(status_code=502, detail="transaction_failed")
-
-    event = _parse_minted_event(receipt)
-    token_id = int(event["tokenId"])
+        await (await _get_mint_queue()).wait(claim, timeout=_CLAIM_WAIT_TIMEOUT)
+    except asyncio.TimeoutError:
+        # The mint keeps going in the background; the client polls GET /claims/{claim_id}
+        status = ClaimStatusResponse.from_claim(claim)
+        return JSONResponse(status_code=202, content=status.model_dump(by_alias=True, mode="json"))
+
+    if claim.status != ClaimStatus.CONFIRMED:
+        error = claim.error or "mint_failed"
+        raise HTTPException(status_code=_ERROR_STATUS.get(error, 500), detail=error)
 
     return ClaimBadgeResponse(
         success=True,
-        token_id=token_id,
+        token_id=claim.token_id,
         contract_address=_contract_address,
-        tx_hash=tx_hash.hex(),
+        tx_hash=claim.tx_hash,
     )
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import os
+import pickle
+import sqlite3
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+BM25_INDEX_FILE = "bm25.sqlite3"
+LEGACY_BM25_FILE = "bm25_dump.pkl"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    rowid INTEGER PRIMARY KEY,
+    collection TEXT NOT NULL,
+    id TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    UNIQUE (collection, id)
+);
+CREATE TABLE IF NOT EXISTS postings (
+    collection TEXT NOT NULL,
+    term TEXT NOT NULL,
+    doc INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (collection, term, doc)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc);
+CREATE TABLE IF NOT EXISTS stats (
+    collection TEXT PRIMARY KEY,
+    doc_count INTEGER NOT NULL,
+    total_length INTEGER NOT NULL
+);
+"""
+
+
+def tokenize(text: str) -> List[str]:
+    # Simple whitespace tokenization, matching the previous rank_bm25 setup
+    return text.lower().split()
+
+
+class BM25Index:
+    """Persistent BM25 inverted index stored in SQLite.
+
+    Postings are keyed by (collection, term) so a query reads only the postings
+    of its own terms, and per-collection document counts and total lengths are
+    kept up to date on add/delete. Ingest cost therefore scales with the new
+    documents and opening an existing index does no work.
+    """
+
+    def __init__(self, path: str, *, k1: float = 1.5, b: float = 0.75) -> None:
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    @classmethod
+    def for_rag_dir(
+        cls, rag_dir: str, *, collection: str = "default", create: bool = True
+    ) -> Optional["BM25Index"]:
+        """Open the index under ``rag_dir``, importing a legacy pickle dump once.
+
+        The pickle dump was not partitioned by collection, so its documents
+        are imported into ``collection``. Returns None when ``create`` is False
+        and there is nothing to open.
+        """
+        path = os.path.join(rag_dir, BM25_INDEX_FILE)
+        legacy = os.path.join(rag_dir, LEGACY_BM25_FILE)
+        if not create and not os.path.exists(path) and not os.path.exists(legacy):
+            return None
+        index = cls(path)
+        if os.path.exists(legacy):
+            index._import_legacy(legacy, collection)
+        return index
+
+    def _import_legacy(self, legacy_path: str, collection: str) -> None:
+        try:
+            with open(legacy_path, "rb") as f:
+                data = pickle.load(f)
+            self.add(
+                collection,
+                ids=data["ids"],
+                texts=data["texts"],
+                metadatas=data["metadatas"],
+            )
+            os.remove(legacy_path)
+        except Exception as e:
+            print(f"[Warning] Failed to import legacy BM25 data: {e}")
+
+    def add(
+        self,
+        collection: str,
+        *,
+        ids: List[str],
+        texts: List[str],
+        metadatas: Optional[List[Dict]] = None,
+    ) -> int:
+        """Index documents; re-adding an existing id replaces it."""
+        metadatas = metadatas if metadatas is not None else [{} for _ in ids]
+        # Last occurrence wins for ids repeated within one batch
+        docs = {id_: (text, md) for id_, text, md in zip(ids, texts, metadatas)}
+        with self._lock, self._conn:
+            self._delete_locked(collection, list(docs))
+            added_length = 0
+            postings = []
+            for id_, (text, md) in docs.items():
+                tokens = tokenize(text)
+                cur = self._conn.execute(
+                    "INSERT INTO docs (collection, id, length, text, metadata) VALUES (?, ?, ?, ?, ?)",
+                    (collection, id_, len(tokens), text, json.dumps(md, default=str)),
+                )
+                doc = cur.lastrowid
+                postings.extend((collection, term, doc, tf) for term, tf in Counter(tokens).items())
+                added_length += len(tokens)
+            # Insert in key order so the postings B-tree is appended to per term
+            postings.sort()
+            self._conn.executemany(
+                "INSERT INTO postings (collection, term, doc, tf) VALUES (?, ?, ?, ?)", postings
+            )
+            self._update_stats(collection, len(docs), added_length)
+        return len(docs)
+
+    def delete(self, collection: str, ids: Iterable[str]) -> int:
+        """Remove documents by id; returns the number removed."""
+        with self._lock, self._conn:
+            return self._delete_locked(collection, list(ids))
+
+    def _delete_locked(self, collection: str, ids: List[str]) -> int:
+        removed = 0
+        removed_length = 0
+        for id_ in ids:
+            row = self._conn.execute(
+                "SELECT rowid, length FROM docs WHERE collection = ? AND id = ?", (collection, id_)
+            ).fetchone()
+            if row is None:
+                continue
+            doc, length = row
+            self._conn.execute("DELETE FROM postings WHERE doc = ?", (doc,))
+            self._conn.execute("DELETE FROM docs WHERE rowid = ?", (doc,))
+            removed += 1
+            removed_length += length
+        if removed:
+            self._update_stats(collection, -removed, -removed_length)
+        return removed
+
+    def _update_stats(self, collection: str, doc_delta: int, length_delta: int) -> None:
+        self._conn.execute(
+            "INSERT INTO stats (collection, doc_count, total_length) VALUES (?, ?, ?) "
+            "ON CONFLICT (collection) DO UPDATE SET "
+            "doc_count = doc_count + excluded.doc_count, "
+            "total_length = total_length + excluded.total_length",
+            (collection, doc_delta, length_delta),
+        )
+
+    def clear(self, collection: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM postings WHERE collection = ?", (collection,))
+            self._conn.execute("DELETE FROM docs WHERE collection = ?", (collection,))
+            self._conn.execute("DELETE FROM stats WHERE collection = ?", (collection,))
+
+    def count(self, collection: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT doc_count FROM stats WHERE collection = ?", (collection,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def search(self, collection: str, query: str, top_k: int = 5) -> List[Tuple[str, float, str, Dict]]:
+        """Return up to ``top_k`` (id, score, text, metadata) for documents matching ``query``."""
+        terms = Counter(tokenize(query))
+        if not terms or top_k <= 0:
+            return []
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT doc_count, total_length FROM stats WHERE collection = ?", (collection,)
+            ).fetchone()
+            if not row or row[0] <= 0:
+                return []
+            n_docs, total_length = row
+            avgdl = total_length / n_docs or 1.0
+
+            scores: Dict[int, float] = {}
+            for term, qtf in terms.items():
+                postings = self._conn.execute(
+                    "SELECT p.doc, p.tf, d.length FROM postings p JOIN docs d ON d.rowid = p.doc "
+                    "WHERE p.collection = ? AND p.term = ?",
+                    (collection, term),
+                ).fetchall()
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+                for doc, tf, length in postings:
+                    norm = tf + self.k1 * (1.0 - self.b + self.b * length / avgdl)
+                    scores[doc] = scores.get(doc, 0.0) + qtf * idf * tf * (self.k1 + 1.0) / norm
+
+            top = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+            results = []
+            for doc, score in top:
+                id_, text, md = self._conn.execute(
+                    "SELECT id, text, metadata FROM docs WHERE rowid = ?", (doc,)
+                ).fetchone()
+                results.append((id_, score, text, json.loads(md)))
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
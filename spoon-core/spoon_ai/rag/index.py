@@ -4,12 +4,11 @@ import uuid
 from dataclasses import dataclass
 from typing import Dict, Iterable, List, Optional
 
+from .bm25 import BM25Index
 from .config import RagConfig
 from .embeddings import EmbeddingClient
 from .loader import load_inputs, chunk_text
 from .vectorstores import VectorStore
-import pickle
-import os
 
 
 @dataclass
@@ -30,6 +29,12 @@ class RagIndex:
         self.config = config
         self.store = store
         self.embeddings = embeddings
+        self._bm25: Optional[BM25Index] = None
+
+    def _get_bm25(self) -> BM25Index:
+        if self._bm25 is None:
+            self._bm25 = BM25Index.for_rag_dir(self.config.rag_dir, collection=self.config.collection)
+        return self._bm25
 
     def ingest(self, inputs: Iterable[str], *, collection: Optional[str] = None) -> int:
         docs = load_inputs(inputs)
@@ -57,39 +62,34 @@ class RagIndex:
             metadatas=[r.metadata | {"text": r.text} for r in records],
         )
 
-        # Save data for BM25 (Hybrid Search)
+        # Index only the new records for BM25 (Hybrid Search)
         try:
-            bm2_file = os.path.join(self.config.rag_dir, "bm25_dump.pkl")
-            if not os.path.exists(self.config.rag_dir):
-                os.makedirs(self.config.rag_dir, exist_ok=True)
-            
-            existing_data = {"ids": [], "texts": [], "metadatas": []}
-            if os.path.exists(bm2_file):
-                try:
-                    with open(bm2_file, "rb") as f:
-                        existing_data = pickle.load(f)
-                except Exception:
-                    pass
-            
-            existing_data["ids"].extend([r.id for r in records])
-            existing_data["texts"].extend([r.text for r in records])
-            existing_data["metadatas"].extend([r.metadata for r in records])
-            
-            with open(bm2_file, "wb") as f:
-                pickle.dump(existing_data, f)
+            self._get_bm25().add(
+                collection or self.config.collection,
+                ids=[r.id for r in records],
+                texts=[r.text for r in records],
+                metadatas=[r.metadata for r in records],
+            )
         except Exception as e:
             # Non-critical failure
             print(f"[Warning] Failed to save BM25 data: {e}")
 
         return len(records)
 
+    def delete(self, ids: List[str], *, collection: Optional[str] = None) -> None:
+        """Remove records by id from the vector store (when supported) and BM25 index."""
+        name = collection or self.config.collection
+        if hasattr(self.store, "delete"):
+            self.store.delete(collection=name, ids=ids)
+        try:
+            self._get_bm25().delete(name, ids)
+        except Exception as e:
+            print(f"[Warning] Failed to delete BM25 data: {e}")
+
     def clear(self, *, collection: Optional[str] = None) -> None:
         # Also clear BM25 data
         try:
-            bm2_file = os.path.join(self.config.rag_dir, "bm25_dump.pkl")
-            if os.path.exists(bm2_file):
-                os.remove(bm2_file)
+            self._get_bm25().clear(collection or self.config.collection)
         except Exception:
             pass
         self.store.delete_collection(collection or self.config.collection)
-
@@ -3,13 +3,10 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 
-from .config import RagConfig
-from .embeddings import EmbeddingClient
+from .bm25 import BM25Index
 from .config import RagConfig
 from .embeddings import EmbeddingClient
 from .vectorstores import VectorStore
-import os
-import pickle
 
 
 @dataclass
@@ -31,23 +28,15 @@ class RagRetriever:
         self.config = config
         self.store = store
         self.embeddings = embeddings
-        self.bm25 = None
-        self.bm25_data = None
+        self.bm25: Optional[BM25Index] = None
         self._load_bm25()
 
     def _load_bm25(self):
+        # Opening the on-disk inverted index is cheap; nothing is rebuilt here
         try:
-            from rank_bm25 import BM25Okapi
-            bm2_file = os.path.join(self.config.rag_dir, "bm25_dump.pkl")
-            if os.path.exists(bm2_file):
-                with open(bm2_file, "rb") as f:
-                    self.bm25_data = pickle.load(f)
-                
-                # Simple whitespace tokenization
-                tokenized_corpus = [doc.lower().split() for doc in self.bm25_data["texts"]]
-                self.bm25 = BM25Okapi(tokenized_corpus)
-        except ImportError:
-            pass  # BM25 optional
+            self.bm25 = BM25Index.for_rag_dir(
+                self.config.rag_dir, collection=self.config.collection, create=False
+            )
         except Exception as e:
             print(f"[Warning] Failed to load BM25 index: {e}")
 
@@ -76,38 +65,27 @@ class RagRetriever:
             chunks.append(RetrievedChunk(id=id_, text=text, score=score, metadata=md))
 
         # Hybrid Search: Add BM25 results
-        if self.bm25 and self.bm25_data:
+        if self.bm25 is None:
+            # Pick up an index created by an ingest after construction
+            self._load_bm25()
+        if self.bm25 is not None:
             try:
-                tokenized_query = query.lower().split()
-                # Get indices of top k results
-                # We fetch top_k indices. rank_bm25 returns the actual documents by get_top_n, 
-                # but we need indices to look up metadata.
-                # So we calculate scores and sort manually or use private API.
-                # Standard way: get scores
-                scores = self.bm25.get_scores(tokenized_query)
-                # Get top k indices
-                top_n_indices = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)[:k]
-                
-                for idx in top_n_indices:
-                    # Skip if score is 0 (no match)
-                    if scores[idx] <= 0:
+                seen_ids = {c.id for c in chunks}
+                for c_id, _, c_text, c_meta in self.bm25.search(
+                    collection or self.config.collection, query, top_k=k
+                ):
+                    if c_id in seen_ids:
                         continue
-                        
-                    c_id = self.bm25_data["ids"][idx]
-                    # If not already present
-                    if not any(c.id == c_id for c in chunks):
-                        c_text = self.bm25_data["texts"][idx]
-                        c_meta = self.bm25_data["metadatas"][idx]
-                        # Boost score for keyword match to prioritize it
-                        # Or assign a high constant like 0.95
-                        chunks.append(RetrievedChunk(
-                            id=c_id,
-                            text=c_text,
-                            score=0.95, 
-                            metadata=c_meta
-                        ))
+                    seen_ids.add(c_id)
+                    # Boost score for keyword match to prioritize it
+                    chunks.append(RetrievedChunk(
+                        id=c_id,
+                        text=c_text,
+                        score=0.95,
+                        metadata=c_meta
+                    ))
             except Exception as e:
-                print(f"[Warning] BM25 search failed: {e}") 
+                print(f"[Warning] BM25 search failed: {e}")
 
         # Lightweight dedup by text
         seen = set()
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import heapq
 import math
 
 
@@ -34,10 +35,246 @@ class VectorStore(ABC):
         raise NotImplementedError
 
 
+class _Collection:
+    """Row-oriented storage for one collection of the in-memory store.
+
+    Vectors are L2-normalized on insert so cosine similarity is a plain dot
+    product. With numpy they live in one contiguous float32 matrix that grows
+    by doubling; without numpy they are kept as Python lists. Deleted rows are
+    tombstoned and reclaimed by ``compact`` once they pile up.
+    """
+
+    def __init__(self, dim: int, np_module=None, initial_capacity: int = 64):
+        self.dim = dim
+        self.np = np_module
+        self.size = 0
+        self.deleted = 0
+        self.ids: List[Optional[str]] = []
+        self.metas: List[Optional[Dict]] = []
+        self.id_to_row: Dict[str, int] = {}
+        # metadata key -> value -> live rows carrying it
+        self.meta_index: Dict[str, Dict[Any, Set[int]]] = {}
+        if np_module is not None:
+            self.matrix = np_module.empty((initial_capacity, dim), dtype=np_module.float32)
+            self.alive = np_module.zeros(initial_capacity, dtype=bool)
+        else:
+            self.vectors: List[Optional[List[float]]] = []
+
+    def _normalize_rows(self, vecs: List[List[float]]):
+        np = self.np
+        arr = np.asarray(vecs, dtype=np.float32).reshape(len(vecs), -1)
+        norms = np.linalg.norm(arr, axis=1)
+        norms[norms == 0] = 1.0
+        return arr / norms[:, None]
+
+    @staticmethod
+    def _normalize_list(vec: List[float]) -> List[float]:
+        norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+        return [x / norm for x in vec]
+
+    def _index_meta(self, row: int, md: Dict) -> None:
+        for k, v in md.items():
+            try:
+                self.meta_index.setdefault(k, {}).setdefault(v, set()).add(row)
+            except TypeError:
+                # Unhashable value: filtered by a linear check instead
+                continue
+
+    def _unindex_meta(self, row: int, md: Dict) -> None:
+        for k, v in md.items():
+            try:
+                rows = self.meta_index.get(k, {}).get(v)
+            except TypeError:
+                continue
+            if rows is not None:
+                rows.discard(row)
+                if not rows:
+                    del self.meta_index[k][v]
+
+    def _ensure_capacity(self, extra: int) -> None:
+        np = self.np
+        needed = self.size + extra
+        capacity = self.matrix.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        matrix = np.empty((capacity, self.dim), dtype=np.float32)
+        matrix[: self.size] = self.matrix[: self.size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self.size] = self.alive[: self.size]
+        self.matrix, self.alive = matrix, alive
+
+    def add(self, ids: List[str], embeddings: List[List[float]], metadatas: List[Dict]) -> None:
+        if len(set(ids)) != len(ids):
+            # Repeated ids within a batch: the last occurrence wins
+            last = {id_: i for i, id_ in enumerate(ids)}
+            keep = sorted(last.values())
+            ids = [ids[i] for i in keep]
+            embeddings = [embeddings[i] for i in keep]
+            metadatas = [metadatas[i] for i in keep]
+
+        # Re-adding an id replaces it
+        self.delete([id_ for id_ in ids if id_ in self.id_to_row], compact=False)
+
+        if self.np is not None:
+            rows = self._normalize_rows(embeddings)
+            self._ensure_capacity(len(ids))
+            self.matrix[self.size : self.size + len(ids)] = rows
+            self.alive[self.size : self.size + len(ids)] = True
+        else:
+            self.vectors.extend(self._normalize_list(vec) for vec in embeddings)
+
+        for id_, md in zip(ids, metadatas):
+            row = self.size
+            self.ids.append(id_)
+            self.metas.append(md)
+            self.id_to_row[id_] = row
+            self._index_meta(row, md)
+            self.size += 1
+
+    def delete(self, ids: List[str], compact: bool = True) -> int:
+        removed = 0
+        for id_ in ids:
+            row = self.id_to_row.pop(id_, None)
+            if row is None:
+                continue
+            self._unindex_meta(row, self.metas[row])
+            self.ids[row] = None
+            self.metas[row] = None
+            if self.np is not None:
+                self.alive[row] = False
+            else:
+                self.vectors[row] = None
+            removed += 1
+        self.deleted += removed
+        if compact and self.deleted > 0.25 * self.size:
+            self.compact()
+        return removed
+
+    def compact(self) -> None:
+        """Drop tombstoned rows and rebuild row-keyed structures."""
+        live_rows = [row for row in range(self.size) if self.ids[row] is not None]
+        if self.np is not None:
+            np = self.np
+            kept = self.matrix[live_rows] if live_rows else np.empty((0, self.dim), dtype=np.float32)
+            capacity = max(64, len(live_rows))
+            self.matrix = np.empty((capacity, self.dim), dtype=np.float32)
+            self.matrix[: len(live_rows)] = kept
+            self.alive = np.zeros(capacity, dtype=bool)
+            self.alive[: len(live_rows)] = True
+        else:
+            self.vectors = [self.vectors[row] for row in live_rows]
+
+        self.ids = [self.ids[row] for row in live_rows]
+        self.metas = [self.metas[row] for row in live_rows]
+        self.size = len(live_rows)
+        self.deleted = 0
+        self.id_to_row = {id_: row for row, id_ in enumerate(self.ids)}
+        self.meta_index = {}
+        for row, md in enumerate(self.metas):
+            self._index_meta(row, md)
+
+    def candidate_rows(self, filter: Optional[Dict]) -> Optional[Set[int]]:
+        """Rows matching ``filter`` via the metadata index, or None for "all live rows"."""
+        if not filter:
+            return None
+        candidates: Optional[Set[int]] = None
+        for k, v in filter.items():
+            if v is None:
+                # None also matches rows without the key, as md.get(k) == None does
+                rows = {row for row in range(self.size)
+                        if self.ids[row] is not None and self.metas[row].get(k) is None}
+                candidates = rows if candidates is None else candidates & rows
+                if not candidates:
+                    return set()
+                continue
+            try:
+                rows = self.meta_index.get(k, {}).get(v, set())
+            except TypeError:
+                # Unhashable filter value: linear check
+                rows = {row for row in range(self.size)
+                        if self.ids[row] is not None and self.metas[row].get(k) == v}
+            candidates = set(rows) if candidates is None else candidates & rows
+            if not candidates:
+                return set()
+        return candidates
+
+    def query(self, query_embeddings: List[List[float]], top_k: int,
+              filter: Optional[Dict]) -> List[List[Tuple[str, float, Dict]]]:
+        candidates = self.candidate_rows(filter)
+        if self.np is not None:
+            return self._query_matrix(query_embeddings, top_k, candidates)
+        return self._query_lists(query_embeddings, top_k, candidates)
+
+    def _query_matrix(self, query_embeddings, top_k, candidates) -> List[List[Tuple[str, float, Dict]]]:
+        np = self.np
+        if candidates is None:
+            rows = np.flatnonzero(self.alive[: self.size])
+        else:
+            rows = np.fromiter(sorted(candidates), dtype=np.int64, count=len(candidates))
+        if rows.size == 0 or top_k <= 0:
+            return [[] for _ in query_embeddings]
+
+        queries = self._normalize_rows(query_embeddings)
+        if rows.size == self.size:
+            scores = queries @ self.matrix[: self.size].T
+        else:
+            scores = queries @ self.matrix[rows].T
+
+        k = min(top_k, rows.size)
+        if k < rows.size:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(rows.size), (scores.shape[0], 1))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        results: List[List[Tuple[str, float, Dict]]] = []
+        for row_positions, row_scores in zip(top, top_scores):
+            triples = []
+            for pos, score in zip(row_positions, row_scores):
+                row = int(rows[pos])
+                triples.append((self.ids[row], float(score), self.metas[row]))
+            results.append(triples)
+        return results
+
+    def _query_lists(self, query_embeddings, top_k, candidates) -> List[List[Tuple[str, float, Dict]]]:
+        rows = sorted(candidates) if candidates is not None else [
+            row for row in range(self.size) if self.ids[row] is not None
+        ]
+        results: List[List[Tuple[str, float, Dict]]] = []
+        for q in query_embeddings:
+            qn = self._normalize_list(q)
+            scored = [
+                (self.ids[row], sum(x * y for x, y in zip(qn, self.vectors[row])), self.metas[row])
+                for row in rows
+            ]
+            results.append(heapq.nlargest(top_k, scored, key=lambda x: x[1]) if top_k > 0 else [])
+        return results
+
+    def __len__(self) -> int:
+        return self.size - self.deleted
+
+
 class InMemoryVectorStore(VectorStore):
+    """Exact cosine-similarity store kept in process memory.
+
+    Uses a numpy matrix per collection when numpy is installed, so a batch of
+    queries is answered with a single matrix multiply and ``argpartition``
+    top-k selection; otherwise falls back to pure Python scoring.
+    """
+
     def __init__(self):
-        # storage: collection -> {id: (embedding, metadata)}
-        self._data: Dict[str, Dict[str, Tuple[List[float], Dict]]] = {}
+        try:
+            import numpy as np
+        except ImportError:  # pragma: no cover - numpy is optional
+            np = None
+        self._np = np
+        # storage: collection -> row-oriented collection
+        self._data: Dict[str, _Collection] = {}
 
     def add(
         self,
@@ -47,17 +284,16 @@ class InMemoryVectorStore(VectorStore):
         embeddings: List[List[float]],
         metadatas: List[Dict],
     ) -> None:
-        if collection not in self._data:
-            self._data[collection] = {}
-        col = self._data[collection]
-        for id_, vec, md in zip(ids, embeddings, metadatas):
-            col[id_] = (vec, md)
-
-    def _cosine(self, a: List[float], b: List[float]) -> float:
-        dot = sum(x * y for x, y in zip(a, b))
-        na = math.sqrt(sum(x * x for x in a)) or 1.0
-        nb = math.sqrt(sum(y * y for y in b)) or 1.0
-        return dot / (na * nb)
+        if not embeddings:
+            return
+        dim = len(embeddings[0])
+        col = self._data.get(collection)
+        if col is None:
+            col = _Collection(dim, self._np)
+            self._data[collection] = col
+        if col.dim != dim:
+            raise RuntimeError(f"Embedding dim mismatch: existing {col.dim} vs new {dim}")
+        col.add(list(ids), embeddings, list(metadatas))
 
     def query(
         self,
@@ -67,27 +303,21 @@ class InMemoryVectorStore(VectorStore):
         top_k: int = 5,
         filter: Optional[Dict] = None,
     ) -> List[List[Tuple[str, float, Dict]]]:
-        col = self._data.get(collection, {})
-        results: List[List[Tuple[str, float, Dict]]] = []
-        items = list(col.items())
-        for q in query_embeddings:
-            scored: List[Tuple[str, float, Dict]] = []
-            for id_, (vec, md) in items:
-                if filter:
-                    # very simple exact-match filter on metadata keys
-                    ok = True
-                    for k, v in filter.items():
-                        if md.get(k) != v:
-                            ok = False
-                            break
-                    if not ok:
-                        continue
-                score = self._cosine(q, vec)
-                scored.append((id_, score, md))
-            scored.sort(key=lambda x: x[1], reverse=True)
-            results.append(scored[: top_k])
-        return results
+        col = self._data.get(collection)
+        if col is None or not query_embeddings:
+            return [[] for _ in query_embeddings]
+        return col.query(query_embeddings, top_k, filter)
+
+    def delete(self, *, collection: str, ids: List[str]) -> int:
+        """Delete vectors by id; returns the number removed."""
+        col = self._data.get(collection)
+        if col is None:
+            return 0
+        return col.delete(list(ids))
+
+    def count(self, collection: str) -> int:
+        col = self._data.get(collection)
+        return len(col) if col is not None else 0
 
     def delete_collection(self, collection: str) -> None:
         self._data.pop(collection, None)
-
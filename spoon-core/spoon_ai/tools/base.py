@@ -18,6 +18,11 @@ class BaseTool(ABC, BaseModel):
     # (not os.environ) for better security.
     requires_decrypted_env: ClassVar[bool] = False
 
+    # When True, agents never run this tool concurrently with other tool calls
+    # from the same step. Set it on tools that mutate external state (signing,
+    # broadcasting, payments) where ordering matters.
+    serial_only: ClassVar[bool] = False
+
     # Heuristic default: common blockchain tool prefixes that may need private keys.
     _DECRYPT_ENV_NAME_PREFIXES: ClassVar[tuple[str, ...]] = (
         "evm_",
@@ -1,6 +1,8 @@
 
 from typing import Union, Dict, Any, Optional, List
 import asyncio
+import hashlib
+import json
 import os
 import time
 import logging
@@ -54,7 +56,7 @@ class MCPTool(BaseTool, MCPClientMixin):
             mcp_config=mcp_config
         )
 
-        MCPClientMixin.__init__(self, transport_obj)
+        MCPClientMixin.__init__(self, transport_obj, pool_key=self._pool_key_from_config(mcp_config))
 
         self._parameters_loaded = False
         self._parameters_loading = False
@@ -70,6 +72,18 @@ class MCPTool(BaseTool, MCPClientMixin):
 
         logger.info(f"Initialized MCP tool '{self.name}' with deferred parameter loading")
 
+    @staticmethod
+    def _pool_key_from_config(config: dict) -> str:
+        """Build a session pool key so tools targeting the same MCP server share a connection."""
+        identity = {
+            k: config.get(k)
+            for k in ("url", "transport", "headers", "command", "args", "env")
+            if config.get(k) is not None
+        }
+        digest = hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode()).hexdigest()
+        # Keep secrets (headers/env) out of the readable part of the key used in logs
+        return f"{config.get('url') or config.get('command')}#{digest[:12]}"
+
     def _create_transport_from_config(self, config: dict):
         """Create a transport object from a configuration dictionary."""
         url = config.get("url")
@@ -43,6 +43,8 @@ class TurnkeyBaseTool(BaseTool):
 
 class SignEVMTransactionTool(TurnkeyBaseTool):
     """Sign EVM transaction using Turnkey"""
+
+    serial_only = True
     
     name: str = "sign_evm_transaction"
     description: str = "Sign EVM transaction using Turnkey secure signing"
@@ -87,6 +89,8 @@ class SignEVMTransactionTool(TurnkeyBaseTool):
 
 class SignMessageTool(TurnkeyBaseTool):
     """Sign arbitrary message using Turnkey"""
+
+    serial_only = True
     
     name: str = "sign_message"
     description: str = "Sign arbitrary message using Turnkey secure signing"
@@ -131,6 +135,8 @@ class SignMessageTool(TurnkeyBaseTool):
 
 class SignTypedDataTool(TurnkeyBaseTool):
     """Sign EIP-712 structured data using Turnkey"""
+
+    serial_only = True
     
     name: str = "sign_typed_data"
     description: str = "Sign EIP-712 structured data using Turnkey secure signing"
@@ -169,6 +175,8 @@ class SignTypedDataTool(TurnkeyBaseTool):
 
 class BroadcastTransactionTool(TurnkeyBaseTool):
     """Broadcast signed transaction to blockchain"""
+
+    serial_only = True
     
     name: str = "broadcast_transaction"
     description: str = "Broadcast signed transaction to blockchain network"
@@ -733,6 +741,8 @@ class ListAllAccountsTool(TurnkeyBaseTool):
 
 class BatchSignTransactionsTool(TurnkeyBaseTool):
     """Batch sign transactions for multiple accounts"""
+
+    serial_only = True
     
     name: str = "batch_sign_transactions"
     description: str = "Batch sign transactions for multiple accounts in the organization"
@@ -895,6 +905,8 @@ class BatchSignTransactionsTool(TurnkeyBaseTool):
 
 class CreateWalletTool(TurnkeyBaseTool):
     """Create a new wallet"""
+
+    serial_only = True
     
     name: str = "create_wallet"
     description: str = "Create a new wallet with specified accounts"
@@ -989,6 +1001,8 @@ class GetWalletTool(TurnkeyBaseTool):
 
 class CreateWalletAccountsTool(TurnkeyBaseTool):
     """Add accounts to an existing wallet"""
+
+    serial_only = True
     
     name: str = "create_wallet_accounts"
     description: str = "Add new accounts to an existing wallet"
@@ -1034,6 +1048,8 @@ class CreateWalletAccountsTool(TurnkeyBaseTool):
 
 class CompleteTransactionWorkflowTool(TurnkeyBaseTool):
     """Complete transaction workflow: build, sign, and optionally broadcast"""
+
+    serial_only = True
     
     name: str = "complete_transaction_workflow"
     description: str = "Complete transaction workflow: build unsigned tx, sign with Turnkey, and optionally broadcast"
@@ -0,0 +1,62 @@
+import pickle
+
+from spoon_ai.rag.bm25 import BM25Index, BM25_INDEX_FILE, LEGACY_BM25_FILE
+
+
+def _ids(results):
+    return [id_ for id_, _, _, _ in results]
+
+
+def test_search_scores_only_matching_docs(tmp_path):
+    index = BM25Index(str(tmp_path / BM25_INDEX_FILE))
+    index.add(
+        "c",
+        ids=["a", "b", "c"],
+        texts=["install the sdk with pip", "the weather is nice", "pip pip pip install"],
+        metadatas=[{"source": "a.md"}, {"source": "b.md"}, {"source": "c.md"}],
+    )
+
+    results = index.search("c", "pip install", top_k=5)
+
+    assert _ids(results) == ["c", "a"]
+    assert results[0][1] > results[1][1] > 0
+    assert results[1][2] == "install the sdk with pip"
+    assert results[1][3] == {"source": "a.md"}
+    assert index.search("c", "unknown terms", top_k=5) == []
+    assert index.search("other", "pip", top_k=5) == []
+
+
+def test_incremental_add_delete_and_persistence(tmp_path):
+    path = str(tmp_path / BM25_INDEX_FILE)
+    index = BM25Index(path)
+    index.add("c", ids=["a", "b"], texts=["alpha beta", "beta gamma"])
+    index.add("c", ids=["c"], texts=["gamma delta"])
+    assert index.count("c") == 3
+
+    # Re-adding replaces the document
+    index.add("c", ids=["a"], texts=["delta"])
+    assert index.count("c") == 3
+    assert index.search("c", "alpha") == []
+
+    assert index.delete("c", ["b", "missing"]) == 1
+    assert _ids(index.search("c", "beta gamma", top_k=5)) == ["c"]
+    index.close()
+
+    reopened = BM25Index(path)
+    assert reopened.count("c") == 2
+    assert sorted(_ids(reopened.search("c", "delta", top_k=5))) == ["a", "c"]
+
+    reopened.clear("c")
+    assert reopened.count("c") == 0
+    assert reopened.search("c", "delta") == []
+
+
+def test_legacy_pickle_is_imported_once(tmp_path):
+    with open(tmp_path / LEGACY_BM25_FILE, "wb") as f:
+        pickle.dump({"ids": ["x"], "texts": ["legacy text"], "metadatas": [{"source": "old"}]}, f)
+
+    index = BM25Index.for_rag_dir(str(tmp_path), collection="docs", create=False)
+
+    assert not (tmp_path / LEGACY_BM25_FILE).exists()
+    assert _ids(index.search("docs", "legacy")) == ["x"]
+    assert BM25Index.for_rag_dir(str(tmp_path / "empty"), create=False) is None
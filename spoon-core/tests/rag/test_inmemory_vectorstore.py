@@ -0,0 +1,123 @@
+import random
+
+import pytest
+
+from spoon_ai.rag.vectorstores.base import InMemoryVectorStore
+
+
+@pytest.fixture(params=["numpy", "python"])
+def store(request):
+    s = InMemoryVectorStore()
+    if request.param == "numpy":
+        if s._np is None:
+            pytest.skip("numpy not installed")
+    else:
+        s._np = None
+    return s
+
+
+def _brute_force(vectors, q, top_k):
+    def cos(a, b):
+        dot = sum(x * y for x, y in zip(a, b))
+        na = sum(x * x for x in a) ** 0.5 or 1.0
+        nb = sum(y * y for y in b) ** 0.5 or 1.0
+        return dot / (na * nb)
+
+    scored = sorted(((id_, cos(q, v)) for id_, v in vectors.items()), key=lambda x: x[1], reverse=True)
+    return [id_ for id_, _ in scored[:top_k]]
+
+
+def test_batch_query_matches_brute_force(store):
+    rng = random.Random(7)
+    vectors = {f"v{i}": [rng.uniform(-1, 1) for _ in range(16)] for i in range(300)}
+    store.add(
+        collection="c",
+        ids=list(vectors),
+        embeddings=list(vectors.values()),
+        metadatas=[{"i": i} for i in range(len(vectors))],
+    )
+    queries = [[rng.uniform(-1, 1) for _ in range(16)] for _ in range(5)]
+
+    results = store.query(collection="c", query_embeddings=queries, top_k=10)
+
+    assert len(results) == len(queries)
+    for q, res in zip(queries, results):
+        assert [id_ for id_, _, _ in res] == _brute_force(vectors, q, 10)
+        scores = [score for _, score, _ in res]
+        assert scores == sorted(scores, reverse=True)
+
+
+def test_metadata_filter(store):
+    store.add(
+        collection="c",
+        ids=["a", "b", "c"],
+        embeddings=[[1.0, 0.0], [0.9, 0.1], [0.0, 1.0]],
+        metadatas=[{"source": "x"}, {"source": "y"}, {"source": "x", "tags": ["t"]}],
+    )
+
+    res = store.query(collection="c", query_embeddings=[[1.0, 0.0]], top_k=5, filter={"source": "x"})[0]
+    assert [id_ for id_, _, _ in res] == ["a", "c"]
+
+    res = store.query(collection="c", query_embeddings=[[1.0, 0.0]], top_k=5, filter={"tags": ["t"]})[0]
+    assert [id_ for id_, _, _ in res] == ["c"]
+
+    assert store.query(collection="c", query_embeddings=[[1.0, 0.0]], filter={"source": "z"}) == [[]]
+
+
+def test_none_filter_matches_missing_key(store):
+    store.add(
+        collection="c",
+        ids=["a", "b", "c", "d"],
+        embeddings=[[1.0, 0.0], [0.9, 0.1], [0.5, 0.5], [0.0, 1.0]],
+        metadatas=[{"source": "x"}, {"source": None}, {}, {"source": None, "lang": "en"}],
+    )
+    store.delete(collection="c", ids=["d"])
+
+    res = store.query(collection="c", query_embeddings=[[1.0, 0.0]], top_k=5, filter={"source": None})[0]
+    assert [id_ for id_, _, _ in res] == ["b", "c"]
+
+
+def test_upsert_delete_and_compaction(store):
+    ids = [f"v{i}" for i in range(10)]
+    store.add(
+        collection="c",
+        ids=ids,
+        embeddings=[[float(i), 1.0] for i in range(10)],
+        metadatas=[{"i": i} for i in range(10)],
+    )
+    # Re-adding an id replaces the vector and its metadata
+    store.add(collection="c", ids=["v0"], embeddings=[[1.0, 0.0]], metadatas=[{"i": "new"}])
+    top = store.query(collection="c", query_embeddings=[[1.0, 0.0]], top_k=1)[0][0]
+    assert top[0] == "v0" and top[2] == {"i": "new"}
+    assert store.count("c") == 10
+
+    assert store.delete(collection="c", ids=["v0", "v1", "v2", "missing"]) == 3
+    assert store.count("c") == 7
+    res = store.query(collection="c", query_embeddings=[[1.0, 0.0]], top_k=10)[0]
+    assert sorted(id_ for id_, _, _ in res) == sorted(ids[3:])
+    assert store._data["c"].deleted == 0  # compacted once tombstones passed 25%
+
+    store.delete_collection("c")
+    assert store.query(collection="c", query_embeddings=[[1.0, 0.0]]) == [[]]
+
+
+def test_dim_mismatch_raises(store):
+    store.add(collection="c", ids=["a"], embeddings=[[1.0, 0.0]], metadatas=[{}])
+    with pytest.raises(RuntimeError):
+        store.add(collection="c", ids=["b"], embeddings=[[1.0, 0.0, 0.0]], metadatas=[{}])
+
+
+def test_repeated_ids_in_one_batch_keep_the_last(store):
+    store.add(
+        collection="c",
+        ids=["a", "b", "a"],
+        embeddings=[[1.0, 0.0], [0.0, 1.0], [0.6, 0.8]],
+        metadatas=[{"v": 1}, {"v": 2}, {"v": 3}],
+    )
+
+    assert store.count("c") == 2
+    res = store.query(collection="c", query_embeddings=[[1.0, 0.0]], top_k=5)[0]
+    assert [(id_, md) for id_, _, md in res] == [("a", {"v": 3}), ("b", {"v": 2})]
+
+    assert store.delete(collection="c", ids=["a"]) == 1
+    assert [id_ for id_, _, _ in store.query(collection="c", query_embeddings=[[1.0, 0.0]], top_k=5)[0]] == ["b"]
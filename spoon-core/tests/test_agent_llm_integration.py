@@ -4,12 +4,14 @@ Integration tests for agents with the new LLM architecture.
 
 import pytest
 import asyncio
+from typing import Any
 from unittest.mock import Mock, AsyncMock, patch
 from spoon_ai.agents.toolcall import ToolCallAgent
 from spoon_ai.agents.spoon_react import SpoonReactAI
 from spoon_ai.chat import ChatBot
 from spoon_ai.schema import Message, LLMResponse, ToolCall, Function, AgentState
 from spoon_ai.tools import ToolManager
+from spoon_ai.tools.base import BaseTool
 
 
 class TestAgentLLMIntegration:
@@ -332,6 +334,102 @@ class TestAgentLLMIntegration:
             assert agent_legacy.llm.use_llm_manager is False
 
 
+class SleepTool(BaseTool):
+    """Tool that sleeps, recording start/end order."""
+
+    name: str = "sleep_tool"
+    description: str = "Sleep for a while"
+    parameters: dict = {"type": "object", "properties": {"delay": {"type": "number"}}}
+    events: Any = None
+
+    async def execute(self, delay: float = 0.05) -> str:
+        self.events.append(("start", self.name))
+        await asyncio.sleep(delay)
+        self.events.append(("end", self.name))
+        return f"{self.name} done"
+
+
+class SerialSleepTool(SleepTool):
+    """State-mutating tool that must not run concurrently."""
+
+    serial_only = True
+
+
+class TestToolCallConcurrency:
+    """Test concurrent tool-call execution in ToolCallAgent.act."""
+
+    def _agent(self, tools, tool_calls, **kwargs):
+        agent = ToolCallAgent(
+            name="test_agent",
+            llm=Mock(spec=ChatBot),
+            available_tools=ToolManager(tools),
+            **kwargs
+        )
+        agent.tool_calls = [
+            ToolCall(id=f"call_{i}", function=Function(name=name, arguments=arguments))
+            for i, (name, arguments) in enumerate(tool_calls)
+        ]
+        return agent
+
+    @pytest.mark.asyncio
+    async def test_independent_tools_run_concurrently_in_order(self):
+        events = []
+        tools = [SleepTool(name=f"tool_{i}", events=events) for i in range(3)]
+        agent = self._agent(tools, [
+            ("tool_0", '{"delay": 0.2}'),
+            ("tool_1", '{"delay": 0.1}'),
+            ("tool_2", '{"delay": 0.01}'),
+        ])
+
+        start = asyncio.get_running_loop().time()
+        await agent.act()
+        elapsed = asyncio.get_running_loop().time() - start
+
+        assert elapsed < 0.3
+        tool_messages = [m for m in agent.memory.messages if m.role == "tool"]
+        assert [m.tool_call_id for m in tool_messages] == ["call_0", "call_1", "call_2"]
+        assert "tool_0 done" in tool_messages[0].content
+
+    @pytest.mark.asyncio
+    async def test_serial_only_tool_is_not_parallelized(self):
+        events = []
+        tools = [
+            SleepTool(name="lookup", events=events),
+            SerialSleepTool(name="sign", events=events),
+            SleepTool(name="lookup_after", events=events),
+        ]
+        agent = self._agent(tools, [("lookup", "{}"), ("sign", "{}"), ("lookup_after", "{}")])
+
+        await agent.act()
+
+        sign_start = events.index(("start", "sign"))
+        sign_end = events.index(("end", "sign"))
+        assert events.index(("end", "lookup")) < sign_start
+        assert events.index(("start", "lookup_after")) > sign_end
+
+    @pytest.mark.asyncio
+    async def test_tool_timeout_produces_error_result(self):
+        tools = [SleepTool(name="slow", events=[]), SleepTool(name="fast", events=[])]
+        agent = self._agent(
+            tools, [("slow", '{"delay": 1.0}'), ("fast", "{}")], tool_timeouts={"slow": 0.05}
+        )
+
+        result = await agent.act()
+
+        assert "timed out" in result
+        assert "fast done" in result
+
+    @pytest.mark.asyncio
+    async def test_tool_own_timeout_error_without_configured_timeout(self):
+        agent = self._agent([SleepTool(name="remote", events=[])], [("remote", "{}")])
+
+        with patch.object(ToolCallAgent, "execute_tool", AsyncMock(side_effect=asyncio.TimeoutError("upstream deadline"))):
+            result = await agent.act()
+
+        assert "upstream deadline" in result
+        assert "None" not in result
+
+
 class TestAgentMigrationCompatibility:
     """Test migration compatibility between old and new architectures."""
     
@@ -0,0 +1,155 @@
+"""
+Tests for cache_control breakpoint planning in the Anthropic provider.
+
+Requests are captured from a mocked client, so breakpoint placement is
+checked on the payloads that would be sent.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from spoon_ai.llm.prompt_cache import PromptCachePlanner
+from spoon_ai.llm.providers.anthropic_provider import AnthropicProvider
+from spoon_ai.schema import Message
+
+SYSTEM = "You are a careful on-chain analyst. " * 200  # ~7000 chars, above the minimum prefix
+
+
+def _response(input_tokens=10, cache_creation=0, cache_read=0):
+    usage = SimpleNamespace(input_tokens=input_tokens, output_tokens=5,
+                            cache_creation_input_tokens=cache_creation, cache_read_input_tokens=cache_read)
+    return SimpleNamespace(id="msg_1", model="claude-sonnet-4-20250514", stop_reason="end_turn",
+                           content=[SimpleNamespace(text="ok")], usage=usage)
+
+
+async def _provider(**config):
+    provider = AnthropicProvider()
+    with patch("spoon_ai.llm.providers.anthropic_provider.AsyncAnthropic", return_value=MagicMock()):
+        await provider.initialize({"api_key": "key", "model": "claude-sonnet-4-20250514", **config})
+    provider.client.messages.create = AsyncMock(return_value=_response())
+    return provider
+
+
+def _payload(provider):
+    return provider.client.messages.create.await_args.kwargs
+
+
+def _marked(payload):
+    """Labels of the blocks carrying cache_control, in prefix order."""
+    labels = [f"tool:{i}" for i, tool in enumerate(payload.get("tools", [])) if "cache_control" in tool]
+    system = payload.get("system")
+    if isinstance(system, list) and "cache_control" in system[-1]:
+        labels.append("system")
+    for i, message in enumerate(payload["messages"]):
+        if isinstance(message["content"], list) and any("cache_control" in block for block in message["content"]):
+            labels.append(f"message:{i}")
+    return labels
+
+
+def _tool(i):
+    return {"type": "function", "function": {
+        "name": f"tool_{i}", "description": "Look up token balances. " * 40,
+        "parameters": {"type": "object", "properties": {"address": {"type": "string"}}},
+    }}
+
+
+class TestBreakpointPlacement:
+    """Test where breakpoints land across the turns of an agent loop."""
+
+    @pytest.mark.asyncio
+    async def test_agent_loop_reads_previous_tail(self):
+        provider = await _provider()
+        history = [Message(role="system", content=SYSTEM), Message(role="user", content="check wallet 0x1")]
+
+        await provider.chat(history)
+        assert _marked(_payload(provider)) == ["system", "message:0"]
+
+        history += [Message(role="assistant", content="balance is 3 ETH"), Message(role="user", content="and 0x2?")]
+        await provider.chat(history)
+        # message:0 was last turn's tail (a cache read); message:2 writes this turn's tail
+        assert _marked(_payload(provider)) == ["system", "message:0", "message:2"]
+
+        history += [Message(role="assistant", content="balance is 1 ETH"), Message(role="user", content="thanks")]
+        await provider.chat(history)
+        assert _marked(_payload(provider)) == ["system", "message:2", "message:4"]
+
+        metrics = provider.get_cache_metrics()
+        assert metrics["planned_requests"] == 3
+        assert metrics["stable_prefix_hits"] == 2
+        assert metrics["tail_reuses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_short_prompts_are_not_marked(self):
+        provider = await _provider()
+
+        await provider.chat([Message(role="system", content="Be brief."), Message(role="user", content="hi")])
+
+        payload = _payload(provider)
+        assert payload["system"] == "Be brief."
+        assert payload["messages"][0]["content"] == "hi"
+        assert provider.get_cache_metrics()["breakpoints_placed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_breakpoint_limit_includes_caller_marks(self):
+        provider = await _provider()
+        tools = provider._convert_tools([_tool(i) for i in range(8)])
+        user_block = {"type": "text", "text": "x" * 5000, "cache_control": {"type": "ephemeral"}}
+        params = {
+            "tools": tools,
+            "system": SYSTEM,
+            "messages": [
+                {"role": "user", "content": [user_block]},
+                {"role": "assistant", "content": "ok"},
+                {"role": "user", "content": "next"},
+            ],
+        }
+
+        provider._apply_cache_plan(params)
+
+        assert _marked(params) == ["tool:7", "system", "message:0", "message:2"]
+        assert "cache_control" not in tools[7]  # caller's tool definitions are left untouched
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_sends_plain_payload(self):
+        provider = await _provider(enable_prompt_cache=False)
+
+        await provider.chat([Message(role="system", content=SYSTEM), Message(role="user", content="hi")])
+
+        assert _marked(_payload(provider)) == []
+        assert _payload(provider)["system"] == SYSTEM
+
+
+class TestCacheMetrics:
+    """Test reporting of cache effectiveness."""
+
+    @pytest.mark.asyncio
+    async def test_hit_ratio_counts_all_prompt_tokens(self):
+        provider = await _provider()
+        provider.client.messages.create = AsyncMock(side_effect=[
+            _response(input_tokens=100, cache_creation=1900),
+            _response(input_tokens=100, cache_read=1900),
+        ])
+        messages = [Message(role="system", content=SYSTEM), Message(role="user", content="hi")]
+
+        await provider.chat(messages)
+        await provider.chat(messages)
+
+        metrics = provider.get_cache_metrics()
+        assert metrics["cache_read_input_tokens"] == 1900
+        assert metrics["cache_creation_input_tokens"] == 1900
+        assert metrics["total_input_tokens"] == 200
+        assert metrics["cache_hit_ratio"] == pytest.approx(1900 / 4000)
+
+    def test_unread_tail_writes_are_throttled(self):
+        planner = PromptCachePlanner(min_prefix_tokens=10, probe_every=8)
+        placed = []
+        for i in range(16):
+            params = {"messages": [{"role": "user", "content": f"unrelated question {i} " * 20}]}
+            placed.append(bool(planner.plan(params)))
+
+        # Four tail writes that were never read back, then only periodic probes
+        assert placed[:4] == [True] * 4
+        assert sum(placed[4:]) == 2
+        assert planner.get_stats()["tail_reuses"] == 0
@@ -0,0 +1,125 @@
+"""
+Tests for the Gemini provider's shared async client and image prefetching.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from spoon_ai.llm.providers.gemini_provider import GeminiProvider
+from spoon_ai.schema import Message
+
+
+def _response(text="hello"):
+    part = MagicMock(text=text)
+    candidate = MagicMock()
+    candidate.content.parts = [part]
+    return MagicMock(candidates=[candidate])
+
+
+def _fake_client():
+    client = MagicMock()
+    client.aio.models.generate_content = AsyncMock(return_value=_response())
+    client.aio.aclose = AsyncMock()
+    return client
+
+
+def _image_message(*urls):
+    content = [{"type": "text", "text": "what is this?"}]
+    content += [{"type": "image_url", "image_url": {"url": url}} for url in urls]
+    return Message(role="user", content=content)
+
+
+class _ImageResponse:
+    def __init__(self, data):
+        self.content = data
+        self.headers = {"Content-Type": "image/png"}
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def client_factory():
+    with patch("spoon_ai.llm.providers.gemini_provider.genai.Client", side_effect=lambda **_: _fake_client()) as factory:
+        yield factory
+
+
+async def _provider(**config):
+    provider = GeminiProvider()
+    await provider.initialize({"api_key": "key", "model": "gemini-2.5-flash", **config})
+    return provider
+
+
+class TestGeminiClient:
+    """Test client reuse and non-blocking generation."""
+
+    @pytest.mark.asyncio
+    async def test_client_is_created_once_and_closed_on_cleanup(self, client_factory):
+        provider = await _provider()
+
+        for _ in range(3):
+            response = await provider.chat([Message(role="user", content="hi")])
+            assert response.content == "hello"
+
+        assert client_factory.call_count == 1
+        client = provider.client
+        assert client.aio.models.generate_content.await_count == 3
+
+        await provider.cleanup()
+        client.aio.aclose.assert_awaited_once()
+        assert provider.client is None
+
+    @pytest.mark.asyncio
+    async def test_stream_uses_async_iterator(self, client_factory):
+        provider = await _provider()
+
+        async def chunks():
+            for text in ("Hel", "lo"):
+                yield _response(text)
+
+        provider.client.aio.models.generate_content_stream = AsyncMock(return_value=chunks())
+
+        deltas = [chunk.delta async for chunk in provider.chat_stream([Message(role="user", content="hi")])]
+
+        assert deltas == ["Hel", "lo"]
+
+    @pytest.mark.asyncio
+    async def test_default_base_url_is_left_to_the_sdk(self, client_factory):
+        await _provider(base_url="https://generativelanguage.googleapis.com/v1beta")
+        assert "http_options" not in client_factory.call_args.kwargs
+
+        await _provider(base_url="http://127.0.0.1:8080")
+        assert client_factory.call_args.kwargs["http_options"].base_url == "http://127.0.0.1:8080"
+
+
+class TestGeminiImages:
+    """Test async image download and the bounded image cache."""
+
+    @pytest.mark.asyncio
+    async def test_images_are_fetched_once_and_cached(self, client_factory):
+        provider = await _provider()
+        http_client = MagicMock(is_closed=False)
+        http_client.get = AsyncMock(side_effect=lambda url: _ImageResponse(b"png:" + url.encode()))
+        provider._http_client = http_client
+        message = _image_message("https://img/a.png", "https://img/b.png", "https://img/a.png")
+
+        await provider.chat([message])
+        await provider.chat([message])
+
+        assert sorted(call.args[0] for call in http_client.get.await_args_list) == ["https://img/a.png", "https://img/b.png"]
+        parts = provider.client.aio.models.generate_content.await_args.kwargs["contents"]
+        assert parts[1].inline_data.data == b"png:https://img/a.png"
+        assert parts[1].inline_data.mime_type == "image/png"
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded_by_bytes(self, client_factory):
+        provider = await _provider(image_cache_bytes=10)
+
+        provider._cache_image("a", (b"12345", "image/png"))
+        provider._cache_image("b", (b"12345", "image/png"))
+        provider._cache_image("c", (b"123", "image/png"))
+        provider._cache_image("huge", (b"x" * 11, "image/png"))
+
+        assert list(provider._image_cache) == ["b", "c"]
+        assert provider._image_cache_size == 8
@@ -0,0 +1,88 @@
+"""
+Tests for CompiledGraph.batch and abatch_as_completed.
+"""
+
+import asyncio
+from typing import TypedDict
+
+import pytest
+
+from spoon_ai.graph import END, GraphExecutionError, StateGraph
+
+
+class EvalState(TypedDict):
+    value: int
+    doubled: int
+
+
+def _compiled(tracker=None):
+    async def double(state):
+        if tracker is not None:
+            tracker["now"] += 1
+            tracker["peak"] = max(tracker["peak"], tracker["now"])
+        # Larger inputs finish first so completion order differs from input order
+        await asyncio.sleep(0.01 * (5 - state["value"] % 5))
+        if tracker is not None:
+            tracker["now"] -= 1
+        if state["value"] < 0:
+            raise ValueError("negative input")
+        return {"doubled": state["value"] * 2}
+
+    graph = StateGraph(EvalState)
+    graph.add_node("double", double)
+    graph.add_edge("double", END)
+    graph.set_entry_point("double")
+    return graph.compile()
+
+
+class TestBatch:
+    """Test ordering, concurrency caps, errors and thread ids."""
+
+    @pytest.mark.asyncio
+    async def test_results_in_input_order_under_cap(self):
+        tracker = {"now": 0, "peak": 0}
+        compiled = _compiled(tracker)
+
+        results = await compiled.batch([{"value": i} for i in range(10)], max_concurrency=3)
+
+        assert [r["doubled"] for r in results] == [i * 2 for i in range(10)]
+        assert tracker["peak"] == 3
+
+    @pytest.mark.asyncio
+    async def test_exceptions_are_returned_per_input(self):
+        compiled = _compiled()
+
+        results = await compiled.batch([{"value": 1}, {"value": -1}, {"value": 2}])
+
+        assert results[0]["doubled"] == 2
+        assert isinstance(results[1], GraphExecutionError)
+        assert results[2]["doubled"] == 4
+
+        with pytest.raises(GraphExecutionError):
+            await compiled.batch([{"value": 1}, {"value": -1}], return_exceptions=False)
+
+    @pytest.mark.asyncio
+    async def test_as_completed_yields_indices_and_uses_thread_ids(self):
+        compiled = _compiled()
+        inputs = [{"value": i} for i in range(1, 5)]
+
+        seen = [index async for index, _ in compiled.abatch_as_completed(inputs, thread_ids=["a", "b", "c", "d"])]
+
+        assert sorted(seen) == [0, 1, 2, 3]
+        assert seen != [0, 1, 2, 3]
+        assert compiled.graph.checkpointer.get_checkpoint("c").values["value"] == 3
+
+    @pytest.mark.asyncio
+    async def test_config_count_must_match(self):
+        compiled = _compiled()
+
+        with pytest.raises(ValueError):
+            await compiled.batch([{"value": 1}, {"value": 2}], config=[{}])
+
+    @pytest.mark.asyncio
+    async def test_rejects_pending_resume(self):
+        compiled = _compiled()
+        compiled._resume_thread_id = "t"
+
+        with pytest.raises(ValueError):
+            await compiled.batch([{"value": 1}, {"value": 2}])
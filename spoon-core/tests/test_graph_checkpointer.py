@@ -0,0 +1,239 @@
+"""
+Tests for the graph checkpointer backends.
+"""
+
+from collections import Counter, OrderedDict, defaultdict, namedtuple
+from datetime import datetime, timedelta
+
+import pytest
+
+from spoon_ai.graph import InMemoryCheckpointer, SQLiteCheckpointer, StateSnapshot
+
+_T0 = datetime(2024, 1, 1)
+
+Point = namedtuple("Point", ["x", "tags"])
+
+
+class Registry(dict):
+    """dict subclass with its own constructor and attributes."""
+
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+
+
+def _snapshot(values, step, created_at=None):
+    return StateSnapshot(
+        values=values,
+        next=("node",),
+        config={"thread_id": "t"},
+        metadata={"checkpoint_id": f"cp-{step}", "iteration": step},
+        created_at=created_at or _T0 + timedelta(seconds=step),
+    )
+
+
+def _history(steps):
+    """Return the states saved at each step of a growing message list."""
+    states = []
+    state = {"messages": [], "scratch": {"seen": set()}, "step": 0}
+    for step in range(steps):
+        state = {
+            "messages": state["messages"] + [{"role": "tool", "content": f"result {step}"}],
+            "scratch": {"seen": state["scratch"]["seen"] | {step}, "last": step},
+            "step": step,
+        }
+        if step % 5 == 0:
+            state.pop("scratch")
+            state["scratch"] = {"seen": set(), "reset": True}
+        states.append(state)
+    return states
+
+
+class TestDeltaCheckpoints:
+    """Test reconstruction, isolation and trimming of delta checkpoints."""
+
+    def test_every_checkpoint_round_trips(self):
+        checkpointer = InMemoryCheckpointer(keyframe_interval=4)
+        states = _history(30)
+        for step, state in enumerate(states):
+            checkpointer.save_checkpoint("t", _snapshot(state, step))
+
+        listed = checkpointer.list_checkpoints("t")
+        assert [c.values for c in listed] == states
+        for step in (0, 3, 4, 17, 29):
+            assert checkpointer.get_checkpoint("t", f"cp-{step}").values == states[step]
+        assert checkpointer.get_checkpoint("t").values == states[-1]
+
+    def test_live_state_mutation_does_not_leak(self):
+        checkpointer = InMemoryCheckpointer()
+        state = {"messages": [{"role": "user", "content": "hi"}], "data": {"nested": [1]}}
+        checkpointer.save_checkpoint("t", _snapshot(state, 0))
+
+        state["messages"].append({"role": "assistant", "content": "hello"})
+        state["messages"][0]["content"] = "changed"
+        state["data"]["nested"].append(2)
+
+        restored = checkpointer.get_checkpoint("t").values
+        assert restored == {"messages": [{"role": "user", "content": "hi"}], "data": {"nested": [1]}}
+
+        restored["messages"].append("mutated by caller")
+        assert checkpointer.get_checkpoint("t").values["messages"] == [{"role": "user", "content": "hi"}]
+
+    def test_container_subclasses_keep_their_type(self):
+        checkpointer = InMemoryCheckpointer(keyframe_interval=2)
+        states = []
+        for step in range(4):
+            registry = Registry("tools")
+            registry["echo"] = [step]
+            states.append({
+                "counts": defaultdict(list, {"a": list(range(step))}),
+                "order": OrderedDict([("z", step), ("a", [step])]),
+                "hits": Counter({"x": step}),
+                "point": Point(step, ["t"]),
+                "registry": registry,
+            })
+            checkpointer.save_checkpoint("t", _snapshot(states[-1], step))
+
+        for step in (0, 1, 3):
+            restored = checkpointer.get_checkpoint("t", f"cp-{step}").values
+            assert restored == states[step]
+            assert type(restored["counts"]) is defaultdict and restored["counts"].default_factory is list
+            assert type(restored["order"]) is OrderedDict and list(restored["order"]) == ["z", "a"]
+            assert type(restored["hits"]) is Counter
+            assert type(restored["point"]) is Point and restored["point"].tags == ["t"]
+            assert type(restored["registry"]) is Registry and restored["registry"].name == "tools"
+
+        restored["counts"]["missing"].append(1)
+        restored["registry"]["echo"].append(2)
+        assert checkpointer.get_checkpoint("t", "cp-3").values == states[3]
+
+    def test_trimming_rebases_oldest_checkpoint(self):
+        checkpointer = InMemoryCheckpointer(max_checkpoints_per_thread=10, keyframe_interval=8)
+        states = _history(25)
+        for step, state in enumerate(states):
+            checkpointer.save_checkpoint("t", _snapshot(state, step))
+
+        listed = checkpointer.list_checkpoints("t")
+        assert [c.values for c in listed] == states[-10:]
+        assert checkpointer.get_checkpoint("t", "cp-15").values == states[15]
+        assert checkpointer.get_checkpoint("t", "cp-14") is None
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_checkpointer(request, tmp_path):
+    """Build either backend with the same limits."""
+    opened = []
+
+    def make(**kwargs):
+        if request.param == "memory":
+            return InMemoryCheckpointer(**kwargs)
+        checkpointer = SQLiteCheckpointer(str(tmp_path / "checkpoints.sqlite3"), **kwargs)
+        opened.append(checkpointer)
+        return checkpointer
+
+    yield make
+    for checkpointer in opened:
+        checkpointer.close()
+
+
+class TestCheckpointerBackends:
+    """Test lookup, trimming, TTL and LRU on both backends."""
+
+    def test_lookup_by_id_and_trim(self, make_checkpointer):
+        checkpointer = make_checkpointer(max_checkpoints_per_thread=5)
+        for step in range(12):
+            checkpointer.save_checkpoint("t", _snapshot({"step": step}, step))
+
+        assert [c.values["step"] for c in checkpointer.list_checkpoints("t")] == list(range(7, 12))
+        assert checkpointer.get_checkpoint("t", "cp-8").values == {"step": 8}
+        assert checkpointer.get_checkpoint("t", "cp-3") is None
+        assert checkpointer.get_checkpoint("t").values == {"step": 11}
+        assert checkpointer.get_checkpoint("missing") is None
+
+    def test_repeated_checkpoint_id_returns_oldest_retained(self, make_checkpointer):
+        checkpointer = make_checkpointer(max_checkpoints_per_thread=3)
+        for step, checkpoint_id in enumerate(["x", "y", "x", "x"]):
+            snapshot = _snapshot({"step": step}, step)
+            snapshot.metadata["checkpoint_id"] = checkpoint_id
+            checkpointer.save_checkpoint("t", snapshot)
+
+        # The first "x" was trimmed; the next one is now the oldest
+        assert checkpointer.get_checkpoint("t", "x").values == {"step": 2}
+        assert checkpointer.get_checkpoint("t", "y").values == {"step": 1}
+
+    def test_least_recently_used_thread_is_evicted(self, make_checkpointer):
+        checkpointer = make_checkpointer(max_threads=2)
+        checkpointer.save_checkpoint("a", _snapshot({"n": 1}, 1))
+        checkpointer.save_checkpoint("b", _snapshot({"n": 2}, 2))
+        checkpointer.get_checkpoint("a")
+        checkpointer.save_checkpoint("c", _snapshot({"n": 3}, 3))
+        checkpointer.list_checkpoints("c")
+        # SQLite evicts on batch flushes, not on reads
+        getattr(checkpointer, "flush", lambda: None)()
+
+        assert checkpointer.get_checkpoint("b") is None
+        assert checkpointer.get_checkpoint("a").values == {"n": 1}
+        assert checkpointer.get_checkpoint("c").values == {"n": 3}
+
+    def test_expired_checkpoints_are_dropped(self, make_checkpointer):
+        checkpointer = make_checkpointer(ttl_seconds=60)
+        now = datetime.now()
+        checkpointer.save_checkpoint("old", _snapshot({"n": 0}, 0, now - timedelta(hours=1)))
+        checkpointer.save_checkpoint("t", _snapshot({"n": 1}, 1, now - timedelta(hours=1)))
+        checkpointer.save_checkpoint("t", _snapshot({"n": 2}, 2, now))
+
+        assert checkpointer.get_checkpoint("old") is None
+        assert [c.values for c in checkpointer.list_checkpoints("t")] == [{"n": 2}]
+
+    def test_clear_thread(self, make_checkpointer):
+        checkpointer = make_checkpointer()
+        checkpointer.save_checkpoint("t", _snapshot({"n": 1}, 1))
+        checkpointer.clear_thread("t")
+
+        assert checkpointer.list_checkpoints("t") == []
+
+
+def test_sqlite_reads_only_flush_their_own_thread(tmp_path):
+    checkpointer = SQLiteCheckpointer(str(tmp_path / "checkpoints.sqlite3"), batch_size=100, flush_interval=60)
+    checkpointer.save_checkpoint("a", _snapshot({"n": 1}, 1))
+    checkpointer.flush()
+    checkpointer.save_checkpoint("b", _snapshot({"n": 2}, 2))
+
+    assert checkpointer.get_checkpoint("a").values == {"n": 1}
+    assert [row[0] for row in checkpointer._pending] == ["b"]
+    assert checkpointer.get_checkpoint("b").values == {"n": 2}
+    assert checkpointer._pending == []
+    checkpointer.close()
+
+
+def test_sqlite_checkpoints_survive_reopen(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite3")
+    checkpointer = SQLiteCheckpointer(path, batch_size=100)
+    state = {"messages": [{"role": "user", "content": "hi"}]}
+    checkpointer.save_checkpoint("t", _snapshot(state, 0))
+    state["messages"].append({"role": "assistant", "content": "mutated after save"})
+    checkpointer.close()
+
+    reopened = SQLiteCheckpointer(path)
+    try:
+        restored = reopened.get_checkpoint("t", "cp-0")
+        assert restored.values == {"messages": [{"role": "user", "content": "hi"}]}
+        assert reopened.get_checkpoint_tuple({"configurable": {"thread_id": "t"}}).checkpoint["id"] == "cp-0"
+    finally:
+        reopened.close()
+
+
+def test_sqlite_thread_limit_is_shared_between_connections(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite3")
+    first = SQLiteCheckpointer(path, max_threads=2, batch_size=1)
+    second = SQLiteCheckpointer(path, max_threads=2, batch_size=1)
+    try:
+        first.save_checkpoint("a", _snapshot({"n": 1}, 1))
+        first.save_checkpoint("b", _snapshot({"n": 2}, 2))
+        second.save_checkpoint("c", _snapshot({"n": 3}, 3))
+
+        assert first.get_checkpoint("a") is None
+        assert [second.get_checkpoint(t).values["n"] for t in ("b", "c")] == [2, 3]
+    finally:
+        first.close()
+        second.close()
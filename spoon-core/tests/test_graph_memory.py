@@ -0,0 +1,105 @@
+"""
+Tests for the graph agent's JSONL-backed Memory.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from spoon_ai.graph import Memory
+
+
+def _lines(memory):
+    return memory.session_file.read_text(encoding="utf-8").splitlines()
+
+
+class TestMemoryStorage:
+    """Test the append-only log, compaction and recovery."""
+
+    def test_writes_append_one_line_and_reload(self, tmp_path):
+        memory = Memory(storage_path=str(tmp_path), session_id="s")
+        memory.add_message({"role": "user", "content": "hello"})
+        memory.add_message("plain text")
+        memory.set_metadata("topic", "greeting")
+
+        assert len(_lines(memory)) == 3
+
+        reloaded = Memory(storage_path=str(tmp_path), session_id="s")
+        assert [m["content"] for m in reloaded.get_messages()] == ["hello", "plain text"]
+        assert reloaded.get_metadata("topic") == "greeting"
+
+    def test_superseded_metadata_triggers_compaction(self, tmp_path):
+        memory = Memory(storage_path=str(tmp_path), session_id="s", compact_every=5)
+        memory.add_message({"content": "kept"})
+        for i in range(6):
+            memory.set_metadata("cursor", i)
+
+        assert len(_lines(memory)) == 2
+        assert Memory(storage_path=str(tmp_path), session_id="s").get_metadata("cursor") == 5
+
+    def test_torn_last_line_is_skipped_and_repaired(self, tmp_path):
+        memory = Memory(storage_path=str(tmp_path), session_id="s")
+        memory.add_message({"content": "one"})
+        memory.add_message({"content": "two"})
+        with open(memory.session_file, "a", encoding="utf-8") as f:
+            f.write('{"op": "message", "data": {"cont')
+
+        reloaded = Memory(storage_path=str(tmp_path), session_id="s")
+        assert [m["content"] for m in reloaded.get_messages()] == ["one", "two"]
+        assert len(_lines(reloaded)) == 2
+
+    def test_legacy_json_session_is_migrated(self, tmp_path):
+        legacy = {"messages": [{"content": "old", "timestamp": datetime.now().isoformat()}], "metadata": {"k": "v"}}
+        (tmp_path / "s.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+        memory = Memory(storage_path=str(tmp_path), session_id="s")
+        memory.add_message({"content": "new"})
+
+        reloaded = Memory(storage_path=str(tmp_path), session_id="s")
+        assert [m["content"] for m in reloaded.get_messages()] == ["old", "new"]
+        assert reloaded.get_metadata("k") == "v"
+
+    def test_clear_truncates_log(self, tmp_path):
+        memory = Memory(storage_path=str(tmp_path), session_id="s")
+        memory.add_message({"content": "gone"})
+        memory.clear()
+
+        assert _lines(memory) == []
+        assert Memory(storage_path=str(tmp_path), session_id="s").get_messages() == []
+
+
+class TestMemoryQueries:
+    """Test recent-message and search lookups."""
+
+    @pytest.mark.parametrize("in_order", [True, False])
+    def test_recent_messages(self, tmp_path, in_order):
+        memory = Memory(storage_path=str(tmp_path), session_id="s")
+        now = datetime.now()
+        ages = [48, 30, 2, 1] if in_order else [2, 48, 1, 30]
+        for hours in ages:
+            memory.add_message({"content": f"{hours}h", "timestamp": (now - timedelta(hours=hours)).isoformat()})
+        memory.add_message({"content": "bad", "timestamp": "not a date"})
+
+        recent = [m["content"] for m in memory.get_recent_messages(hours=24)]
+        expected = [f"{h}h" for h in ages if h < 24] + ["bad"]
+        assert recent == expected
+
+    @pytest.mark.parametrize("index_search", [False, True])
+    def test_search_matches_substrings_most_recent_first(self, tmp_path, index_search):
+        memory = Memory(storage_path=str(tmp_path), session_id="s", index_search=index_search)
+        for text in ["Swap ETH to USDC", "check balance", "swapping again", "ab", "bridge to base"]:
+            memory.add_message({"content": text})
+
+        assert [m["content"] for m in memory.search_messages("SWAP")] == ["swapping again", "Swap ETH to USDC"]
+        assert [m["content"] for m in memory.search_messages("swap", limit=1)] == ["swapping again"]
+        assert [m["content"] for m in memory.search_messages("ab")] == ["ab"]
+        assert memory.search_messages("solana") == []
+
+    def test_indexes_follow_direct_list_changes(self, tmp_path):
+        memory = Memory(storage_path=str(tmp_path), session_id="s", index_search=True)
+        memory.add_message({"content": "first"})
+        memory.messages.append({"content": "appended directly"})
+
+        assert [m["content"] for m in memory.search_messages("direct")] == ["appended directly"]
+        assert len(memory.get_recent_messages()) == 2
@@ -0,0 +1,106 @@
+"""
+Tests for parallel group resource controls.
+"""
+
+import asyncio
+from typing import Any, Dict, TypedDict
+
+import pytest
+
+from spoon_ai.graph import GraphExecutionError, StateGraph
+from spoon_ai.graph.config import ParallelGroupConfig
+
+
+class FanOutState(TypedDict):
+    results: Dict[str, Any]
+
+
+def _fan_out(width: int, config: ParallelGroupConfig, node_factory):
+    graph = StateGraph(FanOutState)
+    names = [f"branch_{i}" for i in range(width)]
+    for name in names:
+        graph.add_node(name, node_factory(name))
+    graph.set_entry_point(names[0])
+    graph.add_parallel_group("fan_out", names, config)
+    return graph.compile()
+
+
+class TestParallelGroupLimits:
+    """Test max_in_flight, rate limiting and the circuit breaker."""
+
+    @pytest.mark.asyncio
+    async def test_max_in_flight_caps_concurrency(self):
+        running = {"now": 0, "peak": 0}
+
+        def make(name):
+            async def node(state):
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+                await asyncio.sleep(0.01)
+                running["now"] -= 1
+                return {"results": {name: True}}
+            return node
+
+        compiled = _fan_out(8, ParallelGroupConfig(max_in_flight=2), make)
+        state = {"results": {}}
+        await compiled._execute_parallel_group("fan_out", state)
+
+        assert len(state["results"]) == 8
+        assert running["peak"] == 2
+        metrics = compiled.get_execution_metrics()["parallel_groups"]["fan_out"]
+        assert metrics["max_in_flight_seen"] == 2
+        assert metrics["branches_queued"] == 6
+        assert metrics["queued_time"] > 0
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_throttles_beyond_burst(self):
+        def make(name):
+            async def node(state):
+                return {"results": {name: True}}
+            return node
+
+        compiled = _fan_out(12, ParallelGroupConfig(rate_limit_per_second=20), make)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await compiled._execute_parallel_group("fan_out", {"results": {}})
+
+        # The first run spends 12 of the 20 burst tokens, so the second waits for refills
+        second = {"results": {}}
+        await compiled._execute_parallel_group("fan_out", second)
+        elapsed = loop.time() - start
+
+        metrics = compiled.get_execution_metrics()["parallel_groups"]["fan_out"]
+        assert len(second["results"]) == 12
+        assert metrics["throttled_time"] > 0
+        assert elapsed >= 0.15
+
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_opens_and_rejects(self):
+        calls = []
+
+        def make(name):
+            async def node(state):
+                calls.append(name)
+                raise RuntimeError("upstream unavailable")
+            return node
+
+        config = ParallelGroupConfig(
+            max_in_flight=1,
+            circuit_breaker_threshold=2,
+            circuit_breaker_cooldown=60,
+            error_strategy="collect_errors",
+        )
+        compiled = _fan_out(4, config, make)
+        state = {"results": {}}
+        await compiled._execute_parallel_group("fan_out", state)
+
+        # Branches queued behind the second failure never reach the node
+        assert len(calls) == 2
+        metrics = compiled.get_execution_metrics()["parallel_groups"]["fan_out"]
+        assert metrics["circuit_state"] == "open"
+        assert metrics["branches_rejected"] == 2
+
+        compiled.graph.parallel_group_configs["fan_out"].error_strategy = "fail_fast"
+        with pytest.raises(GraphExecutionError, match="Circuit breaker open"):
+            await compiled._execute_parallel_group("fan_out", {"results": {}})
+        assert len(calls) == 2
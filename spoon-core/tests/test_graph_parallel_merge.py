@@ -0,0 +1,134 @@
+"""
+Tests for branch-isolated state and delta merging in parallel groups.
+"""
+
+import asyncio
+from typing import Any, Dict, List, TypedDict
+
+import pytest
+
+from spoon_ai.graph import StateGraph
+from spoon_ai.graph.config import ParallelGroupConfig
+
+
+class BranchState(TypedDict):
+    messages: List[Dict[str, Any]]
+    items: List[str]
+    seen: Dict[str, Any]
+
+
+def _group(branches: Dict[str, Any], config: ParallelGroupConfig = None):
+    graph = StateGraph(BranchState)
+    for name, func in branches.items():
+        graph.add_node(name, func)
+    names = list(branches)
+    graph.set_entry_point(names[0])
+    graph.add_parallel_group("group", names, config or ParallelGroupConfig())
+    return graph.compile()
+
+
+def _initial():
+    return {"messages": [{"role": "user", "content": "start"}], "items": ["base"], "seen": {}}
+
+
+class TestParallelBranchState:
+    """Test copy-on-write branch views and deterministic merges."""
+
+    @pytest.mark.asyncio
+    async def test_deltas_merge_in_declaration_order(self):
+        def branch(name, delay):
+            async def node(state):
+                await asyncio.sleep(delay)
+                return {"messages": [{"role": "assistant", "content": name}], "seen": {name: True}}
+            return node
+
+        # Completion order is c, b, a; the merged order must follow declaration order
+        compiled = _group({"a": branch("a", 0.03), "b": branch("b", 0.02), "c": branch("c", 0.0)})
+        state = _initial()
+        await compiled._execute_parallel_group("group", state)
+
+        assert [m["content"] for m in state["messages"]] == ["start", "a", "b", "c"]
+        assert state["seen"] == {"a": True, "b": True, "c": True}
+
+    @pytest.mark.asyncio
+    async def test_in_place_writes_are_isolated_between_branches(self):
+        observed = {}
+
+        async def writer(state):
+            state["items"].append("from writer")
+            state["flag"] = "set by writer"
+            await asyncio.sleep(0.01)
+            return {}
+
+        async def reader(state):
+            await asyncio.sleep(0.005)
+            observed["items"] = list(state["items"])
+            observed["flag"] = state.get("flag")
+            return {}
+
+        async def failing(state):
+            state["items"].append("from failing")
+            raise RuntimeError("boom")
+
+        compiled = _group(
+            {"writer": writer, "reader": reader, "failing": failing},
+            ParallelGroupConfig(error_strategy="collect_errors"),
+        )
+        state = _initial()
+        shared_items = state["items"]
+        await compiled._execute_parallel_group("group", state)
+
+        assert observed == {"items": ["base"], "flag": None}
+        assert shared_items == ["base"]
+        assert state["items"] == ["base", "from writer"]
+        assert state["flag"] == "set by writer"
+        assert [e["node"] for e in state["__errors__"]] == ["failing"]
+
+    @pytest.mark.asyncio
+    async def test_any_join_discards_cancelled_branches(self):
+        async def fast(state):
+            return {"items": ["fast"]}
+
+        async def slow(state):
+            state["items"].append("partial")
+            await asyncio.sleep(1)
+            return {"items": ["slow"]}
+
+        compiled = _group({"fast": fast, "slow": slow}, ParallelGroupConfig(join_strategy="any"))
+        state = _initial()
+        await compiled._execute_parallel_group("group", state)
+
+        assert state["items"] == ["base", "fast"]
+
+    @pytest.mark.asyncio
+    async def test_in_place_appends_from_several_branches_are_merged(self):
+        def appender(name):
+            async def node(state):
+                state["items"].append(name)
+                state["seen"][name] = True
+                return {}
+            return node
+
+        compiled = _group({"a": appender("a"), "b": appender("b")})
+        state = _initial()
+        state["seen"] = {"base": True}
+        await compiled._execute_parallel_group("group", state)
+
+        assert state["items"] == ["base", "a", "b"]
+        assert state["seen"] == {"base": True, "a": True, "b": True}
+
+    @pytest.mark.asyncio
+    async def test_non_append_edit_falls_back_to_overwrite(self):
+        async def clearer(state):
+            state["items"].clear()
+            return {}
+
+        async def appender(state):
+            state["items"].append("added")
+            return {}
+
+        compiled = _group({"clearer": clearer, "appender": appender})
+        state = _initial()
+        await compiled._execute_parallel_group("group", state)
+
+        assert state["items"] == ["added"]
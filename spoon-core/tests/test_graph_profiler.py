@@ -0,0 +1,138 @@
+"""
+Tests for the graph profiler and execution metrics aggregates.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, TypedDict
+
+import pytest
+
+from spoon_ai.graph import END, GraphConfigurationError, GraphProfiler, StateGraph
+
+
+class LoopState(TypedDict):
+    messages: List[Dict[str, Any]]
+    step: int
+
+
+def _loop_graph(steps=3):
+    async def think(state):
+        await asyncio.sleep(0.002)
+        return {"step": state["step"] + 1, "messages": [{"role": "assistant", "content": "ok"}]}
+
+    async def act(state):
+        return {"messages": [{"role": "tool", "content": "result"}]}
+
+    graph = StateGraph(LoopState)
+    graph.add_node("think", think)
+    graph.add_node("act", act)
+    graph.add_edge("think", "act")
+    graph.add_conditional_edges("act", lambda s: "done" if s["step"] >= steps else "again", {"again": "think", "done": END})
+    graph.set_entry_point("think")
+    return graph
+
+
+class TestGraphProfiler:
+    """Test aggregates and trace export."""
+
+    def test_percentiles_are_within_bucket_resolution(self):
+        profiler = GraphProfiler(trace=False)
+        for ms in range(1, 101):
+            profiler.record("node", "n", 0, ms * 1_000_000)
+
+        stats = profiler.summary()["node"]["n"]
+        assert stats["count"] == 100
+        assert stats["total_ms"] == pytest.approx(5050)
+        assert stats["max_ms"] == pytest.approx(100)
+        assert 50 <= stats["p50_ms"] <= 50 * 1.1
+        assert 95 <= stats["p95_ms"] <= 100
+
+    def test_trace_buffer_is_bounded(self):
+        profiler = GraphProfiler(max_trace_events=10)
+        for i in range(50):
+            profiler.record("node", "n", i * 1000, i * 1000 + 500)
+
+        trace = profiler.chrome_trace()
+        spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        assert len(spans) == 10
+        assert profiler.summary()["node"]["n"]["count"] == 50
+
+    @pytest.mark.asyncio
+    async def test_run_records_every_category(self):
+        compiled = _loop_graph().compile()
+        compiled.enable_profiling()
+
+        await compiled.invoke({"messages": [], "step": 0}, {"configurable": {"thread_id": "run-1"}})
+
+        profile = compiled.get_execution_metrics()["profile"]
+        assert profile["node"]["think"]["count"] == 3
+        assert profile["node"]["think"]["p50_ms"] >= 1
+        assert profile["reducer"]["act"]["count"] == 3
+        assert profile["checkpoint"]["think"]["count"] == 3
+        assert profile["routing"]["act"]["count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_chrome_trace_filters_by_run(self, tmp_path):
+        compiled = _loop_graph().compile()
+        compiled.enable_profiling()
+
+        await asyncio.gather(
+            compiled.invoke({"messages": [], "step": 0}, {"configurable": {"thread_id": "a"}}),
+            compiled.invoke({"messages": [], "step": 0}, {"configurable": {"thread_id": "b"}}),
+        )
+        path = tmp_path / "trace.json"
+        compiled.export_chrome_trace(str(path), thread_id="a")
+
+        events = json.loads(path.read_text())["traceEvents"]
+        spans = [e for e in events if e["ph"] == "X"]
+        assert {e["tid"] for e in spans} == {1}
+        assert [e["name"] for e in spans if e["cat"] == "node"] == ["think", "act"] * 3
+        assert all(e["dur"] >= 0 for e in spans)
+
+    @pytest.mark.asyncio
+    async def test_stream_records_checkpoints_under_its_run(self):
+        compiled = _loop_graph().compile()
+        compiled.enable_profiling()
+
+        chunks = [c async for c in compiled.stream({"messages": [], "step": 0}, {"configurable": {"thread_id": "s"}})]
+
+        assert chunks[-1]["step"] == 3
+        assert compiled.get_execution_metrics()["profile"]["checkpoint"]["think"]["count"] == 3
+        spans = [e for e in compiled.profiler.chrome_trace(run="s")["traceEvents"] if e["ph"] == "X"]
+        assert [e["name"] for e in spans if e["cat"] == "node"] == ["think", "act"] * 3
+
+    def test_export_requires_profiling(self, tmp_path):
+        compiled = _loop_graph().compile()
+
+        with pytest.raises(GraphConfigurationError):
+            compiled.export_chrome_trace(str(tmp_path / "trace.json"))
+
+
+class TestExecutionMetrics:
+    """Test the bounded execution history and its running totals."""
+
+    @pytest.mark.asyncio
+    async def test_totals_cover_only_retained_history(self):
+        compiled = _loop_graph(steps=5).enable_monitoring().compile()
+        compiled.max_execution_history = 4
+
+        await compiled.invoke({"messages": [], "step": 0})
+
+        metrics = compiled.get_execution_metrics()
+        assert len(compiled.execution_history) == 4
+        assert metrics["total_executions"] == 4
+        assert metrics["node_stats"]["think"]["count"] == 2
+        assert metrics["node_stats"]["act"]["count"] == 2
+        assert metrics["success_rate"] == 1.0
+        assert "profile" not in metrics
+
+    @pytest.mark.asyncio
+    async def test_assigning_history_resets_totals(self):
+        compiled = _loop_graph().enable_monitoring().compile()
+        await compiled.invoke({"messages": [], "step": 0})
+
+        compiled.execution_history = []
+
+        assert compiled.get_execution_metrics()["total_executions"] == 0
+        assert compiled.get_execution_metrics()["node_stats"] == {}
@@ -0,0 +1,57 @@
+"""
+Tests for the graph state reducers.
+"""
+
+from spoon_ai.graph import add_messages, append_history
+from spoon_ai.memory.remove_message import REMOVE_ALL_MESSAGES, RemoveMessage
+from spoon_ai.schema import Message
+
+
+def _msg(msg_id, content="x"):
+    return {"id": msg_id, "role": "user", "content": content}
+
+
+class TestAddMessages:
+    """Test appends, id updates and removals in one pass."""
+
+    def test_appends_without_mutating_existing(self):
+        existing = [_msg("a"), {"role": "user", "content": "no id"}]
+
+        result = add_messages(existing, [_msg("b"), {"role": "assistant", "content": "no id"}])
+
+        assert [m.get("id") for m in result] == ["a", None, "b", None]
+        assert len(existing) == 2
+
+    def test_known_id_is_updated_in_place(self):
+        existing = [Message(id="a", role="user", content="old"), _msg("b")]
+
+        result = add_messages(existing, [Message(id="a", role="user", content="new"), _msg("c")])
+
+        assert [getattr(m, "id", None) or m["id"] for m in result] == ["a", "b", "c"]
+        assert result[0].content == "new"
+        assert existing[0].content == "old"
+
+    def test_removals_apply_in_order(self):
+        existing = [_msg("a"), _msg("b"), _msg("a", "dup"), _msg("c")]
+
+        result = add_messages(
+            existing,
+            [RemoveMessage(id="a"), _msg("a", "re-added"), {"type": "remove", "target_id": "c"}, _msg("d")],
+        )
+
+        assert [(m["id"], m["content"]) for m in result] == [("b", "x"), ("a", "re-added"), ("d", "x")]
+
+    def test_remove_all_resets_the_index(self):
+        result = add_messages([_msg("a"), _msg("b")], [RemoveMessage(id=REMOVE_ALL_MESSAGES), _msg("a", "fresh")])
+
+        assert result == [_msg("a", "fresh")]
+
+
+def test_append_history_appends_in_place():
+    history = [{"event": "start"}]
+
+    result = append_history(history, {"event": "step"})
+
+    assert result is history
+    assert result[-1]["event"] == "step"
+    assert "timestamp" in result[-1]
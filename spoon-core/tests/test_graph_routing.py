@@ -0,0 +1,59 @@
+"""
+Tests for compiled graph routing tables.
+"""
+
+from typing import TypedDict
+
+import pytest
+
+from spoon_ai.graph import END, StateGraph
+
+
+class QueryState(TypedDict):
+    user_query: str
+
+
+def _graph(*names):
+    graph = StateGraph(QueryState)
+    for name in names:
+        graph.add_node(name, lambda state: {})
+    graph.set_entry_point(names[0])
+    return graph
+
+
+class TestCompiledRouting:
+    """Test edge and rule resolution through the per-node tables."""
+
+    def test_edges_resolve_in_declaration_order(self):
+        graph = _graph("start", "gas", "other")
+        graph.add_edge("start", "gas", condition=lambda state: "gas" in state["user_query"])
+        graph.add_conditional_edges("start", lambda state: "x", {"x": "other"})
+        graph.add_edge("start", END)
+        compiled = graph.compile()
+
+        assert compiled._find_edge_target("start", {"user_query": "gas fees"}) == "gas"
+        assert compiled._find_edge_target("start", {"user_query": "price"}) == "other"
+        assert compiled._find_edge_target("gas", {"user_query": ""}) is None
+
+    def test_rules_respect_priority_and_kind(self):
+        graph = _graph("start", "price", "swap", "custom")
+        graph.add_routing_rule("start", "PRICE", "price", priority=1)
+        graph.add_pattern_routing("start", r"sw\w+", "swap", priority=2)
+        graph.add_routing_rule("start", lambda state, query: query.endswith("!"), "custom", priority=3)
+        compiled = graph.compile()
+
+        route = compiled._find_matching_route
+        assert route("start", {"user_query": "Price and Swap"}) == "swap"
+        assert route("start", {"user_query": "price please"}) == "price"
+        assert route("start", {"user_query": "swap now!"}) == "custom"
+        assert route("start", {"user_query": "bridge"}) is None
+
+    @pytest.mark.asyncio
+    async def test_rules_added_after_compile_are_used(self):
+        graph = _graph("start", "price")
+        compiled = graph.compile()
+        assert await compiled._determine_next_node("start", {"user_query": "price"}) is None
+
+        graph.add_routing_rule("start", "price", "price")
+
+        assert await compiled._determine_next_node("start", {"user_query": "price"}) == "price"
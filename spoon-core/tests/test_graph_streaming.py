@@ -0,0 +1,72 @@
+"""
+Tests for CompiledGraph.stream modes.
+"""
+
+from typing import Any, Dict, List, TypedDict
+
+import pytest
+
+from spoon_ai.graph import END, GraphConfigurationError, StateGraph
+
+
+class ChatState(TypedDict):
+    messages: List[Dict[str, Any]]
+    step: int
+    notes: str
+
+
+def _chat_graph():
+    async def think(state):
+        return {"step": state["step"] + 1, "messages": [{"role": "assistant", "content": "thinking"}]}
+
+    async def note(state):
+        return {"notes": "done"}
+
+    graph = StateGraph(ChatState)
+    graph.add_node("think", think)
+    graph.add_node("note", note)
+    graph.add_edge("think", "note")
+    graph.add_edge("note", END)
+    graph.set_entry_point("think")
+    return graph.compile()
+
+
+def _initial():
+    return {"messages": [{"role": "user", "content": "hi"}] * 50, "step": 0, "notes": ""}
+
+
+async def _collect(compiled, mode):
+    return [chunk async for chunk in compiled.stream(_initial(), stream_mode=mode)]
+
+
+class TestStreamModes:
+    """Test the payload of each stream mode."""
+
+    @pytest.mark.asyncio
+    async def test_updates_mode_yields_node_deltas(self):
+        chunks = await _collect(_chat_graph(), "updates")
+
+        assert chunks == [
+            {"think": {"step": 1, "messages": [{"role": "assistant", "content": "thinking"}]}},
+            {"note": {"notes": "done"}},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_messages_mode_yields_only_new_messages(self):
+        chunks = await _collect(_chat_graph(), "messages")
+
+        assert chunks == [{"node": "think", "messages": [{"role": "assistant", "content": "thinking"}]}]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mode", ["values", "debug"])
+    async def test_full_state_modes(self, mode):
+        chunks = await _collect(_chat_graph(), mode)
+
+        assert [c["step"] for c in chunks] == [1, 1, 1]
+        assert len(chunks[-1]["messages"]) == 51
+        assert chunks[-1]["notes"] == "done"
+
+    @pytest.mark.asyncio
+    async def test_unknown_mode_is_rejected(self):
+        with pytest.raises(GraphConfigurationError):
+            await _collect(_chat_graph(), "everything")
@@ -0,0 +1,137 @@
+"""
+Tests for LLM response caching.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from spoon_ai.llm.cache import LLMResponseCache, CachedLLMManager
+from spoon_ai.llm.errors import ProviderError
+from spoon_ai.llm.interface import LLMResponse
+from spoon_ai.schema import Message
+
+
+def _messages(text: str):
+    return [Message(role="user", content=text)]
+
+
+def _response(content: str) -> LLMResponse:
+    return LLMResponse(
+        content=content,
+        provider="mock",
+        model="mock-model",
+        finish_reason="stop",
+        native_finish_reason="stop"
+    )
+
+
+class TestLLMResponseCache:
+    """Test LRU/TTL behaviour and accounting of LLMResponseCache."""
+
+    def test_lru_eviction_keeps_recently_used(self):
+        cache = LLMResponseCache(max_size=2)
+        cache.set(_messages("a"), _response("A"))
+        cache.set(_messages("b"), _response("B"))
+
+        # Touch "a" so that "b" becomes least recently used
+        assert cache.get(_messages("a")).content == "A"
+        cache.set(_messages("c"), _response("C"))
+
+        assert cache.get(_messages("b")) is None
+        assert cache.get(_messages("a")).content == "A"
+        assert cache.get(_messages("c")).content == "C"
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_expired_entries_are_dropped_lazily(self):
+        cache = LLMResponseCache(default_ttl=10)
+        with patch("spoon_ai.llm.cache.time.monotonic", return_value=100.0):
+            cache.set(_messages("a"), _response("A"))
+        with patch("spoon_ai.llm.cache.time.monotonic", return_value=111.0):
+            assert cache.get(_messages("a")) is None
+
+        stats = cache.get_stats()
+        assert stats["size"] == 0
+        assert stats["expirations"] == 1
+        assert stats["total_bytes"] == 0
+
+    def test_hit_miss_and_byte_accounting(self):
+        cache = LLMResponseCache()
+        cache.set(_messages("a"), _response("hello"))
+        cache.set(_messages("a"), _response("hello world"))
+
+        assert cache.get(_messages("a")).content == "hello world"
+        assert cache.get(_messages("missing")) is None
+
+        stats = cache.get_stats()
+        assert stats["size"] == 1
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.5)
+        assert stats["evictions"] == 0
+        assert stats["total_bytes"] == len("hello world")
+
+        cache.clear()
+        assert cache.get_stats()["total_bytes"] == 0
+
+
+class SlowManager:
+    """Stand-in for LLMManager that counts provider calls."""
+
+    def __init__(self, delay: float = 0.05, error: Exception = None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def chat(self, messages, provider=None, **kwargs) -> LLMResponse:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return _response("shared")
+
+
+class TestCachedLLMManagerCoalescing:
+    """Test single-flight deduplication in CachedLLMManager."""
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_share_one_provider_call(self):
+        manager = SlowManager()
+        cached = CachedLLMManager(manager)
+
+        responses = await asyncio.gather(*[cached.chat(_messages("same")) for _ in range(10)])
+
+        assert manager.calls == 1
+        assert all(r.content == "shared" for r in responses)
+        stats = cached.get_cache_stats()
+        assert stats["coalesced_requests"] == 9
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_leader_error_propagates_to_followers(self):
+        manager = SlowManager(error=ProviderError("mock", "boom"))
+        cached = CachedLLMManager(manager)
+
+        results = await asyncio.gather(
+            *[cached.chat(_messages("same")) for _ in range(3)], return_exceptions=True
+        )
+
+        assert manager.calls == 1
+        assert all(isinstance(r, ProviderError) for r in results)
+        assert cached.get_cache_stats()["size"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_promotes_follower(self):
+        manager = SlowManager()
+        cached = CachedLLMManager(manager)
+
+        leader = asyncio.create_task(cached.chat(_messages("same")))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(cached.chat(_messages("same")))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        response = await follower
+        assert leader.cancelled()
+        assert response.content == "shared"
+        assert manager.calls == 2
@@ -0,0 +1,194 @@
+"""
+Tests for LLMManager provider-handle caching and DebugLogger bookkeeping.
+"""
+
+import asyncio
+import logging
+from unittest.mock import Mock, patch
+
+import pytest
+
+from spoon_ai.llm.config import ConfigurationManager, ProviderConfig
+from spoon_ai.llm.interface import LLMProviderInterface, LLMResponse, ProviderCapability, ProviderMetadata
+from spoon_ai.llm.manager import LLMManager
+from spoon_ai.llm.monitoring import DebugLogger, MetricsCollector
+from spoon_ai.llm.registry import LLMProviderRegistry
+from spoon_ai.schema import Message
+
+
+class EchoProvider(LLMProviderInterface):
+    """Provider that answers immediately; ``delay`` makes chat block for cancellation tests."""
+
+    _declared_capabilities = [ProviderCapability.CHAT, ProviderCapability.TOOLS]
+    delay = 0.0
+
+    async def initialize(self, config):
+        pass
+
+    async def chat(self, messages, **kwargs):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return LLMResponse(content="ok", provider="echo", model="echo", finish_reason="stop", native_finish_reason="stop")
+
+    async def chat_stream(self, messages, callbacks=None, **kwargs):
+        for text in ("a", "b", "c"):
+            yield text
+
+    async def completion(self, prompt, **kwargs):
+        return await self.chat([])
+
+    async def chat_with_tools(self, messages, tools, **kwargs):
+        return await self.chat(messages)
+
+    def get_metadata(self):
+        return ProviderMetadata(name="echo", version="1", capabilities=self._declared_capabilities,
+                                max_tokens=4096, supports_system_messages=True)
+
+    async def health_check(self):
+        return True
+
+    async def cleanup(self):
+        pass
+
+
+@pytest.fixture
+def config_manager():
+    config_manager = Mock(spec=ConfigurationManager)
+    config_manager.generation = 0
+    config_manager.list_configured_providers.return_value = []
+    config_manager.get_default_provider.return_value = "echo"
+    config_manager.get_fallback_chain.return_value = ["echo"]
+    config_manager.load_provider_config.side_effect = lambda name: ProviderConfig(name=name, api_key="key")
+    return config_manager
+
+
+@pytest.fixture
+def registry():
+    registry = LLMProviderRegistry()
+    registry.register("echo", EchoProvider)
+    return registry
+
+
+def _manager(config_manager, registry, debug_logger=None):
+    return LLMManager(
+        config_manager=config_manager,
+        debug_logger=debug_logger or DebugLogger(),
+        metrics_collector=MetricsCollector(),
+        registry=registry,
+    )
+
+
+MESSAGES = [Message(role="user", content="hi")]
+
+
+class TestProviderHandleCache:
+    """Test that provider resolution happens once until invalidated."""
+
+    @pytest.mark.asyncio
+    async def test_config_is_resolved_once(self, config_manager, registry):
+        manager = _manager(config_manager, registry)
+        await manager.chat(MESSAGES)
+        config_manager.load_provider_config.reset_mock()
+
+        for _ in range(5):
+            await manager.chat(MESSAGES)
+
+        assert config_manager.load_provider_config.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_config_reload_invalidates_handles(self, config_manager, registry):
+        manager = _manager(config_manager, registry)
+        await manager.chat(MESSAGES)
+        config_manager.load_provider_config.reset_mock()
+
+        config_manager.generation += 1
+        await manager.chat(MESSAGES)
+        await manager.chat(MESSAGES)
+
+        assert config_manager.load_provider_config.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_tool_capability_is_checked_once(self, config_manager, registry):
+        manager = _manager(config_manager, registry)
+        tools = [{"type": "function", "function": {"name": "noop", "description": "", "parameters": {}}}]
+
+        with patch.object(registry, "get_capabilities", wraps=registry.get_capabilities) as get_capabilities:
+            for _ in range(3):
+                await manager.chat_with_tools(MESSAGES, tools)
+            assert get_capabilities.call_count == 1
+
+            manager.invalidate_provider_cache("echo")
+            await manager.chat_with_tools(MESSAGES, tools)
+            assert get_capabilities.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_fallback_chain_change_is_picked_up(self, config_manager, registry):
+        registry.register("other", EchoProvider)
+        manager = _manager(config_manager, registry)
+        assert manager._get_providers_for_request(None) == ["echo"]
+
+        manager.set_fallback_chain(["other"])
+
+        assert manager._get_providers_for_request(None) == ["echo", "other"]
+
+
+class TestDebugLoggerBookkeeping:
+    """Test that requests always leave active_requests and disabled logging is skipped."""
+
+    @pytest.mark.asyncio
+    async def test_disabled_logger_is_not_called(self, config_manager, registry):
+        debug_logger = DebugLogger(enabled=False)
+        manager = _manager(config_manager, registry, debug_logger)
+
+        with patch.object(debug_logger, "log_request") as log_request:
+            response = await manager.chat(MESSAGES)
+
+        log_request.assert_not_called()
+        assert response.request_id == ""
+        assert debug_logger.get_request_history() == []
+
+    def test_default_follows_debug_level(self):
+        debug_logger = DebugLogger()
+        monitoring_logger = logging.getLogger("spoon_ai.llm.monitoring")
+        previous = monitoring_logger.level
+        try:
+            monitoring_logger.setLevel(logging.INFO)
+            assert debug_logger.enabled is False
+            assert debug_logger.log_request("echo", "chat", {}) == ""
+            monitoring_logger.setLevel(logging.DEBUG)
+            assert debug_logger.enabled is True
+        finally:
+            monitoring_logger.setLevel(previous)
+
+    @pytest.mark.asyncio
+    async def test_completed_stream_is_recorded(self, config_manager, registry):
+        debug_logger = DebugLogger(enabled=True)
+        manager = _manager(config_manager, registry, debug_logger)
+
+        chunks = [chunk async for chunk in manager.chat_stream(MESSAGES)]
+
+        assert chunks == ["a", "b", "c"]
+        assert debug_logger.active_requests == {}
+        assert [r.success for r in debug_logger.get_request_history()] == [True]
+
+    @pytest.mark.asyncio
+    async def test_abandoned_requests_do_not_leak(self, config_manager, registry):
+        debug_logger = DebugLogger(enabled=True)
+        manager = _manager(config_manager, registry, debug_logger)
+
+        stream = manager.chat_stream(MESSAGES)
+        await stream.__anext__()
+        await stream.aclose()
+
+        EchoProvider.delay = 10
+        try:
+            task = asyncio.create_task(manager.chat(MESSAGES))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        finally:
+            EchoProvider.delay = 0.0
+
+        assert debug_logger.active_requests == {}
+        assert [r.error for r in debug_logger.get_request_history()] == ["cancelled", "cancelled"]
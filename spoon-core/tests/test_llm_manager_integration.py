@@ -5,7 +5,7 @@ Integration tests for LLM Manager and related components.
 import pytest
 import asyncio
 from unittest.mock import Mock, AsyncMock, patch
-from spoon_ai.llm.manager import LLMManager, FallbackStrategy, LoadBalancer
+from spoon_ai.llm.manager import LLMManager, FallbackStrategy, LoadBalancer, CircuitBreaker, CircuitState
 from spoon_ai.llm.registry import LLMProviderRegistry
 from spoon_ai.llm.config import ConfigurationManager
 from spoon_ai.llm.monitoring import DebugLogger, MetricsCollector
@@ -338,6 +338,89 @@ class TestFallbackStrategy:
                 ["provider1", "provider2"], mock_operation
             )
 
+    @pytest.mark.asyncio
+    async def test_hedged_request_beats_slow_primary(self, debug_logger):
+        """A hedge to the next provider wins when the primary is slow."""
+        strategy = FallbackStrategy(debug_logger, enable_hedging=True, hedge_delay=0.05)
+        latencies = {"slow": 1.0, "fast": 0.01}
+        cancelled = []
+
+        async def mock_operation(provider):
+            try:
+                await asyncio.sleep(latencies[provider])
+            except asyncio.CancelledError:
+                cancelled.append(provider)
+                raise
+            return f"Success from {provider}"
+
+        start = asyncio.get_running_loop().time()
+        result = await strategy.execute_with_fallback(["slow", "fast"], mock_operation)
+        elapsed = asyncio.get_running_loop().time() - start
+
+        assert result == "Success from fast"
+        assert elapsed < 0.5
+        assert cancelled == ["slow"]
+        assert strategy.hedged_requests == 1
+        assert strategy.hedge_wins == 1
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_when_primary_is_fast(self, debug_logger):
+        """No hedge is sent when the primary answers within the hedge delay."""
+        strategy = FallbackStrategy(debug_logger, enable_hedging=True, hedge_delay=0.5)
+        calls = []
+
+        async def mock_operation(provider):
+            calls.append(provider)
+            await asyncio.sleep(0.01)
+            return f"Success from {provider}"
+
+        result = await strategy.execute_with_fallback(["provider1", "provider2"], mock_operation)
+
+        assert result == "Success from provider1"
+        assert calls == ["provider1"]
+        assert strategy.hedged_requests == 0
+
+    def test_hedge_delay_uses_latency_quantile(self, debug_logger):
+        """Hedge delay follows the recorded p95 once enough samples exist."""
+        strategy = FallbackStrategy(debug_logger, hedge_delay=2.0, min_hedge_samples=20)
+        assert strategy.get_hedge_delay("provider1") == 2.0
+
+        for i in range(1, 101):
+            strategy.record_latency("provider1", i / 100)
+
+        assert strategy.get_hedge_delay("provider1") == pytest.approx(0.95)
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_provider(self, debug_logger):
+        """Providers with an open circuit are skipped until recovery."""
+        strategy = FallbackStrategy(debug_logger, failure_threshold=2, recovery_timeout=60)
+        calls = []
+
+        async def mock_operation(provider):
+            calls.append(provider)
+            if provider == "provider1":
+                raise Exception("provider1 failed")
+            return f"Success from {provider}"
+
+        for _ in range(4):
+            await strategy.execute_with_fallback(["provider1", "provider2"], mock_operation)
+
+        assert calls.count("provider1") == 2
+        assert strategy.get_circuit_states()["provider1"] == "open"
+
+    def test_circuit_breaker_half_open_probe(self):
+        """A half-open circuit allows a single probe and closes on success."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+
+        assert breaker.allow_request()
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+
 
 class TestLoadBalancer:
     """Test load balancer."""
@@ -406,6 +489,78 @@ class TestLoadBalancer:
         assert "provider2" not in selections
         assert all(s in ["provider1", "provider3"] for s in selections)
 
+    def test_least_latency_selection(self, load_balancer):
+        """Test latency-aware selection avoids a slow provider."""
+        providers = ["provider1", "provider2"]
+        load_balancer.record_request_start("provider1")
+        load_balancer.record_request_end("provider1", 8.0)
+        load_balancer.record_request_start("provider2")
+        load_balancer.record_request_end("provider2", 0.3)
+
+        selections = [load_balancer.select_provider(providers, "least_latency") for _ in range(10)]
+        assert selections == ["provider2"] * 10
+
+    def test_least_latency_accounts_for_in_flight(self, load_balancer):
+        """Test outstanding requests push traffic to the other provider."""
+        providers = ["provider1", "provider2"]
+        for provider in providers:
+            load_balancer.record_request_start(provider)
+            load_balancer.record_request_end(provider, 1.0)
+
+        for _ in range(3):
+            load_balancer.record_request_start("provider1")
+
+        assert load_balancer.select_provider(providers, "least_latency") == "provider2"
+
+    def test_power_of_two_choices_prefers_faster_provider(self, load_balancer):
+        """Test p2c never picks the worse of the sampled pair."""
+        providers = ["provider1", "provider2"]
+        load_balancer.record_request_start("provider1")
+        load_balancer.record_request_end("provider1", 0.2)
+        load_balancer.record_request_start("provider2")
+        load_balancer.record_request_end("provider2", 0.1, success=False)
+
+        selections = [load_balancer.select_provider(providers, "p2c") for _ in range(20)]
+        assert selections == ["provider1"] * 20
+
+    def test_cold_start_burst_is_spread(self, load_balancer):
+        """Test unsampled providers are balanced by in-flight count against the prior."""
+        providers = ["provider1", "provider2", "provider3"]
+
+        selections = []
+        for _ in range(6):
+            selection = load_balancer.select_provider(providers, "least_latency")
+            load_balancer.record_request_start(selection)
+            selections.append(selection)
+
+        assert sorted(selections) == sorted(providers * 2)
+
+    def test_unsampled_provider_scores_at_mean_latency(self, load_balancer):
+        """Test the prior for a new provider is the mean of the sampled EWMAs."""
+        for provider, latency in (("provider1", 1.0), ("provider2", 3.0)):
+            load_balancer.record_request_start(provider)
+            load_balancer.record_request_end(provider, latency)
+
+        assert load_balancer.get_load_score("provider3") == pytest.approx(2.0)
+        load_balancer.record_request_start("provider3")
+        assert load_balancer.select_provider(["provider1", "provider3"], "least_latency") == "provider1"
+
+
+    def test_penalised_provider_recovers_traffic(self, load_balancer):
+        """Test a failure penalty decays so the provider is selected again."""
+        providers = ["provider1", "provider2"]
+        with patch("spoon_ai.llm.manager.time.monotonic", return_value=1000.0):
+            load_balancer.record_request_start("provider1")
+            load_balancer.record_request_end("provider1", 0.1, success=False)
+            load_balancer.record_request_start("provider2")
+            load_balancer.record_request_end("provider2", 0.5)
+            for _ in range(3):
+                load_balancer.record_request_start("provider2")
+            assert load_balancer.select_provider(providers, "least_latency") == "provider2"
+
+        with patch("spoon_ai.llm.manager.time.monotonic", return_value=1000.0 + 10 * load_balancer.decay_seconds):
+            assert load_balancer.select_provider(providers, "least_latency") == "provider1"
+
 
 class TestConfigurationPlaceholders:
     """Ensure placeholder values are surfaced as configuration errors."""
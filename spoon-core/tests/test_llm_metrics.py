@@ -0,0 +1,197 @@
+"""
+Tests for latency histograms and the OpenMetrics exporter in the LLM monitoring module.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from spoon_ai.llm.config import ConfigurationManager, ProviderConfig
+from spoon_ai.llm.interface import LLMProviderInterface, LLMResponse, ProviderCapability, ProviderMetadata
+from spoon_ai.llm.manager import LLMManager
+from spoon_ai.llm.monitoring import (
+    OPENMETRICS_CONTENT_TYPE,
+    DebugLogger,
+    LatencyHistogram,
+    MetricsCollector,
+    create_metrics_router,
+)
+from spoon_ai.llm.registry import LLMProviderRegistry
+from spoon_ai.schema import Message
+
+
+def _samples(text):
+    """Map ``name{labels}`` to value for every sample line of an exposition."""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+class TimingOutProvider(LLMProviderInterface):
+    """Provider configured for gpt-4.1 whose second call times out."""
+
+    def __init__(self):
+        self.model = ""
+        self.calls = 0
+
+    async def initialize(self, config):
+        self.model = config["model"]
+
+    async def chat(self, messages, **kwargs):
+        self.calls += 1
+        if self.calls > 1:
+            await asyncio.sleep(0.2)
+            raise asyncio.TimeoutError("request timed out")
+        # The response reports a dated snapshot; metrics use the requested model
+        return LLMResponse(content="ok", provider="openai", model="gpt-4.1-2025-04-14",
+                           finish_reason="stop", native_finish_reason="stop")
+
+    async def chat_stream(self, messages, callbacks=None, **kwargs):
+        yield "ok"
+
+    async def completion(self, prompt, **kwargs):
+        return await self.chat([])
+
+    async def chat_with_tools(self, messages, tools, **kwargs):
+        return await self.chat(messages)
+
+    def get_metadata(self):
+        return ProviderMetadata(name="openai", version="1", capabilities=[ProviderCapability.CHAT],
+                                max_tokens=4096, supports_system_messages=True)
+
+    async def health_check(self):
+        return True
+
+    async def cleanup(self):
+        pass
+
+
+class TestLatencyHistogram:
+    """Test bucket counting and percentile estimates."""
+
+    def test_percentiles_are_interpolated_within_buckets(self):
+        histogram = LatencyHistogram()
+        for i in range(1000):
+            histogram.observe(i / 500)  # uniform over [0, 2) seconds
+
+        assert histogram.count == 1000
+        assert histogram.quantile(0.5) == pytest.approx(1.0, abs=0.05)
+        assert histogram.quantile(0.9) == pytest.approx(1.8, abs=0.1)
+        assert histogram.quantile(1.0) == pytest.approx(histogram.max)
+
+    def test_values_above_the_last_bound_are_capped_by_max(self):
+        histogram = LatencyHistogram(bounds=(1.0, 2.0))
+        for value in (0.5, 3.0, 9.0):
+            histogram.observe(value)
+
+        assert histogram.cumulative() == [("1.0", 1), ("2.0", 1), ("+Inf", 3)]
+        assert 2.0 < histogram.quantile(0.99) <= 9.0
+
+
+class TestMetricsCollector:
+    """Test per provider/model series and their exposition."""
+
+    def _collector(self):
+        collector = MetricsCollector()
+        collector.record_request("openai", "chat", 0.4, True, tokens=100, model="gpt-4.1")
+        collector.record_request("openai", "chat", 1.2, True, tokens=50, model="gpt-4.1")
+        collector.record_request("openai", "chat", 8.0, False, model="gpt-4.1", error="timeout")
+        collector.record_request("anthropic", "chat_with_tools", 2.0, True, tokens=10, model='claude "x"')
+        return collector
+
+    def test_series_counters(self):
+        collector = self._collector()
+
+        series = collector.series[("openai", "gpt-4.1")]
+        assert (series.requests, series.errors, series.tokens) == (3, 1, 150)
+        assert series.cost == pytest.approx(150 * 0.00003)
+        assert collector.get_latency_percentiles("openai")["p99"] > 5.0
+        assert collector.get_summary()["total_requests"] == 4
+
+    def test_openmetrics_exposition(self):
+        text = self._collector().render_openmetrics()
+        samples = _samples(text)
+        openai = 'provider="openai",model="gpt-4.1"'
+
+        assert text.endswith("# EOF\n")
+        assert samples[f'spoon_llm_request_duration_seconds_bucket{{{openai},le="0.5"}}'] == 1
+        assert samples[f'spoon_llm_request_duration_seconds_bucket{{{openai},le="+Inf"}}'] == 3
+        assert samples[f"spoon_llm_request_duration_seconds_count{{{openai}}}"] == 3
+        assert samples[f"spoon_llm_request_duration_seconds_sum{{{openai}}}"] == pytest.approx(9.6)
+        assert samples[f"spoon_llm_requests_total{{{openai}}}"] == 3
+        assert samples[f"spoon_llm_errors_total{{{openai}}}"] == 1
+        assert samples[f"spoon_llm_tokens_total{{{openai}}}"] == 150
+        assert 'spoon_llm_requests_total{provider="anthropic",model="claude \\"x\\""} 1' in text
+
+    def test_missing_model_is_one_series(self):
+        collector = MetricsCollector()
+        collector.record_request("openai", "chat", 0.1, True, model="gpt-4.1")
+        collector.record_request("openai", "chat", 0.2, True, model=None)
+        collector.record_request("openai", "chat", 0.3, False)
+
+        samples = _samples(collector.render_openmetrics())
+
+        assert samples['spoon_llm_requests_total{provider="openai",model="unknown"}'] == 2
+        assert samples['spoon_llm_errors_total{provider="openai",model="unknown"}'] == 1
+        assert sorted(collector.series) == [("openai", "gpt-4.1"), ("openai", "unknown")]
+
+    def test_rolling_window_still_returns_dicts(self):
+        collector = MetricsCollector(window_size=60)
+        collector.rolling_metrics.append((time.time() - 120, "openai", "chat", 1.0, True, 0, "", None))
+        collector.record_request("openai", "chat", 0.5, True, model="gpt-4.1")
+
+        metrics = collector.get_rolling_metrics(provider="openai")
+
+        assert len(metrics) == 1
+        assert metrics[0]["duration"] == 0.5
+        assert isinstance(metrics[0]["timestamp"], datetime)
+
+    def test_metrics_router(self):
+        collector = self._collector()
+        app = FastAPI()
+        app.include_router(create_metrics_router(collector))
+
+        response = TestClient(app).get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == OPENMETRICS_CONTENT_TYPE
+        assert response.text == collector.render_openmetrics()
+
+
+class TestManagerRecording:
+    """Test that the manager records every outcome under the requested model."""
+
+    @pytest.mark.asyncio
+    async def test_failures_are_labelled_with_the_model(self):
+        config_manager = Mock(spec=ConfigurationManager)
+        config_manager.generation = 0
+        config_manager.list_configured_providers.return_value = []
+        config_manager.get_default_provider.return_value = "openai"
+        config_manager.get_fallback_chain.return_value = ["openai"]
+        config_manager.load_provider_config.side_effect = lambda name: ProviderConfig(
+            name=name, api_key="key", model="gpt-4.1")
+        registry = LLMProviderRegistry()
+        registry.register("openai", TimingOutProvider)
+        collector = MetricsCollector()
+        manager = LLMManager(config_manager=config_manager, debug_logger=DebugLogger(),
+                             metrics_collector=collector, registry=registry)
+        messages = [Message(role="user", content="hi")]
+
+        await manager.chat(messages)
+        with pytest.raises(Exception):
+            await manager.chat(messages)
+
+        samples = _samples(collector.render_openmetrics())
+        openai = 'provider="openai",model="gpt-4.1"'
+        assert samples[f"spoon_llm_requests_total{{{openai}}}"] == 2
+        assert samples[f"spoon_llm_errors_total{{{openai}}}"] == 1
+        assert not any('model="unknown"' in name for name in samples)
+        assert collector.get_latency_percentiles("openai", "gpt-4.1")["p99"] > 0.1  # only the timeout is slower than the first bucket
@@ -0,0 +1,228 @@
+"""
+Tests for pooled MCP sessions.
+"""
+
+import asyncio
+import sys
+import textwrap
+
+import pytest
+from fastmcp.client.transports import PythonStdioTransport
+
+from spoon_ai.agents.mcp_client_mixin import MCPClientMixin, MCPSessionPool, set_mcp_session_pool
+
+
+class FakeMCPClient:
+    """Stand-in for fastmcp.Client that counts transport handshakes."""
+
+    def __init__(self):
+        self.handshakes = 0
+        self.connected = False
+        self.alive = True
+
+    async def __aenter__(self):
+        self.handshakes += 1
+        self.connected = True
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.connected = False
+
+    def is_connected(self) -> bool:
+        return self.connected and self.alive
+
+    async def ping(self) -> bool:
+        return self.alive
+
+    async def list_tools(self):
+        if not self.alive:
+            raise ConnectionError("connection lost")
+        return []
+
+
+class TestMCPSessionPool:
+    """Test session reuse, eviction and reconnect behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_sessions_are_reused(self):
+        pool = MCPSessionPool()
+        client = FakeMCPClient()
+
+        for _ in range(5):
+            async with pool.session("server", lambda: client) as session:
+                await session.list_tools()
+
+        assert client.handshakes == 1
+        assert pool.get_stats()["reused"] == 4
+
+    @pytest.mark.asyncio
+    async def test_dropped_connection_reconnects(self):
+        pool = MCPSessionPool()
+        client = FakeMCPClient()
+
+        client.alive = False
+        with pytest.raises(ConnectionError):
+            async with pool.session("server", lambda: client) as session:
+                await session.list_tools()
+
+        client.alive = True
+        async with pool.session("server", lambda: client) as session:
+            await session.list_tools()
+
+        assert client.handshakes == 2
+        assert pool.get_stats()["reconnected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_transport_error_reconnects_even_if_client_looks_connected(self):
+        pool = MCPSessionPool()
+        client = FakeMCPClient()
+
+        with pytest.raises(RuntimeError):
+            async with pool.session("server", lambda: client):
+                try:
+                    raise BrokenPipeError("stream closed")
+                except BrokenPipeError as e:
+                    raise RuntimeError("call failed") from e
+        assert client.is_connected()
+
+        async with pool.session("server", lambda: client):
+            pass
+
+        assert client.handshakes == 2
+        assert pool.get_stats()["reconnected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_tool_errors_keep_the_session(self):
+        pool = MCPSessionPool()
+        client = FakeMCPClient()
+
+        with pytest.raises(ValueError):
+            async with pool.session("server", lambda: client):
+                raise ValueError("bad arguments")
+        with pytest.raises(asyncio.TimeoutError):
+            async with pool.session("server", lambda: client):
+                await asyncio.wait_for(asyncio.sleep(1), 0.01)
+        async with pool.session("server", lambda: client):
+            pass
+
+        assert client.handshakes == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_session_still_in_use_is_replaced_not_closed(self):
+        pool = MCPSessionPool()
+        clients = []
+
+        def factory():
+            clients.append(FakeMCPClient())
+            return clients[-1]
+
+        async with pool.session("server", factory) as busy:
+            with pytest.raises(ConnectionError):
+                async with pool.session("server", factory):
+                    raise ConnectionError("connection reset")
+
+            async with pool.session("server", factory) as fresh:
+                assert fresh is not busy
+            assert busy.connected  # the in-flight caller keeps its session
+
+        assert [c.connected for c in clients] == [False, True]
+        assert pool.get_stats()["reconnected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_reconnects(self):
+        pool = MCPSessionPool(probe_interval=0)
+        client = FakeMCPClient()
+
+        async with pool.session("server", lambda: client):
+            pass
+        client.alive = False
+        async with pool.session("server", lambda: client):
+            pass
+
+        assert client.handshakes == 2
+
+    @pytest.mark.asyncio
+    async def test_max_size_evicts_least_recently_used(self):
+        pool = MCPSessionPool(max_size=1)
+        first, second = FakeMCPClient(), FakeMCPClient()
+
+        async with pool.session("first", lambda: first):
+            pass
+        async with pool.session("second", lambda: second):
+            pass
+
+        assert not first.connected
+        assert second.connected
+        assert pool.get_stats()["evicted"] == 1
+
+    def test_new_event_loop_gets_fresh_sessions(self):
+        pool = MCPSessionPool()
+        clients = []
+
+        def factory():
+            clients.append(FakeMCPClient())
+            return clients[-1]
+
+        async def use():
+            async with pool.session("server", factory) as session:
+                await session.list_tools()
+            async with pool.session("server", factory) as session:
+                await session.list_tools()
+
+        asyncio.run(use())
+        asyncio.run(use())
+
+        assert [c.handshakes for c in clients] == [1, 1]
+        assert pool.get_stats()["rebound"] == 1
+
+    @pytest.mark.asyncio
+    async def test_max_size_with_all_sessions_busy(self):
+        pool = MCPSessionPool(max_size=1)
+
+        async with pool.session("first", FakeMCPClient):
+            with pytest.raises(RuntimeError):
+                async with pool.session("second", FakeMCPClient):
+                    pass
+
+
+STDIO_SERVER = textwrap.dedent(
+    """
+    from fastmcp import FastMCP
+
+    mcp = FastMCP("echo")
+
+    @mcp.tool()
+    def echo(text: str) -> str:
+        return text
+
+    if __name__ == "__main__":
+        mcp.run()
+    """
+)
+
+
+@pytest.mark.asyncio
+async def test_stdio_server_shares_one_connection(tmp_path):
+    """Clients targeting the same local stdio server share one pooled session."""
+    script = tmp_path / "echo_server.py"
+    script.write_text(STDIO_SERVER)
+    pool = MCPSessionPool()
+    set_mcp_session_pool(pool)
+
+    try:
+        first = MCPClientMixin(PythonStdioTransport(script_path=str(script), python_cmd=sys.executable),
+                               pool_key="echo")
+        second = MCPClientMixin(PythonStdioTransport(script_path=str(script), python_cmd=sys.executable),
+                                pool_key="echo")
+
+        for client in (first, second):
+            async with client.get_session() as session:
+                tools = await session.list_tools()
+                assert [tool.name for tool in tools] == ["echo"]
+
+        stats = pool.get_stats()
+        assert stats["created"] == 1
+        assert stats["reused"] == 1
+    finally:
+        await pool.close_all()
+        set_mcp_session_pool(MCPSessionPool())
@@ -0,0 +1,317 @@
+"""
+Tests for the NFT mint queue and its local nonce manager.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from web3 import Web3
+from web3.exceptions import ContractLogicError, TransactionNotFound
+
+from spoon_ai.nft.mint_queue import ClaimStatus, MintClaim, MintQueue, NonceManager
+
+ARTIFACT = Path(__file__).resolve().parents[2] / "contract" / "out" / "GameBadgeNFT.sol" / "GameBadgeNFT.json"
+
+
+class ChainCounter:
+    """Stand-in for eth_getTransactionCount(address, "pending")."""
+
+    def __init__(self, count: int = 0):
+        self.count = count
+        self.calls = 0
+
+    async def __call__(self) -> int:
+        self.calls += 1
+        return self.count
+
+
+class TestNonceManager:
+    """Test nonce reservation, gap recovery and resync."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reservations_are_unique(self):
+        chain = ChainCounter(7)
+        nonces = NonceManager(chain)
+
+        reserved = await asyncio.gather(*[nonces.reserve() for _ in range(50)])
+
+        assert sorted(reserved) == list(range(7, 57))
+        assert chain.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_released_nonce_is_reused_first(self):
+        nonces = NonceManager(ChainCounter(0))
+        for _ in range(4):
+            await nonces.reserve()
+
+        await nonces.release(1)
+        assert nonces.gaps == [1]
+        assert await nonces.reserve() == 1
+        assert await nonces.reserve() == 4
+
+    @pytest.mark.asyncio
+    async def test_releasing_top_nonces_rolls_back(self):
+        nonces = NonceManager(ChainCounter(0))
+        for _ in range(3):
+            await nonces.reserve()
+
+        await nonces.release(1)
+        await nonces.release(2)
+
+        assert nonces.gaps == []
+        assert nonces.next_nonce == 1
+
+    @pytest.mark.asyncio
+    async def test_resync_skips_nonces_used_elsewhere(self):
+        chain = ChainCounter(0)
+        nonces = NonceManager(chain)
+        for _ in range(3):
+            await nonces.reserve()
+        await nonces.release(0)
+
+        chain.count = 10
+        await nonces.resync()
+
+        assert nonces.gaps == []
+        assert await nonces.reserve() == 10
+
+
+class StubChain:
+    """In-memory stand-in for the web3 and contract calls MintQueue makes.
+
+    Every broadcast is mined immediately unless its nonce is listed in
+    ``drop`` (dropped once, as if evicted from the mempool). ``stale_counts``
+    are returned by the pending-count query before the real value, as a node
+    lagging behind another sender would.
+    """
+
+    def __init__(self):
+        self.next_nonce = 0
+        self.stale_counts = []
+        self.drop = set()
+        self.revert = None
+        self.sent = []
+        self.receipts = {}
+        self.known = set()
+        self.web3 = SimpleNamespace(
+            keccak=Web3.keccak,
+            to_hex=Web3.to_hex,
+            eth=SimpleNamespace(
+                chain_id=1337,
+                gas_price=1,
+                account=SimpleNamespace(sign_transaction=lambda tx, key: SimpleNamespace(raw_transaction=tx)),
+                get_transaction_count=self.get_transaction_count,
+                send_raw_transaction=self.send_raw_transaction,
+                get_transaction_receipt=self.get_transaction_receipt,
+                get_transaction=self.get_transaction,
+            ),
+        )
+        minted = SimpleNamespace(process_receipt=lambda receipt, errors=None: [{"args": {"tokenId": receipt["tokenId"]}}])
+        self.contract = SimpleNamespace(
+            functions=SimpleNamespace(mintTo=self.mint_to),
+            events=SimpleNamespace(Minted=lambda: minted),
+        )
+        self.account = SimpleNamespace(address="0x" + "aa" * 20)
+
+    def queue(self, **kwargs):
+        return MintQueue(self.web3, self.contract, self.account, "key", poll_interval=0.01, **kwargs)
+
+    def mint_to(self, to_address, game_id, claim_bytes):
+        def estimate_gas(tx):
+            if self.revert:
+                raise ContractLogicError(f"execution reverted: {self.revert}")
+            return 100000
+        return SimpleNamespace(estimate_gas=estimate_gas, build_transaction=dict)
+
+    def get_transaction_count(self, address, block):
+        return self.stale_counts.pop(0) if self.stale_counts else self.next_nonce
+
+    def send_raw_transaction(self, tx):
+        if tx["nonce"] < self.next_nonce:
+            raise ValueError("nonce too low")
+        tx_hash = Web3.keccak(text=f"{tx['nonce']}:{len(self.sent)}")
+        self.sent.append(tx["nonce"])
+        if tx["nonce"] in self.drop:
+            self.drop.discard(tx["nonce"])
+        else:
+            self.next_nonce = tx["nonce"] + 1
+            self.known.add(Web3.to_hex(tx_hash))
+            self.receipts[Web3.to_hex(tx_hash)] = {"status": 1, "tokenId": len(self.receipts) + 1}
+        return tx_hash
+
+    def get_transaction_receipt(self, tx_hash):
+        if tx_hash not in self.receipts:
+            raise TransactionNotFound(tx_hash)
+        return self.receipts[tx_hash]
+
+    def get_transaction(self, tx_hash):
+        if tx_hash not in self.known:
+            raise TransactionNotFound(tx_hash)
+        return {}
+
+
+class TestMintQueueWithStubChain:
+    """Test nonce ordering, resync and resend paths of the mint pipeline."""
+
+    async def _run(self, queue, claims):
+        try:
+            await asyncio.wait_for(asyncio.gather(*[queue.wait(c) for c in claims]), 5)
+        finally:
+            await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_claims_are_sent_in_nonce_order(self):
+        chain = StubChain()
+        chain.next_nonce = 5
+        queue = chain.queue()
+
+        claims = [await queue.submit("0x" + "11" * 20, 8004) for _ in range(6)]
+        await self._run(queue, claims)
+
+        assert all(c.status == ClaimStatus.CONFIRMED for c in claims)
+        assert chain.sent == list(range(5, 11))
+        assert sorted(c.token_id for c in claims) == list(range(1, 7))
+        assert queue.get_stats()["next_nonce"] == 11
+
+    @pytest.mark.asyncio
+    async def test_nonce_used_elsewhere_resyncs_and_retries(self):
+        chain = StubChain()
+        chain.next_nonce = 3
+        chain.stale_counts = [0]
+        queue = chain.queue()
+
+        claim = await queue.submit("0x" + "11" * 20, 7702)
+        await self._run(queue, [claim])
+
+        assert claim.status == ClaimStatus.CONFIRMED
+        assert (claim.nonce, claim.attempts) == (3, 2)
+        assert chain.sent == [3]
+
+    @pytest.mark.asyncio
+    async def test_dropped_transaction_is_resent_with_its_nonce(self):
+        chain = StubChain()
+        chain.drop = {0}
+        queue = chain.queue(receipt_timeout=0)
+
+        claim = await queue.submit("0x" + "11" * 20, 1559)
+        await self._run(queue, [claim])
+
+        assert claim.status == ClaimStatus.CONFIRMED
+        assert chain.sent == [0, 0]
+        assert claim.attempts == 2
+        assert queue.get_stats()["resent"] == 1
+
+    @pytest.mark.asyncio
+    async def test_revert_fails_claim_without_reserving_a_nonce(self):
+        chain = StubChain()
+        chain.revert = "Paused()"
+        queue = chain.queue()
+
+        claim = await queue.submit("0x" + "11" * 20, 7702)
+        await self._run(queue, [claim])
+
+        assert claim.status == ClaimStatus.FAILED
+        assert claim.error == "contract_paused"
+        assert chain.sent == []
+        assert queue.nonces.next_nonce is None
+
+
+@pytest.fixture
+def badge_chain():
+    """GameBadgeNFT deployed on an in-process eth-tester chain."""
+    pytest.importorskip("eth_tester")
+    from web3 import EthereumTesterProvider, Web3
+
+    if not ARTIFACT.exists():
+        pytest.skip("GameBadgeNFT build artifact not found")
+    artifact = json.loads(ARTIFACT.read_text())
+
+    w3 = Web3(EthereumTesterProvider())
+    # eth-tester's first default account uses private key 0x...01
+    private_key = "0x" + "00" * 31 + "01"
+    minter = w3.eth.account.from_key(private_key)
+    assert minter.address == w3.eth.accounts[0]
+
+    factory = w3.eth.contract(abi=artifact["abi"], bytecode=artifact["bytecode"]["object"])
+    tx_hash = factory.constructor("Badge", "BDG", "ipfs://badges/", minter.address, minter.address, 1).transact(
+        {"from": minter.address}
+    )
+    address = w3.eth.wait_for_transaction_receipt(tx_hash)["contractAddress"]
+    contract = w3.eth.contract(address=address, abi=artifact["abi"])
+    return w3, contract, minter, private_key
+
+
+class TestMintQueueOnChain:
+    """Run the mint pipeline against a local eth-tester chain."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_claims_get_sequential_nonces(self, badge_chain):
+        w3, contract, minter, private_key = badge_chain
+        queue = MintQueue(w3, contract, minter, private_key, poll_interval=0.01)
+        start_nonce = w3.eth.get_transaction_count(minter.address)
+
+        try:
+            claims = [await queue.submit(w3.eth.accounts[i % 3 + 1], 8004) for i in range(6)]
+            assert all(c.status == ClaimStatus.QUEUED for c in claims)
+            await asyncio.wait_for(asyncio.gather(*[queue.wait(c) for c in claims]), 30)
+        finally:
+            await queue.stop()
+
+        assert all(c.status == ClaimStatus.CONFIRMED for c in claims)
+        assert sorted(c.nonce for c in claims) == list(range(start_nonce, start_nonce + 6))
+        assert sorted(c.token_id for c in claims) == list(range(1, 7))
+        assert queue.get_claim(claims[0].claim_id) is claims[0]
+        assert queue.get_stats()["confirmed"] == 6
+
+    @pytest.mark.asyncio
+    async def test_rejected_claim_does_not_consume_nonce(self, badge_chain):
+        w3, contract, minter, private_key = badge_chain
+        start_nonce = w3.eth.get_transaction_count(minter.address)
+        contract.functions.setPaused(True).transact({"from": minter.address})
+        queue = MintQueue(w3, contract, minter, private_key, poll_interval=0.01)
+
+        try:
+            claim = await queue.submit(w3.eth.accounts[1], 7702)
+            await asyncio.wait_for(queue.wait(claim), 30)
+        finally:
+            await queue.stop()
+
+        assert claim.status == ClaimStatus.FAILED
+        assert claim.error == "contract_paused"
+        assert claim.nonce is None
+        assert w3.eth.get_transaction_count(minter.address) == start_nonce + 1
+
+
+class PendingQueue:
+    """Queue whose claims never confirm."""
+
+    async def submit(self, to_address, game_id):
+        return MintClaim(claim_id="claim-1", to_address=to_address, game_id=game_id)
+
+    async def wait(self, claim, timeout=None):
+        await asyncio.wait_for(claim.done.wait(), timeout)
+        return claim
+
+
+class TestClaimBadgeEndpoint:
+    """Test the synchronous claim endpoints."""
+
+    def test_slow_mint_returns_pending_claim(self, monkeypatch):
+        from fastapi.testclient import TestClient
+
+        from spoon_ai.nft import service
+
+        async def get_queue():
+            return PendingQueue()
+
+        monkeypatch.setattr(service, "_get_mint_queue", get_queue)
+        monkeypatch.setattr(service, "_CLAIM_WAIT_TIMEOUT", 0.01)
+
+        response = TestClient(service.app).post("/claim-badge/8004", json={"userAddress": "0x" + "11" * 20})
+
+        assert response.status_code == 202
+        assert response.json()["claimId"] == "claim-1"
+        assert response.json()["status"] == "queued"
@@ -0,0 +1,201 @@
+"""
+Tests for Files API upload reuse in the OpenAI-compatible provider.
+
+The provider talks to a local mock of the OpenAI Files and Chat Completions
+endpoints, so uploads and deletions are observed on the wire.
+"""
+
+import asyncio
+import base64
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from spoon_ai.llm.file_registry import UploadedFileRegistry
+from spoon_ai.llm.providers import openai_compatible_provider
+from spoon_ai.llm.providers.openai_compatible_provider import OpenAICompatibleProvider
+from spoon_ai.schema import DocumentContent, DocumentSource, Message, TextContent
+
+
+class _MockOpenAI:
+    def __init__(self):
+        self.uploads = []
+        self.deletes = []
+        self.chat_file_ids = []
+
+    def handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.path.endswith("/files"):
+                    file_id = f"file-{len(mock.uploads) + 1}"
+                    mock.uploads.append(len(body))
+                    self._reply({"id": file_id, "object": "file", "bytes": len(body), "created_at": 0,
+                                 "filename": "doc.pdf", "purpose": "user_data", "status": "processed"})
+                    return
+                request = json.loads(body)
+                mock.chat_file_ids.append([
+                    block["file"].get("file_id")
+                    for message in request["messages"] if isinstance(message["content"], list)
+                    for block in message["content"] if block.get("type") == "file"
+                ])
+                self._reply({"id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": request["model"],
+                             "choices": [{"index": 0, "finish_reason": "stop",
+                                          "message": {"role": "assistant", "content": "ok"}}]})
+
+            def do_DELETE(self):
+                file_id = self.path.rsplit("/", 1)[-1]
+                mock.deletes.append(file_id)
+                self._reply({"id": file_id, "object": "file", "deleted": True})
+
+        return Handler
+
+
+@pytest.fixture
+def mock_api():
+    mock = _MockOpenAI()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), mock.handler())
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    mock.base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    yield mock
+    server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def small_inline_limit(monkeypatch):
+    monkeypatch.setattr(openai_compatible_provider, "MAX_INLINE_FILE_SIZE", 1024)
+
+
+async def _provider(mock, **config):
+    provider = OpenAICompatibleProvider()
+    await provider.initialize({"api_key": "key", "base_url": mock.base_url, "model": "gpt-4.1", **config})
+    return provider
+
+
+def _pdf_message(seed: bytes, text: str = "summarize") -> Message:
+    data = base64.b64encode(seed * 4096).decode()
+    return Message(role="user", content=[
+        TextContent(text=text),
+        DocumentContent(source=DocumentSource(media_type="application/pdf", data=data), filename="doc.pdf"),
+    ])
+
+
+class TestFileReuse:
+    """Test that identical attachments are uploaded once."""
+
+    @pytest.mark.asyncio
+    async def test_same_document_is_uploaded_once_across_turns(self, mock_api):
+        provider = await _provider(mock_api)
+        history = [_pdf_message(b"A")]
+
+        for turn in range(3):
+            await provider.chat(history)
+            history += [Message(role="assistant", content="ok"), Message(role="user", content=f"turn {turn}")]
+
+        assert len(mock_api.uploads) == 1
+        assert mock_api.chat_file_ids == [["file-1"]] * 3
+        assert mock_api.deletes == []
+
+        await provider.cleanup()
+        assert mock_api.deletes == ["file-1"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_upload(self, mock_api):
+        provider = await _provider(mock_api)
+
+        await asyncio.gather(*(provider.chat([_pdf_message(b"B")]) for _ in range(5)))
+        await provider.chat([_pdf_message(b"C")])
+
+        assert len(mock_api.uploads) == 2
+        assert provider.file_registry.get_stats()["reuses"] == 4
+        await provider.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_unreferenced_files_are_deleted_after_ttl(self, mock_api):
+        provider = await _provider(mock_api, file_cache_ttl=0)
+
+        await provider.chat([_pdf_message(b"D")])
+        await provider.chat([_pdf_message(b"E")])
+
+        assert mock_api.deletes == ["file-1", "file-2"]
+        assert provider.file_registry.get_stats()["files"] == 0
+        await provider.cleanup()
+
+
+class TestUploadedFileRegistry:
+    """Test reference counting and eviction in the registry."""
+
+    @pytest.mark.asyncio
+    async def test_referenced_files_are_never_collected(self):
+        registry = UploadedFileRegistry(ttl=0, max_files=0)
+        counter = iter(range(1, 10))
+
+        async def upload():
+            return f"file-{next(counter)}", 10
+
+        key = registry.content_key("abc")
+        assert await registry.acquire(key, upload) == "file-1"
+        assert await registry.acquire(key, upload) == "file-1"
+        assert registry.collect() == []
+
+        registry.release([key])
+        assert registry.collect() == []
+        registry.release([key])
+        assert registry.collect() == ["file-1"]
+
+    @pytest.mark.asyncio
+    async def test_failed_upload_is_not_cached(self):
+        registry = UploadedFileRegistry()
+        attempts = []
+
+        async def failing():
+            attempts.append(1)
+            raise RuntimeError("upload failed")
+
+        key = registry.content_key("abc")
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await registry.acquire(key, failing)
+
+        assert len(attempts) == 2
+        assert registry.get_stats()["files"] == 0
+
+    @pytest.mark.asyncio
+    async def test_waiter_uploads_itself_when_uploader_is_cancelled(self):
+        registry = UploadedFileRegistry()
+        started = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(10)
+            return "file-slow", 10
+
+        async def fast():
+            return "file-fast", 10
+
+        key = registry.content_key("abc")
+        uploader = asyncio.create_task(registry.acquire(key, slow))
+        await started.wait()
+        waiter = asyncio.create_task(registry.acquire(key, fast))
+        await asyncio.sleep(0)
+        uploader.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await uploader
+        assert await waiter == "file-fast"
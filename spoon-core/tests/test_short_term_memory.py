@@ -0,0 +1,69 @@
+"""
+Tests for short-term memory trimming.
+"""
+
+import pytest
+
+from spoon_ai.memory.short_term_manager import MessageTokenCounter, ShortTermMemoryManager, TrimStrategy
+from spoon_ai.schema import Function, Message, ToolCall
+
+
+def _tool_call(call_id: str) -> ToolCall:
+    return ToolCall(id=call_id, function=Function(name="search", arguments="{}"))
+
+
+class TestMessageTokenCounter:
+    """Test per-message token caching."""
+
+    @pytest.mark.asyncio
+    async def test_total_is_sum_of_message_counts(self):
+        counter = MessageTokenCounter()
+        messages = [Message(role="user", content="x" * 40), Message(role="assistant", content="y" * 7)]
+
+        total = await counter.count_tokens(messages)
+
+        assert total == sum(counter.count_message_tokens(m) for m in messages)
+        assert total == MessageTokenCounter._approximate_count(messages)
+
+    def test_cache_invalidated_when_content_changes(self):
+        counter = MessageTokenCounter()
+        message = Message(role="user", content="short")
+        before = counter.count_message_tokens(message)
+
+        message.content = "much longer content " * 10
+
+        assert counter.count_message_tokens(message) > before
+
+
+class TestTrimMessages:
+    """Test budget walk and tool-call pairing in trim_messages."""
+
+    @pytest.mark.asyncio
+    async def test_from_end_keeps_system_and_newest(self):
+        manager = ShortTermMemoryManager()
+        system = Message(role="system", content="sys")
+        history = [system] + [Message(role="user", content=f"{i}" * 40) for i in range(10)]
+        per_message = manager.token_counter.count_message_tokens(history[1])
+        budget = manager.token_counter.count_message_tokens(system) + 3 * per_message
+
+        trimmed = await manager.trim_messages(history, budget, strategy=TrimStrategy.FROM_END)
+
+        assert trimmed == [system] + history[-3:]
+
+    @pytest.mark.asyncio
+    async def test_tool_results_stay_with_their_call(self):
+        manager = ShortTermMemoryManager()
+        history = [
+            Message(role="user", content="u" * 400),
+            Message(role="assistant", content="", tool_calls=[_tool_call("a"), _tool_call("b")]),
+            Message(role="tool", tool_call_id="a", name="search", content="r" * 40),
+            Message(role="tool", tool_call_id="b", name="search", content="r" * 40),
+            Message(role="assistant", content="done"),
+        ]
+        count = manager.token_counter.count_message_tokens
+        # Room for the last two messages only: the tool result pulls in its call and sibling
+        budget = count(history[3]) + count(history[4])
+
+        trimmed = await manager.trim_messages(history, budget, strategy=TrimStrategy.FROM_END)
+
+        assert trimmed == history[1:]